@@ -3,14 +3,20 @@
 from __future__ import annotations
 
 import atexit
+import hashlib
 import os
+import re
+import time
 from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from contextlib import ExitStack, contextmanager
+from contextvars import copy_context
+from functools import partial
 from importlib.resources import as_file, files
 from os.path import exists
 from pathlib import Path
-from threading import Condition, Lock
-from typing import Any, Generic, Literal, TypeVar, cast
+from threading import Barrier, BrokenBarrierError, Condition, Lock
+from typing import Any, Generic, Literal, TypeVar, cast, get_args
 
 import numpy as np
 import numpy.typing as npt
@@ -21,15 +27,22 @@ try:
 except ImportError:
     raise ImportError("BUG: version.py doesn't exist. Please file a bug report.")
 
-from .htsengine import HTSEngine
-from .openjtalk import OpenJTalk
+from .cache import LRUCache, bump_dictionary_generation, get_dictionary_generation
+from .htsengine import HTSEngine, _split_labels_at_pauses
+from .openjtalk import _TEXT2MECAB_BUFFER_SIZE, MeCabModel, OpenJTalk
 from .openjtalk import build_mecab_dictionary as _build_mecab_dictionary
 from .openjtalk import mecab_dict_index as _mecab_dict_index
+from .profiling import LockMetrics, is_lock_metrics_enabled
+from .profiling import openjtalk_lock_metrics as _profiling_openjtalk_lock_metrics
+from .profiling import stage as _profiling_stage
 from .types import (
+    CacheStats,
     JPCommonMappingEntry,
+    LockStats,
     MeCabMorph,
     MeCabNBestPath,
     NJDFeature,
+    PoolStats,
     SurfacePhonemeMapping,
     UserDictionaryEntry,
 )
@@ -157,25 +170,81 @@ def _lazy_init() -> None:
     pass
 
 
+def _validate_pool_size(pool_size: int) -> None:
+    """
+    インスタンスプールの上限数を検証する。
+
+    Args:
+        pool_size (int): プールが保持するインスタンスの上限数
+
+    Raises:
+        ValueError: 上限数が1未満の場合
+    """
+
+    if pool_size < 1:
+        raise ValueError(f"Pool size must be greater than or equal to 1: {pool_size}")
+
+
+def _read_pool_size_from_environment(name: str) -> int:
+    """
+    環境変数からインスタンスプールの上限数を読み込む。
+
+    Args:
+        name (str): 上限数を指定する環境変数名
+
+    Returns:
+        int: 環境変数の値。未設定または空文字列の場合は 1
+
+    Raises:
+        ValueError: 環境変数の値が1以上の整数ではない場合
+    """
+
+    value = os.environ.get(name, "").strip()
+    if value == "":
+        return 1
+    try:
+        pool_size = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer: {value!r}") from None
+    _validate_pool_size(pool_size)
+    return pool_size
+
+
 class _ReplaceableInstanceManager(Generic[_T]):
     """
-    利用中の処理を完了させてから交換できる共有インスタンスを管理する。
+    利用中の処理を完了させてから交換できる共有インスタンスのプールを管理する。
     """
 
-    def __init__(self, instance_factory: Callable[[], _T]) -> None:
+    def __init__(self, instance_factory: Callable[[], _T], pool_size: int = 1) -> None:
         """
         インスタンスを遅延生成するマネージャーを初期化する。
 
         Args:
-            instance_factory (Callable[[], _T]): 初回の借り出し時に呼ぶファクトリ
+            instance_factory (Callable[[], _T]): 借り出し時にプールを拡張するためのファクトリ
+            pool_size (int): プールが保持するインスタンスの上限数 (デフォルト: 1)
+
+        Raises:
+            ValueError: 上限数が1未満の場合
         """
 
-        self._instance: _T | None = None
-        self._instance_factory = instance_factory
+        _validate_pool_size(pool_size)
+        self._instances: list[_T] = []
+        # インスタンスごとの借り出し数 (self._instances と同じ添字で対応する)
+        self._lease_counts: list[int] = []
+        self._instance_factory: Callable[[], _T] | None = instance_factory
+        self._pool_size = pool_size
         self._mutex = Lock()
         self._condition = Condition(self._mutex)
         self._active_leases = 0
+        self._pending_creations = 0
         self._is_replacing = False
+        self._metrics = LockMetrics()
+
+    @property
+    def pool_size(self) -> int:
+        """プールが保持するインスタンスの上限数。"""
+
+        return self._pool_size
 
     @contextmanager
     def __call__(self) -> Generator[_T, None, None]:
@@ -183,33 +252,133 @@ class _ReplaceableInstanceManager(Generic[_T]):
         共有インスタンスを借り出す。
 
         Yields:
-            _T: 遅延生成または固定のシングルトン
+            _T: 借り出し数が最も少ないプール内のインスタンス
+
+        NOTE:
+            空きインスタンスがなく上限に達していない場合はファクトリで新規生成する。
+            上限に達している場合は待機せず、借り出し数が最も少ないインスタンスを共有する
+            (各インスタンスは自身のロックで処理を直列化するため、共有しても安全)
         """
 
+        # 計測の有無は借り出しと返却で揃える必要があるため、借り出しの開始時に一度だけ判定する
+        is_measuring = is_lock_metrics_enabled()
+        request_time = time.perf_counter() if is_measuring is True else 0.0
+        is_contended = False
         with self._condition:
-            # 交換開始後の呼び出しは、旧インスタンスを取得せず交換完了まで待機
-            while self._is_replacing is True:
+            while True:
+                # 交換開始後の呼び出しは、旧インスタンスを取得せず交換完了まで待機
+                while self._is_replacing is True:
+                    is_contended = True
+                    self._condition.wait()
+                index = self._select_instance_index()
+                can_grow = (
+                    self._instance_factory is not None
+                    and len(self._instances) + self._pending_creations < self._pool_size
+                )
+                if can_grow is True and (index is None or self._lease_counts[index] > 0):
+                    index = None
+                    break
+                if index is not None:
+                    break
+                # 上限までの生成が全て進行中で借り出せるインスタンスがない場合は生成完了を待つ
+                is_contended = True
                 self._condition.wait()
-            instance = self._instance
-            if instance is None:
-                instance = self._instance_factory()
-                self._instance = instance
             self._active_leases += 1
+            instance_factory = self._instance_factory
+            if index is not None:
+                self._lease_counts[index] += 1
+                instance = self._instances[index]
+            else:
+                self._pending_creations += 1
+
+        if index is None:
+            # 辞書の読み込みは時間がかかるため、ロック外で生成して他の借り出しを止めない
+            ## 生成中も借り出しとして数えるため、交換処理はこの生成の完了を待つ
+            try:
+                instance = cast(Callable[[], _T], instance_factory)()
+            except BaseException:
+                with self._condition:
+                    self._pending_creations -= 1
+                    self._active_leases -= 1
+                    self._condition.notify_all()
+                raise
+            with self._condition:
+                self._pending_creations -= 1
+                self._instances.append(instance)
+                self._lease_counts.append(1)
+                index = len(self._instances) - 1
+                self._condition.notify_all()
+
+        # 新規生成した場合は、生成にかかった時間も借り出しまでの待ち時間に含める
+        acquire_time = 0.0
+        if is_measuring is True:
+            acquire_time = time.perf_counter()
+            self._metrics.record_acquire(acquire_time - request_time, is_contended)
         try:
             yield instance
         finally:
             with self._condition:
+                self._lease_counts[index] -= 1
                 self._active_leases -= 1
                 # 交換処理が待つのは最後の借り出しが返却される瞬間だけ
                 if self._active_leases == 0:
                     self._condition.notify_all()
+            if is_measuring is True:
+                self._metrics.record_release(time.perf_counter() - acquire_time)
+
+    def stats(self) -> PoolStats:
+        """
+        プールの借り出しの統計情報を返す。
+
+        Returns:
+            PoolStats: 借り出し回数・待ち時間などの分布・借り出し中の数・上限数・インスタンス数
+
+        NOTE:
+            借り出し中の数・上限数・インスタンス数以外は、`profiling.set_lock_metrics_enabled(True)` の間の借り出しのみを数える
+        """
+
+        lock_stats = self._metrics.stats()
+        with self._condition:
+            pool_stats = PoolStats(
+                **lock_stats,
+                pool_size=self._pool_size,
+                instance_count=len(self._instances) + self._pending_creations,
+            )
+            pool_stats["active_leases"] = self._active_leases
+        return pool_stats
+
+    def reset_stats(self) -> None:
+        """借り出し中の数・上限数・インスタンス数を除く統計情報を破棄する。"""
+
+        self._metrics.reset()
 
-    def replace(self, instance: _T) -> None:
+    def _select_instance_index(self) -> int | None:
         """
-        進行中の借り出しを待って共有インスタンスを交換する。
+        借り出し数が最も少ないインスタンスの添字を返す。
+
+        Returns:
+            int | None: プールが空の場合は None
+
+        NOTE:
+            `self._condition` を保持した状態で呼ぶ必要がある
+        """
+
+        selected_index: int | None = None
+        for index, lease_count in enumerate(self._lease_counts):
+            if lease_count == 0:
+                return index
+            if selected_index is None or lease_count < self._lease_counts[selected_index]:
+                selected_index = index
+        return selected_index
+
+    def replace(self, instance: _T, instance_factory: Callable[[], _T] | None = None) -> None:
+        """
+        進行中の借り出しを待ってプール全体を交換する。
 
         Args:
             instance (_T): 次の借り出しから返すインスタンス
+            instance_factory (Callable[[], _T] | None): 交換後にプールを拡張するためのファクトリ。
+                None の場合はプールを拡張せず、全ての借り出しで instance を共有する
 
         NOTE:
             非リエントラント。借り出し中 (`with _global_jtalk()` 内) から呼んではいけない。
@@ -217,34 +386,119 @@ class _ReplaceableInstanceManager(Generic[_T]):
             `unset_user_dict()` を呼ぶと、借り出し完了待ちでデッドロックする
         """
 
+        with self._drained():
+            # 旧設定のインスタンスが残らないよう、プール全体を新しいインスタンスだけにする
+            self._instances = [instance]
+            self._lease_counts = [0]
+            self._instance_factory = instance_factory
+
+    def grow(self, pool_size: int) -> None:
+        """
+        上限数が指定値より小さい場合だけ、指定値まで引き上げる。
+
+        Args:
+            pool_size (int): 引き上げ後の上限数
+
+        Raises:
+            ValueError: 上限数が1未満の場合
+
+        NOTE:
+            上限数を下げることはないため、進行中の借り出しを待たずに即座に返る。
+            上限数の確認と変更を1回のロック区間で行うため、他のスレッドが並行して上限数を引き上げても縮小しない
+        """
+
+        _validate_pool_size(pool_size)
+        with self._condition:
+            if self._pool_size < pool_size:
+                self._pool_size = pool_size
+                # 上限までの生成完了を待つ借り出しが、新しい枠でインスタンスを生成できるようにする
+                self._condition.notify_all()
+
+    def resize(self, pool_size: int) -> None:
+        """
+        プールが保持するインスタンスの上限数を変更する。
+
+        Args:
+            pool_size (int): 新しい上限数
+
+        Raises:
+            ValueError: 上限数が1未満の場合
+
+        NOTE:
+            拡大時と、縮小しても既存のインスタンス数を下回らない場合は、進行中の借り出しを待たずに上限数だけを変更する。
+            既存のインスタンス数を下回る縮小時は `replace()` と同様に進行中の借り出しを待ち、上限を超えるインスタンスを破棄する。
+            縮小時は `replace()` と同じく非リエントラント
+        """
+
+        _validate_pool_size(pool_size)
+        with self._condition:
+            # 借り出し中のインスタンスを破棄しない変更では、新規借り出しを止めずに上限数だけを変える
+            if pool_size >= len(self._instances) + self._pending_creations:
+                self._pool_size = pool_size
+                # 上限までの生成完了を待つ借り出しが、新しい枠でインスタンスを生成できるようにする
+                self._condition.notify_all()
+                return
+        with self._drained():
+            del self._instances[pool_size:]
+            del self._lease_counts[pool_size:]
+            self._pool_size = pool_size
+
+    @contextmanager
+    def _drained(self) -> Generator[None, None, None]:
+        """
+        新規の借り出しを止め、進行中の借り出しが全て返却された状態でプールを操作する。
+
+        Yields:
+            None: `self._condition` を保持したまま制御を返す
+        """
+
         with self._condition:
             # 複数の交換要求も順番に処理し、交換中は新規借り出しを止める
             while self._is_replacing is True:
                 self._condition.wait()
             self._is_replacing = True
             try:
+                drain_start_time = time.perf_counter()
                 while self._active_leases > 0:
                     self._condition.wait()
-                self._instance = instance
+                if is_lock_metrics_enabled() is True:
+                    self._metrics.record_drain(time.perf_counter() - drain_start_time)
+                yield
             finally:
                 self._is_replacing = False
                 self._condition.notify_all()
 
 
 class _ExclusiveInstanceManager(Generic[_T]):
-    """一連の操作が完了するまで排他的に貸し出すインスタンスを管理する。"""
+    """一連の操作が完了するまで排他的に貸し出すインスタンスのプールを管理する。"""
 
-    def __init__(self, instance_factory: Callable[[], _T]) -> None:
+    def __init__(self, instance_factory: Callable[[], _T], pool_size: int = 1) -> None:
         """
         インスタンスを遅延生成するマネージャーを初期化する。
 
         Args:
-            instance_factory (Callable[[], _T]): 初回の借り出し時に呼ぶファクトリ
+            instance_factory (Callable[[], _T]): 借り出し時にプールを拡張するためのファクトリ
+            pool_size (int): プールが保持するインスタンスの上限数 (デフォルト: 1)
+
+        Raises:
+            ValueError: 上限数が1未満の場合
         """
 
-        self._instance: _T | None = None
+        _validate_pool_size(pool_size)
+        self._idle_instances: list[_T] = []
+        # 貸し出し中と生成中を含む、プールが管理しているインスタンスの総数
+        self._instance_count = 0
         self._instance_factory = instance_factory
+        self._pool_size = pool_size
         self._mutex = Lock()
+        self._condition = Condition(self._mutex)
+        self._metrics = LockMetrics()
+
+    @property
+    def pool_size(self) -> int:
+        """プールが保持するインスタンスの上限数。"""
+
+        return self._pool_size
 
     @contextmanager
     def __call__(self) -> Generator[_T, None, None]:
@@ -252,31 +506,197 @@ class _ExclusiveInstanceManager(Generic[_T]):
         コンテキスト内の操作全体を排他してインスタンスを貸し出す。
 
         Yields:
-            _T: 遅延生成されたシングルトン
+            _T: 他の呼び出しへ同時に貸し出されないプール内のインスタンス
+
+        NOTE:
+            空きインスタンスがなく上限に達していない場合はファクトリで新規生成する。
+            上限に達している場合は、いずれかのインスタンスが返却されるまで待機する
         """
 
-        # HTSEngine の設定変更と合成を一体として扱うため、返却までロックを保持
-        with self._mutex:
-            if self._instance is None:
-                self._instance = self._instance_factory()
-            yield self._instance
+        # 計測の有無は借り出しと返却で揃える必要があるため、借り出しの開始時に一度だけ判定する
+        is_measuring = is_lock_metrics_enabled()
+        request_time = time.perf_counter() if is_measuring is True else 0.0
+        is_contended = False
+        instance: _T | None = None
+        with self._condition:
+            while len(self._idle_instances) == 0 and self._instance_count >= self._pool_size:
+                is_contended = True
+                self._condition.wait()
+            if len(self._idle_instances) > 0:
+                instance = self._idle_instances.pop()
+            else:
+                # 生成中の枠も上限に数え、同時の借り出しが上限を超えて生成しないようにする
+                self._instance_count += 1
+
+        if instance is None:
+            # 音響モデルの読み込み中も、他の呼び出しが空きインスタンスを借りられるようロック外で生成
+            try:
+                instance = self._instance_factory()
+            except BaseException:
+                with self._condition:
+                    self._instance_count -= 1
+                    self._condition.notify()
+                raise
+
+        # 新規生成した場合は、生成にかかった時間も貸し出しまでの待ち時間に含める
+        acquire_time = 0.0
+        if is_measuring is True:
+            acquire_time = time.perf_counter()
+            self._metrics.record_acquire(acquire_time - request_time, is_contended)
+        # HTSEngine の設定変更と合成を一体として扱うため、返却まで他の呼び出しへ貸し出さない
+        try:
+            yield instance
+        finally:
+            with self._condition:
+                if self._instance_count > self._pool_size:
+                    # 貸し出し中に上限数が縮小された場合は、返却されたインスタンスを破棄する
+                    self._instance_count -= 1
+                else:
+                    self._idle_instances.append(instance)
+                self._condition.notify()
+            if is_measuring is True:
+                self._metrics.record_release(time.perf_counter() - acquire_time)
+
+    def grow(self, pool_size: int) -> None:
+        """
+        上限数が指定値より小さい場合だけ、指定値まで引き上げる。
+
+        Args:
+            pool_size (int): 引き上げ後の上限数
+
+        Raises:
+            ValueError: 上限数が1未満の場合
+
+        NOTE:
+            上限数を下げることはないため、進行中の借り出しを待たずに即座に返る。
+            上限数の確認と変更を1回のロック区間で行うため、他のスレッドが並行して上限数を引き上げても縮小しない
+        """
+
+        _validate_pool_size(pool_size)
+        with self._condition:
+            if self._pool_size < pool_size:
+                self._pool_size = pool_size
+                # 上限待ちの借り出しが新規生成できるようになるため起こす
+                self._condition.notify_all()
+
+    def resize(self, pool_size: int) -> None:
+        """
+        プールが保持するインスタンスの上限数を変更する。
+
+        Args:
+            pool_size (int): 新しい上限数
+
+        Raises:
+            ValueError: 上限数が1未満の場合
+
+        NOTE:
+            縮小時は空きインスタンスを即座に破棄し、貸し出し中のインスタンスは返却時に破棄する
+        """
+
+        _validate_pool_size(pool_size)
+        with self._condition:
+            self._pool_size = pool_size
+            while self._instance_count > pool_size and len(self._idle_instances) > 0:
+                self._idle_instances.pop()
+                self._instance_count -= 1
+            # 拡大時は上限待ちの借り出しが新規生成できるようになるため起こす
+            self._condition.notify_all()
+
+    def stats(self) -> PoolStats:
+        """
+        プールの貸し出しの統計情報を返す。
+
+        Returns:
+            PoolStats: 貸し出し回数・待ち時間などの分布・貸し出し中の数・上限数・インスタンス数
+
+        NOTE:
+            貸し出し中の数・上限数・インスタンス数以外は、`profiling.set_lock_metrics_enabled(True)` の間の貸し出しのみを数える
+            縮小時に貸し出しの返却を待たないため、drain は常に空となる
+        """
+
+        lock_stats = self._metrics.stats()
+        with self._condition:
+            pool_stats = PoolStats(
+                **lock_stats,
+                pool_size=self._pool_size,
+                instance_count=self._instance_count,
+            )
+            pool_stats["active_leases"] = self._instance_count - len(self._idle_instances)
+        return pool_stats
 
+    def reset_stats(self) -> None:
+        """貸し出し中の数・上限数・インスタンス数を除く統計情報を破棄する。"""
 
-# Global instance of OpenJTalk
+        self._metrics.reset()
+
+
+def _create_openjtalk_factory(
+    dn_mecab: bytes,
+    userdic: bytes = b"",
+    userdic_reading_protection: Sequence[bool] | None = None,
+) -> Callable[[], OpenJTalk]:
+    """
+    同じ MeCab 辞書を共有する OpenJTalk インスタンスを生成するファクトリを返す。
+
+    Args:
+        dn_mecab (bytes): MeCab システム辞書のディレクトリパス
+        userdic (bytes): OpenJTalk 用ユーザー辞書 (.dic) のパス。複数指定時はカンマ区切り
+        userdic_reading_protection (Sequence[bool] | None): 各ユーザー辞書の読み保護フラグ
+
+    Returns:
+        Callable[[], OpenJTalk]: 初回呼び出し時に辞書を読み込み、以降はその辞書を共有して生成するファクトリ
+
+    NOTE:
+        プールを拡張しても辞書はファクトリごとに1回だけ読み込まれ、
+        インスタンスごとに増えるのは Tagger / Lattice / NJD / JPCommon のバッファのみになる
+    """
+
+    mecab_model: MeCabModel | None = None
+    model_lock = Lock()
+
+    def create_jtalk() -> OpenJTalk:
+        """共有の MeCab 辞書を参照する OpenJTalk インスタンスを生成する。"""
+
+        nonlocal mecab_model
+        with model_lock:
+            if mecab_model is None:
+                mecab_model = MeCabModel(dn_mecab, userdic)
+        return OpenJTalk(
+            userdic_reading_protection=userdic_reading_protection,
+            mecab_model=mecab_model,
+        )
+
+    return create_jtalk
+
+
+# Global instance pool of OpenJTalk
+# 環境変数 OPEN_JTALK_POOL_SIZE でプールの上限数を指定できる (デフォルト: 1)
 _global_jtalk: _ReplaceableInstanceManager[OpenJTalk] = _ReplaceableInstanceManager(
-    lambda: OpenJTalk(dn_mecab=OPEN_JTALK_DICT_DIR),
+    _create_openjtalk_factory(OPEN_JTALK_DICT_DIR),
+    pool_size=_read_pool_size_from_environment("OPEN_JTALK_POOL_SIZE"),
 )
 # 連続する update / unset が直前のマネージャーを待たずに差し替えるのを防ぐ
 _global_jtalk_swap_lock = Lock()
 
-# Global instance of HTSEngine
+# Global instance pool of HTSEngine
 # mei_normal.voice is used as default
+# 環境変数 HTS_ENGINE_POOL_SIZE でプールの上限数を指定できる (デフォルト: 1)
 _global_htsengine: _ExclusiveInstanceManager[HTSEngine] = _ExclusiveInstanceManager(
-    lambda: HTSEngine(DEFAULT_HTS_VOICE),
+    partial(HTSEngine, DEFAULT_HTS_VOICE),
+    pool_size=_read_pool_size_from_environment("HTS_ENGINE_POOL_SIZE"),
 )
 # Global instance of marine
 _global_marine = None
 
+# グローバル OpenJTalk インスタンスを使う run_frontend() / run_frontend_detailed() の結果キャッシュ
+# set_frontend_cache_size() で最大件数を指定するまでは無効
+_global_frontend_cache: LRUCache[tuple[Any, ...], Any] = LRUCache()
+# synthesize() / tts() の合成波形キャッシュ (int16 で保持し、合計バイト数で上限を管理する)
+# set_waveform_cache_size() で上限バイト数を指定するまでは無効
+_global_waveform_cache: LRUCache[tuple[Any, ...], tuple[npt.NDArray[np.int16], int]] = LRUCache(
+    weigher=lambda cached_waveform: cached_waveform[0].nbytes
+)
+
 
 @contextmanager
 def _resolve_jtalk(jtalk: OpenJTalk | None) -> Generator[OpenJTalk, None, None]:
@@ -626,20 +1046,47 @@ def extract_fullcontext(
 
     Returns:
         list[str]: フルコンテキストラベルのリスト
+
+    NOTE:
+        MeCab の入力バッファに収まらない長文は文・節の境界で分割し、部分ごとに生成したラベルを連結して返す
+        ラベル生成の処理時間はラベル数の2乗に比例して増えるため、連結した NJD features からまとめて生成しない
+        そのため分割位置のラベルは、tts_stream() と同様にポーズ (pau) ではなく無音 (sil) になる
     """
-    njd_features = run_frontend(
-        text,
+    text = normalize_text(text, normalize_mode)
+    run_segment = partial(
+        _extract_fullcontext_segment,
         run_marine=run_marine,
         use_vanilla=use_vanilla,
         use_tsqyomi=use_tsqyomi,
         use_sudachi_kanji_yomi=use_sudachi_kanji_yomi,
         predict_nani=predict_nani,
-        normalize_mode=normalize_mode,
         use_read_as_pron=use_read_as_pron,
         revert_long_vowels=revert_long_vowels,
         revert_yotsugana=revert_yotsugana,
         jtalk=jtalk,
     )
+    labels: list[str] = []
+    for segment_labels in _map_document_segments(run_segment, _split_document(text, jtalk), jtalk):
+        labels.extend(segment_labels)
+    return labels
+
+
+def _extract_fullcontext_segment(
+    text: str, *, jtalk: OpenJTalk | None, **frontend_options: bool
+) -> list[str]:
+    """
+    正規化済みのテキストからフルコンテキストラベルを抽出する。
+
+    Args:
+        text (str): 正規化済みの Unicode 日本語テキスト
+        jtalk (OpenJTalk | None): 使用する OpenJTalk インスタンス。None ならグローバルインスタンスを使う
+        **frontend_options (bool): run_frontend() に渡すオプション
+
+    Returns:
+        list[str]: フルコンテキストラベルのリスト
+    """
+
+    njd_features = run_frontend(text, jtalk=jtalk, **frontend_options)
     return make_label(njd_features, jtalk=jtalk)
 
 
@@ -659,15 +1106,38 @@ def synthesize(
     Returns:
         np.ndarray: 音声波形 (dtype: np.float64)
         int: サンプリング周波数 (デフォルト: 48000)
+
+    NOTE:
+        `set_waveform_cache_size()` で合成波形キャッシュを有効化している場合、
+        同じラベル・話速・半音の2回目以降の呼び出しはキャッシュした波形を返す
+        キャッシュの有効時は、キャッシュの有無で結果が変わらないよう、初回の呼び出しも含めて
+        16bit PCM に量子化した波形 (整数に丸めて -32768 から 32767 の範囲に収めた値) を返す
     """
     if isinstance(labels, tuple) and len(labels) == 2:
         labels = labels[1]
 
+    cache_key = None
+    if _global_waveform_cache.max_size > 0:
+        # ラベル列全体をキーに保持するとメモリを圧迫するため、ダイジェストに置き換える
+        label_digest = hashlib.blake2b("\n".join(labels).encode("utf-8"), digest_size=16).digest()
+        cache_key = (label_digest, DEFAULT_HTS_VOICE, float(speed), float(half_tone))
+        cached_waveform = _global_waveform_cache.get(cache_key)
+        if cached_waveform is not None:
+            return cached_waveform[0].astype(np.float64), cached_waveform[1]
+
     with _global_htsengine() as htsengine:
+        # プール内のインスタンスには前回の借り出し時の設定が残るため、借り出しごとに設定し直す
         sr = htsengine.get_sampling_frequency()
         htsengine.set_speed(speed)
         htsengine.add_half_tone(half_tone)
-        return htsengine.synthesize(labels), sr
+        wav = htsengine.synthesize(labels)
+    if cache_key is not None:
+        # float64 の 1/4 のサイズで保持するため、16bit PCM の範囲に丸めて int16 で格納する
+        cached_wav = np.clip(np.rint(wav), -32768, 32767).astype(np.int16)
+        cached_wav.flags.writeable = False
+        _global_waveform_cache.put(cache_key, (cached_wav, sr))
+        return cached_wav.astype(np.float64), sr
+    return wav, sr
 
 
 def tts(
@@ -742,6 +1212,115 @@ def tts(
     )
 
 
+# tts_stream() でテキストを文単位に区切る位置 (句点・感嘆符・疑問符・改行の直後)
+_STREAM_SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[。．！？!?\n])")
+
+# text2mecab() の出力バッファに収まらない長文を分割する境界 (前の境界で収まらない区切りだけ次の境界で分割する)
+## 文末で区切れない長い文は読点などの節の区切りで分割し、それでも収まらない場合は文字単位で分割する
+## 節の区切りは "1,000" のような数値の桁区切りを分断しないよう、直後が数字の場合を除く
+_DOCUMENT_BOUNDARY_PATTERNS = (
+    _STREAM_SENTENCE_BOUNDARY_PATTERN,
+    re.compile(r"(?<=[、，,；;：:　 \t])(?!\d)"),
+)
+
+
+def tts_stream(
+    text: str,
+    speed: float = 1.0,
+    half_tone: float = 0.0,
+    *,
+    run_marine: bool = False,
+    use_vanilla: bool = False,
+    use_tsqyomi: bool = False,
+    use_sudachi_kanji_yomi: bool = True,
+    predict_nani: bool = True,
+    normalize_mode: Literal["None", "NFC", "NFKC"] = "None",
+    use_read_as_pron: bool = False,
+    revert_long_vowels: bool = False,
+    revert_yotsugana: bool = False,
+    jtalk: OpenJTalk | None = None,
+) -> Generator[tuple[npt.NDArray[np.float64], int], None, None]:
+    """
+    テキストから音声を合成し、文および文中のポーズ (pau) で区切ったセグメントごとに音声波形を返す。
+    全体の合成を待たずに先頭のセグメントから再生を始められるため、応答までの遅延を抑えたい用途に向く。
+    次の文のフロントエンド処理はバックグラウンドスレッドで先行して行い、現在の文の音声合成と並行させる。
+
+    Args:
+        text (str): Unicode 日本語テキスト
+        speed (float): 話速 (デフォルト: 1.0)
+        half_tone (float): 追加の半音 (デフォルト: 0)
+        run_marine (bool): marine を用いたアクセント推定を行うか (デフォルト: False)
+            有効にするには `pip install pyopenjtalk-plus[marine]` で marine をインストールする必要がある
+        use_vanilla (bool): True の場合、pyopenjtalk-plus 独自の後処理を省略し、
+            OpenJTalk の素の NJDFeature をそのまま後段に流す
+            ただし発音復元オプション (use_read_as_pron 等) は use_vanilla とは独立して適用される (デフォルト: False)
+        use_tsqyomi (bool): True の場合、ロード済みの tsqyomi で文脈に合う読み候補を選ぶ
+            Sudachi と「何」モデルによる読み変更を省き、tsqyomi の選択を維持する (デフォルト: False)
+        use_sudachi_kanji_yomi (bool): True の場合、Sudachi による同形異音語の読み補正を行う
+            use_tsqyomi が True の場合は tsqyomi を優先し、常に無効化される (デフォルト: True)
+        predict_nani (bool): True の場合、ONNX モデルで単独形態素として出現した「何」の読みを推定する
+            use_tsqyomi が True の場合は tsqyomi を優先し、常に無効化される (デフォルト: True)
+        normalize_mode (Literal["None", "NFC", "NFKC"]): 入力テキストに適用する Unicode 正規化方式
+            `"NFC"` は結合文字を正規化し、`"NFKC"` は半角カナなどの互換文字も正規化する (デフォルト: `"None"`)
+        use_read_as_pron (bool): True の場合、全ての発音を強制的に読みに置き換える
+            助詞「は」も「ハ」になるため、TTS 用途には適さない (デフォルト: False)
+        revert_long_vowels (bool): True の場合、辞書が自動的に長音化した発音を元に復元する (デフォルト: False)
+        revert_yotsugana (bool): True の場合、四つ仮名 (ヅ・ヂ) の発音統合を元に復元する (デフォルト: False)
+        jtalk (OpenJTalk | None): 使用する OpenJTalk インスタンス。None ならグローバルインスタンスを使う
+
+    Returns:
+        Generator[tuple[np.ndarray, int], None, None]: セグメントごとの音声波形 (dtype: np.float64) と
+            サンプリング周波数の組を返すジェネレータ
+
+    NOTE:
+        フロントエンド処理は文単位で行うため、文境界のラベルは tts() のポーズ (pau) ではなく無音 (sil) になる
+        そのため全セグメントを連結した波形は tts() の波形とは完全には一致しない
+        音声合成はセグメントごとにグローバル HTSEngine インスタンスを借り出すため、消費中も他のスレッドの合成を妨げない
+    """
+    sentences = [
+        sentence
+        for sentence in _STREAM_SENTENCE_BOUNDARY_PATTERN.split(text)
+        if sentence.strip() != ""
+    ]
+    if len(sentences) == 0:
+        sentences = [text]
+
+    run_extract_fullcontext = partial(
+        extract_fullcontext,
+        run_marine=run_marine,
+        use_vanilla=use_vanilla,
+        use_tsqyomi=use_tsqyomi,
+        use_sudachi_kanji_yomi=use_sudachi_kanji_yomi,
+        predict_nani=predict_nani,
+        normalize_mode=normalize_mode,
+        use_read_as_pron=use_read_as_pron,
+        revert_long_vowels=revert_long_vowels,
+        revert_yotsugana=revert_yotsugana,
+        jtalk=jtalk,
+    )
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyopenjtalk-tts-stream")
+    try:
+        next_labels: Future[list[str]] = executor.submit(run_extract_fullcontext, sentences[0])
+        for index in range(len(sentences)):
+            labels = next_labels.result()
+            # 現在の文を合成している間に、次の文のフロントエンド処理を進めておく
+            if index + 1 < len(sentences):
+                next_labels = executor.submit(run_extract_fullcontext, sentences[index + 1])
+            for segment in _split_labels_at_pauses(labels):
+                with _global_htsengine() as htsengine:
+                    # プール内のインスタンスには前回の借り出し時の設定が残るため、借り出しごとに設定し直す
+                    sr = htsengine.get_sampling_frequency()
+                    htsengine.set_speed(speed)
+                    htsengine.add_half_tone(half_tone)
+                    wav = htsengine.synthesize(segment)
+                # 呼び出し側の消費中はインスタンスを保持しないよう、借り出しを返してから yield する
+                yield wav, sr
+    finally:
+        # 途中で消費を打ち切られた場合は、未着手の先行処理を破棄する
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 def apply_postprocessing(
     text: str,
     njd_features: list[NJDFeature],
@@ -800,17 +1379,19 @@ def apply_postprocessing(
         # filler アクセントは読み変更より先に補正する既存の処理順序を維持する
         njd_features = modify_filler_accent(njd_features)
         if predict_nani is True:
-            njd_features = predict_nani_reading(njd_features)
+            with _profiling_stage("nani"):
+                njd_features = predict_nani_reading(njd_features)
         if use_sudachi_kanji_yomi is True:
-            njd_features = modify_kanji_yomi(
-                text,
-                njd_features,
-                _MULTI_READ_KANJI_SET_EXCLUDING_NANI,
-            )
+            with _profiling_stage("sudachi"):
+                njd_features = modify_kanji_yomi(
+                    text,
+                    njd_features,
+                    _MULTI_READ_KANJI_SET_EXCLUDING_NANI,
+                )
         njd_features = suppress_unnatural_auxiliary_u_long_vowel(njd_features)
         njd_features = retreat_acc_nuc(njd_features)
         njd_features = modify_acc_after_chaining(njd_features)
-        with _resolve_jtalk(jtalk) as resolved_jtalk:
+        with _resolve_jtalk(jtalk) as resolved_jtalk, _profiling_stage("odori"):
             njd_features = process_odori_features(njd_features, jtalk=resolved_jtalk)
     # 発音復元は use_vanilla の設定に関係なく、明示的に指定された場合のみ独立して適用する
     if use_read_as_pron is True or revert_long_vowels is True or revert_yotsugana is True:
@@ -871,32 +1452,48 @@ def run_frontend(
 
     Returns:
         list[NJDFeature]: NJDNode 用 features
+
+    NOTE:
+        MeCab の入力バッファに収まらない長文は文・節の境界で分割し、部分ごとに処理した NJD features を連結して返す
+        グローバル OpenJTalk インスタンスのプール上限数が2以上の場合、分割した部分は複数インスタンスで並行処理される
     """
     text = normalize_text(text, normalize_mode)
-    with _resolve_jtalk(jtalk) as inference_jtalk:
-        if use_tsqyomi is True:
-            njd_features, _ = _run_frontend_with_tsqyomi(
-                text,
-                jtalk=inference_jtalk,
-                include_morphs=False,
-            )
-        else:
-            njd_features = inference_jtalk.run_frontend(text)
-
-        # tsqyomi 使用時は読み候補確定済みなので Sudachi と nani_predict モデルを適用しない
-        njd_features = apply_postprocessing(
+    # 結果キャッシュは辞書の世代番号で無効化を追跡できるグローバルインスタンス使用時のみ有効
+    cache_key = None
+    if jtalk is None and _global_frontend_cache.max_size > 0:
+        cache_key = (
+            "run_frontend",
             text,
-            njd_features,
-            run_marine=run_marine,
-            use_vanilla=use_vanilla,
-            use_sudachi_kanji_yomi=use_sudachi_kanji_yomi if use_tsqyomi is False else False,
-            predict_nani=predict_nani if use_tsqyomi is False else False,
-            normalize_mode="None",  # 既に normalize_text() で正規化されているため、再度正規化しない
-            use_read_as_pron=use_read_as_pron,
-            revert_long_vowels=revert_long_vowels,
-            revert_yotsugana=revert_yotsugana,
-            jtalk=inference_jtalk,
+            run_marine,
+            use_vanilla,
+            use_tsqyomi,
+            use_sudachi_kanji_yomi,
+            predict_nani,
+            use_read_as_pron,
+            revert_long_vowels,
+            revert_yotsugana,
+            get_dictionary_generation(),
         )
+        cached_features = _global_frontend_cache.get(cache_key)
+        if cached_features is not None:
+            return _copy_njd_features(cached_features)
+
+    njd_features, _ = _run_frontend_document(
+        text,
+        jtalk=jtalk,
+        include_morphs=False,
+        run_marine=run_marine,
+        use_vanilla=use_vanilla,
+        use_tsqyomi=use_tsqyomi,
+        use_sudachi_kanji_yomi=use_sudachi_kanji_yomi,
+        predict_nani=predict_nani,
+        use_read_as_pron=use_read_as_pron,
+        revert_long_vowels=revert_long_vowels,
+        revert_yotsugana=revert_yotsugana,
+    )
+    if cache_key is not None:
+        # 呼び出し側が返却値を書き換えてもキャッシュ内容が変わらないよう、複製を保持する
+        _global_frontend_cache.put(cache_key, _copy_njd_features(njd_features))
     return njd_features
 
 
@@ -948,67 +1545,360 @@ def run_frontend_detailed(
         jtalk (OpenJTalk | None): 使用する OpenJTalk インスタンス。None ならグローバルインスタンスを使う
 
     Returns:
-        tuple[list[NJDFeature], list[MeCabMorph]]: (NJD features, MeCab morphs)
-            - NJD features: pyopenjtalk.run_frontend() と同一の結果が得られる
-            - MeCab morphs: pyopenjtalk.run_mecab_detailed()[1] と同一の結果が得られる
+        tuple[list[NJDFeature], list[MeCabMorph]]: (NJD features, MeCab morphs)
+            - NJD features: pyopenjtalk.run_frontend() と同一の結果が得られる
+            - MeCab morphs: pyopenjtalk.run_mecab_detailed()[1] と同一の結果が得られる
+
+    NOTE:
+        MeCab の入力バッファに収まらない長文は run_frontend() と同様に分割して処理し、
+        形態素の `char_span` は入力全体の MeCab 正規化本文上の座標に揃えて連結する
+        ただし `link_cost` / `node_cost` は分割した部分ごとのラティス上の値になる
+    """
+    text = normalize_text(text, normalize_mode)
+    # 結果キャッシュは辞書の世代番号で無効化を追跡できるグローバルインスタンス使用時のみ有効
+    cache_key = None
+    if jtalk is None and _global_frontend_cache.max_size > 0:
+        cache_key = (
+            "run_frontend_detailed",
+            text,
+            run_marine,
+            use_vanilla,
+            use_tsqyomi,
+            use_sudachi_kanji_yomi,
+            predict_nani,
+            use_read_as_pron,
+            revert_long_vowels,
+            revert_yotsugana,
+            get_dictionary_generation(),
+        )
+        cached_result = _global_frontend_cache.get(cache_key)
+        if cached_result is not None:
+            return _copy_njd_features(cached_result[0]), _copy_mecab_morphs(cached_result[1])
+
+    njd_features, morphs = _run_frontend_document(
+        text,
+        jtalk=jtalk,
+        include_morphs=True,
+        run_marine=run_marine,
+        use_vanilla=use_vanilla,
+        use_tsqyomi=use_tsqyomi,
+        use_sudachi_kanji_yomi=use_sudachi_kanji_yomi,
+        predict_nani=predict_nani,
+        use_read_as_pron=use_read_as_pron,
+        revert_long_vowels=revert_long_vowels,
+        revert_yotsugana=revert_yotsugana,
+    )
+    if cache_key is not None:
+        # 呼び出し側が返却値を書き換えてもキャッシュ内容が変わらないよう、複製を保持する
+        _global_frontend_cache.put(
+            cache_key, (_copy_njd_features(njd_features), _copy_mecab_morphs(morphs))
+        )
+    return njd_features, morphs
+
+
+def _copy_njd_features(njd_features: list[NJDFeature]) -> list[NJDFeature]:
+    """
+    NJD features を、呼び出し側が書き換えても元の値に影響しないように複製する。
+
+    Args:
+        njd_features (list[NJDFeature]): 複製する NJD features
+
+    Returns:
+        list[NJDFeature]: 複製した NJD features
+    """
+
+    # NJDFeature の値は全て不変型のため、各 dict の浅い複製で十分
+    return [cast(NJDFeature, feature.copy()) for feature in njd_features]
+
+
+def _copy_mecab_morphs(morphs: list[MeCabMorph]) -> list[MeCabMorph]:
+    """
+    MeCab 形態素列を、呼び出し側が書き換えても元の値に影響しないように複製する。
+
+    Args:
+        morphs (list[MeCabMorph]): 複製する MeCab 形態素列
+
+    Returns:
+        list[MeCabMorph]: 複製した MeCab 形態素列
+    """
+
+    # features のみ可変の list のため、dict の複製に加えて個別に複製する
+    copied_morphs: list[MeCabMorph] = []
+    for morph in morphs:
+        copied_morph = cast(MeCabMorph, morph.copy())
+        copied_morph["features"] = list(morph["features"])
+        copied_morphs.append(copied_morph)
+    return copied_morphs
+
+
+def _run_frontend_with_tsqyomi(
+    text: str,
+    *,
+    jtalk: OpenJTalk,
+    include_morphs: bool = True,
+) -> tuple[list[NJDFeature], list[MeCabMorph]]:
+    """
+    tsqyomi で MeCab feature を選び、NJD 処理後の features と morphs を返す。
+    Python 側後処理は apply_postprocessing() に委譲する。
+
+    Args:
+        text (str): 正規化済みの Unicode 日本語テキスト
+        jtalk (OpenJTalk): 候補解析と NJD 処理に使う OpenJTalk インスタンス
+        include_morphs (bool): 詳細形態素列を返す場合は True
+
+    Returns:
+        tuple[list[NJDFeature], list[MeCabMorph]]: NJD features と差し替え後の形態素列
+    """
+
+    # tsqyomi を使う場合のみインポートする
+    from .tsqyomi.inference import select_mecab_features_with_tsqyomi
+
+    mecab_features, morphs = select_mecab_features_with_tsqyomi(
+        text,
+        jtalk,
+        include_morphs=include_morphs,
+    )
+    njd_features = jtalk.run_njd_from_mecab(mecab_features)
+    return njd_features, morphs
+
+
+def _run_frontend_segment(
+    text: str,
+    *,
+    jtalk: OpenJTalk | None,
+    include_morphs: bool,
+    use_tsqyomi: bool,
+    use_sudachi_kanji_yomi: bool,
+    predict_nani: bool,
+    **postprocessing_options: bool,
+) -> tuple[list[NJDFeature], list[MeCabMorph]]:
+    """
+    text2mecab() の出力バッファに収まるテキストにフロントエンド処理と後処理を適用する。
+
+    Args:
+        text (str): 正規化済みの Unicode 日本語テキスト
+        jtalk (OpenJTalk | None): 使用する OpenJTalk インスタンス。None ならグローバルインスタンスを使う
+        include_morphs (bool): 詳細形態素列を返す場合は True
+        use_tsqyomi (bool): True の場合、ロード済みの tsqyomi で文脈に合う読み候補を選ぶ
+        use_sudachi_kanji_yomi (bool): True の場合、Sudachi による同形異音語の読み補正を行う
+        predict_nani (bool): True の場合、ONNX モデルで「何」の読みを推定する
+        **postprocessing_options (bool): apply_postprocessing() に渡すその他のオプション
+
+    Returns:
+        tuple[list[NJDFeature], list[MeCabMorph]]: NJD features と形態素列 (include_morphs が False の場合は空)
     """
-    text = normalize_text(text, normalize_mode)
+
     with _resolve_jtalk(jtalk) as inference_jtalk:
+        morphs: list[MeCabMorph] = []
         if use_tsqyomi is True:
             njd_features, morphs = _run_frontend_with_tsqyomi(
                 text,
                 jtalk=inference_jtalk,
-                include_morphs=True,
+                include_morphs=include_morphs,
             )
-        else:
+        elif include_morphs is True:
             njd_features, morphs = inference_jtalk.run_frontend_detailed(text)
+        else:
+            njd_features = inference_jtalk.run_frontend(text)
+
+        # tsqyomi 使用時は読み候補確定済みなので Sudachi と nani_predict モデルを適用しない
         njd_features = apply_postprocessing(
             text,
             njd_features,
-            run_marine=run_marine,
-            use_vanilla=use_vanilla,
             use_sudachi_kanji_yomi=use_sudachi_kanji_yomi if use_tsqyomi is False else False,
             predict_nani=predict_nani if use_tsqyomi is False else False,
             normalize_mode="None",  # 既に normalize_text() で正規化されているため、再度正規化しない
-            use_read_as_pron=use_read_as_pron,
-            revert_long_vowels=revert_long_vowels,
-            revert_yotsugana=revert_yotsugana,
             jtalk=inference_jtalk,
+            **postprocessing_options,
         )
     return njd_features, morphs
 
 
-def _run_frontend_with_tsqyomi(
+def _run_frontend_document(
     text: str,
     *,
-    jtalk: OpenJTalk,
-    include_morphs: bool = True,
+    jtalk: OpenJTalk | None,
+    include_morphs: bool,
+    **frontend_options: bool,
 ) -> tuple[list[NJDFeature], list[MeCabMorph]]:
     """
-    tsqyomi で MeCab feature を選び、NJD 処理後の features と morphs を返す。
-    Python 側後処理は apply_postprocessing() に委譲する。
+    テキストにフロントエンド処理を適用する。
+    text2mecab() の出力バッファに収まらない長文は、文・節の境界で分割した部分ごとに処理して連結する。
 
     Args:
         text (str): 正規化済みの Unicode 日本語テキスト
-        jtalk (OpenJTalk): 候補解析と NJD 処理に使う OpenJTalk インスタンス
+        jtalk (OpenJTalk | None): 使用する OpenJTalk インスタンス。None ならグローバルインスタンスを使う
         include_morphs (bool): 詳細形態素列を返す場合は True
+        **frontend_options (bool): _run_frontend_segment() に渡すオプション
 
     Returns:
-        tuple[list[NJDFeature], list[MeCabMorph]]: NJD features と差し替え後の形態素列
-    """
+        tuple[list[NJDFeature], list[MeCabMorph]]: NJD features と形態素列 (include_morphs が False の場合は空)
 
-    # tsqyomi を使う場合のみインポートする
-    from .tsqyomi.inference import select_mecab_features_with_tsqyomi
+    NOTE:
+        グローバルインスタンスのプール上限数が2以上の場合、分割した部分はプール内の複数インスタンスで並行処理される
+        文・節の境界で分割した場合、連結後の NJD features は同じ本文を一括処理した結果と一致する
+        (分割後の各部分の先頭を発話の先頭として扱わないよう chain_flag を補正する)
+        文字単位で分割せざるを得ない極端に長い文では、分割位置の前後の解析結果が一括処理と異なり得る
+    """
 
-    mecab_features, morphs = select_mecab_features_with_tsqyomi(
-        text,
-        jtalk,
+    segments = _split_document(text, jtalk)
+    run_segment = partial(
+        _run_frontend_segment,
+        jtalk=jtalk,
         include_morphs=include_morphs,
+        **frontend_options,
     )
-    njd_features = jtalk.run_njd_from_mecab(mecab_features)
+    if len(segments) == 1:
+        return run_segment(text)
+    segment_results = _map_document_segments(run_segment, segments, jtalk)
+
+    # 形態素の char_span は各部分の MeCab 正規化本文上の座標のため、前の部分までの正規化本文長だけずらす
+    normalized_lengths = [0] * len(segments)
+    if include_morphs is True:
+        with _resolve_jtalk(jtalk) as resolved_jtalk:
+            normalized_lengths = [
+                len(resolved_jtalk.normalize_for_mecab(segment)) for segment in segments
+            ]
+
+    njd_features: list[NJDFeature] = []
+    morphs: list[MeCabMorph] = []
+    char_offset = 0
+    for index, (segment_features, segment_morphs) in enumerate(segment_results):
+        # chain_flag -1 は発話の先頭を表すため、2つ目以降の部分の先頭は一括処理と同じくアクセント句の区切りにする
+        if index > 0 and len(segment_features) > 0 and segment_features[0]["chain_flag"] == -1:
+            segment_features[0]["chain_flag"] = 0
+        njd_features.extend(segment_features)
+        for morph in segment_morphs:
+            # (0, 0) は入力文上の位置を特定できなかった形態素を表すため、ずらさない
+            if morph["char_span"] != (0, 0):
+                char_start, char_end = morph["char_span"]
+                morph["char_span"] = (char_start + char_offset, char_end + char_offset)
+            morphs.append(morph)
+        char_offset += normalized_lengths[index]
     return njd_features, morphs
 
 
+def _map_document_segments(
+    function: Callable[[str], _T],
+    segments: list[str],
+    jtalk: OpenJTalk | None,
+) -> list[_T]:
+    """
+    長文を分割した各部分に関数を適用し、結果を部分の順に返す。
+
+    Args:
+        function (Callable[[str], _T]): 各部分に適用する関数
+        segments (list[str]): _split_document() で分割した部分のリスト
+        jtalk (OpenJTalk | None): function が使う OpenJTalk インスタンス。None ならグローバルインスタンスを使う
+
+    Returns:
+        list[_T]: 各部分に対する function の戻り値のリスト
+
+    NOTE:
+        グローバルインスタンスを使う場合は、プール上限数までのスレッドで並行して処理する
+        明示インスタンスは同時に1スレッドからしか使えないため、呼び出し元のスレッドで順に処理する
+    """
+
+    max_workers = min(len(segments), _global_jtalk.pool_size) if jtalk is None else 1
+    if max_workers <= 1:
+        return [function(segment) for segment in segments]
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="pyopenjtalk-document"
+    ) as executor:
+        # 呼び出し元の record_stages() の集計範囲をワーカースレッドにも引き継ぐ
+        futures = [executor.submit(copy_context().run, function, segment) for segment in segments]
+        return [future.result() for future in futures]
+
+
+def _split_document(text: str, jtalk: OpenJTalk | None) -> list[str]:
+    """
+    text2mecab() の出力バッファに収まらない長文を、文・節の境界でバッファに収まる部分に分割する。
+
+    Args:
+        text (str): 正規化済みの Unicode 日本語テキスト
+        jtalk (OpenJTalk | None): 正規化後の長さの確認に使う OpenJTalk インスタンス。None ならグローバルインスタンスを使う
+
+    Returns:
+        list[str]: 連結すると text に一致する部分文字列のリスト。分割が不要な場合は `[text]`
+    """
+
+    # 終端の NUL を除いたバイト数が、正規化後の本文に使える上限
+    max_size = _TEXT2MECAB_BUFFER_SIZE - 1
+    if _estimate_text2mecab_size(text) <= max_size:
+        return [text]
+    # 見積もりは ASCII 文字の全角化を最大に見込むため、実際の正規化結果がバッファに収まる場合は分割しない
+    normalized_size = None
+    with _resolve_jtalk(jtalk) as resolved_jtalk:
+        try:
+            normalized_size = len(resolved_jtalk.normalize_for_mecab(text).encode("utf-8"))
+        except RuntimeError:
+            # 長さ以外の理由による失敗は、分割後の各部分の処理で改めて送出される
+            pass
+    if normalized_size is not None and normalized_size <= max_size:
+        return [text]
+    return _split_document_units(text, max_size)
+
+
+def _split_document_units(text: str, max_size: int, level: int = 0) -> list[str]:
+    """
+    テキストを境界で区切り、正規化後のバイト数の見積もりが上限に収まる範囲で前から順に詰めて連結する。
+
+    Args:
+        text (str): 分割するテキスト
+        max_size (int): 各部分の正規化後のバイト数の上限
+        level (int): 使用する境界の `_DOCUMENT_BOUNDARY_PATTERNS` 上の添字。範囲外の場合は文字単位で区切る
+
+    Returns:
+        list[str]: 連結すると text に一致する部分文字列のリスト
+    """
+
+    if level < len(_DOCUMENT_BOUNDARY_PATTERNS):
+        units = _DOCUMENT_BOUNDARY_PATTERNS[level].split(text)
+    else:
+        units = list(text)
+
+    segments: list[str] = []
+    current_units: list[str] = []
+    current_size = 0
+    for unit in units:
+        unit_size = _estimate_text2mecab_size(unit)
+        if current_size + unit_size <= max_size:
+            current_units.append(unit)
+            current_size += unit_size
+            continue
+        if len(current_units) > 0:
+            segments.append("".join(current_units))
+        if unit_size <= max_size:
+            current_units = [unit]
+            current_size = unit_size
+            continue
+        # 1区切りだけで上限を超える場合は、より細かい境界で分割し、末尾の部分には後続の区切りを詰める
+        sub_segments = _split_document_units(unit, max_size, level + 1)
+        segments.extend(sub_segments[:-1])
+        current_units = [sub_segments[-1]]
+        current_size = _estimate_text2mecab_size(sub_segments[-1])
+    if len(current_units) > 0:
+        segments.append("".join(current_units))
+    return segments
+
+
+def _estimate_text2mecab_size(text: str) -> int:
+    """
+    text2mecab() で正規化した後のバイト数の上限を見積もる。
+
+    Args:
+        text (str): 見積もるテキスト
+
+    Returns:
+        int: 正規化後の UTF-8 バイト数の上限 (終端の NUL を含まない)
+
+    NOTE:
+        text2mecab() は ASCII 文字 (1バイト) を全角文字 (3バイト) に変換し、それ以外の文字は同じか短いバイト列に変換する
+    """
+
+    return len(text.encode("utf-8")) + 2 * len(text.encode("ascii", errors="ignore"))
+
+
 def make_label(njd_features: list[NJDFeature], jtalk: OpenJTalk | None = None) -> list[str]:
     """
     HTS 音声合成用のフルコンテキストラベルを返す。
@@ -2159,14 +3049,18 @@ def update_global_jtalk_with_user_dict(
             raise FileNotFoundError(f"No such file or directory: {dic_path}")
     paths_str = ",".join(dic_paths)
 
+    # プール拡張時にも同じユーザー辞書を共有するよう、生成引数をファクトリに束縛する
+    jtalk_factory = _create_openjtalk_factory(
+        OPEN_JTALK_DICT_DIR,
+        paths_str.encode("utf-8"),
+        reading_protection,
+    )
     with _global_jtalk_swap_lock:
         # 新しい辞書の初期化中は旧インスタンスを引き続き利用可能にする
-        new_jtalk = OpenJTalk(
-            dn_mecab=OPEN_JTALK_DICT_DIR,
-            userdic=paths_str.encode("utf-8"),
-            userdic_reading_protection=reading_protection,
-        )
-        _global_jtalk.replace(new_jtalk)
+        new_jtalk = jtalk_factory()
+        _global_jtalk.replace(new_jtalk, jtalk_factory)
+        # 交換の完了後に世代を進め、新しい世代番号で旧辞書の解析結果がキャッシュから返らないようにする
+        bump_dictionary_generation()
 
 
 def unset_user_dict() -> None:
@@ -2174,10 +3068,425 @@ def unset_user_dict() -> None:
     ユーザー辞書の適用を解除する。
     注意: この関数を実行すると、pyopenjtalk モジュールのグローバル状態が変更される。
     """
+    jtalk_factory = _create_openjtalk_factory(OPEN_JTALK_DICT_DIR)
     with _global_jtalk_swap_lock:
         # デフォルト辞書の初期化中は旧インスタンスを引き続き利用可能にする
-        new_jtalk = OpenJTalk(dn_mecab=OPEN_JTALK_DICT_DIR)
-        _global_jtalk.replace(new_jtalk)
+        new_jtalk = jtalk_factory()
+        _global_jtalk.replace(new_jtalk, jtalk_factory)
+        # 交換の完了後に世代を進め、新しい世代番号で旧辞書の解析結果がキャッシュから返らないようにする
+        bump_dictionary_generation()
+
+
+def set_global_jtalk_pool_size(pool_size: int) -> None:
+    """
+    モジュールレベル API が使うグローバル OpenJTalk インスタンスプールの上限数を変更する。
+    上限数を増やすと、複数スレッドからの呼び出しが別々の OpenJTalk インスタンスで並行処理される。
+    インスタンスは必要になった時点で遅延生成され、現在のユーザー辞書設定が引き継がれる。
+    注意: この関数を実行すると、pyopenjtalk モジュールのグローバル状態が変更される。
+
+    Args:
+        pool_size (int): プールが保持する OpenJTalk インスタンスの上限数 (1 以上)
+
+    Raises:
+        ValueError: 上限数が1未満の場合
+
+    NOTE:
+        起動時の上限数は環境変数 OPEN_JTALK_POOL_SIZE でも指定できる (デフォルト: 1)。
+        プール内のインスタンスは読み込み済みの MeCab 辞書を共有するため、
+        上限数に比例して増えるのは解析用のバッファのみとなる。
+        拡大時は進行中の処理を待たずに上限数だけを変更し、追加のインスタンスは次の借り出し時に生成する。
+        縮小時は進行中の処理の完了を待ってから余剰インスタンスを破棄する
+    """
+
+    _global_jtalk.resize(pool_size)
+
+
+def get_global_jtalk_pool_size() -> int:
+    """
+    グローバル OpenJTalk インスタンスプールの上限数を返す。
+
+    Returns:
+        int: プールが保持する OpenJTalk インスタンスの上限数
+    """
+
+    return _global_jtalk.pool_size
+
+
+def set_global_htsengine_pool_size(pool_size: int) -> None:
+    """
+    `synthesize()` / `tts()` が使うグローバル HTSEngine インスタンスプールの上限数を変更する。
+    HTSEngine は話速・半音の設定から合成完了まで排他的に貸し出されるため、
+    上限数を増やすと複数スレッドからの音声合成が別々のインスタンスで並行処理される。
+    注意: この関数を実行すると、pyopenjtalk モジュールのグローバル状態が変更される。
+
+    Args:
+        pool_size (int): プールが保持する HTSEngine インスタンスの上限数 (1 以上)
+
+    Raises:
+        ValueError: 上限数が1未満の場合
+
+    NOTE:
+        起動時の上限数は環境変数 HTS_ENGINE_POOL_SIZE でも指定できる (デフォルト: 1)。
+        縮小時は空きインスタンスを即座に破棄し、合成中のインスタンスは合成完了後に破棄する
+    """
+
+    _global_htsengine.resize(pool_size)
+
+
+def get_global_htsengine_pool_size() -> int:
+    """
+    グローバル HTSEngine インスタンスプールの上限数を返す。
+
+    Returns:
+        int: プールが保持する HTSEngine インスタンスの上限数
+    """
+
+    return _global_htsengine.pool_size
+
+
+def get_global_jtalk_pool_stats() -> PoolStats:
+    """
+    グローバル OpenJTalk インスタンスプールの借り出しの統計情報を返す。
+    借り出しの待ち時間 (wait)・保持時間 (hold)・ユーザー辞書の差し替え時に進行中の処理の完了を待った時間 (drain) の分布から、
+    プールの上限数が不足しているかを判断できる。
+
+    Returns:
+        PoolStats: 借り出し回数・待機した回数・借り出し中の数・待ち時間などの分布・上限数・インスタンス数
+
+    NOTE:
+        借り出し中の数・上限数・インスタンス数以外は、`pyopenjtalk.profiling.set_lock_metrics_enabled(True)` の間の
+        借り出しのみを数える (デフォルトでは計測しない)
+    """
+
+    return _global_jtalk.stats()
+
+
+def get_global_htsengine_pool_stats() -> PoolStats:
+    """
+    グローバル HTSEngine インスタンスプールの貸し出しの統計情報を返す。
+    HTSEngine は話速・半音の設定から合成完了まで排他的に貸し出されるため、
+    待ち時間 (wait) の分布から音声合成の並行数が不足しているかを判断できる。
+
+    Returns:
+        PoolStats: 貸し出し回数・待機した回数・貸し出し中の数・待ち時間などの分布・上限数・インスタンス数
+
+    NOTE:
+        貸し出し中の数・上限数・インスタンス数以外は、`pyopenjtalk.profiling.set_lock_metrics_enabled(True)` の間の
+        貸し出しのみを数える (デフォルトでは計測しない)
+    """
+
+    return _global_htsengine.stats()
+
+
+def get_openjtalk_lock_stats() -> LockStats:
+    """
+    全 OpenJTalk インスタンス (`jtalk=` 引数で渡したインスタンスを含む) の公開メソッドを直列化するロックの統計情報を返す。
+    同じインスタンスを複数スレッドで共有している場合、待ち時間 (wait) の分布にロック競合が現れる。
+
+    Returns:
+        LockStats: ロックの取得回数・待機した回数・保持中の数・待ち時間と保持時間の分布
+
+    NOTE:
+        `pyopenjtalk.profiling.set_lock_metrics_enabled(True)` の間の取得のみを数える (デフォルトでは計測しない)
+    """
+
+    return _profiling_openjtalk_lock_metrics.stats()
+
+
+def reset_lock_stats() -> None:
+    """
+    グローバルインスタンスプールと OpenJTalk インスタンスのロックの統計情報を破棄する。
+    借り出し中の数・上限数・インスタンス数は現在の状態を表すため破棄しない。
+    """
+
+    _global_jtalk.reset_stats()
+    _global_htsengine.reset_stats()
+    _profiling_openjtalk_lock_metrics.reset()
+
+
+# warmup() で事前に初期化できるコンポーネント
+WarmupFeature = Literal["openjtalk", "sudachi", "nani", "htsengine", "marine", "tsqyomi"]
+# 追加依存なしで利用できる、warmup() が既定で初期化するコンポーネント
+_DEFAULT_WARMUP_FEATURES: tuple[WarmupFeature, ...] = ("openjtalk", "sudachi", "nani", "htsengine")
+# 同形異音語 (風・方) と、モデル判定が必要な「何」を含む代表的な文
+_WARMUP_TEXT = "今日は何の話をしようか。風が強い方なので、東京駅まで３分ほど歩いて行きます。"
+# 並行実行するタスクの開始を揃える待ち時間の上限 (秒)
+## 渡された executor のワーカー数が threads より少ない場合も、待ち続けずに初期化を進める
+_WARMUP_BARRIER_TIMEOUT = 5.0
+
+
+def warmup(
+    features: Sequence[WarmupFeature] = _DEFAULT_WARMUP_FEATURES,
+    threads: int = 1,
+    *,
+    executor: Executor | None = None,
+    text: str = _WARMUP_TEXT,
+) -> dict[str, float]:
+    """
+    指定したコンポーネントを事前に初期化し、代表的な文を各処理経路に一度通す。
+    サーバーの起動時などに呼び出すと、最初のリクエストで辞書やモデルの読み込みを待たずに済む。
+    注意: この関数を実行すると、pyopenjtalk モジュールのグローバル状態が変更される。
+
+    Args:
+        features (Sequence[WarmupFeature]): 初期化するコンポーネント
+            (デフォルト: `("openjtalk", "sudachi", "nani", "htsengine")`)
+            - "openjtalk": OpenJTalk (MeCab 辞書と NJD) のグローバルインスタンス
+            - "sudachi": Sudachi の辞書とトークナイザー
+            - "nani": 「何」読み推定の判定表 (判定表が使えない場合は ONNX Runtime のセッション)
+            - "htsengine": HTSEngine のグローバルインスタンスと音響モデル
+            - "marine": marine のモデル (`pip install pyopenjtalk-plus[marine]` が必要)
+            - "tsqyomi": tsqyomi のモデル (未ロードの場合は既定の設定で `tsqyomi.load_model()` を呼ぶ)
+        threads (int): 初期化後に並行して処理を流すタスク数。2以上の場合は、グローバル OpenJTalk /
+            HTSEngine インスタンスプールをこの数 (プールの上限数を超えない範囲) まで事前に生成する (デフォルト: 1)
+        executor (Executor | None): 並行タスクを実行する Executor。アプリケーションが使うスレッドプールを渡すと、
+            そのワーカースレッドごとの状態 (Sudachi のトークナイザーなど) も初期化される。
+            None の場合は一時的なスレッドで実行する (デフォルト: None)
+        text (str): 各処理経路に通す文 (デフォルト: 同形異音語と「何」を含む代表的な文)
+
+    Returns:
+        dict[str, float]: コンポーネント名ごとの初期化にかかった秒数。
+            並行タスクを実行した場合は "threads" に並行タスク全体の秒数、"total" に全体の秒数が入る
+
+    Raises:
+        ValueError: 未知のコンポーネント名が指定された場合、または threads が1未満の場合
+        ImportError: "marine" / "tsqyomi" の追加依存が導入されていない場合
+
+    NOTE:
+        結果キャッシュと合成波形キャッシュは経由しないため、キャッシュの内容と統計情報は変わらない
+    """
+
+    unknown_features = [feature for feature in features if feature not in get_args(WarmupFeature)]
+    if len(unknown_features) > 0:
+        raise ValueError(f"Unknown warmup features: {unknown_features!r}")
+    if threads < 1:
+        raise ValueError(f"threads must be greater than or equal to 1: {threads}")
+
+    selected_features = frozenset(features)
+    # 初期化したコンポーネントだけを経由するよう、並行タスクのフロントエンド処理のオプションを揃える
+    frontend_options: dict[str, bool] = {
+        "use_sudachi_kanji_yomi": "sudachi" in selected_features,
+        "predict_nani": "nani" in selected_features,
+        "run_marine": "marine" in selected_features,
+        "use_tsqyomi": "tsqyomi" in selected_features,
+    }
+    timings: dict[str, float] = {}
+    total_start_time = time.perf_counter()
+
+    def measure(feature: str, func: Callable[[], object]) -> None:
+        start_time = time.perf_counter()
+        func()
+        timings[feature] = time.perf_counter() - start_time
+
+    # コンポーネントごとの所要時間を分けて計測できるよう、依存の少ない順に1つずつ初期化する
+    if "openjtalk" in selected_features:
+        measure(
+            "openjtalk",
+            partial(_warmup_frontend, text, use_sudachi_kanji_yomi=False, predict_nani=False),
+        )
+    if "sudachi" in selected_features:
+        measure("sudachi", partial(_warmup_frontend, text, predict_nani=False))
+    if "nani" in selected_features:
+        measure("nani", partial(_warmup_frontend, text, use_sudachi_kanji_yomi=False))
+    if "marine" in selected_features:
+
+        def warmup_marine() -> None:
+            load_marine_model()
+            _warmup_frontend(text, run_marine=True)
+
+        measure("marine", warmup_marine)
+    if "tsqyomi" in selected_features:
+
+        def warmup_tsqyomi() -> None:
+            from . import tsqyomi
+
+            if tsqyomi.is_model_loaded() is False:
+                tsqyomi.load_model()
+            _warmup_frontend(text, use_tsqyomi=True)
+
+        measure("tsqyomi", warmup_tsqyomi)
+    if "htsengine" in selected_features:
+        labels = _warmup_frontend(text, use_sudachi_kanji_yomi=False, predict_nani=False)
+        measure("htsengine", partial(_warmup_synthesize, labels))
+
+    if threads > 1 or executor is not None:
+        measure(
+            "threads",
+            partial(
+                _warmup_threads,
+                text,
+                threads,
+                executor,
+                frontend_options,
+                "htsengine" in selected_features,
+            ),
+        )
+
+    timings["total"] = time.perf_counter() - total_start_time
+    return timings
+
+
+def _warmup_frontend(text: str, **frontend_options: bool) -> list[str]:
+    """
+    グローバル OpenJTalk インスタンスを借り出し、結果キャッシュを経由せずにフルコンテキストラベルを生成する。
+
+    Args:
+        text (str): 処理する文
+        **frontend_options (bool): `extract_fullcontext()` に渡すオプション
+
+    Returns:
+        list[str]: フルコンテキストラベル
+    """
+
+    # jtalk を明示して渡すと結果キャッシュを使わないため、キャッシュ済みでも処理経路を必ず通る
+    with _global_jtalk() as jtalk:
+        return extract_fullcontext(text, jtalk=jtalk, **frontend_options)
+
+
+def _warmup_synthesize(labels: list[str]) -> None:
+    """
+    グローバル HTSEngine インスタンスを借り出し、合成波形キャッシュを経由せずに音声を合成する。
+
+    Args:
+        labels (list[str]): フルコンテキストラベル
+    """
+
+    with _global_htsengine() as htsengine:
+        # プール内のインスタンスには前回の借り出し時の設定が残るため、借り出しごとに設定し直す
+        htsengine.set_speed(1.0)
+        htsengine.add_half_tone(0.0)
+        htsengine.synthesize(labels)
+
+
+def _warmup_threads(
+    text: str,
+    threads: int,
+    executor: Executor | None,
+    frontend_options: dict[str, bool],
+    synthesize_speech: bool,
+) -> None:
+    """
+    グローバルインスタンスプールを事前に生成し、threads 個のタスクで並行して処理を流す。
+
+    Args:
+        text (str): 処理する文
+        threads (int): 並行して実行するタスク数
+        executor (Executor | None): タスクを実行する Executor。None なら一時的なスレッドで実行する
+        frontend_options (dict[str, bool]): `extract_fullcontext()` に渡すオプション
+        synthesize_speech (bool): 各タスクで音声合成まで行うか
+    """
+
+    # 1つのスレッドから上限数まで同時に借り出すと、空きがないためプールが上限数まで拡張される
+    with ExitStack() as stack:
+        for _ in range(min(threads, _global_jtalk.pool_size)):
+            stack.enter_context(_global_jtalk())
+    if synthesize_speech is True:
+        with ExitStack() as stack:
+            for _ in range(min(threads, _global_htsengine.pool_size)):
+                stack.enter_context(_global_htsengine())
+
+    barrier = Barrier(threads)
+
+    def run_task() -> None:
+        # 全タスクが別々のワーカースレッドで動くよう、開始を揃えてから処理する
+        try:
+            barrier.wait(timeout=_WARMUP_BARRIER_TIMEOUT)
+        except BrokenBarrierError:
+            pass
+        labels = _warmup_frontend(text, **frontend_options)
+        if synthesize_speech is True:
+            _warmup_synthesize(labels)
+
+    with ExitStack() as stack:
+        if executor is None:
+            executor = stack.enter_context(
+                ThreadPoolExecutor(max_workers=threads, thread_name_prefix="pyopenjtalk-warmup")
+            )
+        futures = [executor.submit(run_task) for _ in range(threads)]
+        # タスク内の例外は呼び出し元へそのまま伝える
+        for future in futures:
+            future.result()
+
+
+def set_frontend_cache_size(max_size: int) -> None:
+    """
+    グローバル OpenJTalk インスタンスを使う `run_frontend()` / `run_frontend_detailed()` の結果キャッシュの最大件数を変更する。
+    同じテキストとオプションの組み合わせを繰り返し処理する場合、2回目以降は MeCab・NJD・後処理を省略して結果を返す。
+    `g2p()` / `extract_fullcontext()` / `tts()` も内部で `run_frontend()` を呼ぶため、同様にキャッシュが効く。
+    注意: この関数を実行すると、pyopenjtalk モジュールのグローバル状態が変更される。
+
+    Args:
+        max_size (int): キャッシュする最大件数。0 ならキャッシュを無効化して全項目を破棄する (デフォルトでは無効)
+
+    Raises:
+        ValueError: 最大件数が0未満の場合
+
+    NOTE:
+        キャッシュキーには正規化後のテキスト・全オプション・辞書の世代番号が含まれ、世代番号は
+        `update_global_jtalk_with_user_dict()` / `unset_user_dict()` / tsqyomi モデルのロードと解除で進む。
+        `jtalk=` 引数で OpenJTalk インスタンスを渡した呼び出しはキャッシュを使わない。
+        キャッシュからは複製を返すため、呼び出し側が返却値を書き換えてもキャッシュ内容は変わらない
+    """
+
+    _global_frontend_cache.resize(max_size)
+
+
+def clear_frontend_cache() -> None:
+    """
+    `run_frontend()` / `run_frontend_detailed()` の結果キャッシュの全項目と統計情報を破棄する。
+    """
+
+    _global_frontend_cache.clear()
+
+
+def get_frontend_cache_stats() -> CacheStats:
+    """
+    `run_frontend()` / `run_frontend_detailed()` の結果キャッシュの統計情報を返す。
+
+    Returns:
+        CacheStats: ヒット数・ミス数・破棄数・現在の件数・最大件数
+    """
+
+    return _global_frontend_cache.stats()
+
+
+def set_waveform_cache_size(max_bytes: int) -> None:
+    """
+    `synthesize()` / `tts()` の合成波形キャッシュの上限バイト数を変更する。
+    同じフルコンテキストラベル・話速・半音の組み合わせを繰り返し合成する場合、2回目以降は HTS Engine の合成を省略して波形を返す。
+    注意: この関数を実行すると、pyopenjtalk モジュールのグローバル状態が変更される。
+
+    Args:
+        max_bytes (int): キャッシュする波形の合計バイト数の上限。0 ならキャッシュを無効化して全項目を破棄する (デフォルトでは無効)
+
+    Raises:
+        ValueError: 上限バイト数が0未満の場合
+
+    NOTE:
+        波形は int16 に丸めて保持するため (1秒あたり約 94 KiB @ 48kHz)、キャッシュの有効時に返す波形は
+        キャッシュへ格納する初回の合成結果も含め、合成直後の値を整数に丸めて 16bit PCM の範囲に収めたものとなる
+        (dtype は np.float64 のまま)。16bit の WAV として書き出す場合、キャッシュの有無で結果は変わらない
+    """
+
+    _global_waveform_cache.resize(max_bytes)
+
+
+def clear_waveform_cache() -> None:
+    """
+    `synthesize()` / `tts()` の合成波形キャッシュの全項目と統計情報を破棄する。
+    """
+
+    _global_waveform_cache.clear()
+
+
+def get_waveform_cache_stats() -> CacheStats:
+    """
+    `synthesize()` / `tts()` の合成波形キャッシュの統計情報を返す。
+
+    Returns:
+        CacheStats: ヒット数・ミス数・破棄数・現在の合計バイト数・上限バイト数
+    """
+
+    return _global_waveform_cache.stats()
 
 
 def run_mecab(text: str, jtalk: OpenJTalk | None = None) -> list[str]:
@@ -0,0 +1,397 @@
+"""asyncio のイベントループをブロックせずに pyopenjtalk の公開 API を呼び出すための非同期 API。"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import weakref
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Literal, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+from . import _global_htsengine, _global_jtalk
+from . import extract_fullcontext as _extract_fullcontext
+from . import g2p as _g2p
+from . import make_label as _make_label
+from . import run_frontend as _run_frontend
+from . import run_frontend_detailed as _run_frontend_detailed
+from . import synthesize as _synthesize
+from .openjtalk import OpenJTalk
+from .types import MeCabMorph, NJDFeature
+
+
+_T = TypeVar("_T")
+
+
+class _AsyncExecutor:
+    """
+    非同期 API の処理を実行する専用スレッドプールと、イベントループごとの同時実行数の上限を管理する。
+    """
+
+    def __init__(self, max_workers: int, max_in_flight: int | None) -> None:
+        """
+        専用スレッドプールを生成し、グローバルインスタンスプールをワーカー数まで拡張する。
+
+        Args:
+            max_workers (int): 専用スレッドプールのワーカースレッド数
+            max_in_flight (int | None): イベントループごとの同時実行数の上限。None なら上限を設けない
+        """
+
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="pyopenjtalk-aio"
+        )
+        # asyncio.Semaphore は最初に待機したイベントループに紐付くため、イベントループごとに生成する
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+        # configure() で新しいスレッドプールへ切り替えられた後は、以降の投入を新しいスレッドプールへ回す
+        self._is_retired = False
+        self._retire_lock = Lock()
+        # ワーカースレッドがグローバルインスタンスの順番待ちで直列化されないよう、プールの上限数をワーカー数まで引き上げる
+        ## 利用者が既により大きな上限数を設定している場合はそのまま維持する
+        ## 最初の非同期 API 呼び出しではイベントループのスレッドで実行されるため、他のスレッドの処理の完了を待たない
+        ## grow() で引き上げる (上限数を下げる resize() は進行中の処理を待つ)
+        _global_jtalk.grow(max_workers)
+        _global_htsengine.grow(max_workers)
+
+    async def run(self, function: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """
+        関数を専用スレッドプールで実行し、その完了を待機する。
+
+        Args:
+            function (Callable[..., _T]): 実行する関数
+            *args (Any): 関数に渡す位置引数
+            **kwargs (Any): 関数に渡すキーワード引数
+
+        Returns:
+            _T: 関数の戻り値
+
+        NOTE:
+            待機中のタスクがキャンセルされた場合、まだ開始されていない処理は実行されずに破棄される
+            既に開始された処理は中断できないため完了まで実行され、その間は同時実行数の枠を占有し続ける
+            同時実行数の上限で待機している間に configure() で切り替えられた場合は、新しいスレッドプールで実行する
+        """
+
+        if self.max_in_flight is None:
+            future = self._submit(function, *args, **kwargs)
+            if future is None:
+                return await _get_executor().run(function, *args, **kwargs)
+            return await asyncio.wrap_future(future)
+
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._semaphores[loop] = semaphore
+        await semaphore.acquire()
+        try:
+            future = self._submit(function, *args, **kwargs)
+        except BaseException:
+            semaphore.release()
+            raise
+        if future is None:
+            semaphore.release()
+            return await _get_executor().run(function, *args, **kwargs)
+
+        def release_semaphore(_: Future[_T]) -> None:
+            # キャンセル済みのタスクの処理もワーカースレッドで完了した時点で枠を解放する
+            try:
+                loop.call_soon_threadsafe(semaphore.release)
+            except RuntimeError:
+                # イベントループが既に閉じられている場合は解放先がないため何もしない
+                pass
+
+        future.add_done_callback(release_semaphore)
+        return await asyncio.wrap_future(future)
+
+    def retire(self) -> None:
+        """
+        新しいスレッドプールへの切り替え時に専用スレッドプールを停止する。
+        投入済みの処理は未着手のものも含めて完了まで実行し、以降の投入は新しいスレッドプールへ回す。
+        """
+
+        with self._retire_lock:
+            self._is_retired = True
+            self._executor.shutdown(wait=False, cancel_futures=False)
+
+    def _submit(self, function: Callable[..., _T], *args: Any, **kwargs: Any) -> Future[_T] | None:
+        """
+        関数を専用スレッドプールへ投入する。
+
+        Args:
+            function (Callable[..., _T]): 実行する関数
+            *args (Any): 関数に渡す位置引数
+            **kwargs (Any): 関数に渡すキーワード引数
+
+        Returns:
+            Future[_T] | None: 投入した処理の Future。retire() 済みで投入できない場合は None
+        """
+
+        # retire() による停止と投入が競合しないよう、停止済みかの確認と投入を同じロックの中で行う
+        with self._retire_lock:
+            if self._is_retired is True:
+                return None
+            return self._executor.submit(function, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        専用スレッドプールを停止する。未着手の処理は破棄される。
+
+        Args:
+            wait (bool): True の場合、実行中の処理の完了を待つ (デフォルト: True)
+        """
+
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# 非同期 API が使う専用スレッドプールのデフォルトのワーカースレッド数
+_DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# 非同期 API が使う専用スレッドプール (最初の呼び出し時に遅延生成する)
+_executor: _AsyncExecutor | None = None
+_executor_lock = Lock()
+
+# 専用スレッドプールの生成時に使う設定 (ワーカースレッド数, 同時実行数の上限)
+_executor_configuration: tuple[int, int | None] = (_DEFAULT_MAX_WORKERS, None)
+
+
+def configure(max_workers: int | None = None, max_in_flight: int | None = None) -> None:
+    """
+    非同期 API が使う専用スレッドプールのワーカー数と同時実行数の上限を設定する。
+    既に専用スレッドプールが存在する場合は、実行中の処理の完了を待たずに新しいスレッドプールへ切り替える。
+    切り替え前に投入された処理は破棄されず、以前のスレッドプールで完了まで実行される。
+    注意: この関数を実行すると、グローバルインスタンスプールの上限数が変更される場合がある。
+
+    Args:
+        max_workers (int | None): ワーカースレッド数。None の場合は CPU コア数 (最大4) (デフォルト: None)
+            グローバル OpenJTalk / HTSEngine インスタンスプールの上限数がこれより小さい場合は、この値まで引き上げる
+        max_in_flight (int | None): イベントループごとに同時に実行または実行待ちとする処理数の上限
+            上限に達すると、後続の呼び出しはワーカースレッドへ投入される前にイベントループ上で待機する
+            None の場合は上限を設けない (デフォルト: None)
+
+    Raises:
+        ValueError: max_workers または max_in_flight が1未満の場合
+    """
+
+    global _executor, _executor_configuration
+
+    if max_workers is None:
+        max_workers = _DEFAULT_MAX_WORKERS
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be greater than or equal to 1: {max_workers}")
+    if max_in_flight is not None and max_in_flight < 1:
+        raise ValueError(f"max_in_flight must be greater than or equal to 1: {max_in_flight}")
+
+    with _executor_lock:
+        previous_executor = _executor
+        _executor_configuration = (max_workers, max_in_flight)
+        _executor = _AsyncExecutor(max_workers, max_in_flight)
+    if previous_executor is not None:
+        previous_executor.retire()
+
+
+def shutdown(wait: bool = True) -> None:
+    """
+    非同期 API が使う専用スレッドプールを停止する。
+    停止後に非同期 API を呼び出した場合は、同じ設定で専用スレッドプールを再生成する。
+
+    Args:
+        wait (bool): True の場合、実行中の処理の完了を待つ (デフォルト: True)
+    """
+
+    global _executor
+
+    with _executor_lock:
+        previous_executor = _executor
+        _executor = None
+    if previous_executor is not None:
+        previous_executor.shutdown(wait=wait)
+
+
+def _get_executor() -> _AsyncExecutor:
+    """
+    非同期 API が使う専用スレッドプールを返す。未生成の場合は生成する。
+
+    Returns:
+        _AsyncExecutor: 専用スレッドプール
+    """
+
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = _AsyncExecutor(*_executor_configuration)
+        return _executor
+
+
+async def g2p(
+    text: str,
+    kana: bool = False,
+    join: bool = True,
+    *,
+    run_marine: bool = False,
+    use_vanilla: bool = False,
+    use_tsqyomi: bool = False,
+    use_sudachi_kanji_yomi: bool = True,
+    predict_nani: bool = True,
+    normalize_mode: Literal["None", "NFC", "NFKC"] = "None",
+    use_read_as_pron: bool = False,
+    revert_long_vowels: bool = False,
+    revert_yotsugana: bool = False,
+    jtalk: OpenJTalk | None = None,
+) -> list[str] | str:
+    """
+    pyopenjtalk.g2p() の非同期版。引数と戻り値は pyopenjtalk.g2p() と同じ。
+    """
+
+    return await _get_executor().run(
+        _g2p,
+        text,
+        kana,
+        join,
+        run_marine=run_marine,
+        use_vanilla=use_vanilla,
+        use_tsqyomi=use_tsqyomi,
+        use_sudachi_kanji_yomi=use_sudachi_kanji_yomi,
+        predict_nani=predict_nani,
+        normalize_mode=normalize_mode,
+        use_read_as_pron=use_read_as_pron,
+        revert_long_vowels=revert_long_vowels,
+        revert_yotsugana=revert_yotsugana,
+        jtalk=jtalk,
+    )
+
+
+async def run_frontend(
+    text: str,
+    *,
+    run_marine: bool = False,
+    use_vanilla: bool = False,
+    use_tsqyomi: bool = False,
+    use_sudachi_kanji_yomi: bool = True,
+    predict_nani: bool = True,
+    normalize_mode: Literal["None", "NFC", "NFKC"] = "None",
+    use_read_as_pron: bool = False,
+    revert_long_vowels: bool = False,
+    revert_yotsugana: bool = False,
+    jtalk: OpenJTalk | None = None,
+) -> list[NJDFeature]:
+    """
+    pyopenjtalk.run_frontend() の非同期版。引数と戻り値は pyopenjtalk.run_frontend() と同じ。
+    """
+
+    return await _get_executor().run(
+        _run_frontend,
+        text,
+        run_marine=run_marine,
+        use_vanilla=use_vanilla,
+        use_tsqyomi=use_tsqyomi,
+        use_sudachi_kanji_yomi=use_sudachi_kanji_yomi,
+        predict_nani=predict_nani,
+        normalize_mode=normalize_mode,
+        use_read_as_pron=use_read_as_pron,
+        revert_long_vowels=revert_long_vowels,
+        revert_yotsugana=revert_yotsugana,
+        jtalk=jtalk,
+    )
+
+
+async def run_frontend_detailed(
+    text: str,
+    *,
+    run_marine: bool = False,
+    use_vanilla: bool = False,
+    use_tsqyomi: bool = False,
+    use_sudachi_kanji_yomi: bool = True,
+    predict_nani: bool = True,
+    normalize_mode: Literal["None", "NFC", "NFKC"] = "None",
+    use_read_as_pron: bool = False,
+    revert_long_vowels: bool = False,
+    revert_yotsugana: bool = False,
+    jtalk: OpenJTalk | None = None,
+) -> tuple[list[NJDFeature], list[MeCabMorph]]:
+    """
+    pyopenjtalk.run_frontend_detailed() の非同期版。引数と戻り値は pyopenjtalk.run_frontend_detailed() と同じ。
+    """
+
+    return await _get_executor().run(
+        _run_frontend_detailed,
+        text,
+        run_marine=run_marine,
+        use_vanilla=use_vanilla,
+        use_tsqyomi=use_tsqyomi,
+        use_sudachi_kanji_yomi=use_sudachi_kanji_yomi,
+        predict_nani=predict_nani,
+        normalize_mode=normalize_mode,
+        use_read_as_pron=use_read_as_pron,
+        revert_long_vowels=revert_long_vowels,
+        revert_yotsugana=revert_yotsugana,
+        jtalk=jtalk,
+    )
+
+
+async def make_label(njd_features: list[NJDFeature], jtalk: OpenJTalk | None = None) -> list[str]:
+    """
+    pyopenjtalk.make_label() の非同期版。引数と戻り値は pyopenjtalk.make_label() と同じ。
+    """
+
+    return await _get_executor().run(_make_label, njd_features, jtalk=jtalk)
+
+
+async def synthesize(
+    labels: list[str] | tuple[Any, list[str]],
+    speed: float = 1.0,
+    half_tone: float = 0.0,
+) -> tuple[npt.NDArray[np.float64], int]:
+    """
+    pyopenjtalk.synthesize() の非同期版。引数と戻り値は pyopenjtalk.synthesize() と同じ。
+    """
+
+    return await _get_executor().run(_synthesize, labels, speed, half_tone)
+
+
+async def tts(
+    text: str,
+    speed: float = 1.0,
+    half_tone: float = 0.0,
+    *,
+    run_marine: bool = False,
+    use_vanilla: bool = False,
+    use_tsqyomi: bool = False,
+    use_sudachi_kanji_yomi: bool = True,
+    predict_nani: bool = True,
+    normalize_mode: Literal["None", "NFC", "NFKC"] = "None",
+    use_read_as_pron: bool = False,
+    revert_long_vowels: bool = False,
+    revert_yotsugana: bool = False,
+    jtalk: OpenJTalk | None = None,
+) -> tuple[npt.NDArray[np.float64], int]:
+    """
+    pyopenjtalk.tts() の非同期版。引数と戻り値は pyopenjtalk.tts() と同じ。
+
+    NOTE:
+        フロントエンド処理と音声合成を分けて投入し、キャンセルされた場合は音声合成を開始しない
+    """
+
+    executor = _get_executor()
+    labels = await executor.run(
+        _extract_fullcontext,
+        text,
+        run_marine=run_marine,
+        use_vanilla=use_vanilla,
+        use_tsqyomi=use_tsqyomi,
+        use_sudachi_kanji_yomi=use_sudachi_kanji_yomi,
+        predict_nani=predict_nani,
+        normalize_mode=normalize_mode,
+        use_read_as_pron=use_read_as_pron,
+        revert_long_vowels=revert_long_vowels,
+        revert_yotsugana=revert_yotsugana,
+        jtalk=jtalk,
+    )
+    return await executor.run(_synthesize, labels, speed, half_tone)
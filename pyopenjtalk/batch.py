@@ -0,0 +1,501 @@
+"""データセット規模のテキストを複数プロセスで並列に処理するバッチ API。"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from typing import Any, Literal
+
+from . import extract_fullcontext, g2p, run_frontend, update_global_jtalk_with_user_dict
+from .types import UserDictionaryEntry
+
+
+BatchTask = Literal["g2p", "run_frontend", "make_label"]
+
+# タスク名と各ワーカーで呼び出す公開 API の対応
+## make_label はテキストを入力とするため、run_frontend() と make_label() を続けて実行する extract_fullcontext() を使う
+_TASK_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "g2p": g2p,
+    "run_frontend": run_frontend,
+    "make_label": extract_fullcontext,
+}
+
+# ワーカーの事前準備で1回だけ処理するテキスト
+## OpenJTalk・Sudachi・「何」の読み推定モデルなど、初回呼び出しで遅延生成される状態を構築させる
+_WARMUP_TEXT = "何を事前に準備しますか。"
+
+# シャードファイル名の書式 (辞書順とシャード番号順を一致させるため0埋めする)
+_SHARD_FILE_NAME_FORMAT = "shard-{index:06d}.jsonl"
+
+
+def create_process_pool(
+    max_workers: int | None = None,
+    *,
+    user_dictionary: str | list[str] | list[UserDictionaryEntry] | None = None,
+    load_tsqyomi: bool = False,
+    tsqyomi_load_options: Mapping[str, Any] | None = None,
+    expected_tsqyomi_revision: str | None = None,
+    mp_context: BaseContext | None = None,
+) -> ProcessPoolExecutor:
+    """
+    OpenJTalk などの処理系を事前に構築したワーカープロセスのプールを生成する。
+    各ワーカーは自身のグローバル OpenJTalk・Sudachi トークナイザー・「何」の読み推定モデルを保持する。
+
+    Args:
+        max_workers (int | None): ワーカープロセス数。None の場合は CPU コア数 (デフォルト: None)
+        user_dictionary (str | list[str] | list[UserDictionaryEntry] | None): 各ワーカーに適用するユーザー辞書
+            `update_global_jtalk_with_user_dict()` と同じ形式で指定する (デフォルト: None)
+        load_tsqyomi (bool): True の場合、各ワーカーで tsqyomi のモデルをロードする (デフォルト: False)
+        tsqyomi_load_options (Mapping[str, Any] | None): 各ワーカーで `tsqyomi.load_model()` に渡すキーワード引数
+            (例: {"model_dir": "path/to/model", "model_variant": "int8"})。ワーカーへ送るため pickle 可能な値に限る
+            None の場合は Hugging Face Hub の既定のモデルをロードする (デフォルト: None)
+        expected_tsqyomi_revision (str | None): 各ワーカーでロードした tsqyomi のモデルに求めるリビジョン
+            一致しない場合はワーカーの初期化に失敗し、プールに投入した処理は BrokenProcessPool を送出する
+            None の場合は確認しない (デフォルト: None)
+        mp_context (BaseContext | None): ワーカーの起動に使う multiprocessing コンテキスト
+            None の場合は "spawn" を使う (デフォルト: None)
+
+    Returns:
+        ProcessPoolExecutor: `process_texts()` や `process_texts_to_shards()` に渡せるプロセスプール
+
+    Raises:
+        ValueError: load_tsqyomi=False で tsqyomi_load_options または expected_tsqyomi_revision を指定した場合
+
+    NOTE:
+        ONNX Runtime などのスレッドを持つ状態を fork で複製するとデッドロックし得るため、既定では spawn で起動する
+        spawn ではワーカーがメインモジュールを再 import するため、呼び出し側は `if __name__ == "__main__":` で保護すること
+    """
+
+    if tsqyomi_load_options is not None and load_tsqyomi is False:
+        raise ValueError("tsqyomi_load_options requires load_tsqyomi=True")
+    if expected_tsqyomi_revision is not None and load_tsqyomi is False:
+        raise ValueError("expected_tsqyomi_revision requires load_tsqyomi=True")
+
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp_context if mp_context is not None else multiprocessing.get_context("spawn"),
+        initializer=_initialize_worker,
+        initargs=(
+            user_dictionary,
+            load_tsqyomi,
+            dict(tsqyomi_load_options) if tsqyomi_load_options is not None else None,
+            expected_tsqyomi_revision,
+        ),
+    )
+
+
+def process_texts(
+    texts: Iterable[str],
+    task: BatchTask = "g2p",
+    *,
+    options: Mapping[str, Any] | None = None,
+    executor: Executor | None = None,
+    max_workers: int | None = None,
+    chunk_size: int = 64,
+    max_pending_chunks: int | None = None,
+    return_exceptions: bool = False,
+    progress_callback: Callable[[int], None] | None = None,
+    user_dictionary: str | list[str] | list[UserDictionaryEntry] | None = None,
+    load_tsqyomi: bool = False,
+    tsqyomi_load_options: Mapping[str, Any] | None = None,
+) -> Iterator[Any]:
+    """
+    テキスト列をチャンク単位でワーカープロセスへ分配し、入力と同じ順序で結果を逐次返す。
+
+    Args:
+        texts (Iterable[str]): 入力テキストの列。処理の進行に合わせて必要な分だけ読み出される
+        task (BatchTask): 実行する処理 ("g2p" / "run_frontend" / "make_label") (デフォルト: "g2p")
+        options (Mapping[str, Any] | None): 各テキストの処理に渡すキーワード引数 (例: {"kana": True}) (デフォルト: None)
+        executor (Executor | None): 処理に使う Executor。None の場合は `create_process_pool()` で生成し、
+            処理の完了時にシャットダウンする (デフォルト: None)
+        max_workers (int | None): executor=None の場合に生成するワーカープロセス数 (デフォルト: None)
+        chunk_size (int): 1回の分配でワーカーへ送るテキスト数 (デフォルト: 64)
+        max_pending_chunks (int | None): 同時に処理中とするチャンク数の上限。None の場合はワーカー数の2倍 (デフォルト: None)
+        return_exceptions (bool): True の場合、失敗したテキストの位置に例外オブジェクトを返して処理を続ける
+            False の場合は最初に失敗したテキストの例外を送出する (デフォルト: False)
+        progress_callback (Callable[[int], None] | None): チャンクの結果を返すたびに処理済みテキスト数を渡して呼ぶ関数 (デフォルト: None)
+        user_dictionary (str | list[str] | list[UserDictionaryEntry] | None): executor=None の場合に各ワーカーへ適用するユーザー辞書 (デフォルト: None)
+        load_tsqyomi (bool): executor=None の場合に各ワーカーで tsqyomi のモデルをロードするか (デフォルト: False)
+        tsqyomi_load_options (Mapping[str, Any] | None): executor=None の場合に各ワーカーで
+            `tsqyomi.load_model()` に渡すキーワード引数 (デフォルト: None)
+
+    Yields:
+        Any: 各テキストの処理結果 (g2p() / run_frontend() / extract_fullcontext() の戻り値)
+
+    Raises:
+        ValueError: chunk_size または max_pending_chunks が1未満の場合
+
+    NOTE:
+        処理中のチャンクは max_pending_chunks 個までに制限されるため、入力や結果の総数によらずメモリ使用量は一定に保たれる
+        ただし先頭のチャンクの完了を待ってから結果を返すため、後続のチャンクが先に完了しても保持されたまま待機する
+    """
+
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be greater than or equal to 1: {chunk_size}")
+    if max_pending_chunks is None:
+        max_pending_chunks = 2 * (max_workers or os.cpu_count() or 1)
+    if max_pending_chunks < 1:
+        raise ValueError(
+            f"max_pending_chunks must be greater than or equal to 1: {max_pending_chunks}"
+        )
+    if task not in _TASK_FUNCTIONS:
+        raise ValueError(f"Unknown task: {task}")
+
+    owned_executor: Executor | None = None
+    if executor is None:
+        owned_executor = create_process_pool(
+            max_workers,
+            user_dictionary=user_dictionary,
+            load_tsqyomi=load_tsqyomi,
+            tsqyomi_load_options=tsqyomi_load_options,
+        )
+        executor = owned_executor
+    task_options = dict(options) if options is not None else {}
+    text_iterator = iter(texts)
+    pending_chunks: deque[Future[list[Any]]] = deque()
+    processed_count = 0
+
+    def submit_next_chunk() -> bool:
+        """次のチャンクを入力から読み出して投入し、投入できたかを返す。"""
+
+        chunk = list(itertools.islice(text_iterator, chunk_size))
+        if len(chunk) == 0:
+            return False
+        pending_chunks.append(
+            executor.submit(_process_chunk, task, chunk, task_options, return_exceptions)
+        )
+        return True
+
+    try:
+        # 上限までチャンクを先行投入し、先頭のチャンクが完了するたびに1つずつ補充する
+        has_more_texts = True
+        while has_more_texts is True and len(pending_chunks) < max_pending_chunks:
+            has_more_texts = submit_next_chunk()
+        while len(pending_chunks) > 0:
+            results = pending_chunks.popleft().result()
+            if has_more_texts is True:
+                has_more_texts = submit_next_chunk()
+            processed_count += len(results)
+            yield from results
+            if progress_callback is not None:
+                progress_callback(processed_count)
+    finally:
+        # 途中で例外が発生したりジェネレーターが閉じられたりした場合は、未着手のチャンクを破棄する
+        for future in pending_chunks:
+            future.cancel()
+        if owned_executor is not None:
+            owned_executor.shutdown(wait=True, cancel_futures=True)
+
+
+def process_texts_to_shards(
+    texts: Iterable[str],
+    output_dir: str | Path,
+    task: BatchTask = "g2p",
+    *,
+    shard_size: int = 10000,
+    options: Mapping[str, Any] | None = None,
+    executor: Executor | None = None,
+    max_workers: int | None = None,
+    chunk_size: int = 64,
+    max_pending_chunks: int | None = None,
+    progress_callback: Callable[[int], None] | None = None,
+    user_dictionary: str | list[str] | list[UserDictionaryEntry] | None = None,
+    load_tsqyomi: bool = False,
+    tsqyomi_load_options: Mapping[str, Any] | None = None,
+) -> int:
+    """
+    テキスト列を並列に処理し、結果を一定件数ごとの JSONL シャードファイルへ書き出す。
+    書き出し済みのシャードがある場合は、それらの行数分の入力を読み飛ばして続きから再開する。
+
+    各行は `{"index": 入力順の通し番号, "text": 入力テキスト, "result": 処理結果}` 形式の JSON で、
+    処理に失敗したテキストは "result" の代わりに `"error": "例外クラス名: メッセージ"` を持つ。
+
+    Args:
+        texts (Iterable[str]): 入力テキストの列。再開時は前回と同じ順序で同じテキストを返す必要がある
+        output_dir (str | Path): シャードファイルの出力先ディレクトリ (存在しない場合は作成する)
+        task (BatchTask): 実行する処理 ("g2p" / "run_frontend" / "make_label") (デフォルト: "g2p")
+        shard_size (int): 1シャードあたりのテキスト数 (デフォルト: 10000)
+        options (Mapping[str, Any] | None): 各テキストの処理に渡すキーワード引数 (デフォルト: None)
+        executor (Executor | None): 処理に使う Executor。None の場合は `create_process_pool()` で生成する (デフォルト: None)
+        max_workers (int | None): executor=None の場合に生成するワーカープロセス数 (デフォルト: None)
+        chunk_size (int): 1回の分配でワーカーへ送るテキスト数 (デフォルト: 64)
+        max_pending_chunks (int | None): 同時に処理中とするチャンク数の上限 (デフォルト: None)
+        progress_callback (Callable[[int], None] | None): 読み飛ばした件数を含む処理済みテキスト数を渡して呼ぶ関数 (デフォルト: None)
+        user_dictionary (str | list[str] | list[UserDictionaryEntry] | None): executor=None の場合に各ワーカーへ適用するユーザー辞書 (デフォルト: None)
+        load_tsqyomi (bool): executor=None の場合に各ワーカーで tsqyomi のモデルをロードするか (デフォルト: False)
+        tsqyomi_load_options (Mapping[str, Any] | None): executor=None の場合に各ワーカーで
+            `tsqyomi.load_model()` に渡すキーワード引数 (デフォルト: None)
+
+    Returns:
+        int: 出力先ディレクトリにある完成済みシャードの数
+
+    Raises:
+        ValueError: shard_size が1未満の場合
+
+    NOTE:
+        シャードは一時ファイルへ書き込んでから名前を変更するため、中断時に不完全なシャードが完成済みとして残ることはない
+        入力の末尾に達して shard_size 未満の件数で書き出された最終シャードは、再開時に続きの入力を含めて書き直す
+        読み飛ばす件数は既存シャードの行数から求めるため、前回と異なる shard_size で再開しても入力との対応は崩れない
+    """
+
+    if shard_size < 1:
+        raise ValueError(f"shard_size must be greater than or equal to 1: {shard_size}")
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    # 先頭から連続して完成しているシャードまでを処理済みとみなし、それらの行数分の入力を読み飛ばす
+    ## 前回の shard_size が異なる場合や最終シャードが件数不足の場合があるため、件数は実際の行数から求める
+    shard_line_counts: list[int] = []
+    while True:
+        shard_path = output_path / _SHARD_FILE_NAME_FORMAT.format(index=len(shard_line_counts))
+        if shard_path.exists() is False:
+            break
+        with shard_path.open(encoding="utf-8") as f:
+            shard_line_counts.append(sum(1 for _ in f))
+    existing_shard_count = len(shard_line_counts)
+    # 件数不足の最終シャードは入力の末尾で書き出されたものであり、入力が追加されていれば続きを含めて書き直す
+    if len(shard_line_counts) > 0 and shard_line_counts[-1] < shard_size:
+        shard_line_counts.pop()
+    completed_shard_count = len(shard_line_counts)
+    skipped_count = sum(shard_line_counts)
+    remaining_texts = itertools.islice(texts, skipped_count, None)
+
+    # 結果と対応付けるため、ワーカーへ送ったテキストを出力順に控えておく
+    ## process_texts() が保持するチャンク数は上限があるため、このキューも一定の長さに収まる
+    dispatched_texts: deque[str] = deque()
+
+    def record_dispatched_texts() -> Iterator[str]:
+        """ワーカーへ送るテキストを控えながら返す。"""
+
+        for text in remaining_texts:
+            dispatched_texts.append(text)
+            yield text
+
+    def report_progress(processed_count: int) -> None:
+        """読み飛ばした件数を含めた処理済み件数を呼び出し元へ通知する。"""
+
+        if progress_callback is not None:
+            progress_callback(skipped_count + processed_count)
+
+    results = process_texts(
+        record_dispatched_texts(),
+        task,
+        options=options,
+        executor=executor,
+        max_workers=max_workers,
+        chunk_size=chunk_size,
+        max_pending_chunks=max_pending_chunks,
+        return_exceptions=True,
+        progress_callback=report_progress,
+        user_dictionary=user_dictionary,
+        load_tsqyomi=load_tsqyomi,
+        tsqyomi_load_options=tsqyomi_load_options,
+    )
+    shard_index = completed_shard_count
+    text_index = skipped_count
+    try:
+        while True:
+            shard_records = list(itertools.islice(results, shard_size))
+            if len(shard_records) == 0:
+                break
+            shard_path = output_path / _SHARD_FILE_NAME_FORMAT.format(index=shard_index)
+            temporary_path = shard_path.with_name(shard_path.name + ".tmp")
+            with temporary_path.open("w", encoding="utf-8") as f:
+                for result in shard_records:
+                    record: dict[str, Any] = {
+                        "index": text_index,
+                        "text": dispatched_texts.popleft(),
+                    }
+                    if isinstance(result, Exception):
+                        record["error"] = f"{type(result).__name__}: {result}"
+                    else:
+                        record["result"] = result
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    text_index += 1
+            os.replace(temporary_path, shard_path)
+            shard_index += 1
+    finally:
+        # 書き込みに失敗した場合も、処理中のチャンクの破棄と自前のプロセスプールの停止を確実に行う
+        results.close()
+    # 書き直し対象の最終シャードに続く入力がなかった場合は、既存の最終シャードがそのまま残る
+    return max(shard_index, existing_shard_count)
+
+
+def iter_texts_from_file(path: str | Path, *, jsonl_key: str = "text") -> Iterator[str]:
+    """
+    テキストファイルまたは JSONL ファイルから入力テキストを1行ずつ読み出す。
+
+    Args:
+        path (str | Path): 入力ファイルのパス。拡張子が .jsonl / .ndjson の場合は JSONL として読む
+        jsonl_key (str): JSONL の各行がオブジェクトの場合に入力テキストとして読むキー (デフォルト: "text")
+
+    Yields:
+        str: 入力テキスト。テキストファイルでは改行を除いた各行 (行番号と結果の対応を保つため空行も含む)
+
+    Raises:
+        ValueError: JSONL の行が文字列でも jsonl_key を持つオブジェクトでもない場合
+    """
+
+    file_path = Path(path)
+    is_jsonl = file_path.suffix.lower() in (".jsonl", ".ndjson")
+    with file_path.open(encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.rstrip("\r\n")
+            if is_jsonl is False:
+                yield line
+                continue
+            if line.strip() == "":
+                continue
+            value = json.loads(line)
+            if isinstance(value, dict) and isinstance(value.get(jsonl_key), str):
+                yield value[jsonl_key]
+            elif isinstance(value, str):
+                yield value
+            else:
+                raise ValueError(
+                    f"{file_path}:{line_number}: each JSONL line must be a string "
+                    f"or an object with a string {jsonl_key!r} field"
+                )
+
+
+def _initialize_worker(
+    user_dictionary: str | list[str] | list[UserDictionaryEntry] | None,
+    load_tsqyomi: bool,
+    tsqyomi_load_options: dict[str, Any] | None,
+    expected_tsqyomi_revision: str | None,
+) -> None:
+    """
+    ワーカープロセスの起動時に、ユーザー辞書・tsqyomi・遅延生成される処理系を準備する。
+
+    Args:
+        user_dictionary (str | list[str] | list[UserDictionaryEntry] | None): 適用するユーザー辞書
+        load_tsqyomi (bool): True の場合、tsqyomi のモデルをロードする
+        tsqyomi_load_options (dict[str, Any] | None): `tsqyomi.load_model()` に渡すキーワード引数
+        expected_tsqyomi_revision (str | None): ロードした tsqyomi のモデルに求めるリビジョン
+
+    Raises:
+        RuntimeError: ロードした tsqyomi のモデルのリビジョンが expected_tsqyomi_revision と一致しない場合
+    """
+
+    if user_dictionary is not None:
+        update_global_jtalk_with_user_dict(user_dictionary)
+    if load_tsqyomi is True:
+        from . import tsqyomi
+
+        tsqyomi.load_model(**(tsqyomi_load_options or {}))
+        # 呼び出し元と異なるモデルの結果を返さないよう、処理を受け付ける前にリビジョンを照合する
+        revision = tsqyomi.get_loaded_model().revision
+        if expected_tsqyomi_revision is not None and revision != expected_tsqyomi_revision:
+            raise RuntimeError(
+                f"tsqyomi model revision loaded in the worker ({revision}) does not match "
+                f"the expected revision ({expected_tsqyomi_revision})"
+            )
+    g2p(_WARMUP_TEXT, use_tsqyomi=load_tsqyomi)
+
+
+def _process_chunk(
+    task: str,
+    texts: list[str],
+    options: dict[str, Any],
+    return_exceptions: bool,
+) -> list[Any]:
+    """
+    ワーカープロセスでチャンク内のテキストを順に処理する。
+
+    Args:
+        task (str): 実行する処理の名前
+        texts (list[str]): チャンク内の入力テキスト
+        options (dict[str, Any]): 処理に渡すキーワード引数
+        return_exceptions (bool): True の場合、失敗したテキストの位置に例外オブジェクトを格納する
+
+    Returns:
+        list[Any]: 入力順の処理結果
+    """
+
+    function = _TASK_FUNCTIONS[task]
+    results: list[Any] = []
+    for text in texts:
+        try:
+            results.append(function(text, **options))
+        except Exception as e:
+            if return_exceptions is False:
+                raise
+            results.append(e)
+    return results
+
+
+def main() -> None:
+    """Command line interface for pyopenjtalk.batch.process_texts_to_shards()"""
+    parser = argparse.ArgumentParser(
+        description="Process a text or JSONL file in parallel and write resumable JSONL shards"
+    )
+    parser.add_argument("input", type=str, help="Input text file (one text per line) or JSONL file")
+    parser.add_argument("output_dir", type=str, help="Output directory for JSONL shards")
+    parser.add_argument(
+        "--task", choices=list(_TASK_FUNCTIONS), default="g2p", help="Processing to run"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Texts per dispatched chunk")
+    parser.add_argument("--shard-size", type=int, default=10000, help="Texts per output shard")
+    parser.add_argument("--jsonl-key", type=str, default="text", help="Text field of JSONL input")
+    parser.add_argument("--kana", action="store_true", help="Return kana instead of phonemes (g2p)")
+    parser.add_argument("--use-tsqyomi", action="store_true", help="Load and use tsqyomi")
+    parser.add_argument(
+        "--tsqyomi-model-dir",
+        type=str,
+        default=None,
+        help="Local tsqyomi model directory (default: download from Hugging Face Hub)",
+    )
+    parser.add_argument(
+        "--tsqyomi-model-variant",
+        choices=["fp32", "int8"],
+        default="fp32",
+        help="tsqyomi model variant",
+    )
+    parser.add_argument("--user-dic", type=str, default=None, help="User dictionary (.dic) paths")
+    args = parser.parse_args()
+
+    options: dict[str, Any] = {}
+    if args.kana is True:
+        options["kana"] = True
+    tsqyomi_load_options: dict[str, Any] | None = None
+    if args.use_tsqyomi is True:
+        options["use_tsqyomi"] = True
+        tsqyomi_load_options = {"model_variant": args.tsqyomi_model_variant}
+        if args.tsqyomi_model_dir is not None:
+            tsqyomi_load_options["model_dir"] = args.tsqyomi_model_dir
+
+    def print_progress(processed_count: int) -> None:
+        print(f"\rprocessed: {processed_count}", end="", file=sys.stderr, flush=True)
+
+    try:
+        shard_count = process_texts_to_shards(
+            iter_texts_from_file(args.input, jsonl_key=args.jsonl_key),
+            args.output_dir,
+            args.task,
+            shard_size=args.shard_size,
+            options=options,
+            max_workers=args.workers,
+            chunk_size=args.chunk_size,
+            progress_callback=print_progress,
+            user_dictionary=args.user_dic,
+            load_tsqyomi=args.use_tsqyomi,
+            tsqyomi_load_options=tsqyomi_load_options,
+        )
+        print(f"\nshards: {shard_count}", file=sys.stderr)
+    except Exception as e:
+        print(f"Error: {e!s}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
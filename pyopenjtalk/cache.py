@@ -0,0 +1,187 @@
+"""フロントエンド処理結果などを再利用するためのスレッドセーフな LRU キャッシュと、辞書の世代番号。"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from threading import Lock
+from typing import Generic, TypeVar
+
+from .types import CacheStats
+
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+class LRUCache(Generic[_K, _V]):
+    """
+    合計サイズが最大サイズを超えると最も長く参照されていない項目から破棄する、スレッドセーフな LRU キャッシュ。
+    各項目のサイズは既定では1 (最大サイズ = 最大件数) で、weigher を指定すると値ごとのサイズ (バイト数など) になる。
+    最大サイズが0の場合は無効化され、get() は常に None を返し put() は何も保持しない。
+    """
+
+    def __init__(self, max_size: int = 0, weigher: Callable[[_V], int] | None = None) -> None:
+        """
+        LRU キャッシュを初期化する。
+
+        Args:
+            max_size (int): 保持する項目の合計サイズの上限。0 ならキャッシュを無効化する (デフォルト: 0)
+            weigher (Callable[[_V], int] | None): 値のサイズを返す関数。None なら全項目のサイズを1とする (デフォルト: None)
+
+        Raises:
+            ValueError: 最大サイズが0未満の場合
+        """
+
+        _validate_max_size(max_size)
+        self._entries: OrderedDict[_K, tuple[_V, int]] = OrderedDict()
+        self._weigher = weigher
+        self._total_size = 0
+        self._max_size = max_size
+        self._mutex = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        """保持する項目の合計サイズの上限 (0 なら無効)。"""
+
+        return self._max_size
+
+    def get(self, key: _K) -> _V | None:
+        """
+        キーに対応する値を返し、その項目を最近参照したものとして扱う。
+
+        Args:
+            key (_K): キャッシュキー
+
+        Returns:
+            _V | None: キャッシュされた値。存在しない場合は None
+        """
+
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: _K, value: _V) -> None:
+        """
+        値をキャッシュし、最大サイズを超えた分を古い順に破棄する。
+        単独で最大サイズを超える値はキャッシュしない。
+
+        Args:
+            key (_K): キャッシュキー
+            value (_V): キャッシュする値
+        """
+
+        # サイズの計算はロック外で行い、他のスレッドの参照を待たせない
+        size = 1 if self._weigher is None else self._weigher(value)
+        with self._mutex:
+            if self._max_size == 0 or size > self._max_size:
+                return
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry is not None:
+                self._total_size -= previous_entry[1]
+            self._entries[key] = (value, size)
+            self._total_size += size
+            self._evict_locked()
+
+    def resize(self, max_size: int) -> None:
+        """
+        最大サイズを変更し、超過分を古い順に破棄する。
+
+        Args:
+            max_size (int): 保持する項目の合計サイズの上限。0 ならキャッシュを無効化して全項目を破棄する
+
+        Raises:
+            ValueError: 最大サイズが0未満の場合
+        """
+
+        _validate_max_size(max_size)
+        with self._mutex:
+            self._max_size = max_size
+            self._evict_locked()
+
+    def clear(self) -> None:
+        """全項目と統計情報を破棄する。"""
+
+        with self._mutex:
+            self._entries.clear()
+            self._total_size = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """
+        キャッシュの統計情報を返す。
+
+        Returns:
+            CacheStats: ヒット数・ミス数・破棄数・現在の合計サイズ・最大サイズ
+        """
+
+        with self._mutex:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=self._total_size,
+                max_size=self._max_size,
+            )
+
+    def _evict_locked(self) -> None:
+        """最大サイズを超えた分を古い順に破棄する。呼び出し側で self._mutex を保持すること。"""
+
+        while self._total_size > self._max_size:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._total_size -= size
+            self._evictions += 1
+
+
+def _validate_max_size(max_size: int) -> None:
+    """
+    キャッシュの最大サイズが0以上であることを検証する。
+
+    Args:
+        max_size (int): 検証する最大サイズ
+
+    Raises:
+        ValueError: 最大サイズが0未満の場合
+    """
+
+    if max_size < 0:
+        raise ValueError(f"Cache size must be greater than or equal to 0: {max_size}")
+
+
+# ユーザー辞書や tsqyomi モデルなど、フロントエンド処理結果を変え得る状態の世代番号
+## キャッシュキーに含めることで、状態の変更前に計算された結果を変更後に返さないようにする
+_dictionary_generation = 0
+_dictionary_generation_lock = Lock()
+
+
+def get_dictionary_generation() -> int:
+    """
+    現在の辞書の世代番号を返す。
+
+    Returns:
+        int: 辞書の世代番号
+    """
+
+    return _dictionary_generation
+
+
+def bump_dictionary_generation() -> None:
+    """
+    辞書の世代番号を進める。
+    ユーザー辞書の差し替えや tsqyomi モデルのロードなど、フロントエンド処理結果を変え得る操作の後に呼ぶ。
+    """
+
+    global _dictionary_generation
+
+    with _dictionary_generation_lock:
+        _dictionary_generation += 1
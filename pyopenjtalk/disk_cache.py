@@ -0,0 +1,581 @@
+"""プロセスをまたいで共有できる、SQLite によるフロントエンド処理結果の永続キャッシュ。"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import AbstractContextManager, nullcontext
+from pathlib import Path
+from typing import Any, Literal
+
+from . import (
+    __version__,
+    _global_jtalk,
+    extract_fullcontext,
+    g2p,
+    run_frontend,
+    update_global_jtalk_with_user_dict,
+)
+from .openjtalk import OpenJTalk
+from .types import CacheStats, NJDFeature
+
+
+DiskCacheTask = Literal["g2p", "run_frontend", "make_label"]
+
+# キャッシュファイルの形式を変更した場合に進めるバージョン (キャッシュキーに含めて旧形式の項目を参照しない)
+_SCHEMA_VERSION = 1
+
+# 解析結果に影響するシステム辞書のファイル
+_SYSTEM_DICTIONARY_FILES = ("sys.dic", "unk.dic", "matrix.bin", "char.bin")
+
+# 参照時刻の更新間隔 (秒)
+## ヒットのたびに書き込むと読み取り主体の複数プロセスが書き込みロックで直列化されるため、
+## 一定時間以上参照されていなかった項目の参照時刻だけを更新する (LRU は近似となる)
+_ACCESSED_AT_REFRESH_INTERVAL = 3600
+
+# タスク名と公開 API の対応 (make_label はテキストを入力とする extract_fullcontext() を使う)
+_TASK_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "g2p": g2p,
+    "run_frontend": run_frontend,
+    "make_label": extract_fullcontext,
+}
+
+# 公開 API のオプションの既定値
+## 既定値を明示した呼び出しと省略した呼び出しが同じキャッシュキーになるよう、キー計算前に補完する
+_TASK_DEFAULT_OPTIONS: dict[str, dict[str, Any]] = {
+    task: {
+        name: parameter.default
+        for name, parameter in inspect.signature(function).parameters.items()
+        if parameter.default is not inspect.Parameter.empty and name != "jtalk"
+    }
+    for task, function in _TASK_FUNCTIONS.items()
+}
+
+# ファイルのチェックサムのメモ ((パス, サイズ, 更新時刻) → SHA-256)
+_file_checksums: dict[tuple[str, int, int], str] = {}
+_file_checksums_lock = threading.Lock()
+
+
+class FrontendDiskCache:
+    """
+    `g2p()` / `run_frontend()` / `extract_fullcontext()` の結果を SQLite ファイルへ永続化するキャッシュ。
+    キャッシュキーは入力テキスト・オプション・pyopenjtalk のバージョン・システム辞書とユーザー辞書のチェックサム・
+    tsqyomi モデルのリビジョンから計算したハッシュ値で、辞書やモデルが変わると別の項目として扱われる。
+
+    同じキャッシュファイルを複数のプロセス・スレッドから同時に開いて読み書きできる。
+    プロセスの再起動後も結果が残るため、起動直後のワーカーでも高いヒット率が得られる。
+
+    Args:
+        path (str | Path): キャッシュファイルのパス (存在しない場合は作成する)
+        max_entries (int): 保持する最大件数。超過すると参照時刻の古い項目から破棄する (デフォルト: 1000000)
+        timeout (float): 他のプロセスの書き込み完了を待つ最大秒数 (デフォルト: 30.0)
+
+    Raises:
+        ValueError: 最大件数が1未満の場合
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        max_entries: int = 1_000_000,
+        timeout: float = 30.0,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be greater than or equal to 1: {max_entries}")
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._timeout = timeout
+        # sqlite3 の接続はスレッド間で共有できないため、スレッドごとに接続を開く
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._mutex = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._writes_since_eviction_check = 0
+        # 書き込みのたびに件数を数えると遅いため、最大件数の1%ごとに超過を確認する
+        self._eviction_check_interval = max(1, max_entries // 100)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS frontend_cache ("
+                "key BLOB PRIMARY KEY, value TEXT NOT NULL, accessed_at INTEGER NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS frontend_cache_accessed_at "
+                "ON frontend_cache (accessed_at)"
+            )
+
+    def __enter__(self) -> FrontendDiskCache:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def g2p(
+        self,
+        text: str,
+        kana: bool = False,
+        join: bool = True,
+        **options: Any,
+    ) -> list[str] | str:
+        """
+        キャッシュを参照して pyopenjtalk.g2p() を実行する。引数と戻り値は pyopenjtalk.g2p() と同じ。
+        """
+
+        return self._call("g2p", text, {"kana": kana, "join": join, **options})
+
+    def run_frontend(self, text: str, **options: Any) -> list[NJDFeature]:
+        """
+        キャッシュを参照して pyopenjtalk.run_frontend() を実行する。引数と戻り値は pyopenjtalk.run_frontend() と同じ。
+        """
+
+        return self._call("run_frontend", text, options)
+
+    def extract_fullcontext(self, text: str, **options: Any) -> list[str]:
+        """
+        キャッシュを参照して pyopenjtalk.extract_fullcontext() を実行する。
+        引数と戻り値は pyopenjtalk.extract_fullcontext() と同じ。
+        """
+
+        return self._call("make_label", text, options)
+
+    def populate(
+        self,
+        texts: Iterable[str],
+        task: DiskCacheTask = "g2p",
+        *,
+        options: dict[str, Any] | None = None,
+        max_workers: int | None = None,
+        user_dictionary: str | list[str] | None = None,
+        tsqyomi_load_options: Mapping[str, Any] | None = None,
+        progress_callback: Callable[[int], None] | None = None,
+    ) -> int:
+        """
+        テキスト列を処理し、キャッシュにない結果をまとめて格納する。
+
+        Args:
+            texts (Iterable[str]): 入力テキストの列
+            task (DiskCacheTask): 実行する処理 ("g2p" / "run_frontend" / "make_label") (デフォルト: "g2p")
+            options (dict[str, Any] | None): 各テキストの処理に渡すキーワード引数 (デフォルト: None)
+            max_workers (int | None): 1より大きい場合は `pyopenjtalk.batch` のワーカープロセスで並列に処理する
+                None または1の場合は呼び出し元のプロセスで順に処理する (デフォルト: None)
+            user_dictionary (str | list[str] | None): 並列処理時に各ワーカーへ適用するユーザー辞書
+                呼び出し元のプロセスにも同じユーザー辞書を適用しておくこと (デフォルト: None)
+            tsqyomi_load_options (Mapping[str, Any] | None): use_tsqyomi=True の並列処理時に、各ワーカーで
+                `tsqyomi.load_model()` に渡すキーワード引数。呼び出し元と同じモデルをロードする指定にすること
+                None の場合は Hugging Face Hub の既定のモデルをロードする (デフォルト: None)
+            progress_callback (Callable[[int], None] | None): 処理済みテキスト数を渡して呼ぶ関数 (デフォルト: None)
+
+        Returns:
+            int: 新たに格納した件数
+
+        Raises:
+            RuntimeError: use_tsqyomi=True で tsqyomi のモデルが未ロードの場合、
+                または並列処理時にワーカーでロードしたモデルのリビジョンが呼び出し元と一致しない場合
+
+        NOTE:
+            キャッシュキーの辞書チェックサムと tsqyomi のリビジョンは呼び出し元のプロセスから計算するため、
+            並列処理時のワーカーは呼び出し元と同じ辞書設定・同じ tsqyomi のモデルで起動する必要がある
+            ワーカーでロードした tsqyomi のモデルのリビジョンは処理の開始前に照合し、異なる場合は何も格納しない
+        """
+
+        task_options = {**_TASK_DEFAULT_OPTIONS[task], **(options or {})}
+        with _global_jtalk() as jtalk:
+            fingerprint = self._fingerprint(jtalk, task_options)
+        if fingerprint is None:
+            raise RuntimeError(
+                "tsqyomi model is not loaded; call pyopenjtalk.tsqyomi.load_model() first"
+            )
+
+        stored_count = 0
+        processed_count = 0
+        if max_workers is None or max_workers <= 1:
+            function = _TASK_FUNCTIONS[task]
+            for text in texts:
+                key = self._make_key(task, text, task_options, fingerprint)
+                if self._get(key, count_stats=False) is None:
+                    self._put(key, function(text, **task_options))
+                    stored_count += 1
+                processed_count += 1
+                if progress_callback is not None:
+                    progress_callback(processed_count)
+            return stored_count
+
+        # 並列処理ではキャッシュにないテキストだけをワーカーへ送り、結果と対応付けるためにキーを控えておく
+        from .batch import create_process_pool, process_texts
+
+        pending_keys: deque[bytes] = deque()
+
+        def filter_missing_texts() -> Iterator[str]:
+            """キャッシュにないテキストだけをキーを控えながら返す。"""
+
+            nonlocal processed_count
+            for text in texts:
+                key = self._make_key(task, text, task_options, fingerprint)
+                processed_count += 1
+                if self._get(key, count_stats=False) is None:
+                    pending_keys.append(key)
+                    yield text
+                elif progress_callback is not None:
+                    progress_callback(processed_count)
+
+        # キャッシュキーは呼び出し元のモデルのリビジョンから計算するため、ワーカーのモデルも同じリビジョンに限る
+        load_tsqyomi = task_options.get("use_tsqyomi", False) is True
+        expected_tsqyomi_revision: str | None = None
+        if load_tsqyomi is True:
+            from .tsqyomi import model as tsqyomi_model
+
+            expected_tsqyomi_revision = tsqyomi_model.get_loaded_model().revision
+        executor = create_process_pool(
+            max_workers,
+            user_dictionary=user_dictionary,
+            load_tsqyomi=load_tsqyomi,
+            tsqyomi_load_options=tsqyomi_load_options,
+            expected_tsqyomi_revision=expected_tsqyomi_revision,
+        )
+        try:
+            for result in process_texts(
+                filter_missing_texts(),
+                task,
+                options=task_options,
+                executor=executor,
+                max_workers=max_workers,
+            ):
+                self._put(pending_keys.popleft(), result)
+                stored_count += 1
+                if progress_callback is not None:
+                    progress_callback(processed_count - len(pending_keys))
+        except BrokenProcessPool as ex:
+            if expected_tsqyomi_revision is None:
+                raise
+            raise RuntimeError(
+                "batch workers failed to start; check that tsqyomi_load_options loads "
+                f"the same tsqyomi model as the caller (revision: {expected_tsqyomi_revision})"
+            ) from ex
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return stored_count
+
+    def stats(self) -> CacheStats:
+        """
+        このインスタンスでのヒット数・ミス数・破棄数と、キャッシュファイル全体の件数を返す。
+
+        Returns:
+            CacheStats: ヒット数・ミス数・破棄数・現在の件数・最大件数
+        """
+
+        (size,) = self._connection().execute("SELECT COUNT(*) FROM frontend_cache").fetchone()
+        with self._mutex:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=size,
+                max_size=self.max_entries,
+            )
+
+    def clear(self) -> None:
+        """キャッシュファイルの全項目と、このインスタンスの統計情報を破棄する。"""
+
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM frontend_cache")
+        with self._mutex:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def close(self) -> None:
+        """このインスタンスが開いた全ての接続を閉じる。"""
+
+        with self._mutex:
+            connections = self._connections
+            self._connections = []
+            self._local = threading.local()
+        for connection in connections:
+            connection.close()
+
+    def _call(self, task: DiskCacheTask, text: str, options: dict[str, Any]) -> Any:
+        """
+        キャッシュを参照し、ない場合は処理を実行して結果を格納する。
+
+        Args:
+            task (DiskCacheTask): 処理の種類
+            text (str): 入力テキスト
+            options (dict[str, Any]): 公開 API に渡すキーワード引数 (jtalk を含み得る)
+
+        Returns:
+            Any: 処理結果
+        """
+
+        function = _TASK_FUNCTIONS[task]
+        jtalk: OpenJTalk | None = options.pop("jtalk", None)
+        options = {**_TASK_DEFAULT_OPTIONS[task], **options}
+        # 辞書のチェックサムと実際の処理に同じインスタンスを使うよう、グローバルインスタンスは処理完了まで借り出す
+        lease: AbstractContextManager[OpenJTalk] = (
+            _global_jtalk() if jtalk is None else nullcontext(jtalk)
+        )
+        with lease as resolved_jtalk:
+            fingerprint = self._fingerprint(resolved_jtalk, options)
+            if fingerprint is None:
+                # tsqyomi 未ロード時は公開 API と同じ例外を送出させる
+                return function(text, **options, jtalk=resolved_jtalk)
+            key = self._make_key(task, text, options, fingerprint)
+            cached_result = self._get(key)
+            if cached_result is not None:
+                return cached_result
+            result = function(text, **options, jtalk=resolved_jtalk)
+        self._put(key, result)
+        return result
+
+    def _fingerprint(self, jtalk: OpenJTalk, options: dict[str, Any]) -> str | None:
+        """
+        処理結果を左右する辞書とモデルの識別文字列を返す。
+
+        Args:
+            jtalk (OpenJTalk): 処理に使う OpenJTalk インスタンス
+            options (dict[str, Any]): 公開 API に渡すキーワード引数
+
+        Returns:
+            str | None: 識別文字列。tsqyomi を使う指定でモデルが未ロードまたは識別できない場合は None
+        """
+
+        mecab_model = jtalk.mecab_model
+        dictionary_directory = Path(os.fsdecode(mecab_model.dn_mecab))
+        components = [
+            __version__,
+            *(_file_checksum(dictionary_directory / name) for name in _SYSTEM_DICTIONARY_FILES),
+        ]
+        if len(mecab_model.userdic) > 0:
+            for userdic_path in mecab_model.userdic.split(b","):
+                components.append(_file_checksum(Path(os.fsdecode(userdic_path))))
+        components.append(repr(jtalk.userdic_reading_protection))
+        if options.get("use_tsqyomi", False) is True:
+            from .tsqyomi import model as tsqyomi_model
+
+            if tsqyomi_model.is_model_loaded() is False:
+                return None
+            revision = tsqyomi_model.get_loaded_model().revision
+            if revision is None:
+                return None
+            components.append(revision)
+        return "\n".join(components)
+
+    def _make_key(
+        self,
+        task: DiskCacheTask,
+        text: str,
+        options: dict[str, Any],
+        fingerprint: str,
+    ) -> bytes:
+        """
+        キャッシュキーを計算する。
+
+        Args:
+            task (DiskCacheTask): 処理の種類
+            text (str): 入力テキスト
+            options (dict[str, Any]): 公開 API に渡すキーワード引数 (jtalk を除く)
+            fingerprint (str): 辞書とモデルの識別文字列
+
+        Returns:
+            bytes: SHA-256 ハッシュ値
+        """
+
+        payload = json.dumps(
+            [_SCHEMA_VERSION, task, text, sorted(options.items()), fingerprint],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).digest()
+
+    def _get(self, key: bytes, count_stats: bool = True) -> Any | None:
+        """
+        キャッシュから結果を取得する。
+
+        Args:
+            key (bytes): キャッシュキー
+            count_stats (bool): True の場合、ヒット数・ミス数に数える (デフォルト: True)
+
+        Returns:
+            Any | None: キャッシュされた結果。存在しない場合は None
+        """
+
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT value, accessed_at FROM frontend_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if count_stats is True:
+            with self._mutex:
+                if row is None:
+                    self._misses += 1
+                else:
+                    self._hits += 1
+        if row is None:
+            return None
+        value, accessed_at = row
+        now = int(time.time())
+        if now - accessed_at >= _ACCESSED_AT_REFRESH_INTERVAL:
+            with connection:
+                connection.execute(
+                    "UPDATE frontend_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+        return json.loads(value)
+
+    def _put(self, key: bytes, result: Any) -> None:
+        """
+        結果をキャッシュへ格納し、一定回数ごとに最大件数の超過分を破棄する。
+
+        Args:
+            key (bytes): キャッシュキー
+            result (Any): JSON に変換可能な処理結果
+        """
+
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO frontend_cache (key, value, accessed_at) VALUES (?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), int(time.time())),
+            )
+        with self._mutex:
+            self._writes_since_eviction_check += 1
+            if self._writes_since_eviction_check < self._eviction_check_interval:
+                return
+            self._writes_since_eviction_check = 0
+        self._evict()
+
+    def _evict(self) -> None:
+        """最大件数を超えた分を参照時刻の古い順に破棄する。"""
+
+        connection = self._connection()
+        with connection:
+            (size,) = connection.execute("SELECT COUNT(*) FROM frontend_cache").fetchone()
+            excess = size - self.max_entries
+            if excess <= 0:
+                return
+            connection.execute(
+                "DELETE FROM frontend_cache WHERE key IN ("
+                "SELECT key FROM frontend_cache ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+        with self._mutex:
+            self._evictions += excess
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        呼び出し元のスレッド用の接続を返す。未接続の場合は接続する。
+
+        Returns:
+            sqlite3.Connection: SQLite 接続
+        """
+
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self._timeout)
+            # WAL モードでは書き込み中も他のプロセスが読み取りを続けられる
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._mutex:
+                self._connections.append(connection)
+        return connection
+
+
+def _file_checksum(path: Path) -> str:
+    """
+    ファイルの SHA-256 チェックサムを返す。サイズと更新時刻が変わらない限り再計算しない。
+
+    Args:
+        path (Path): チェックサムを計算するファイルのパス
+
+    Returns:
+        str: 16進数表記のチェックサム。ファイルが存在しない場合は "missing"
+    """
+
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return "missing"
+    memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+    with _file_checksums_lock:
+        checksum = _file_checksums.get(memo_key)
+    if checksum is not None:
+        return checksum
+
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    checksum = digest.hexdigest()
+    with _file_checksums_lock:
+        _file_checksums[memo_key] = checksum
+    return checksum
+
+
+def main() -> None:
+    """Command line interface for pre-populating pyopenjtalk.disk_cache.FrontendDiskCache"""
+    parser = argparse.ArgumentParser(
+        description="Pre-populate a persistent pyopenjtalk frontend cache from a corpus"
+    )
+    parser.add_argument("cache", type=str, help="SQLite cache file")
+    parser.add_argument("input", type=str, help="Input text file (one text per line) or JSONL file")
+    parser.add_argument(
+        "--task", choices=list(_TASK_FUNCTIONS), default="g2p", help="Processing to cache"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument(
+        "--max-entries", type=int, default=1_000_000, help="Maximum number of cache entries"
+    )
+    parser.add_argument("--jsonl-key", type=str, default="text", help="Text field of JSONL input")
+    parser.add_argument("--kana", action="store_true", help="Return kana instead of phonemes (g2p)")
+    parser.add_argument("--use-tsqyomi", action="store_true", help="Load and use tsqyomi")
+    parser.add_argument("--user-dic", type=str, default=None, help="User dictionary (.dic) paths")
+    args = parser.parse_args()
+
+    from .batch import iter_texts_from_file
+
+    options: dict[str, Any] = {}
+    if args.kana is True:
+        options["kana"] = True
+    if args.use_tsqyomi is True:
+        from . import tsqyomi
+
+        tsqyomi.load_model()
+        options["use_tsqyomi"] = True
+
+    def print_progress(processed_count: int) -> None:
+        print(f"\rprocessed: {processed_count}", end="", file=sys.stderr, flush=True)
+
+    try:
+        if args.user_dic is not None:
+            update_global_jtalk_with_user_dict(args.user_dic)
+        with FrontendDiskCache(args.cache, max_entries=args.max_entries) as cache:
+            stored_count = cache.populate(
+                iter_texts_from_file(args.input, jsonl_key=args.jsonl_key),
+                args.task,
+                options=options,
+                max_workers=args.workers,
+                user_dictionary=args.user_dic,
+                progress_callback=print_progress,
+            )
+        print(f"\nstored: {stored_count}", file=sys.stderr)
+    except Exception as e:
+        print(f"Error: {e!s}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
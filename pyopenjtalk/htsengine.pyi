@@ -1,10 +1,15 @@
 # flake8: noqa
 
+from collections.abc import Generator
 from threading import RLock
-from typing import Any
+from typing import Any, overload
 
 import numpy as np
 
+_Float64Speech = np.ndarray[Any, np.dtype[np.float64]]
+_Float32Speech = np.ndarray[Any, np.dtype[np.float32]]
+_Int16Speech = np.ndarray[Any, np.dtype[np.int16]]
+
 class HTSEngine:
     _lock: RLock
 
@@ -69,9 +74,22 @@ class HTSEngine:
         """
         ...
 
+    @overload
+    def synthesize(
+        self, labels: list[str] | list[bytes] | list[bytearray], dtype: type[np.float64] = ...
+    ) -> _Float64Speech: ...
+    @overload
+    def synthesize(
+        self, labels: list[str] | list[bytes] | list[bytearray], dtype: type[np.float32]
+    ) -> _Float32Speech: ...
+    @overload
     def synthesize(
-        self, labels: list[str] | list[bytes] | list[bytearray]
-    ) -> np.ndarray[Any, np.dtype[np.float64]]:
+        self, labels: list[str] | list[bytes] | list[bytearray], dtype: type[np.int16]
+    ) -> _Int16Speech: ...
+    @overload
+    def synthesize(
+        self, labels: list[str] | list[bytes] | list[bytearray], dtype: np.dtype[Any] | type
+    ) -> _Float64Speech | _Float32Speech | _Int16Speech:
         """
         フルコンテキストラベルから音声波形を合成する。
         synthesize_from_strings() を呼び出し、生成された波形を返す。
@@ -79,9 +97,50 @@ class HTSEngine:
 
         Args:
             labels (list[str] | list[bytes] | list[bytearray]): フルコンテキストラベル文字列のリスト
+            dtype (np.dtype | type): 返す波形の dtype。np.float64 / np.float32 / np.int16 のいずれか
+                np.int16 の場合は 16bit PCM の範囲にクリップして丸める (デフォルト: np.float64)
 
         Returns:
-            np.ndarray: 音声波形 (dtype: np.float64)
+            np.ndarray: 音声波形
+
+        Raises:
+            ValueError: 対応していない dtype が指定された場合
+        """
+        ...
+
+    @overload
+    def synthesize_stream(
+        self, labels: list[str] | list[bytes] | list[bytearray], dtype: type[np.float64] = ...
+    ) -> Generator[_Float64Speech, None, None]: ...
+    @overload
+    def synthesize_stream(
+        self, labels: list[str] | list[bytes] | list[bytearray], dtype: type[np.float32]
+    ) -> Generator[_Float32Speech, None, None]: ...
+    @overload
+    def synthesize_stream(
+        self, labels: list[str] | list[bytes] | list[bytearray], dtype: type[np.int16]
+    ) -> Generator[_Int16Speech, None, None]: ...
+    @overload
+    def synthesize_stream(
+        self, labels: list[str] | list[bytes] | list[bytearray], dtype: np.dtype[Any] | type
+    ) -> Generator[_Float64Speech | _Float32Speech | _Int16Speech, None, None]:
+        """
+        フルコンテキストラベルを文中のポーズ (pau) ごとのセグメントに分けて順に合成し、
+        各セグメントの音声波形を合成し終えた時点で返す。
+        全体の合成を待たずに先頭のセグメントから再生を始められる。
+        話速と半音はセグメント間で維持されるため、呼び出し前に set_speed() / add_half_tone() で設定しておく。
+
+        Args:
+            labels (list[str] | list[bytes] | list[bytearray]): フルコンテキストラベル文字列のリスト
+            dtype (np.dtype | type): 返す波形の dtype。np.float64 / np.float32 / np.int16 のいずれか (デフォルト: np.float64)
+
+        Returns:
+            Generator[np.ndarray, None, None]: セグメントごとの音声波形を返すジェネレータ
+
+        NOTE:
+            セグメントの合成ごとに排他ロックを取得・解放するため、ジェネレータの消費中も他のスレッドから利用できる
+            ただし、他のスレッドが話速や半音を変更すると後続のセグメントに反映される
+            セグメント境界のポーズ前後では HTS のパラメータ生成が分かれるため、synthesize() の波形とは完全には一致しない
         """
         ...
 
@@ -100,14 +159,50 @@ class HTSEngine:
         """
         ...
 
-    def get_generated_speech(self) -> np.ndarray[Any, np.dtype[np.float64]]:
+    @overload
+    def get_generated_speech(
+        self, dtype: type[np.float64] | None = None, out: None = None
+    ) -> _Float64Speech: ...
+    @overload
+    def get_generated_speech(self, dtype: type[np.float32], out: None = None) -> _Float32Speech: ...
+    @overload
+    def get_generated_speech(self, dtype: type[np.int16], out: None = None) -> _Int16Speech: ...
+    @overload
+    def get_generated_speech(
+        self, dtype: type[np.float64] | None = None, *, out: _Float64Speech
+    ) -> _Float64Speech: ...
+    @overload
+    def get_generated_speech(
+        self, dtype: type[np.float32] | None = None, *, out: _Float32Speech
+    ) -> _Float32Speech: ...
+    @overload
+    def get_generated_speech(
+        self, dtype: type[np.int16] | None = None, *, out: _Int16Speech
+    ) -> _Int16Speech: ...
+    @overload
+    def get_generated_speech(
+        self,
+        dtype: np.dtype[Any] | type | None = None,
+        out: _Float64Speech | _Float32Speech | _Int16Speech | None = None,
+    ) -> _Float64Speech | _Float32Speech | _Int16Speech:
         """
         合成済み音声波形を取得する。
         synthesize_from_strings() 実行後に呼び出す。
         取得後は refresh() で内部バッファをクリアすること。
+        エンジン内部の波形バッファから GIL を解放したまま一括でコピーする。
+
+        Args:
+            dtype (np.dtype | type | None): 返す波形の dtype。np.float64 / np.float32 / np.int16 のいずれか
+                np.int16 の場合は 16bit PCM の範囲にクリップして丸める
+                None の場合は out の dtype、out も None の場合は np.float64 を使う (デフォルト: None)
+            out (np.ndarray | None): 波形の書き込み先となる1次元の C 連続な配列
+                合成済みのサンプル数以上の長さが必要で、先頭から書き込む。None の場合は新たに確保する (デフォルト: None)
 
         Returns:
-            np.ndarray: 音声波形 (dtype: np.float64)
+            np.ndarray: 音声波形。out を指定した場合は、out の先頭からサンプル数分のビュー
+
+        Raises:
+            ValueError: 対応していない dtype が指定された場合、または out の dtype・形状・長さが不正な場合
         """
         ...
 
@@ -5,7 +5,7 @@
 # cython: language_level=3
 # pyright: reportGeneralTypeIssues=false
 
-from collections.abc import Callable
+from collections.abc import Callable, Generator
 from functools import wraps
 from threading import RLock
 from typing import Concatenate, ParamSpec, TypeVar
@@ -13,11 +13,15 @@ from typing import Concatenate, ParamSpec, TypeVar
 import numpy as np
 from numpy.typing import NDArray
 
+from .profiling import stage as _profiling_stage
+
 cimport numpy as np
 np.import_array()
 
 cimport cython
+from libc.math cimport rint
 from libc.stdlib cimport malloc, free
+from libc.string cimport memcpy
 
 from .htsengine cimport HTS_Engine
 from .htsengine cimport (
@@ -25,9 +29,12 @@ from .htsengine cimport (
     HTS_Engine_get_sampling_frequency, HTS_Engine_get_fperiod,
     HTS_Engine_set_speed, HTS_Engine_add_half_tone,
     HTS_Engine_synthesize_from_strings,
-    HTS_Engine_get_generated_speech, HTS_Engine_get_nsamples
+    HTS_Engine_get_nsamples
 )
 
+# get_generated_speech() が出力できる波形の dtype
+_SUPPORTED_SPEECH_DTYPES = (np.dtype(np.float64), np.dtype(np.float32), np.dtype(np.int16))
+
 P = ParamSpec("P")
 R = TypeVar("R")
 Self = TypeVar("Self")
@@ -53,6 +60,34 @@ def _generate_lock_manager() -> Callable[
     return decorator
 
 
+def _split_labels_at_pauses(
+    labels: list[str] | list[bytes] | list[bytearray],
+) -> list[list[str] | list[bytes] | list[bytearray]]:
+    """
+    フルコンテキストラベル列を、文中のポーズ (pau) の直後で区切ったセグメントのリストに分割する。
+    pau は直前のセグメントの末尾に含め、ポーズ長が変わらないよう後続のセグメントには複製しない。
+
+    Args:
+        labels (list[str] | list[bytes] | list[bytearray]): フルコンテキストラベル文字列のリスト
+
+    Returns:
+        list: セグメントごとのフルコンテキストラベルのリスト。pau を含まない場合は要素数1、ラベルが空の場合は空のリスト
+    """
+    segments = []
+    # 空のラベル列は HTS Engine で合成できないため、セグメントを作らない
+    if len(labels) == 0:
+        return segments
+    start = 0
+    for index, label in enumerate(labels):
+        # 当該音素 (p3) は "-" と "+" に挟まれている
+        is_pause = ("-pau+" if isinstance(label, str) else b"-pau+") in label
+        if is_pause is True and index + 1 < len(labels):
+            segments.append(labels[start : index + 1])
+            start = index + 1
+    segments.append(labels[start:])
+    return segments
+
+
 cdef class HTSEngine:
     """
     HTS 音声合成エンジンの Cython 実装。フルコンテキストラベルから波形を生成する。
@@ -138,8 +173,10 @@ cdef class HTSEngine:
 
     @_lock_manager
     def synthesize(
-        self, labels: list[str] | list[bytes] | list[bytearray]
-    ) -> NDArray[np.float64]:
+        self,
+        labels: list[str] | list[bytes] | list[bytearray],
+        dtype: np.dtype | type = np.float64,
+    ) -> NDArray[np.float64] | NDArray[np.float32] | NDArray[np.int16]:
         """
         フルコンテキストラベルから音声波形を合成する。
         synthesize_from_strings() を呼び出し、生成された波形を返す。
@@ -147,15 +184,49 @@ cdef class HTSEngine:
 
         Args:
             labels (list[str] | list[bytes] | list[bytearray]): フルコンテキストラベル文字列のリスト
+            dtype (np.dtype | type): 返す波形の dtype。np.float64 / np.float32 / np.int16 のいずれか
+                np.int16 の場合は 16bit PCM の範囲にクリップして丸める (デフォルト: np.float64)
 
         Returns:
-            np.ndarray: 音声波形 (dtype: np.float64)
+            np.ndarray: 音声波形
+
+        Raises:
+            ValueError: 対応していない dtype が指定された場合
         """
-        self.synthesize_from_strings(labels)
-        x = self.get_generated_speech()
-        self.refresh()
+        with _profiling_stage("htsengine"):
+            self.synthesize_from_strings(labels)
+            try:
+                x = self.get_generated_speech(dtype=dtype)
+            finally:
+                self.refresh()
         return x
 
+    def synthesize_stream(
+        self,
+        labels: list[str] | list[bytes] | list[bytearray],
+        dtype: np.dtype | type = np.float64,
+    ) -> Generator[NDArray[np.float64] | NDArray[np.float32] | NDArray[np.int16], None, None]:
+        """
+        フルコンテキストラベルを文中のポーズ (pau) ごとのセグメントに分けて順に合成し、
+        各セグメントの音声波形を合成し終えた時点で返す。
+        全体の合成を待たずに先頭のセグメントから再生を始められる。
+        話速と半音はセグメント間で維持されるため、呼び出し前に set_speed() / add_half_tone() で設定しておく。
+
+        Args:
+            labels (list[str] | list[bytes] | list[bytearray]): フルコンテキストラベル文字列のリスト
+            dtype (np.dtype | type): 返す波形の dtype。np.float64 / np.float32 / np.int16 のいずれか (デフォルト: np.float64)
+
+        Returns:
+            Generator[np.ndarray, None, None]: セグメントごとの音声波形を返すジェネレータ
+
+        NOTE:
+            セグメントの合成ごとに排他ロックを取得・解放するため、ジェネレータの消費中も他のスレッドから利用できる
+            ただし、他のスレッドが話速や半音を変更すると後続のセグメントに反映される
+            セグメント境界のポーズ前後では HTS のパラメータ生成が分かれるため、synthesize() の波形とは完全には一致しない
+        """
+        for segment in _split_labels_at_pauses(labels):
+            yield self.synthesize(segment, dtype=dtype)
+
     @_lock_manager
     def synthesize_from_strings(
         self, labels: list[str] | list[bytes] | list[bytearray]
@@ -193,22 +264,75 @@ cdef class HTSEngine:
             raise RuntimeError("Failed to run synthesize_from_strings")
 
     @_lock_manager
-    def get_generated_speech(self) -> NDArray[np.float64]:
+    def get_generated_speech(
+        self,
+        dtype: np.dtype | type | None = None,
+        out: NDArray[np.float64] | NDArray[np.float32] | NDArray[np.int16] | None = None,
+    ) -> NDArray[np.float64] | NDArray[np.float32] | NDArray[np.int16]:
         """
         合成済み音声波形を取得する。
         synthesize_from_strings() 実行後に呼び出す。
         取得後は refresh() で内部バッファをクリアすること。
+        エンジン内部の波形バッファから GIL を解放したまま一括でコピーする。
+
+        Args:
+            dtype (np.dtype | type | None): 返す波形の dtype。np.float64 / np.float32 / np.int16 のいずれか
+                np.int16 の場合は 16bit PCM の範囲にクリップして丸める
+                None の場合は out の dtype、out も None の場合は np.float64 を使う (デフォルト: None)
+            out (np.ndarray | None): 波形の書き込み先となる1次元の C 連続な配列
+                合成済みのサンプル数以上の長さが必要で、先頭から書き込む。None の場合は新たに確保する (デフォルト: None)
 
         Returns:
-            np.ndarray: 音声波形 (dtype: np.float64)
+            np.ndarray: 音声波形。out を指定した場合は、out の先頭からサンプル数分のビュー
+
+        Raises:
+            ValueError: 対応していない dtype が指定された場合、または out の dtype・形状・長さが不正な場合
         """
         cdef size_t nsamples = HTS_Engine_get_nsamples(self.engine)
-        cdef np.ndarray speech = np.empty([nsamples], dtype=np.float64)
-        cdef double[:] speech_view = speech
+        cdef const double* source = self.engine.gss.gspeech
+        cdef double[::1] float64_view
+        cdef float[::1] float32_view
+        cdef np.int16_t[::1] int16_view
+        cdef double sample
         cdef size_t index
-        with (nogil, cython.boundscheck(False)):
-            for index in range(nsamples):
-                speech_view[index] = HTS_Engine_get_generated_speech(self.engine, index)
+
+        if dtype is None:
+            dtype = np.float64 if out is None else out.dtype
+        dtype = np.dtype(dtype)
+        if dtype not in _SUPPORTED_SPEECH_DTYPES:
+            raise ValueError(f"Unsupported speech dtype: {dtype}")
+        if out is None:
+            out = np.empty(nsamples, dtype=dtype)
+        elif out.dtype != dtype:
+            raise ValueError(f"Output buffer dtype {out.dtype} does not match {dtype}")
+        elif out.ndim != 1 or <size_t>out.shape[0] < nsamples:
+            raise ValueError(
+                f"Output buffer must be a 1-D array of at least {nsamples} samples: {out.shape}"
+            )
+        speech = out[:nsamples]
+        # 合成前やバッファ解放後はサンプルが存在しない
+        if nsamples == 0 or source == NULL:
+            return speech
+
+        if dtype == np.float64:
+            float64_view = speech
+            with nogil:
+                memcpy(&float64_view[0], source, nsamples * sizeof(double))
+        elif dtype == np.float32:
+            float32_view = speech
+            with (nogil, cython.boundscheck(False), cython.wraparound(False)):
+                for index in range(nsamples):
+                    float32_view[index] = <float>source[index]
+        else:
+            int16_view = speech
+            with (nogil, cython.boundscheck(False), cython.wraparound(False)):
+                for index in range(nsamples):
+                    sample = rint(source[index])
+                    if sample > 32767.0:
+                        sample = 32767.0
+                    elif sample < -32768.0:
+                        sample = -32768.0
+                    int16_view[index] = <np.int16_t>sample
         return speech
 
     @_lock_manager
@@ -3,8 +3,12 @@
 
 
 cdef extern from "HTS_engine.h":
+    ctypedef struct HTS_GStreamSet:
+        size_t total_nsample
+        double *gspeech
+
     cdef cppclass _HTS_Engine:
-        pass
+        HTS_GStreamSet gss
     ctypedef _HTS_Engine HTS_Engine
 
     void HTS_Engine_initialize(HTS_Engine * engine)
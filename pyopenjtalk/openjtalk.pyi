@@ -6,7 +6,33 @@ from threading import Lock
 from .types import JPCommonMappingEntry, MeCabMorph, MeCabNBestPath, NJDFeature
 from .tsqyomi.types import ReadingAnalysis
 
+_TEXT2MECAB_BUFFER_SIZE: int  # text2mecab() 出力バッファのバイト数 (終端の NUL を含む)
+
+class MeCabModel:
+    dn_mecab: bytes  # 読み込んだ MeCab システム辞書のディレクトリパス
+    userdic: bytes  # 読み込んだユーザー辞書のパス (カンマ区切り)。未指定時は空バイト列
+
+    def __init__(self, dn_mecab: bytes = b"/usr/local/dic", userdic: bytes = b"") -> None:
+        """
+        読み込み済みの MeCab 辞書 (システム辞書・ユーザー辞書・連接コスト表) を保持する。
+        同じ辞書を使う複数の `OpenJTalk` インスタンスへ渡すと、辞書を1回だけ読み込んで共有できる。
+
+        Args:
+            dn_mecab (bytes): MeCab システム辞書のディレクトリパス
+            userdic (bytes): OpenJTalk 用ユーザー辞書 (.dic) のパス。空バイト列の場合は無視される。複数指定時はカンマ区切り。デフォルト: 空
+
+        Raises:
+            RuntimeError: MeCab 辞書の読み込みに失敗した場合
+
+        NOTE:
+            MeCab Model は解析中に変更されない読み取り専用の状態のみを持つため、複数スレッドから共有できる
+            解析ごとに変化する Tagger / Lattice は、`OpenJTalk` インスタンスごとに Model から生成される
+        """
+        pass
+
 class OpenJTalk:
+    mecab_model: MeCabModel  # このインスタンスが参照する読み込み済みの MeCab 辞書
+    userdic_reading_protection: tuple[bool, ...]  # ユーザー辞書ごとの tsqyomi 読み保護フラグ
     _lock: Lock  # 同一インスタンスの呼び出しを直列化する内部実装用ロック
 
     def __init__(
@@ -14,6 +40,7 @@ class OpenJTalk:
         dn_mecab: bytes = b"/usr/local/dic",
         userdic: bytes = b"",
         userdic_reading_protection: Sequence[bool] | None = None,
+        mecab_model: MeCabModel | None = None,
     ) -> None:
         """
         OpenJTalk のテキスト処理フロントエンドの Cython 実装。
@@ -24,6 +51,8 @@ class OpenJTalk:
             userdic (bytes): OpenJTalk 用ユーザー辞書 (.dic) のパス。空バイト列の場合は無視される。複数指定時はカンマ区切り。デフォルト: 空
             userdic_reading_protection (Sequence[bool] | None): 各ユーザー辞書の読み候補を tsqyomi による MeCab feature 差し替えから保護するか
                 None の場合は全辞書を未保護として扱う。デフォルト: None
+            mecab_model (MeCabModel | None): 他のインスタンスと共有する読み込み済みの MeCab 辞書
+                指定時は `dn_mecab` / `userdic` を無視し、`mecab_model` の辞書を使う。None の場合は辞書を新たに読み込む。デフォルト: None
 
         Raises:
             ValueError: `userdic_reading_protection` の要素数が辞書数と一致しない場合
@@ -33,6 +62,7 @@ class OpenJTalk:
         NOTE:
             公開メソッドは `@_lock_manager()` で直列化される。`Mecab` / `NJD` / `JPCommon` はインスタンス内で共有される
             `Mecab_refresh()` は Python 側の `try/finally` から呼び出し、Lattice ノード走査後に MeCab 内部状態を解放する
+            読み取り専用の MeCab Model は `mecab_model` 属性として公開され、同じ辞書を使うインスタンス間で共有できる
         """
         pass
 
@@ -157,6 +187,32 @@ class OpenJTalk:
         """
         pass
 
+    def run_frontend_batch(
+        self,
+        texts: Iterable[str | bytes | bytearray],
+        return_exceptions: bool = False,
+    ) -> list[list[NJDFeature] | Exception]:
+        """
+        複数のテキストに対して OpenJTalk のテキスト処理フロントエンドを順に実行する。
+        各テキストの結果は run_frontend() と同一で、入力と同じ順序で返される。
+
+        Args:
+            texts (Iterable[str | bytes | bytearray]): 入力テキストの列 (str の場合は UTF-8 にエンコードされる)
+            return_exceptions (bool): True の場合、失敗したテキストの位置に例外オブジェクトを格納して残りの処理を続ける
+                False の場合は最初に失敗したテキストの例外をそのまま送出する。デフォルト: False
+
+        Returns:
+            list[list[NJDFeature] | Exception]: 入力順の NJDNode 用 features (return_exceptions=True の場合は例外を含む)
+
+        NOTE:
+            インスタンスロックの取得はバッチ全体で1回だけ行い、text2mecab() の正規化バッファと
+            mecab2njd() へ渡すポインタ配列をテキスト間で再利用する
+            MeCab が返す feature は常に str で null 文字を含まないため、run_njd_from_mecab() の入力検証も省略する
+            処理中は同じインスタンスの他の呼び出しを待たせるため、別スレッドと共有するインスタンスでは
+            巨大なバッチを避けること
+        """
+        pass
+
     def run_frontend_detailed(
         self, text: str | bytes | bytearray
     ) -> tuple[list[NJDFeature], list[MeCabMorph]]:
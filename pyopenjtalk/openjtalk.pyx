@@ -12,6 +12,7 @@ import numpy as np
 from collections.abc import Callable, Sequence
 from functools import wraps
 from threading import Lock
+from time import perf_counter
 from typing import Concatenate, Iterable, ParamSpec, TypeVar
 
 from .types import (
@@ -32,13 +33,15 @@ cimport numpy as np
 np.import_array()
 
 from ._known_symbols import KNOWN_SYMBOL_FEATURES
+from . import profiling as _profiling
+from .profiling import stage as _profiling_stage
 
 from libc.limits cimport LONG_MAX
 from libc.stdlib cimport calloc
 from libc.string cimport strlen
 from libc.stdint cimport *
 
-from .openjtalk.mecab cimport Mecab, Mecab_initialize, Mecab_load, Mecab_analysis
+from .openjtalk.mecab cimport Mecab, Mecab_initialize, Mecab_analysis
 from .openjtalk.mecab cimport Mecab_get_feature, Mecab_get_size, Mecab_refresh, Mecab_clear
 from .openjtalk.mecab cimport createModel, Model, Tagger, Lattice
 from .openjtalk.mecab cimport mecab_dict_index as _mecab_dict_index
@@ -86,6 +89,10 @@ from .openjtalk.njd2jpcommon cimport njd2jpcommon
 
 DEF TEXT2MECAB_BUFFER_SIZE = 16384
 
+# Python 側から参照するための text2mecab() 出力バッファのバイト数
+## 長文を分割する pyopenjtalk.run_frontend() などが、分割後の各部分の上限として使う
+_TEXT2MECAB_BUFFER_SIZE = TEXT2MECAB_BUFFER_SIZE
+
 _NON_PAUSE_SYMBOLS = frozenset((
     "「", "」", "『", "』", "（", "）", "(", ")",
     "【", "】", "［", "］", "[", "]", "〈", "〉",
@@ -647,52 +654,130 @@ cdef object _mecab_node_to_cost_candidate(
 
 
 # based on Mecab_load in impl. from mecab.cpp
-cdef inline int Mecab_load_with_userdic(Mecab *m, char* dicdir, char* userdic) noexcept nogil:
+cdef inline Model* Mecab_create_model(char* dicdir, char* userdic) noexcept nogil:
     """
-    システム辞書とユーザー辞書 (カンマ区切り複数可) を読み込み、MeCab Model / Tagger / Lattice を初期化する。
+    システム辞書とユーザー辞書 (カンマ区切り複数可) を読み込んだ MeCab Model を生成する。
 
     Args:
-        m (Mecab*): 初期化対象の OpenJTalk MeCab ラッパ
         dicdir (char*): システム辞書ディレクトリ
-        userdic (char*): ユーザー辞書パス。空文字列なら `Mecab_load()` のみ実行
+        userdic (char*): ユーザー辞書パス。空文字列ならシステム辞書のみ読み込む
 
     Returns:
-        int: 成功時 1、失敗時 0
+        Model*: 成功時は生成した Model、失敗時は NULL
     """
-    if userdic == NULL or strlen(userdic) == 0:
-        return Mecab_load(m, dicdir)
-
-    if m == NULL or dicdir == NULL or strlen(dicdir) == 0:
-        return 0
-
-    Mecab_clear(m)
+    if dicdir == NULL or strlen(dicdir) == 0:
+        return NULL
 
     cdef char* argv[5]
+    cdef int argc = 3
     argv[0] = "mecab"
     argv[1] = "-d"
     argv[2] = dicdir
-    argv[3] = "-u"
-    argv[4] = userdic
-    cdef Model *model = createModel(5, argv)
+    if userdic != NULL and strlen(userdic) > 0:
+        argv[3] = "-u"
+        argv[4] = userdic
+        argc = 5
+    return createModel(argc, argv)
+
+
+cdef inline void Mecab_detach_model(Mecab *m) noexcept nogil:
+    """
+    共有 Model を解放せずに、OpenJTalk MeCab ラッパが所有する Tagger / Lattice と解析結果を解放する。
+
+    Args:
+        m (Mecab*): 解放対象の OpenJTalk MeCab ラッパ
+    """
+    # Model は MeCabModel が所有し他のインスタンスと共有するため、Mecab_clear() の delete 対象から外す
+    m.model = NULL
+    Mecab_clear(m)
 
-    if model == NULL:
+
+cdef inline int Mecab_attach_model(Mecab *m, Model *model) noexcept nogil:
+    """
+    読み込み済みの MeCab Model から Tagger / Lattice を生成し、OpenJTalk MeCab ラッパへ設定する。
+
+    Args:
+        m (Mecab*): 初期化対象の OpenJTalk MeCab ラッパ
+        model (Model*): `MeCabModel` が所有する読み込み済みの Model
+
+    Returns:
+        int: 成功時 1、失敗時 0
+
+    NOTE:
+        `m.model` には所有権を持たない参照を設定する。`Mecab_clear()` に Model を解放させないよう、
+        解放時は `Mecab_detach_model()` で先に参照を外す必要がある
+    """
+    if m == NULL or model == NULL:
         return 0
+
+    Mecab_detach_model(m)
     m.model = model
 
     cdef Tagger *tagger = model.createTagger()
     if tagger == NULL:
-        Mecab_clear(m)
+        Mecab_detach_model(m)
         return 0
     m.tagger = tagger
 
     cdef Lattice *lattice = model.createLattice()
     if lattice == NULL:
-        Mecab_clear(m)
+        Mecab_detach_model(m)
         return 0
     m.lattice = lattice
 
     return 1
 
+
+cdef class MeCabModel:
+    """
+    読み込み済みの MeCab 辞書 (システム辞書・ユーザー辞書・連接コスト表) を保持する。
+    同じ辞書を使う複数の `OpenJTalk` インスタンスへ渡すと、辞書を1回だけ読み込んで共有できる。
+
+    Args:
+        dn_mecab (bytes): MeCab システム辞書のディレクトリパス
+        userdic (bytes): OpenJTalk 用ユーザー辞書 (.dic) のパス。空バイト列の場合は無視される。複数指定時はカンマ区切り。デフォルト: 空
+
+    Raises:
+        RuntimeError: MeCab 辞書の読み込みに失敗した場合
+
+    NOTE:
+        MeCab Model は解析中に変更されない読み取り専用の状態のみを持つため、複数スレッドから共有できる
+        解析ごとに変化する Tagger / Lattice は、`OpenJTalk` インスタンスごとに Model から生成される
+    """
+    cdef Model* model
+    cdef readonly bytes dn_mecab
+    cdef readonly bytes userdic
+
+    def __cinit__(self, dn_mecab: bytes = b"/usr/local/dic", userdic: bytes = b""):
+        """
+        読み込み済みの MeCab 辞書 (システム辞書・ユーザー辞書・連接コスト表) を保持する。
+
+        Args:
+            dn_mecab (bytes): MeCab システム辞書のディレクトリパス
+            userdic (bytes): OpenJTalk 用ユーザー辞書 (.dic) のパス。空バイト列の場合は無視される。複数指定時はカンマ区切り。デフォルト: 空
+
+        Raises:
+            RuntimeError: MeCab 辞書の読み込みに失敗した場合
+        """
+        cdef char* _dn_mecab = dn_mecab
+        cdef char* _userdic = userdic
+
+        self.model = NULL
+        self.dn_mecab = dn_mecab
+        self.userdic = userdic
+        with nogil:
+            self.model = Mecab_create_model(_dn_mecab, _userdic)
+        if self.model == NULL:
+            raise RuntimeError("Failed to initialize Mecab")
+
+    def __dealloc__(self) -> None:
+        """
+        MeCab Model を解放する。
+        """
+        if self.model != NULL:
+            del self.model
+            self.model = NULL
+
 P = ParamSpec("P")
 R = TypeVar("R")
 Self = TypeVar("Self")
@@ -708,13 +793,31 @@ def _lock_manager() -> Callable[[Callable[Concatenate[Self, P], R]], Callable[Co
     NOTE:
         `Mecab` / `NJD` / `JPCommon` はインスタンス内で共有されるため、同一インスタンスへの同時呼び出しは安全でない
         ロックはインスタンスごとに分離され、別インスタンスの `nogil` 区間は並行実行できる
+        `profiling.set_lock_metrics_enabled(True)` の間は、全インスタンスのロックの待ち時間と保持時間を
+        `profiling.openjtalk_lock_metrics` にまとめて記録する
     """
 
     def decorator(method: Callable[Concatenate[Self, P], R]) -> Callable[Concatenate[Self, P], R]:
         @wraps(method)
         def wrapped(self: Self, *args: P.args, **kwargs: P.kwargs) -> R:
-            with self._lock:
+            if _profiling.is_lock_metrics_enabled() is False:
+                with self._lock:
+                    return method(self, *args, **kwargs)
+
+            # 計測時は、待機せずに取得できたかで競合を判定してから、待ち時間と保持時間を記録する
+            request_time = perf_counter()
+            is_contended = self._lock.acquire(blocking=False) is False
+            if is_contended is True:
+                self._lock.acquire()
+            acquire_time = perf_counter()
+            _profiling.openjtalk_lock_metrics.record_acquire(
+                acquire_time - request_time, is_contended
+            )
+            try:
                 return method(self, *args, **kwargs)
+            finally:
+                self._lock.release()
+                _profiling.openjtalk_lock_metrics.record_release(perf_counter() - acquire_time)
 
         return wrapped
 
@@ -731,6 +834,8 @@ cdef class OpenJTalk:
         userdic (bytes): OpenJTalk 用ユーザー辞書 (.dic) のパス。空バイト列の場合は無視される。複数指定時はカンマ区切り。デフォルト: 空
         userdic_reading_protection (Sequence[bool] | None): 各ユーザー辞書の読み候補を tsqyomi による MeCab feature 差し替えから保護するか
             None の場合は全辞書を未保護として扱う。デフォルト: None
+        mecab_model (MeCabModel | None): 他のインスタンスと共有する読み込み済みの MeCab 辞書
+            指定時は `dn_mecab` / `userdic` を無視し、`mecab_model` の辞書を使う。None の場合は辞書を新たに読み込む。デフォルト: None
 
     Raises:
         ValueError: `userdic_reading_protection` の要素数が辞書数と一致しない場合
@@ -740,11 +845,13 @@ cdef class OpenJTalk:
     NOTE:
         公開メソッドは `@_lock_manager()` で直列化される。`Mecab` / `NJD` / `JPCommon` はインスタンス内で共有される
         `Mecab_refresh()` は Python 側の `try/finally` から呼び出し、Lattice ノード走査後に MeCab 内部状態を解放する
+        読み取り専用の MeCab Model は `mecab_model` 属性として公開され、同じ辞書を使うインスタンス間で共有できる
     """
     cdef Mecab* mecab
     cdef NJD* njd
     cdef JPCommon* jpcommon
-    cdef tuple userdic_reading_protection
+    cdef readonly tuple userdic_reading_protection
+    cdef readonly MeCabModel mecab_model
     cdef readonly object _lock
 
     def __cinit__(
@@ -752,6 +859,7 @@ cdef class OpenJTalk:
         dn_mecab: bytes = b"/usr/local/dic",
         userdic: bytes = b"",
         userdic_reading_protection: Sequence[bool] | None = None,
+        mecab_model: MeCabModel | None = None,
     ):
         """
         OpenJTalk のテキスト処理フロントエンドの Cython 実装。
@@ -762,6 +870,8 @@ cdef class OpenJTalk:
             userdic (bytes): OpenJTalk 用ユーザー辞書 (.dic) のパス。空バイト列の場合は無視される。複数指定時はカンマ区切り。デフォルト: 空
             userdic_reading_protection (Sequence[bool] | None): 各ユーザー辞書の読み候補を tsqyomi による MeCab feature 差し替えから保護するか
                 None の場合は全辞書を未保護として扱う。デフォルト: None
+            mecab_model (MeCabModel | None): 他のインスタンスと共有する読み込み済みの MeCab 辞書
+                指定時は `dn_mecab` / `userdic` を無視し、`mecab_model` の辞書を使う。None の場合は辞書を新たに読み込む。デフォルト: None
 
         Raises:
             ValueError: `userdic_reading_protection` の要素数が辞書数と一致しない場合
@@ -771,17 +881,21 @@ cdef class OpenJTalk:
         NOTE:
             公開メソッドは `@_lock_manager()` で直列化される。`Mecab` / `NJD` / `JPCommon` はインスタンス内で共有される
             `Mecab_refresh()` は Python 側の `try/finally` から呼び出し、Lattice ノード走査後に MeCab 内部状態を解放する
+            読み取り専用の MeCab Model は `mecab_model` 属性として公開され、同じ辞書を使うインスタンス間で共有できる
         """
-        cdef char* _dn_mecab = dn_mecab
-        cdef char* _userdic = userdic
         cdef tuple protection_flags
         cdef Py_ssize_t userdic_count
+        cdef Model* model
 
         # 引数検証で例外になっても __dealloc__() が未初期化ポインタを解放しないよう先に NULL を設定する
         self.mecab = NULL
         self.njd = NULL
         self.jpcommon = NULL
 
+        # 共有 Model 指定時は、保護フラグを Model が実際に読み込んだユーザー辞書と対応させる
+        if mecab_model is not None:
+            userdic = mecab_model.userdic
+
         # 低レベル API のカンマ区切り辞書と同じ順序で保護状態を固定する
         userdic_count = 0 if len(userdic) == 0 else len(userdic.split(b","))
         if userdic_reading_protection is None:
@@ -796,6 +910,12 @@ cdef class OpenJTalk:
                 raise TypeError("userdic_reading_protection entries must be bool")
         self.userdic_reading_protection = protection_flags
 
+        # 辞書の読み込みは最も重い初期化処理のため、共有 Model がなければここで1回だけ読み込む
+        if mecab_model is None:
+            mecab_model = MeCabModel(dn_mecab, userdic)
+        self.mecab_model = mecab_model
+        model = self.mecab_model.model
+
         # 排他範囲をインスタンス内へ限定し、異なる辞書を使う処理同士も並行実行できるようにする
         self._lock = Lock()
         self.mecab = new Mecab()
@@ -807,7 +927,7 @@ cdef class OpenJTalk:
             NJD_initialize(self.njd)
             JPCommon_initialize(self.jpcommon)
 
-            r = self._load(_dn_mecab, _userdic)
+            r = self._load(model)
             if r != 1:
                 self._clear()
         if r != 1:
@@ -819,20 +939,20 @@ cdef class OpenJTalk:
         C Wrapper 自体は解放しない。
         """
         if self.mecab != NULL:
-            Mecab_clear(self.mecab)
+            Mecab_detach_model(self.mecab)
         if self.njd != NULL:
             NJD_clear(self.njd)
         if self.jpcommon != NULL:
             JPCommon_clear(self.jpcommon)
 
-    cdef int _load(self, char* dn_mecab, char* userdic) noexcept nogil:
+    cdef int _load(self, Model* model) noexcept nogil:
         """
-        `Mecab_load_with_userdic()` へ委譲して辞書をロードする。
+        `Mecab_attach_model()` へ委譲して、読み込み済みの辞書からインスタンス固有の Tagger / Lattice を生成する。
 
         Returns:
             int: 成功時 1、失敗時 0
         """
-        return Mecab_load_with_userdic(self.mecab, dn_mecab, userdic)
+        return Mecab_attach_model(self.mecab, model)
 
     def normalize_for_mecab(self, text: str | bytes | bytearray) -> str:
         """
@@ -853,8 +973,9 @@ cdef class OpenJTalk:
         if isinstance(text, str):
             text = text.encode("utf-8")
         cdef const char* _text = text
-        with nogil:
-            text2mecab_result = text2mecab(buff, TEXT2MECAB_BUFFER_SIZE, _text)
+        with _profiling_stage("text2mecab"):
+            with nogil:
+                text2mecab_result = text2mecab(buff, TEXT2MECAB_BUFFER_SIZE, _text)
         if text2mecab_result != 0:
             if text2mecab_result == TEXT2MECAB_RESULT_INVALID_ARGUMENT:
                 raise RuntimeError("Invalid arguments for text2mecab")
@@ -880,13 +1001,27 @@ cdef class OpenJTalk:
             全トークンが必要な場合は `_run_mecab_detailed()` を使うこと
         """
         cdef char buff[TEXT2MECAB_BUFFER_SIZE]
+        return self._run_mecab_with_buffer(text, buff)
+
+    cdef list _run_mecab_with_buffer(self, object text, char* buff):
+        """
+        呼び出し元が確保した正規化バッファを使って `_run_mecab()` と同じ解析を行う。
+
+        Args:
+            text (str | bytes | bytearray): 入力テキスト (str の場合は UTF-8 にエンコードされる)
+            buff (char*): `TEXT2MECAB_BUFFER_SIZE` バイト以上の `text2mecab()` 出力バッファ
+
+        Returns:
+            list[str]: MeCab の feature 文字列のリスト ("記号,空白" を除く)
+        """
         if isinstance(text, str):
             text = text.encode("utf-8")
 
         cdef const char* _text = text
         cdef int result
-        with nogil:
-            result = text2mecab(buff, TEXT2MECAB_BUFFER_SIZE, _text)
+        with _profiling_stage("text2mecab"):
+            with nogil:
+                result = text2mecab(buff, TEXT2MECAB_BUFFER_SIZE, _text)
         if result != 0:
             if result == TEXT2MECAB_RESULT_INVALID_ARGUMENT:
                 raise RuntimeError("Invalid arguments for text2mecab")
@@ -897,11 +1032,12 @@ cdef class OpenJTalk:
         cdef int morph_size
         cdef char** mecab_morphs
         cdef int analysis_result
-        with nogil:
-            analysis_result = Mecab_analysis(self.mecab, buff)
+        with _profiling_stage("mecab_analysis"):
+            with nogil:
+                analysis_result = Mecab_analysis(self.mecab, buff)
 
-            morph_size = Mecab_get_size(self.mecab)
-            mecab_morphs = Mecab_get_feature(self.mecab)
+                morph_size = Mecab_get_size(self.mecab)
+                mecab_morphs = Mecab_get_feature(self.mecab)
         try:
             if analysis_result != 1:
                 raise RuntimeError("Failed to run MeCab analysis")
@@ -971,8 +1107,9 @@ cdef class OpenJTalk:
 
         cdef const char* _text = text
         cdef int result
-        with nogil:
-            result = text2mecab(buff, TEXT2MECAB_BUFFER_SIZE, _text)
+        with _profiling_stage("text2mecab"):
+            with nogil:
+                result = text2mecab(buff, TEXT2MECAB_BUFFER_SIZE, _text)
         if result != 0:
             if result == TEXT2MECAB_RESULT_INVALID_ARGUMENT:
                 raise RuntimeError("Invalid arguments for text2mecab")
@@ -984,10 +1121,11 @@ cdef class OpenJTalk:
         byte_to_char_offsets = _build_byte_to_char_offsets(sentence_bytes)
 
         # Mecab_analysis() で解析を実行
-        with nogil:
-            analysis_result = Mecab_analysis(self.mecab, buff)
-            morph_size = Mecab_get_size(self.mecab)
-            mecab_feature_array = Mecab_get_feature(self.mecab)
+        with _profiling_stage("mecab_analysis"):
+            with nogil:
+                analysis_result = Mecab_analysis(self.mecab, buff)
+                morph_size = Mecab_get_size(self.mecab)
+                mecab_feature_array = Mecab_get_feature(self.mecab)
         try:
             if analysis_result != 1:
                 raise RuntimeError("Failed to run MeCab analysis")
@@ -1095,8 +1233,9 @@ cdef class OpenJTalk:
         if isinstance(text, str):
             text = text.encode("utf-8")
         _text = text
-        with nogil:
-            result = text2mecab(buff, TEXT2MECAB_BUFFER_SIZE, _text)
+        with _profiling_stage("text2mecab"):
+            with nogil:
+                result = text2mecab(buff, TEXT2MECAB_BUFFER_SIZE, _text)
         if result != 0:
             if result == TEXT2MECAB_RESULT_INVALID_ARGUMENT:
                 raise RuntimeError("Invalid arguments for text2mecab")
@@ -1248,8 +1387,9 @@ cdef class OpenJTalk:
             text = text.encode("utf-8")
 
         _text = text
-        with nogil:
-            text2mecab_result = text2mecab(buff, TEXT2MECAB_BUFFER_SIZE, _text)
+        with _profiling_stage("text2mecab"):
+            with nogil:
+                text2mecab_result = text2mecab(buff, TEXT2MECAB_BUFFER_SIZE, _text)
         if text2mecab_result != 0:
             if text2mecab_result == TEXT2MECAB_RESULT_INVALID_ARGUMENT:
                 raise RuntimeError("Invalid arguments for text2mecab")
@@ -1492,8 +1632,7 @@ cdef class OpenJTalk:
             成否にかかわらず `NJD_refresh()` で C 側メモリを解放する
         """
         # if empty list, return empty list
-        new_size = len(mecab_features)
-        if new_size == 0:
+        if len(mecab_features) == 0:
             return []
 
         for mecab_feature in mecab_features:
@@ -1502,30 +1641,51 @@ cdef class OpenJTalk:
             if "\x00" in mecab_feature:
                 raise ValueError("MeCab feature must not contain null characters")
 
+        return self._run_njd_from_validated_mecab(
+            mecab_features, np.empty(len(mecab_features), dtype=np.uint64)
+        )
+
+    cdef list _run_njd_from_validated_mecab(self, list mecab_features, np.ndarray pointer_buffer):
+        """
+        検証済みの MeCab feature 列から `_run_njd_from_mecab()` と同じ NJD 処理を行う。
+
+        Args:
+            mecab_features (list[str]): 型と null 文字を検証済みの MeCab feature 文字列のリスト
+            pointer_buffer (np.ndarray): 要素数が mecab_features 以上の uint64 配列。feature 文字列へのポインタ列に使う
+
+        Returns:
+            list[NJDFeature]: NJD 処理後の features
+        """
+        cdef int new_size = len(mecab_features)
+        if new_size == 0:
+            return []
+
         byte_morphs = [m.encode("utf-8") + b"\x00" for m in mecab_features]
-        int_morphs = np.zeros(len(byte_morphs), dtype=np.uint64)
+        cdef uint64_t[:] cint_morphs = pointer_buffer
         for i in range(new_size):
-            int_morphs[i] = <uint64_t>(<char *>byte_morphs[i])
+            cint_morphs[i] = <uint64_t>(<char *>byte_morphs[i])
 
-        cdef uint64_t[:] cint_morphs = int_morphs
         cdef char** new_mecab_morphs = <char**>&cint_morphs[0]
         try:
-            with nogil:
-                mecab2njd(self.njd, new_mecab_morphs, new_size)
-                _njd.njd_set_pronunciation(self.njd)
+            # chaining 前規則のための中間変換も NJD の規則適用の一部として計測する
+            with _profiling_stage("njd"):
+                with nogil:
+                    mecab2njd(self.njd, new_mecab_morphs, new_size)
+                    _njd.njd_set_pronunciation(self.njd)
 
-            feature = njd2feature(self.njd)
-            feature = apply_original_rule_before_chaining(feature)
-            NJD_refresh(self.njd)
-            feature2njd(self.njd, feature)
+                feature = njd2feature(self.njd)
+                feature = apply_original_rule_before_chaining(feature)
+                NJD_refresh(self.njd)
+                feature2njd(self.njd, feature)
 
-            with nogil:
-                _njd.njd_set_digit(self.njd)
-                _njd.njd_set_accent_phrase(self.njd)
-                _njd.njd_set_accent_type(self.njd)
-                _njd.njd_set_unvoiced_vowel(self.njd)
-                _njd.njd_set_long_vowel(self.njd)
-            return njd2feature(self.njd)
+                with nogil:
+                    _njd.njd_set_digit(self.njd)
+                    _njd.njd_set_accent_phrase(self.njd)
+                    _njd.njd_set_accent_type(self.njd)
+                    _njd.njd_set_unvoiced_vowel(self.njd)
+                    _njd.njd_set_long_vowel(self.njd)
+            with _profiling_stage("njd2feature"):
+                return njd2feature(self.njd)
         finally:
             # Python 側の規則適用が失敗した場合も、次の呼び出しへ NJD ノードを残さない
             NJD_refresh(self.njd)
@@ -1561,6 +1721,49 @@ cdef class OpenJTalk:
         njd_features = self._run_njd_from_mecab(features)
         return njd_features
 
+    @_lock_manager()
+    def run_frontend_batch(
+        self,
+        texts: Iterable[str | bytes | bytearray],
+        return_exceptions: bool = False,
+    ) -> list[list[NJDFeature] | Exception]:
+        """
+        複数のテキストに対して OpenJTalk のテキスト処理フロントエンドを順に実行する。
+        各テキストの結果は run_frontend() と同一で、入力と同じ順序で返される。
+
+        Args:
+            texts (Iterable[str | bytes | bytearray]): 入力テキストの列 (str の場合は UTF-8 にエンコードされる)
+            return_exceptions (bool): True の場合、失敗したテキストの位置に例外オブジェクトを格納して残りの処理を続ける
+                False の場合は最初に失敗したテキストの例外をそのまま送出する。デフォルト: False
+
+        Returns:
+            list[list[NJDFeature] | Exception]: 入力順の NJDNode 用 features (return_exceptions=True の場合は例外を含む)
+
+        NOTE:
+            インスタンスロックの取得はバッチ全体で1回だけ行い、text2mecab() の正規化バッファと
+            mecab2njd() へ渡すポインタ配列をテキスト間で再利用する
+            MeCab が返す feature は常に str で null 文字を含まないため、run_njd_from_mecab() の入力検証も省略する
+            処理中は同じインスタンスの他の呼び出しを待たせるため、別スレッドと共有するインスタンスでは
+            巨大なバッチを避けること
+        """
+        cdef char buff[TEXT2MECAB_BUFFER_SIZE]
+        cdef list results = []
+        cdef list features
+        # ポインタ配列は最長の feature 列に合わせて拡張し、以降のテキストで再利用する
+        cdef np.ndarray pointer_buffer = np.empty(64, dtype=np.uint64)
+
+        for text in texts:
+            try:
+                features = self._run_mecab_with_buffer(text, buff)
+                if len(features) > len(pointer_buffer):
+                    pointer_buffer = np.empty(len(features) * 2, dtype=np.uint64)
+                results.append(self._run_njd_from_validated_mecab(features, pointer_buffer))
+            except Exception as e:
+                if return_exceptions is False:
+                    raise
+                results.append(e)
+        return results
+
     @_lock_manager()
     def run_frontend_detailed(
         self, text: str | bytes | bytearray
@@ -1659,14 +1862,15 @@ cdef class OpenJTalk:
             `try/finally` で `JPCommon_refresh()` と `NJD_refresh()` を呼び、ラベル文字列と中間バッファを解放する
         """
         try:
-            feature2njd(self.njd, features)
-            with nogil:
-                njd2jpcommon(self.jpcommon, self.njd)
+            with _profiling_stage("make_label"):
+                feature2njd(self.njd, features)
+                with nogil:
+                    njd2jpcommon(self.jpcommon, self.njd)
 
-                JPCommon_make_label(self.jpcommon)
+                    JPCommon_make_label(self.jpcommon)
 
-                label_size = JPCommon_get_label_size(self.jpcommon)
-                label_feature = JPCommon_get_label_feature(self.jpcommon)
+                    label_size = JPCommon_get_label_size(self.jpcommon)
+                    label_feature = JPCommon_get_label_feature(self.jpcommon)
             if label_size > 0 and label_feature == NULL:
                 raise RuntimeError("Failed to create full-context labels")
             if label_size < 0:
@@ -0,0 +1,411 @@
+"""
+フロントエンド処理と音声合成の処理ステージごとの所要時間と、ロック・インスタンスプールの待ち時間などを計測する、
+オプトインの計測機構。
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Generator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from types import TracebackType
+from typing import Literal, get_args
+
+from .types import LatencyHistogramStats, LockStats, StageStats
+
+
+# 計測対象の処理ステージ
+StageName = Literal[
+    "text2mecab",  # text2mecab() による MeCab 入力の正規化
+    "mecab_analysis",  # Mecab_analysis() による形態素解析
+    "njd",  # mecab2njd() と NJD の各種規則の適用 (chaining 前規則のための中間変換を含む)
+    "njd2feature",  # 規則適用後の NJD から NJDFeature 列への変換
+    "sudachi",  # Sudachi による同形異音語の読み補正 (modify_kanji_yomi())
+    "nani",  # 「何」の読み推定 (predict_nani_reading())
+    "odori",  # 踊り字の展開と再解析 (process_odori_features())
+    "tsqyomi_analysis",  # tsqyomi の読み候補グラフの解析
+    "tsqyomi_inference",  # tsqyomi モデルの推論
+    "make_label",  # フルコンテキストラベルの生成
+    "htsengine",  # HTS Engine による音声合成
+]
+
+STAGE_NAMES: tuple[StageName, ...] = get_args(StageName)
+
+
+class StageTimings:
+    """処理ステージごとの実行回数と所要時間を集計する。"""
+
+    def __init__(self) -> None:
+        """空の集計を初期化する。"""
+
+        # ステージ名から [実行回数, 合計秒数, 最小秒数, 最大秒数] への対応
+        self._stats: dict[str, list[float]] = {}
+        self._mutex = Lock()
+
+    def add(self, stage: StageName, seconds: float) -> None:
+        """
+        ステージの所要時間を1回分加算する。
+
+        Args:
+            stage (StageName): 処理ステージ
+            seconds (float): 所要時間 (秒)
+        """
+
+        with self._mutex:
+            stats = self._stats.get(stage)
+            if stats is None:
+                self._stats[stage] = [1, seconds, seconds, seconds]
+                return
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = min(stats[2], seconds)
+            stats[3] = max(stats[3], seconds)
+
+    def clear(self) -> None:
+        """全ステージの集計を破棄する。"""
+
+        with self._mutex:
+            self._stats.clear()
+
+    def to_dict(self) -> dict[str, StageStats]:
+        """
+        集計結果を辞書として返す。
+
+        Returns:
+            dict[str, StageStats]: 一度でも実行されたステージ名から統計情報への対応 (`STAGE_NAMES` の順)
+        """
+
+        with self._mutex:
+            return {
+                stage: StageStats(
+                    count=int(self._stats[stage][0]),
+                    total_seconds=self._stats[stage][1],
+                    min_seconds=self._stats[stage][2],
+                    max_seconds=self._stats[stage][3],
+                )
+                for stage in STAGE_NAMES
+                if stage in self._stats
+            }
+
+
+class _StageTimer:
+    """with 文の範囲の所要時間を計測し、有効な集計に加算する。"""
+
+    __slots__ = ("_stage", "_start_time")
+
+    def __init__(self, stage: StageName) -> None:
+        """
+        計測するステージを指定して初期化する。
+
+        Args:
+            stage (StageName): 処理ステージ
+        """
+
+        self._stage: StageName = stage
+        self._start_time = 0.0
+
+    def __enter__(self) -> None:
+        """計測を開始する。"""
+
+        self._start_time = perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """計測を終了し、所要時間を加算する。"""
+
+        # 例外で中断したステージも、そこまでにかかった時間として記録する
+        add_stage_timing(self._stage, perf_counter() - self._start_time)
+
+
+# 現在のコンテキストで有効な record_stages() の集計 (入れ子の場合は外側から順に並ぶ)
+_recorders: ContextVar[tuple[StageTimings, ...]] = ContextVar(
+    "pyopenjtalk_stage_recorders",
+    default=(),
+)
+# プロセス全体の集計
+_aggregated_timings = StageTimings()
+_is_aggregation_enabled = False
+# いずれかのスレッドで実行中の record_stages() の数
+_active_recording_count = 0
+_state_lock = Lock()
+# 計測が無効な間は、各ステージの計測箇所がこのフラグだけを見て何もしない
+_is_enabled = False
+_DISABLED_STAGE_TIMER: AbstractContextManager[None] = nullcontext()
+
+
+def stage(name: StageName) -> AbstractContextManager[None]:
+    """
+    with 文の範囲を処理ステージとして計測するコンテキストマネージャを返す。
+
+    Args:
+        name (StageName): 処理ステージ
+
+    Returns:
+        AbstractContextManager[None]: 計測が無効な場合は何もしない共有のコンテキストマネージャ
+    """
+
+    if _is_enabled is False:
+        return _DISABLED_STAGE_TIMER
+    return _StageTimer(name)
+
+
+def add_stage_timing(stage: StageName, seconds: float) -> None:
+    """
+    処理ステージの所要時間を、現在のコンテキストの `record_stages()` とプロセス全体の集計に加算する。
+
+    Args:
+        stage (StageName): 処理ステージ
+        seconds (float): 所要時間 (秒)
+    """
+
+    for timings in _recorders.get():
+        timings.add(stage, seconds)
+    if _is_aggregation_enabled is True:
+        _aggregated_timings.add(stage, seconds)
+
+
+@contextmanager
+def record_stages() -> Generator[StageTimings, None, None]:
+    """
+    with 文の範囲内で、現在のスレッド (コンテキスト) が実行した処理ステージの所要時間を集計する。
+
+    Yields:
+        StageTimings: 集計結果。with 文を抜けた後も `to_dict()` で参照できる
+
+    NOTE:
+        集計は contextvars で管理されるため、別スレッドで実行された処理 (`tts_stream()` の先行処理など) は含まれない
+        入れ子にした場合は、内側の範囲の処理が外側の集計にも加算される
+    """
+
+    global _active_recording_count, _is_enabled
+
+    timings = StageTimings()
+    with _state_lock:
+        _active_recording_count += 1
+        _is_enabled = True
+    token = _recorders.set((*_recorders.get(), timings))
+    try:
+        yield timings
+    finally:
+        _recorders.reset(token)
+        with _state_lock:
+            _active_recording_count -= 1
+            _is_enabled = _is_aggregation_enabled is True or _active_recording_count > 0
+
+
+def set_aggregation_enabled(enabled: bool) -> None:
+    """
+    全スレッドの処理ステージの所要時間を、プロセス全体で集計するかを切り替える。
+    注意: この関数を実行すると、pyopenjtalk モジュールのグローバル状態が変更される。
+
+    Args:
+        enabled (bool): True なら集計を開始し、False なら停止する (集計済みの値は保持される)
+    """
+
+    global _is_aggregation_enabled, _is_enabled
+
+    with _state_lock:
+        _is_aggregation_enabled = enabled
+        _is_enabled = enabled is True or _active_recording_count > 0
+
+
+def is_aggregation_enabled() -> bool:
+    """
+    プロセス全体の集計が有効かを返す。
+
+    Returns:
+        bool: `set_aggregation_enabled(True)` 済みなら True
+    """
+
+    return _is_aggregation_enabled
+
+
+def get_aggregated_stats() -> dict[str, StageStats]:
+    """
+    プロセス全体で集計した処理ステージごとの統計情報を返す。
+
+    Returns:
+        dict[str, StageStats]: 一度でも実行されたステージ名から実行回数・所要時間の合計・最小・最大への対応
+    """
+
+    return _aggregated_timings.to_dict()
+
+
+def reset_aggregated_stats() -> None:
+    """プロセス全体で集計した統計情報を破棄する。"""
+
+    _aggregated_timings.clear()
+
+
+# LatencyHistogram の区間の上限 (秒)。1マイクロ秒から10秒までを10倍ごとに区切る
+HISTOGRAM_BUCKET_BOUNDS: tuple[float, ...] = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0, 10.0)
+
+
+class LatencyHistogram:
+    """
+    待ち時間などの分布を、`HISTOGRAM_BUCKET_BOUNDS` で区切った区間ごとの回数として記録する。
+    スレッドセーフではないため、呼び出し側で排他する。
+    """
+
+    def __init__(self) -> None:
+        """空の分布を初期化する。"""
+
+        self._bucket_counts = [0] * (len(HISTOGRAM_BUCKET_BOUNDS) + 1)
+        self._count = 0
+        self._total_seconds = 0.0
+        self._max_seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        時間を1回分記録する。
+
+        Args:
+            seconds (float): 記録する時間 (秒)
+        """
+
+        self._bucket_counts[bisect_left(HISTOGRAM_BUCKET_BOUNDS, seconds)] += 1
+        self._count += 1
+        self._total_seconds += seconds
+        self._max_seconds = max(self._max_seconds, seconds)
+
+    def stats(self) -> LatencyHistogramStats:
+        """
+        記録した分布を返す。
+
+        Returns:
+            LatencyHistogramStats: 記録回数・合計・最大値・区間ごとの回数
+        """
+
+        return LatencyHistogramStats(
+            count=self._count,
+            total_seconds=self._total_seconds,
+            max_seconds=self._max_seconds,
+            bucket_counts=list(self._bucket_counts),
+        )
+
+
+class LockMetrics:
+    """ロックまたはインスタンスプールの借り出し回数・待ち時間・保持時間・交換時の待ち時間を記録する。"""
+
+    def __init__(self) -> None:
+        """空の統計情報を初期化する。"""
+
+        self._mutex = Lock()
+        self._active_leases = 0
+        self._reset_locked()
+
+    def record_acquire(self, wait_seconds: float, is_contended: bool) -> None:
+        """
+        借り出しを1回分記録する。
+
+        Args:
+            wait_seconds (float): 借り出しを要求してから借り出せるまでの時間 (秒)
+            is_contended (bool): 空きがなく待機した場合は True
+        """
+
+        with self._mutex:
+            self._acquisitions += 1
+            if is_contended is True:
+                self._contended += 1
+            self._active_leases += 1
+            self._max_active_leases = max(self._max_active_leases, self._active_leases)
+            self._wait.record(wait_seconds)
+
+    def record_release(self, hold_seconds: float) -> None:
+        """
+        `record_acquire()` で記録した借り出しの返却を記録する。
+
+        Args:
+            hold_seconds (float): 借り出してから返却するまでの時間 (秒)
+        """
+
+        with self._mutex:
+            self._active_leases -= 1
+            self._hold.record(hold_seconds)
+
+    def record_drain(self, seconds: float) -> None:
+        """
+        交換・縮小時に進行中の借り出しの返却を待った時間を記録する。
+
+        Args:
+            seconds (float): 待った時間 (秒)
+        """
+
+        with self._mutex:
+            self._drain.record(seconds)
+
+    def reset(self) -> None:
+        """借り出し中の数を除く統計情報を破棄する。"""
+
+        with self._mutex:
+            self._reset_locked()
+
+    def stats(self) -> LockStats:
+        """
+        統計情報を返す。
+
+        Returns:
+            LockStats: 借り出し回数・待機した回数・借り出し中の数・待ち時間などの分布
+        """
+
+        with self._mutex:
+            return LockStats(
+                acquisitions=self._acquisitions,
+                contended=self._contended,
+                active_leases=self._active_leases,
+                max_active_leases=self._max_active_leases,
+                wait=self._wait.stats(),
+                hold=self._hold.stats(),
+                drain=self._drain.stats(),
+            )
+
+    def _reset_locked(self) -> None:
+        """借り出し中の数を除く統計情報を初期化する。呼び出し側で self._mutex を保持すること。"""
+
+        self._acquisitions = 0
+        self._contended = 0
+        # 借り出し中の数は返却時に減らすため破棄せず、最大値は現在の値から数え直す
+        self._max_active_leases = self._active_leases
+        self._wait = LatencyHistogram()
+        self._hold = LatencyHistogram()
+        self._drain = LatencyHistogram()
+
+
+# ロック・インスタンスプールの計測を有効にするか
+## 無効な間は、借り出しごとの時刻の取得と統計情報の更新を行わない
+_is_lock_metrics_enabled = False
+
+# 全 OpenJTalk インスタンスの公開メソッドを直列化するロックの統計情報
+openjtalk_lock_metrics = LockMetrics()
+
+
+def set_lock_metrics_enabled(enabled: bool) -> None:
+    """
+    ロックとインスタンスプールの待ち時間などの計測を有効にするかを切り替える。
+    注意: この関数を実行すると、pyopenjtalk モジュールのグローバル状態が変更される。
+
+    Args:
+        enabled (bool): True なら計測を開始し、False なら停止する (計測済みの値は保持される)
+    """
+
+    global _is_lock_metrics_enabled
+
+    _is_lock_metrics_enabled = enabled
+
+
+def is_lock_metrics_enabled() -> bool:
+    """
+    ロックとインスタンスプールの計測が有効かを返す。
+
+    Returns:
+        bool: `set_lock_metrics_enabled(True)` 済みなら True
+    """
+
+    return _is_lock_metrics_enabled
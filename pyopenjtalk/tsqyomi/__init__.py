@@ -2,34 +2,103 @@
 
 from __future__ import annotations
 
-from .model import (
-    ONNXProvider,
-    ReadingPrediction,
-    ReadingTarget,
-    TargetWindowOverflowError,
-    TsqyomiMetadata,
-    TsqyomiModel,
-    get_loaded_model,
-    is_model_loaded,
-    load_model,
-    unload_model,
-)
+from typing import TYPE_CHECKING, Any
+
 from .types import CandidateConnection, CandidateNode, CandidatePath, ReadingAnalysis
 
 
+if TYPE_CHECKING:
+    from .model import (
+        ModelVariant,
+        ONNXProvider,
+        ReadingPrediction,
+        ReadingTarget,
+        TargetSurfaceMatcher,
+        TargetWindowOverflowError,
+        TsqyomiMetadata,
+        TsqyomiModel,
+        clear_prediction_cache,
+        get_loaded_model,
+        get_prediction_cache_stats,
+        is_model_loaded,
+        load_model,
+        set_prediction_cache_size,
+        unload_model,
+    )
+
+
 __all__ = [
     "CandidateConnection",
     "CandidateNode",
     "CandidatePath",
+    "ModelVariant",
     "ONNXProvider",
     "ReadingAnalysis",
     "ReadingPrediction",
     "ReadingTarget",
+    "TargetSurfaceMatcher",
     "TargetWindowOverflowError",
     "TsqyomiMetadata",
     "TsqyomiModel",
+    "clear_prediction_cache",
     "get_loaded_model",
+    "get_prediction_cache_stats",
     "is_model_loaded",
     "load_model",
+    "set_prediction_cache_size",
     "unload_model",
 ]
+
+# model モジュールは pydantic などの読み込みに時間がかかるため、属性の初回参照時に import する
+## OpenJTalk 本体は types モジュールのみを参照するため、tsqyomi を使わない限り model は読み込まれない
+_MODEL_ATTRIBUTE_NAMES = frozenset(
+    {
+        "ModelVariant",
+        "ONNXProvider",
+        "ReadingPrediction",
+        "ReadingTarget",
+        "TargetSurfaceMatcher",
+        "TargetWindowOverflowError",
+        "TsqyomiMetadata",
+        "TsqyomiModel",
+        "clear_prediction_cache",
+        "get_loaded_model",
+        "get_prediction_cache_stats",
+        "is_model_loaded",
+        "load_model",
+        "set_prediction_cache_size",
+        "unload_model",
+    }
+)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    model モジュールで定義された公開属性を、初回参照時に import して返す。
+
+    Args:
+        name (str): 属性名
+
+    Returns:
+        Any: model モジュールの属性
+
+    Raises:
+        AttributeError: 公開属性ではない場合
+    """
+
+    if name in _MODEL_ATTRIBUTE_NAMES:
+        from . import model
+
+        return getattr(model, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    """
+    遅延 import する属性を含む、モジュールの属性名の一覧を返す。
+
+    Returns:
+        list[str]: 属性名の一覧
+    """
+
+    return sorted({*globals(), *__all__})
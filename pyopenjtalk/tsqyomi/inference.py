@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, replace
 
 from ..openjtalk import OpenJTalk
+from ..profiling import stage as _profiling_stage
 from ..types import MeCabMorph
 from . import diagnostics
 from .model import (
@@ -798,10 +799,7 @@ def select_mecab_features_with_tsqyomi(
 
     model = get_loaded_model()
     normalized_text = jtalk.normalize_for_mecab(text)
-    target_spans = _find_target_spans(
-        normalized_text,
-        model.metadata.surfaces_by_first_character,
-    )
+    target_spans = model.metadata.target_surface_matcher.find_spans(normalized_text)
 
     # 対象表層が本文にない呼び出しが多い場合は候補グラフ生成とモデル推論を省略する
     if len(target_spans) == 0:
@@ -833,7 +831,8 @@ def select_mecab_features_with_tsqyomi(
                 combined_morphs.append(adjusted_morph)
         return combined_features, combined_morphs
 
-    analysis = jtalk.analyze_mecab_candidates(normalized_text, target_spans)
+    with _profiling_stage("tsqyomi_analysis"):
+        analysis = jtalk.analyze_mecab_candidates(normalized_text, target_spans)
     nodes_by_id = {node["node_id"]: node for node in analysis["nodes"]}
     selected_features = list(analysis["features"])
     resolved_targets: list[_ResolvedTarget] = []
@@ -941,10 +940,11 @@ def select_mecab_features_with_tsqyomi(
         )
 
     if len(resolved_targets) > 0:
-        predictions = model.predict(
-            analysis["normalized_text"],
-            tuple(item.to_reading_target() for item in resolved_targets),
-        )
+        with _profiling_stage("tsqyomi_inference"):
+            predictions = model.predict(
+                analysis["normalized_text"],
+                tuple(item.to_reading_target() for item in resolved_targets),
+            )
         resolved_targets = _resolve_selected_pronunciations(
             model,
             resolved_targets,
@@ -1102,39 +1102,6 @@ def select_mecab_features_with_tsqyomi(
     return selected_features, selected_morphs
 
 
-def _find_target_spans(
-    text: str,
-    surfaces_by_first_character: dict[str, tuple[str, ...]],
-) -> tuple[tuple[int, int], ...]:
-    """
-    推論対象表層を最長一致させ、内側の短い対象を除いた範囲を返す。
-
-    Args:
-        text (str): 正規化済みの Unicode 日本語テキスト
-        surfaces_by_first_character (dict[str, tuple[str, ...]]): 先頭文字別・長さ降順の表層索引
-
-    Returns:
-        tuple[tuple[int, int], ...]: 重なりのない対象表層の半開区間 (文字位置昇順)
-    """
-
-    occurrences: list[tuple[int, int]] = []
-    for start, character in enumerate(text):
-        # 同じ開始位置では長い表層から確認し、最長の1件だけを対象候補にする
-        for surface in surfaces_by_first_character.get(character, ()):
-            if text.startswith(surface, start):
-                occurrences.append((start, start + len(surface)))
-                break
-    selected: list[tuple[int, int]] = []
-    last_selected_end = 0
-    for occurrence in occurrences:
-        # 出現は開始位置順なので、直前に採用した範囲の終端だけで重なりを判定できる
-        if occurrence[0] < last_selected_end:
-            continue
-        selected.append(occurrence)
-        last_selected_end = occurrence[1]
-    return tuple(selected)
-
-
 def _split_target_processing_segments(
     text: str,
     target_spans: tuple[tuple[int, int], ...],
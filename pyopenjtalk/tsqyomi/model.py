@@ -1,15 +1,23 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
-from dataclasses import dataclass
-from itertools import pairwise
+import hashlib
+import os
+import re
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from itertools import count, pairwise
 from pathlib import Path
-from threading import Condition, Lock
+from threading import Condition, Lock, get_ident
 from typing import Any, Literal
 
 import numpy as np
 from pydantic import BaseModel, PrivateAttr, computed_field, model_validator
 
+from ..cache import LRUCache, bump_dictionary_generation
+from ..types import CacheStats
+
 
 # モデル、トークナイザー、メタデータの組み合わせを同一スナップショットへ固定する
 _MODEL_REPOSITORY = "tsukumijima/tsqyomi-models"
@@ -20,8 +28,15 @@ _MODEL_FILES = {
     "metadata": "v4/metadata.json",
 }
 
+# 量子化済みモデルのファイル名 (ローカルのモデルディレクトリと Hub 用の量子化キャッシュで共通)
+_QUANTIZED_MODEL_FILE_NAME = "model.int8.onnx"
+
 ONNXProvider = str | tuple[str, dict[str, Any]]
 
+# fp32: 配布されている ONNX モデルをそのまま使う
+# int8: 重みを int8 へ動的量子化したモデルを使う (CPU 推論向け)
+ModelVariant = Literal["fp32", "int8"]
+
 
 class TargetWindowOverflowError(ValueError):
     """全対象が1つのモデル入力窓に同時には収まらない場合に送出する。"""
@@ -57,6 +72,211 @@ class ReadingPrediction:
     scores: tuple[float, ...]
 
 
+class TargetSurfaceMatcher:
+    """
+    推論対象表層を本文から最左最長一致で検出する照合器。
+
+    NOTE:
+        対象表層の先頭文字を集めた文字クラスの正規表現で候補位置まで読み飛ばし、候補位置からのみトライ木を辿る
+        対象表層を含まない大半の本文は、C 実装の正規表現による1回の走査だけで判定が終わる
+    """
+
+    # トライ木のノードで、そこまでの文字列が対象表層であることを表すキー (本文の1文字とは衝突しない)
+    _TERMINAL_KEY = ""
+
+    def __init__(self, surfaces: Iterable[str]) -> None:
+        """
+        推論対象表層からトライ木と先頭文字の正規表現を構築する。
+
+        Args:
+            surfaces (Iterable[str]): 推論対象表層 (空文字列を含まない)
+        """
+
+        # 各ノードは次の文字から子ノードへの dict
+        self._trie: dict[str, Any] = {}
+        for surface in surfaces:
+            node = self._trie
+            for character in surface:
+                node = node.setdefault(character, {})
+            node[self._TERMINAL_KEY] = {}
+        self._first_character_pattern: re.Pattern[str] | None = None
+        if len(self._trie) > 0:
+            self._first_character_pattern = re.compile(
+                "[" + "".join(re.escape(character) for character in sorted(self._trie)) + "]"
+            )
+
+    def find_spans(self, text: str) -> tuple[tuple[int, int], ...]:
+        """
+        対象表層を先頭から順に最長一致させ、重なりのない出現範囲を返す。
+        ある位置で一致した表層の内側から始まる短い対象は、重なるため返さない。
+
+        Args:
+            text (str): 正規化済みの Unicode 日本語テキスト
+
+        Returns:
+            tuple[tuple[int, int], ...]: 重なりのない対象表層の半開区間 (文字位置昇順)
+        """
+
+        if self._first_character_pattern is None:
+            return ()
+        search = self._first_character_pattern.search
+        text_length = len(text)
+        spans: list[tuple[int, int]] = []
+        position = 0
+        while (match := search(text, position)) is not None:
+            start = match.start()
+            # 候補位置からトライ木を辿れるところまで辿り、最後に通過した終端を最長一致とする
+            node: dict[str, Any] | None = self._trie
+            index = start
+            end = -1
+            while index < text_length:
+                node = node.get(text[index])
+                if node is None:
+                    break
+                index += 1
+                if self._TERMINAL_KEY in node:
+                    end = index
+            if end == -1:
+                position = start + 1
+                continue
+            spans.append((start, end))
+            position = end
+        return tuple(spans)
+
+
+@dataclass(frozen=True)
+class _WindowInput:
+    """
+    1つのモデル入力窓に載せるトークン列と対象位置を保持する。
+
+    Attributes:
+        input_ids (list[int]): 先頭と末尾の特殊トークンを含む窓のトークン ID 列
+        target_positions (list[list[int]]): 窓内の対象ごとの昇順のトークン位置
+    """
+
+    input_ids: list[int]
+    target_positions: list[list[int]]
+
+
+@dataclass
+class _PendingWindow:
+    """
+    推論待ち行列に積んだ1入力窓と、その実行結果を保持する。
+
+    Attributes:
+        window_input (_WindowInput): 推論する入力窓
+        class_logits (np.ndarray | None): 実行済みなら対象ごとの読みクラスロジット
+        error (BaseException | None): 実行に失敗した場合の例外
+    """
+
+    window_input: _WindowInput
+    class_logits: np.ndarray | None = None
+    error: BaseException | None = None
+
+    @property
+    def is_done(self) -> bool:
+        """
+        実行が完了 (成功または失敗) したか返す。
+
+        Returns:
+            bool: 完了していれば True
+        """
+
+        return self.class_logits is not None or self.error is not None
+
+
+@dataclass
+class _WindowBatchQueue:
+    """
+    複数スレッドから届く入力窓を束ね、1回の ONNX 実行で推論するマイクロバッチ待ち行列。
+
+    NOTE:
+        専用のワーカースレッドは持たず、待機中の呼び出し元のうち1スレッドが代表となってバッチを実行する。
+        代表は最大 `max_wait_seconds` 秒だけ後続の入力窓を待ち、`max_batch_size` 個に達した時点で待たずに実行する。
+        バッチの実行は常に1つずつ行い、実行中に届いた入力窓は次のバッチへまとめる。
+
+    Attributes:
+        run_batch (Callable[[Sequence[_WindowInput]], list[np.ndarray]]): 入力窓の列を1回で推論する関数
+        max_batch_size (int): 1バッチに載せる入力窓の最大数
+        max_wait_seconds (float): 代表がバッチを満たすまで後続を待つ最大秒数
+    """
+
+    run_batch: Callable[[Sequence[_WindowInput]], list[np.ndarray]]
+    max_batch_size: int
+    max_wait_seconds: float
+    _condition: Condition = field(default_factory=Condition, init=False, repr=False)
+    _pending_windows: deque[_PendingWindow] = field(default_factory=deque, init=False, repr=False)
+    _is_batch_running: bool = field(default=False, init=False, repr=False)
+
+    def run(self, window_inputs: Sequence[_WindowInput]) -> list[np.ndarray]:
+        """
+        入力窓を待ち行列へ積み、他スレッドの入力窓と束ねて推論した結果を返す。
+
+        Args:
+            window_inputs (Sequence[_WindowInput]): 推論する入力窓
+
+        Returns:
+            list[np.ndarray]: 入力窓と同じ順序の、対象ごとの読みクラスロジット
+
+        Raises:
+            BaseException: 自身の入力窓を含むバッチの実行で送出された例外
+        """
+
+        pending_windows = [_PendingWindow(window_input) for window_input in window_inputs]
+        with self._condition:
+            self._pending_windows.extend(pending_windows)
+            # 後続を待っている代表へ、バッチが満ちた可能性を知らせる
+            self._condition.notify_all()
+            while all(pending_window.is_done for pending_window in pending_windows) is False:
+                if self._is_batch_running is True:
+                    self._condition.wait()
+                    continue
+                self._run_next_batch()
+
+        for pending_window in pending_windows:
+            if pending_window.error is not None:
+                raise pending_window.error
+        return [
+            pending_window.class_logits
+            for pending_window in pending_windows
+            if pending_window.class_logits is not None
+        ]
+
+    def _run_next_batch(self) -> None:
+        """
+        代表として後続の入力窓を待ち、待ち行列の先頭から1バッチ分を推論して結果を書き戻す。
+        `_condition` を保持した状態で呼び出し、ONNX の実行中だけロックを手放す。
+        """
+
+        self._is_batch_running = True
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(self._pending_windows) < self.max_batch_size:
+            remaining_seconds = deadline - time.monotonic()
+            if remaining_seconds <= 0:
+                break
+            self._condition.wait(remaining_seconds)
+        batch = [
+            self._pending_windows.popleft()
+            for _ in range(min(self.max_batch_size, len(self._pending_windows)))
+        ]
+
+        self._condition.release()
+        try:
+            class_logits_by_window = self.run_batch(
+                [pending_window.window_input for pending_window in batch]
+            )
+            for pending_window, class_logits in zip(batch, class_logits_by_window, strict=True):
+                pending_window.class_logits = class_logits
+        except BaseException as ex:
+            # 同じバッチに載った全呼び出し元へ、実行失敗をそれぞれの呼び出しの例外として返す
+            for pending_window in batch:
+                pending_window.error = ex
+        finally:
+            self._condition.acquire()
+            self._is_batch_running = False
+            self._condition.notify_all()
+
+
 class TsqyomiMetadata(BaseModel):
     """
     tsqyomi の ONNX モデルが参照するメタデータ。
@@ -78,7 +298,7 @@ class TsqyomiMetadata(BaseModel):
     trailing_token_id: int | None = None
     class_index_by_surface_and_pronunciation: dict[str, dict[str, int]]
     preserve_dictionary_default_pronunciations: tuple[tuple[str, str], ...] = ()
-    _surfaces_by_first_character: dict[str, tuple[str, ...]] = PrivateAttr()
+    _target_surface_matcher: TargetSurfaceMatcher = PrivateAttr()
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -93,43 +313,21 @@ class TsqyomiMetadata(BaseModel):
         return frozenset(self.class_index_by_surface_and_pronunciation)
 
     @property
-    def surfaces_by_first_character(self) -> dict[str, tuple[str, ...]]:
-        """
-        推論対象表層の先頭文字別索引を返す。
-
-        Returns:
-            dict[str, tuple[str, ...]]: `validate_reading_classes()` 実行時に構築した索引
+    def target_surface_matcher(self) -> TargetSurfaceMatcher:
         """
-
-        return self._surfaces_by_first_character
-
-    @staticmethod
-    def _index_surfaces_by_first_character(
-        surfaces: frozenset[str],
-    ) -> dict[str, tuple[str, ...]]:
-        """
-        推論対象表層を先頭文字別・長さ降順へ索引化する。
-
-        Args:
-            surfaces (frozenset[str]): モデルが推論対象とする表層の集合
+        推論対象表層の照合器を返す。
 
         Returns:
-            dict[str, tuple[str, ...]]: 先頭文字から、長い表層を優先した表層列への索引
+            TargetSurfaceMatcher: `validate_reading_classes()` 実行時に構築した照合器
         """
 
-        indexed: dict[str, list[str]] = {}
-        for surface in surfaces:
-            indexed.setdefault(surface[0], []).append(surface)
-        return {
-            character: tuple(sorted(values, key=lambda surface: (-len(surface), surface)))
-            for character, values in indexed.items()
-        }
+        return self._target_surface_matcher
 
     @model_validator(mode="after")
     def validate_reading_classes(self) -> TsqyomiMetadata:
         """
         出力列と表層別の読みクラス定義が完全に対応することを検証する。
-        検証成功時に `surfaces_by_first_character` をロードする。
+        検証成功時に `target_surface_matcher` を構築する。
 
         Returns:
             TsqyomiMetadata: 検証済みの自身
@@ -147,9 +345,7 @@ class TsqyomiMetadata(BaseModel):
                 raise ValueError("each model-scored surface must have at least two pronunciations")
             if any(class_index < 0 for class_index in pronunciation_mapping.values()):
                 raise ValueError("reading class index must not be negative")
-        self._surfaces_by_first_character = self._index_surfaces_by_first_character(
-            self.model_scored_surfaces
-        )
+        self._target_surface_matcher = TargetSurfaceMatcher(self.model_scored_surfaces)
         return self
 
     @classmethod
@@ -186,6 +382,10 @@ class TsqyomiModel:
         tokenizer: Any,
         session: Any,
         metadata: TsqyomiMetadata,
+        revision: str | None = None,
+        *,
+        max_batch_size: int = 8,
+        batch_wait_seconds: float | None = None,
     ) -> None:
         """
         トークナイザー、ONNX セッション、メタデータを1つのモデル参照へまとめる。
@@ -194,11 +394,34 @@ class TsqyomiModel:
             tokenizer (Any): `tokenizers.Tokenizer` のロード済みインスタンス
             session (Any): `onnxruntime.InferenceSession` のロード済みインスタンス
             metadata (TsqyomiMetadata): 検証済みのモデル設定
+            revision (str | None): モデルファイルの組を識別する文字列。永続キャッシュのキーに使う
+                None の場合は識別できないモデルとして扱う (デフォルト: None)
+            max_batch_size (int): 1回の ONNX 実行にパディングして載せる入力窓の最大数 (デフォルト: 8)
+            batch_wait_seconds (float | None): 複数スレッドの入力窓を束ねるため、後続の入力窓を待つ最大秒数
+                None の場合はスレッド間で束ねず、各呼び出しが自身の入力窓だけで ONNX を実行する (デフォルト: None)
+
+        Raises:
+            ValueError: `max_batch_size` が1未満、または `batch_wait_seconds` が負の場合
         """
 
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if batch_wait_seconds is not None and batch_wait_seconds < 0:
+            raise ValueError("batch_wait_seconds must not be negative")
+
         self.tokenizer = tokenizer
         self.session = session
         self.metadata = metadata
+        self.revision = revision
+        self.max_batch_size = max_batch_size
+        # 予測キャッシュのキーへ含め、別のモデルで計算した予測を返さないようにする
+        self._prediction_cache_namespace = next(_model_serial_numbers)
+        # スレッド間で入力窓を束ねる場合だけ待ち行列を作り、既定では呼び出しごとに ONNX を実行する
+        self._batch_queue = (
+            None
+            if batch_wait_seconds is None
+            else _WindowBatchQueue(self._run_window_batch, max_batch_size, batch_wait_seconds)
+        )
         # DirectML だけは ORT 本体が mutex を付けないため、同一セッションの Run() をここで直列化する
         self._inference_lock = Lock() if "DmlExecutionProvider" in session.get_providers() else None
 
@@ -285,7 +508,11 @@ class TsqyomiModel:
     ) -> tuple[ReadingPrediction, ...]:
         """
         本文内の対象読みを推論する。
-        全対象が1入力窓に収まる場合は ONNX を1回だけ実行し、収まらない場合は対象列を分割して再帰する。
+        本文は対象境界で区切って1回だけトークン化し、全対象を覆う入力窓を出現順に貪欲に詰める。
+        入力窓は `max_batch_size` 個ずつパディングして束ね、1回の ONNX 実行で推論する。
+        `batch_wait_seconds` を指定したモデルでは、他スレッドの入力窓とも同じ ONNX 実行へ束ねる。
+        `set_prediction_cache_size()` で予測キャッシュを有効化している場合、トークン列・対象位置・候補発音が
+        同一の入力窓は ONNX を実行せずキャッシュした予測を返す。
 
         Args:
             text (str): 入力本文
@@ -301,48 +528,79 @@ class TsqyomiModel:
 
         if len(targets) == 0:
             return ()
-        try:
-            return self._predict_single_window(text, targets)
-        except TargetWindowOverflowError:
-            if len(targets) == 1:
-                raise
-        # 二分した各区間は順次実行し、長文の対象数に比例した巨大バッチを作らない
-        middle = len(targets) // 2
-        return (
-            *self.predict(text, targets[:middle]),
-            *self.predict(text, targets[middle:]),
+
+        ordered_targets = tuple(sorted(targets, key=lambda target: target.char_span))
+        for previous, current in pairwise(ordered_targets):
+            if previous.char_span[1] > current.char_span[0]:
+                raise ValueError("targets must not overlap")
+        content_ids, positions_by_target = self._encode_with_target_boundaries(
+            text, ordered_targets
+        )
+        windows = self._plan_target_windows(positions_by_target)
+        window_targets_list = [
+            ordered_targets[window_targets.start : window_targets.stop]
+            for window_targets in windows
+        ]
+        window_inputs = [
+            self._build_window_input(
+                content_ids,
+                positions_by_target[window_targets.start : window_targets.stop],
+            )
+            for window_targets in windows
+        ]
+        predictions_by_window: list[tuple[ReadingPrediction, ...] | None] = [None] * len(windows)
+        cache_keys: list[bytes] | None = None
+        if _prediction_cache.max_size > 0:
+            cache_keys = [
+                self._prediction_cache_key(window_input, window_targets)
+                for window_input, window_targets in zip(
+                    window_inputs, window_targets_list, strict=True
+                )
+            ]
+            predictions_by_window = [_prediction_cache.get(cache_key) for cache_key in cache_keys]
+        # キャッシュにない入力窓だけを ONNX で推論する
+        missing_indices = [
+            index for index, predictions in enumerate(predictions_by_window) if predictions is None
+        ]
+        class_logits_by_window = self._run_windows(
+            [window_inputs[index] for index in missing_indices]
         )
+        for index, class_logits in zip(missing_indices, class_logits_by_window, strict=True):
+            predictions = self._score_window_targets(window_targets_list[index], class_logits)
+            predictions_by_window[index] = predictions
+            if cache_keys is not None:
+                _prediction_cache.put(cache_keys[index], predictions)
+
+        predictions_by_span: dict[tuple[int, int], ReadingPrediction] = {}
+        for window_targets, predictions in zip(
+            window_targets_list, predictions_by_window, strict=True
+        ):
+            assert predictions is not None
+            for target, prediction in zip(window_targets, predictions, strict=True):
+                predictions_by_span[target.char_span] = prediction
+        # 呼び出し側の targets 順を保つため、内部では文字位置順に並べ替えてから元順で返す
+        return tuple(predictions_by_span[target.char_span] for target in targets)
 
-    def _predict_single_window(
+    def _encode_with_target_boundaries(
         self,
         text: str,
-        targets: tuple[ReadingTarget, ...],
-    ) -> tuple[ReadingPrediction, ...]:
+        ordered_targets: tuple[ReadingTarget, ...],
+    ) -> tuple[list[int], list[list[int]]]:
         """
-        全対象を1つのモデル入力窓へ載せて ONNX 推論を1回実行する。
+        本文を対象境界で区切ってトークン化し、トークン ID 列と対象ごとのトークン位置を返す。
 
         Args:
             text (str): 入力本文
-            targets (tuple[ReadingTarget, ...]): 同じ本文にある対象と候補発音
+            ordered_targets (tuple[ReadingTarget, ...]): 文字位置順に並べた重なりのない対象
 
         Returns:
-            tuple[ReadingPrediction, ...]: 入力順の対象別予測
+            tuple[list[int], list[list[int]]]: 特殊トークンを除く本文全体のトークン ID 列と、
+                対象ごとの昇順のトークン位置
 
         Raises:
-            TargetWindowOverflowError: 全対象が1入力窓に収まらない場合
-            ValueError: 候補発音が空、対象が重なる、tokenizer が span を保持できない等
+            ValueError: 対象の範囲が表層と一致しない、または tokenizer が対象の範囲を保持できない場合
         """
 
-        if len(targets) == 0:
-            raise ValueError("targets must not be empty")
-
-        # 循環インポート回避のためここでインポート
-        from .inference import canonicalize_pronunciation
-
-        ordered_targets = tuple(sorted(targets, key=lambda target: target.char_span))
-        for previous, current in pairwise(ordered_targets):
-            if previous.char_span[1] > current.char_span[0]:
-                raise ValueError("targets must not overlap")
         boundaries = sorted(
             {
                 0,
@@ -353,66 +611,231 @@ class TsqyomiModel:
         )
         content_ids: list[int] = []
         content_offsets: list[tuple[int, int]] = []
+        # 区切りの開始文字位置から、その区切りのトークン位置の半開区間への対応
+        token_range_by_segment_start: dict[int, tuple[int, int]] = {}
         for segment_start, segment_end in pairwise(boundaries):
             # MeCab が確定した対象境界で部分語分割も切り、助詞を対象表現へ混入させない
             segment_encoding = self.tokenizer.encode(
                 text[segment_start:segment_end],
                 add_special_tokens=False,
             )
+            first_token_index = len(content_ids)
             content_ids.extend(segment_encoding.ids)
             content_offsets.extend(
                 (start + segment_start, end + segment_start)
                 for start, end in segment_encoding.offsets
             )
+            token_range_by_segment_start[segment_start] = (first_token_index, len(content_ids))
+
         positions_by_target: list[list[int]] = []
         for target in ordered_targets:
             if text[target.char_span[0] : target.char_span[1]] != target.surface:
                 raise ValueError("target span does not match surface")
+            # 対象は境界で区切った1区切りに一致するため、その区切りのトークンだけを調べれば足りる
+            first_token_index, last_token_index = token_range_by_segment_start[target.char_span[0]]
             positions = [
                 index
-                for index, (start, end) in enumerate(content_offsets)
-                if start < target.char_span[1] and end > target.char_span[0]
+                for index in range(first_token_index, last_token_index)
+                if content_offsets[index][0] < target.char_span[1]
+                and content_offsets[index][1] > target.char_span[0]
             ]
             if len(positions) == 0:
                 raise ValueError("tokenizer did not preserve target span")
             positions_by_target.append(positions)
+        return content_ids, positions_by_target
+
+    def _plan_target_windows(self, positions_by_target: list[list[int]]) -> list[range]:
+        """
+        文字位置順の対象を、先頭から1入力窓に収まる限り同じ窓へ詰めて分ける。
+
+        Args:
+            positions_by_target (list[list[int]]): 文字位置順の対象ごとの昇順のトークン位置
+
+        Returns:
+            list[range]: 窓ごとの対象の添字範囲 (連結すると全対象を1度ずつ覆う)
+
+        Raises:
+            TargetWindowOverflowError: 単一対象が入力窓に収まらない場合
+
+        NOTE:
+            対象は文字位置順に並ぶため、連続する対象を収まる限り詰める貪欲法で窓の数 (ONNX の実行回数) が最小になる
+        """
+
+        # 先頭と末尾の特殊トークンを除いた、本文トークンに使える長さ
+        capacity = self.metadata.model_max_length - 2
+        windows: list[range] = []
+        window_start_index = 0
+        for index, positions in enumerate(positions_by_target):
+            if positions[-1] + 1 - positions[0] > capacity:
+                raise TargetWindowOverflowError("target does not fit in one model input window")
+            if positions[-1] + 1 - positions_by_target[window_start_index][0] > capacity:
+                windows.append(range(window_start_index, index))
+                window_start_index = index
+        windows.append(range(window_start_index, len(positions_by_target)))
+        return windows
+
+    def _build_window_input(
+        self,
+        content_ids: list[int],
+        positions_by_target: list[list[int]],
+    ) -> _WindowInput:
+        """
+        1つのモデル入力窓に収まる対象について、前後の文脈を含む入力窓を切り出す。
+
+        Args:
+            content_ids (list[int]): 特殊トークンを除く本文全体のトークン ID 列
+            positions_by_target (list[list[int]]): 窓に載せる文字位置順の対象ごとの昇順のトークン位置
+
+        Returns:
+            _WindowInput: 特殊トークンで挟んだ窓のトークン列と、窓内の対象位置
+
+        Raises:
+            ValueError: 対象が入力窓から切り捨てられた場合
+        """
 
         # 全対象を残す最小窓を求め、余った長さを左右の文脈へ均等に配る
-        required_start = min(positions[0] for positions in positions_by_target)
-        required_end = max(positions[-1] for positions in positions_by_target) + 1
-        if required_end - required_start > self.metadata.model_max_length - 2:
-            raise TargetWindowOverflowError("all targets do not fit in one model input window")
+        required_start = positions_by_target[0][0]
+        required_end = positions_by_target[-1][-1] + 1
         context_capacity = self.metadata.model_max_length - 2 - (required_end - required_start)
         window_start = max(0, required_start - context_capacity // 2)
         window_start = min(
             window_start, max(0, len(content_ids) - self.metadata.model_max_length + 2)
         )
         window_end = min(len(content_ids), window_start + self.metadata.model_max_length - 2)
-        input_id_values = [
+        input_ids = [
             self._leading_token_id,
             *content_ids[window_start:window_end],
             self._trailing_token_id,
         ]
-        target_mask = np.zeros((1, len(ordered_targets), len(input_id_values)), dtype=np.bool_)
-        for target_index, positions in enumerate(positions_by_target):
+        target_positions: list[list[int]] = []
+        for positions in positions_by_target:
             shifted_positions = [position - window_start + 1 for position in positions]
             if any(
-                position <= 0 or position >= len(input_id_values) - 1
-                for position in shifted_positions
+                position <= 0 or position >= len(input_ids) - 1 for position in shifted_positions
             ):
                 raise ValueError("target span was truncated from the shared model input")
-            target_mask[0, target_index, shifted_positions] = True
-        input_ids = np.asarray([input_id_values], dtype=np.int64)
-        attention_mask = np.ones_like(input_ids)
+            target_positions.append(shifted_positions)
+        return _WindowInput(input_ids, target_positions)
+
+    def _run_window_batch(self, window_inputs: Sequence[_WindowInput]) -> list[np.ndarray]:
+        """
+        複数の入力窓を右側パディングで1つのテンソルへ束ね、ONNX 推論を1回実行する。
+
+        Args:
+            window_inputs (Sequence[_WindowInput]): 推論する入力窓
+
+        Returns:
+            list[np.ndarray]: 入力窓と同じ順序の、窓内の対象ごとの読みクラスロジット
+
+        NOTE:
+            パディング位置は attention_mask で参照されないため、実トークンの出力は単独実行時と同じ計算になる
+            ただし束ねた形状に応じて ONNX Runtime が選ぶカーネルが変わるため、浮動小数点の誤差程度の差は生じ得る
+        """
+
+        sequence_length = max(len(window_input.input_ids) for window_input in window_inputs)
+        target_count = max(len(window_input.target_positions) for window_input in window_inputs)
+        # パディング位置の ID は attention_mask で無視されるため、語彙内の値であれば何でもよい
+        input_ids = np.full(
+            (len(window_inputs), sequence_length), self._trailing_token_id, dtype=np.int64
+        )
+        attention_mask = np.zeros_like(input_ids)
+        target_mask = np.zeros((len(window_inputs), target_count, sequence_length), dtype=np.bool_)
+        for batch_index, window_input in enumerate(window_inputs):
+            input_ids[batch_index, : len(window_input.input_ids)] = window_input.input_ids
+            attention_mask[batch_index, : len(window_input.input_ids)] = 1
+            for target_index, positions in enumerate(window_input.target_positions):
+                target_mask[batch_index, target_index, positions] = True
+            # 対象数の少ない窓の埋め草は、空マスクによる 0 除算を避けるため先頭対象のマスクを複製する
+            ## 埋め草の出力は読み捨てるため、予測には影響しない
+            target_mask[batch_index, len(window_input.target_positions) :] = target_mask[
+                batch_index, 0
+            ]
         model_inputs = {
             "input_ids": input_ids,
             "attention_mask": attention_mask,
             "target_mask": target_mask,
         }
-        logits = self._run_onnx_session(model_inputs)
-        class_logits = np.asarray(logits, dtype=np.float32)[0]
-        predictions_by_span: dict[tuple[int, int], ReadingPrediction] = {}
-        for target, target_logits in zip(ordered_targets, class_logits, strict=True):
+        logits = np.asarray(self._run_onnx_session(model_inputs), dtype=np.float32)
+        return [
+            logits[batch_index, : len(window_input.target_positions)]
+            for batch_index, window_input in enumerate(window_inputs)
+        ]
+
+    def _run_windows(self, window_inputs: Sequence[_WindowInput]) -> list[np.ndarray]:
+        """
+        入力窓を `max_batch_size` 個ずつ束ねて推論する。
+        `batch_wait_seconds` を指定したモデルでは、待ち行列を通して他スレッドの入力窓と束ねる。
+
+        Args:
+            window_inputs (Sequence[_WindowInput]): 推論する入力窓
+
+        Returns:
+            list[np.ndarray]: 入力窓と同じ順序の、窓内の対象ごとの読みクラスロジット
+        """
+
+        if self._batch_queue is not None:
+            return self._batch_queue.run(window_inputs)
+        class_logits_by_window: list[np.ndarray] = []
+        for batch_start in range(0, len(window_inputs), self.max_batch_size):
+            class_logits_by_window.extend(
+                self._run_window_batch(
+                    window_inputs[batch_start : batch_start + self.max_batch_size]
+                )
+            )
+        return class_logits_by_window
+
+    def _prediction_cache_key(
+        self,
+        window_input: _WindowInput,
+        window_targets: tuple[ReadingTarget, ...],
+    ) -> bytes:
+        """
+        入力窓のトークン列・対象位置・候補発音から予測キャッシュのキーを計算する。
+
+        Args:
+            window_input (_WindowInput): 推論する入力窓
+            window_targets (tuple[ReadingTarget, ...]): 窓に載せた文字位置順の対象
+
+        Returns:
+            bytes: キャッシュキー
+        """
+
+        # 窓のトークン列全体をキーに保持するとメモリを圧迫するため、ダイジェストに置き換える
+        ## 候補発音は読みクラスの引き方を、表層は読みクラスの対応表を決めるため、どちらもキーに含める
+        key_source = repr(
+            (
+                self._prediction_cache_namespace,
+                window_input.input_ids,
+                window_input.target_positions,
+                [(target.surface, target.pronunciations) for target in window_targets],
+            )
+        )
+        return hashlib.blake2b(key_source.encode("utf-8"), digest_size=16).digest()
+
+    def _score_window_targets(
+        self,
+        window_targets: tuple[ReadingTarget, ...],
+        class_logits: np.ndarray,
+    ) -> tuple[ReadingPrediction, ...]:
+        """
+        1入力窓の読みクラスロジットから、対象ごとに候補発音のスコアを引いて発音を選ぶ。
+
+        Args:
+            window_targets (tuple[ReadingTarget, ...]): 窓に載せた文字位置順の対象
+            class_logits (np.ndarray): window_targets ごとの読みクラスロジット
+
+        Returns:
+            tuple[ReadingPrediction, ...]: window_targets と同じ順序の予測
+
+        Raises:
+            ValueError: 候補発音がメタデータの読みクラスにない場合など
+        """
+
+        # 循環インポート回避のためここでインポート
+        from .inference import canonicalize_pronunciation
+
+        predictions: list[ReadingPrediction] = []
+        for target, target_logits in zip(window_targets, class_logits, strict=True):
             try:
                 class_indices = self.metadata.class_index_by_surface_and_pronunciation[
                     target.surface
@@ -434,14 +857,21 @@ class TsqyomiModel:
                     ) from ex
                 scores.append(float(target_logits[class_index]))
             selected_index = int(np.argmax(np.asarray(scores)))
-            predictions_by_span[target.char_span] = ReadingPrediction(
-                target.pronunciations[selected_index],
-                tuple(scores),
+            predictions.append(
+                ReadingPrediction(
+                    target.pronunciations[selected_index],
+                    tuple(scores),
+                )
             )
-        # 呼び出し側の targets 順を保つため、内部では文字位置順に並べ替えてから元順で返す
-        return tuple(predictions_by_span[target.char_span] for target in targets)
+        return tuple(predictions)
 
 
+# TsqyomiModel.predict() の入力窓ごとの予測キャッシュ
+## set_prediction_cache_size() で最大件数を指定するまでは無効
+_prediction_cache: LRUCache[bytes, tuple[ReadingPrediction, ...]] = LRUCache()
+# モデルごとに予測キャッシュのキー空間を分けるための通し番号
+_model_serial_numbers = count()
+
 _lifecycle_lock = Lock()
 _lifecycle_condition = Condition(_lifecycle_lock)
 _loaded_model: TsqyomiModel | None = None
@@ -525,12 +955,72 @@ def _verify_session_providers(
         )
 
 
+def _local_model_revision(model_path: Path, tokenizer_path: Path, metadata_path: Path) -> str:
+    """
+    ローカル配置のモデルファイルの組を識別する文字列を返す。
+
+    Args:
+        model_path (Path): ONNX モデルのパス
+        tokenizer_path (Path): トークナイザー JSON のパス
+        metadata_path (Path): メタデータ JSON のパス
+
+    Returns:
+        str: "local-" で始まる識別文字列
+    """
+
+    # 大きな ONNX モデルは全体を読まずにサイズと更新時刻で識別し、小さな JSON は内容で識別する
+    digest = hashlib.sha256()
+    model_stat = model_path.stat()
+    digest.update(f"{model_stat.st_size}:{model_stat.st_mtime_ns}".encode())
+    digest.update(tokenizer_path.read_bytes())
+    digest.update(metadata_path.read_bytes())
+    return f"local-{digest.hexdigest()[:16]}"
+
+
+def _prepare_quantized_model(model_path: Path, quantized_model_path: Path) -> None:
+    """
+    fp32 の ONNX モデルを int8 へ動的量子化して保存する。保存済みの場合は何もしない。
+
+    Args:
+        model_path (Path): 量子化元の fp32 ONNX モデルのパス
+        quantized_model_path (Path): 量子化したモデルの保存先
+
+    Raises:
+        ImportError: ONNX Runtime または onnx が導入されていない場合
+    """
+
+    if quantized_model_path.is_file() is True:
+        return
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+    except ImportError as ex:
+        raise ImportError(
+            "the int8 tsqyomi model variant requires ONNX Runtime and onnx; "
+            "install `pyopenjtalk-plus[onnxruntime]` and `onnx`"
+        ) from ex
+
+    # 複数のプロセスが同時に量子化しても書きかけのファイルを読まないよう、一時ファイルから置き換える
+    quantized_model_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = quantized_model_path.with_name(
+        f"{quantized_model_path.name}.{os.getpid()}-{get_ident()}.tmp"
+    )
+    try:
+        quantize_dynamic(model_path, temporary_path, weight_type=QuantType.QInt8)
+        os.replace(temporary_path, quantized_model_path)
+    finally:
+        temporary_path.unlink(missing_ok=True)
+
+
 def _load_model_from_paths(
     model_path: Path,
     tokenizer_path: Path,
     metadata_path: Path,
     onnx_providers: Sequence[ONNXProvider] | None,
     allow_provider_fallback: bool,
+    revision: str,
+    max_batch_size: int,
+    batch_wait_seconds: float | None,
+    session_options: Any | None,
 ) -> TsqyomiModel:
     """
     ダウンロード済みのモデルファイルからモデルをロードする。
@@ -542,6 +1032,10 @@ def _load_model_from_paths(
         onnx_providers (Sequence[ONNXProvider] | None): ONNX Runtime の実行プロバイダ順
         allow_provider_fallback (bool): 最優先プロバイダが初期化に失敗したときに
             後続プロバイダでの継続を許可するか (デフォルト: True)
+        revision (str): モデルファイルの組を識別する文字列
+        max_batch_size (int): 1回の ONNX 実行に束ねる入力窓の最大数
+        batch_wait_seconds (float | None): スレッド間で入力窓を束ねるために待つ最大秒数
+        session_options (Any | None): `onnxruntime.InferenceSession` へ渡す `onnxruntime.SessionOptions`
 
     Returns:
         TsqyomiModel: 構築したモデル
@@ -581,6 +1075,7 @@ def _load_model_from_paths(
     # ONNX Runtime 推論セッションを初期化
     session = onnxruntime.InferenceSession(
         str(model_path),
+        sess_options=session_options,
         providers=resolved_providers,
     )
     _verify_session_providers(session, resolved_providers, allow_provider_fallback)
@@ -592,6 +1087,9 @@ def _load_model_from_paths(
         tokenizer,
         session,
         metadata,
+        revision,
+        max_batch_size=max_batch_size,
+        batch_wait_seconds=batch_wait_seconds,
     )
 
 
@@ -601,6 +1099,10 @@ def load_model(
     *,
     model_dir: str | Path | None = None,
     allow_provider_fallback: bool = True,
+    max_batch_size: int = 8,
+    batch_wait_seconds: float | None = None,
+    session_options: Any | None = None,
+    model_variant: ModelVariant = "fp32",
 ) -> None:
     """
     tsqyomi モデルを取得するか、ローカルディレクトリを参照し、プロセス全体へロードする。
@@ -613,13 +1115,28 @@ def load_model(
         allow_provider_fallback (bool): 最優先の Execution Provider がランタイム不備で
             初期化に失敗したとき、後続プロバイダでの継続を許可するか (デフォルト: True)
             CUDAExecutionProvider に厳密に固定したい際は False を指定する
+        max_batch_size (int): 1回の ONNX 実行にパディングして束ねる入力窓の最大数 (デフォルト: 8)
+        batch_wait_seconds (float | None): 複数スレッドから同時に届く推論を同じ ONNX 実行へ束ねるため、
+            後続の入力窓を待つ最大秒数。None の場合はスレッド間で束ねない (デフォルト: None)
+            多数のスレッドから `use_tsqyomi=True` の処理を並行して呼ぶサーバー用途では、
+            0.002 程度を指定すると1件あたりの待ち時間と引き換えに ONNX の実行回数を減らせる
+        session_options (Any | None): `onnxruntime.InferenceSession` へ渡す `onnxruntime.SessionOptions`
+            intra_op_num_threads / inter_op_num_threads によるスレッド数、graph_optimization_level、
+            enable_cpu_mem_arena によるメモリアリーナ、optimized_model_filepath による最適化済みモデルの保存などを指定できる
+            None の場合は ONNX Runtime の既定値を使う (デフォルト: None)
+        model_variant (ModelVariant): 使用するモデルの種類 (デフォルト: "fp32")
+            "int8" の場合は重みを int8 へ動的量子化したモデルを使う。初回のみ量子化を行い、
+            `model_dir` 指定時はそのディレクトリの model.int8.onnx に、それ以外は Hugging Face Hub の
+            キャッシュディレクトリに保存して再利用する。量子化には別途 `onnx` パッケージが必要
 
     NOTE:
         モデルが既にロード済み、または別スレッドがロード中の場合、
-        本呼び出しの `onnx_providers` と `model_dir` は無視され、既存モデルを共有する
+        本呼び出しの `onnx_providers` と `model_dir` などの設定は無視され、既存モデルを共有する
 
     Raises:
-        ImportError: tsqyomi / ONNX Runtime / huggingface_hub の追加依存が導入されていない場合
+        ImportError: tsqyomi / ONNX Runtime / huggingface_hub の追加依存、または int8 量子化に使う onnx が
+            導入されていない場合
+        ValueError: `model_variant` が未知の値の場合
         RuntimeError: 指定した Execution Provider が利用できない場合、
             または最優先プロバイダがセッションで有効化されず、`allow_provider_fallback` が False の場合
         FileNotFoundError: `model_dir` に必須アセットがない場合
@@ -627,6 +1144,9 @@ def load_model(
 
     global _is_model_loading, _loaded_model
 
+    if model_variant not in ("fp32", "int8"):
+        raise ValueError(f"unknown tsqyomi model variant: {model_variant}")
+
     with _lifecycle_condition:
         # 先行するロードがあれば完了を待ち、同じモデルのダウンロードと初期化を重複させない
         while _is_model_loading is True:
@@ -645,6 +1165,10 @@ def load_model(
             for asset_path in (model_path, tokenizer_path, metadata_path):
                 if asset_path.is_file() is False:
                     raise FileNotFoundError(f"tsqyomi model asset does not exist: {asset_path}")
+            if model_variant == "int8":
+                quantized_model_path = directory / _QUANTIZED_MODEL_FILE_NAME
+                _prepare_quantized_model(model_path, quantized_model_path)
+                model_path = quantized_model_path
 
             # ローカル配置のモデルファイルからモデルをロードする
             loaded_model = _load_model_from_paths(
@@ -653,10 +1177,15 @@ def load_model(
                 metadata_path,
                 onnx_providers,
                 allow_provider_fallback,
+                _local_model_revision(model_path, tokenizer_path, metadata_path),
+                max_batch_size,
+                batch_wait_seconds,
+                session_options,
             )
         else:
             # オプションの依存関係である huggingface_hub を遅延インポート
             try:
+                from huggingface_hub import constants as huggingface_hub_constants
                 from huggingface_hub import hf_hub_download
             except ImportError as ex:
                 raise ImportError(
@@ -676,13 +1205,31 @@ def load_model(
                 for asset_name, filename in _MODEL_FILES.items()
             }
 
+            # Hub のスナップショットは配布ファイルだけを保つため、量子化したモデルはリビジョンごとの別ディレクトリへ置く
+            model_path = downloaded_assets["model"]
+            revision = _MODEL_REVISION
+            if model_variant == "int8":
+                quantized_model_path = (
+                    Path(huggingface_hub_constants.HF_HUB_CACHE if cache_dir is None else cache_dir)
+                    / "tsqyomi-quantized"
+                    / _MODEL_REVISION
+                    / _QUANTIZED_MODEL_FILE_NAME
+                )
+                _prepare_quantized_model(model_path, quantized_model_path)
+                model_path = quantized_model_path
+                revision = f"{_MODEL_REVISION}-int8"
+
             # ダウンロード済みのモデルファイルからモデルをロードする
             loaded_model = _load_model_from_paths(
-                downloaded_assets["model"],
+                model_path,
                 downloaded_assets["tokenizer"],
                 downloaded_assets["metadata"],
                 onnx_providers,
                 allow_provider_fallback,
+                revision,
+                max_batch_size,
+                batch_wait_seconds,
+                session_options,
             )
     except BaseException:
         # 失敗時も待機中のロード呼び出しを解放し、次の呼び出しが再試行できる状態へ戻す
@@ -696,6 +1243,10 @@ def load_model(
         _loaded_model = loaded_model
         _is_model_loading = False
         _lifecycle_condition.notify_all()
+    # モデルの公開後に世代を進め、フロントエンド結果キャッシュが旧モデルの推論結果を返さないようにする
+    bump_dictionary_generation()
+    # 旧モデルの予測はキーのモデル番号が異なり参照されないが、メモリを占有し続けないよう破棄する
+    _prediction_cache.clear()
 
 
 def unload_model() -> None:
@@ -713,6 +1264,8 @@ def unload_model() -> None:
         while _is_model_loading is True:
             _lifecycle_condition.wait()
         _loaded_model = None
+    bump_dictionary_generation()
+    _prediction_cache.clear()
 
 
 def is_model_loaded() -> bool:
@@ -745,3 +1298,43 @@ def get_loaded_model() -> TsqyomiModel:
                 "tsqyomi model is not loaded; call pyopenjtalk.tsqyomi.load_model() first"
             )
         return _loaded_model
+
+
+def set_prediction_cache_size(max_size: int) -> None:
+    """
+    `TsqyomiModel.predict()` の予測キャッシュの最大件数を変更する。
+    定型文など同じ文脈の対象を繰り返し推論する場合、2回目以降は ONNX の実行を省略して予測を返す。
+    注意: この関数を実行すると、tsqyomi モジュールのグローバル状態が変更される。
+
+    Args:
+        max_size (int): キャッシュする入力窓の最大件数。0 ならキャッシュを無効化して全項目を破棄する (デフォルトでは無効)
+
+    Raises:
+        ValueError: 最大件数が0未満の場合
+
+    NOTE:
+        キャッシュキーは入力窓のトークン ID 列・窓内の対象位置・対象の表層と候補発音・モデルから計算したハッシュ値で、
+        同じ入力窓に対しては ONNX の実行結果と同じ予測を返す。
+        `load_model()` / `unload_model()` の呼び出し時には全項目を破棄する (統計情報も初期化される)
+    """
+
+    _prediction_cache.resize(max_size)
+
+
+def clear_prediction_cache() -> None:
+    """
+    `TsqyomiModel.predict()` の予測キャッシュの全項目と統計情報を破棄する。
+    """
+
+    _prediction_cache.clear()
+
+
+def get_prediction_cache_stats() -> CacheStats:
+    """
+    `TsqyomiModel.predict()` の予測キャッシュの統計情報を返す。
+
+    Returns:
+        CacheStats: ヒット数・ミス数・破棄数・現在の件数・最大件数
+    """
+
+    return _prediction_cache.stats()
@@ -181,3 +181,62 @@ class UserDictionaryEntry(TypedDict):
 
     dic_path: str  # ユーザー辞書ファイル (.dic) のパス
     is_reading_protected: bool  # tsqyomi による MeCab feature 差し替えから保護するか
+
+
+class CacheStats(TypedDict):
+    """
+    LRU キャッシュの統計情報を表す型。
+    """
+
+    hits: int  # キャッシュから結果を返した回数
+    misses: int  # キャッシュに結果がなく処理を実行した回数
+    evictions: int  # 最大件数を超えたため破棄した項目数
+    size: int  # 現在キャッシュしている項目の合計サイズ (波形キャッシュではバイト数、それ以外では項目数)
+    max_size: int  # キャッシュする項目の合計サイズの上限 (0 ならキャッシュは無効)
+
+
+class StageStats(TypedDict):
+    """
+    処理ステージごとの所要時間の統計情報を表す型。
+    """
+
+    count: int  # ステージを実行した回数
+    total_seconds: float  # 所要時間の合計 (秒)
+    min_seconds: float  # 1回あたりの所要時間の最小値 (秒)
+    max_seconds: float  # 1回あたりの所要時間の最大値 (秒)
+
+
+class LatencyHistogramStats(TypedDict):
+    """
+    待ち時間・保持時間などの分布を表す型。
+    """
+
+    count: int  # 記録した回数
+    total_seconds: float  # 記録した時間の合計 (秒)
+    max_seconds: float  # 記録した時間の最大値 (秒)
+    # profiling.HISTOGRAM_BUCKET_BOUNDS の各上限以下 (直前の上限より大きい) に収まった回数
+    ## 末尾の要素は最後の上限を超えた回数
+    bucket_counts: list[int]
+
+
+class LockStats(TypedDict):
+    """
+    ロックまたはインスタンスプールの借り出しの統計情報を表す型。
+    """
+
+    acquisitions: int  # 借り出した回数
+    contended: int  # 空きがなく、他の借り出しの返却などを待機した回数
+    active_leases: int  # 現在借り出されている数
+    max_active_leases: int  # 同時に借り出されていた数の最大値
+    wait: LatencyHistogramStats  # 借り出しを要求してから借り出せるまでの時間
+    hold: LatencyHistogramStats  # 借り出してから返却するまでの時間
+    drain: LatencyHistogramStats  # 交換・縮小時に進行中の借り出しの返却を待った時間
+
+
+class PoolStats(LockStats):
+    """
+    インスタンスプールの統計情報を表す型。
+    """
+
+    pool_size: int  # プールが保持するインスタンスの上限数
+    instance_count: int  # 生成中を含む、プールが管理しているインスタンスの数
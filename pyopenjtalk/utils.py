@@ -1,12 +1,16 @@
+from __future__ import annotations
+
 import unicodedata
 from threading import Lock, local
-from typing import Any, Literal
-
-from sudachipy import dictionary, tokenizer
+from typing import TYPE_CHECKING, Any, Literal
 
 from .openjtalk import OpenJTalk
 from .types import NJDFeature
-from .yomi_model.nani_predict import predict
+from .yomi_model.nani_predict import predict_batch
+
+
+if TYPE_CHECKING:
+    from sudachipy import dictionary, tokenizer
 
 
 # 小書き仮名の集合 (モーラ分割で前の文字と結合される文字)
@@ -160,6 +164,9 @@ def _get_sudachi_tokenizer() -> tokenizer.Tokenizer:
     if sudachi_tokenizer is None:
         with _SUDACHI_DICTIONARY_LOCK:
             if _SUDACHI_DICTIONARY is None:
+                # Sudachi を使わない呼び出し (use_sudachi_kanji_yomi=False など) では import しない
+                from sudachipy import dictionary
+
                 _SUDACHI_DICTIONARY = dictionary.Dictionary()
         sudachi_tokenizer = _SUDACHI_DICTIONARY.create()
         _SUDACHI_TOKENIZER_LOCAL.tokenizer = sudachi_tokenizer
@@ -308,6 +315,8 @@ def sudachi_analyze(text: str, target_kanji_set: frozenset[str]) -> list[list[st
         return []
 
     text = text.replace("ー", "")
+    from sudachipy import tokenizer
+
     tokenizer_obj = _get_sudachi_tokenizer()
     mode = tokenizer.Tokenizer.SplitMode.C
     m_list = tokenizer_obj.tokenize(text, mode)
@@ -353,6 +362,9 @@ def predict_nani_reading(njd_features: list[NJDFeature]) -> list[NJDFeature]:
     if any(feature["orig"] == "何" for feature in njd_features) is False:
         return njd_features
 
+    # モデル判定が必要な「何」は最後にまとめて推定し、ONNX Runtime の呼び出しを1回に抑える
+    model_target_indices: list[int] = []
+    model_target_next_features: list[NJDFeature | None] = []
     for feature_index, current_feature in enumerate(njd_features):
         if current_feature["orig"] != "何":
             continue
@@ -370,18 +382,39 @@ def predict_nani_reading(njd_features: list[NJDFeature]) -> list[NJDFeature]:
             and next_feature["pos_group1"] == "格助詞"
         )
         if is_high_confidence_nani is True:
-            is_read_nan = 0
+            _set_nani_reading(current_feature, 0)
         elif should_keep_default_nan is True:
-            is_read_nan = 1
+            _set_nani_reading(current_feature, 1)
         else:
-            is_read_nan = predict([next_feature])
-        yomi = "ナン" if is_read_nan == 1 else "ナニ"
-        current_feature["pron"] = yomi
-        current_feature["read"] = yomi
+            model_target_indices.append(feature_index)
+            # 「何何を」のように後続も「何」の場合、後続はこのループ内で読みが書き換えられるため、
+            # 推定時点ではなく登録時点の特徴量をモデルに渡せるよう複製しておく
+            model_target_next_features.append(
+                next_feature.copy() if next_feature is not None else None
+            )
+
+    if len(model_target_indices) > 0:
+        predictions = predict_batch(model_target_next_features)
+        for feature_index, is_read_nan in zip(model_target_indices, predictions, strict=True):
+            _set_nani_reading(njd_features[feature_index], is_read_nan)
 
     return njd_features
 
 
+def _set_nani_reading(feature: NJDFeature, is_read_nan: int) -> None:
+    """
+    「何」の NJD feature に推定した読みを設定する。
+
+    Args:
+        feature (NJDFeature): 「何」の NJD feature
+        is_read_nan (int): 1 ならナン、0 ならナニ
+    """
+
+    yomi = "ナン" if is_read_nan == 1 else "ナニ"
+    feature["pron"] = yomi
+    feature["read"] = yomi
+
+
 def suppress_unnatural_auxiliary_u_long_vowel(
     njd_features: list[NJDFeature],
 ) -> list[NJDFeature]:
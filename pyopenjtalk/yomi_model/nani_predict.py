@@ -1,70 +1,422 @@
+import hashlib
+import os
+import warnings
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Any, cast
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Literal, cast
 
 import numpy as np
+import numpy.typing as npt
 
+from ..cache import LRUCache
 from ..types import NJDFeature
 
 
+if TYPE_CHECKING:
+    from onnxruntime import InferenceSession
+
+
 X_COLS = ["pos", "pos_group1", "pos_group2", "pron", "ctype", "cform"]
 MODEL_DIR = Path(__file__).parent
+LOOKUP_TABLE_PATH = MODEL_DIR / "nani_table.npz"
 
-# ONNX モデルをロード
-# 非常に軽量なモデルのため、import 時に ONNX モデルをロードするオーバーヘッドはほとんどない
-try:
-    from onnxruntime import InferenceSession
+GraphOptimizationLevel = Literal["disable", "basic", "extended", "all"]
+
+
+class NaniLookupTable:
+    """
+    「何」読み推定モデルの全入力に対する推定結果を保持する事前計算済みの判定表。
+    OneHotEncoder は未知のカテゴリを全て0の列に変換するため、各列の値は「既知カテゴリのいずれか」か
+    「未知」に集約され、入力空間は有限となる。その全組み合わせを scripts/build_nani_lookup_table.py で
+    ONNX モデルに通した結果を1組み合わせ1ビットで保持し、ONNX Runtime を使わずに推定結果を引く。
+    """
+
+    def __init__(self, categories: Sequence[Sequence[str]], packed_predictions: bytes) -> None:
+        """
+        判定表を初期化する。
+
+        Args:
+            categories (Sequence[Sequence[str]]): X_COLS の各列について OneHotEncoder が既知とするカテゴリ
+            packed_predictions (bytes): 各列のカテゴリ番号 (未知はカテゴリ数) を X_COLS 順の混合基数として
+                並べた全組み合わせの推定結果 (1 ならナン) を、np.packbits() でビッグエンディアンに詰めたもの
+
+        Raises:
+            ValueError: カテゴリの列数または推定結果のビット数が入力空間と一致しない場合
+        """
+
+        if len(categories) != len(X_COLS):
+            raise ValueError(f"Expected categories for {len(X_COLS)} columns: {len(categories)}")
+        self._category_indices = [
+            {category: index for index, category in enumerate(column_categories)}
+            for column_categories in categories
+        ]
+        # 列ごとに「未知」の番号を末尾に1つ追加した混合基数で組み合わせ番号を計算する
+        self._unknown_indices = [len(column_categories) for column_categories in categories]
+        self._strides: list[int] = []
+        combination_count = 1
+        for unknown_index in reversed(self._unknown_indices):
+            self._strides.insert(0, combination_count)
+            combination_count *= unknown_index + 1
+        if len(packed_predictions) != (combination_count + 7) // 8:
+            raise ValueError(
+                f"Expected {combination_count} packed predictions: {len(packed_predictions) * 8} bits"
+            )
+        self._packed_predictions = packed_predictions
+
+    def lookup(self, njd: NJDFeature) -> int:
+        """
+        直後形態素の NJDFeature に対する「何」の読みの推定結果を返す。
+
+        Args:
+            njd (NJDFeature): 「何」の直後 1 形態素分の NJDFeature
+
+        Returns:
+            int: 0 ならナニ、1 ならナン
+        """
+
+        combination_index = 0
+        for column, category_indices, unknown_index, stride in zip(
+            X_COLS, self._category_indices, self._unknown_indices, self._strides, strict=True
+        ):
+            combination_index += category_indices.get(njd[column], unknown_index) * stride
+        packed_byte = self._packed_predictions[combination_index >> 3]
+        return (packed_byte >> (7 - (combination_index & 7))) & 1
+
+
+def compute_model_digest() -> str:
+    """
+    判定表の作成元である ONNX モデル (エンコーダーと分類器) のダイジェストを計算する。
+
+    Returns:
+        str: nani_enc.onnx と nani_model.onnx の内容から計算した SHA-256 の16進文字列
+    """
+
+    digest = hashlib.sha256()
+    for model_name in ("nani_enc.onnx", "nani_model.onnx"):
+        digest.update((MODEL_DIR / model_name).read_bytes())
+    return digest.hexdigest()
+
+
+def save_lookup_table(
+    path: Path,
+    categories: Sequence[Sequence[str]],
+    predictions: npt.NDArray[np.bool_],
+    model_digest: str,
+) -> None:
+    """
+    判定表を NumPy の圧縮アーカイブとして保存する。
 
-    enc_session = InferenceSession(
-        MODEL_DIR / "nani_enc.onnx",
-        providers=["CPUExecutionProvider"],
+    Args:
+        path (Path): 保存先のパス
+        categories (Sequence[Sequence[str]]): X_COLS の各列について OneHotEncoder が既知とするカテゴリ
+        predictions (npt.NDArray[np.bool_]): 全組み合わせの推定結果 (True ならナン)
+        model_digest (str): 作成元の ONNX モデルのダイジェスト
+    """
+
+    column_categories = {
+        f"categories_{column}": np.array(list(categories[column_index]), dtype=np.str_)
+        for column_index, column in enumerate(X_COLS)
+    }
+    np.savez_compressed(
+        path,
+        predictions=np.packbits(predictions),
+        model_digest=np.array(model_digest, dtype=np.str_),
+        **column_categories,  # pyright: ignore[reportArgumentType]
     )
-    model_session = InferenceSession(
-        MODEL_DIR / "nani_model.onnx",
-        providers=["CPUExecutionProvider"],
+
+
+def load_lookup_table(path: Path = LOOKUP_TABLE_PATH) -> NaniLookupTable | None:
+    """
+    判定表を読み込む。
+    判定表が存在しない場合や、作成元の ONNX モデルと現在のモデルが異なる場合は None を返す。
+
+    Args:
+        path (Path): 判定表のパス (デフォルト: LOOKUP_TABLE_PATH)
+
+    Returns:
+        NaniLookupTable | None: 読み込んだ判定表。利用できない場合は None
+    """
+
+    if path.exists() is False:
+        return None
+    with np.load(path, allow_pickle=False) as archive:
+        # モデルだけが差し替えられた場合に、古いモデルの推定結果を返さないようにする
+        if str(archive["model_digest"]) != compute_model_digest():
+            return None
+        categories = [archive[f"categories_{column}"].tolist() for column in X_COLS]
+        packed_predictions = archive["predictions"].tobytes()
+    return NaniLookupTable(categories, packed_predictions)
+
+
+# 判定表は初回の推定時に読み込む
+_lookup_table: NaniLookupTable | None = None
+_lookup_table_loaded = False
+_lookup_table_lock = Lock()
+
+# 判定表を利用できない場合に ONNX モデルで推定した結果を、直後形態素の特徴量ごとに保持する
+_fallback_predictions: LRUCache[tuple[str, ...], int] = LRUCache(4096)
+
+
+def _get_lookup_table() -> NaniLookupTable | None:
+    """
+    判定表を初回呼び出し時に読み込んで返す。
+
+    Returns:
+        NaniLookupTable | None: 判定表。利用できない場合は None
+    """
+
+    global _lookup_table, _lookup_table_loaded
+
+    if _lookup_table_loaded is True:
+        return _lookup_table
+    with _lookup_table_lock:
+        if _lookup_table_loaded is False:
+            _lookup_table = load_lookup_table()
+            _lookup_table_loaded = True
+    return _lookup_table
+
+
+# ONNX Runtime の推論セッションは、判定表を利用できない場合の初回推定時に作成する
+## import 時に作成すると、判定表で足りる場合も ONNX Runtime の初期化とスレッドプールの起動が発生するため
+_session_configuration: dict[str, Any] = {
+    "intra_op_num_threads": 1,
+    "inter_op_num_threads": 1,
+    "graph_optimization_level": "all",
+    "optimized_model_dir": None,
+}
+_sessions: tuple["InferenceSession", "InferenceSession"] | None = None
+_sessions_loaded = False
+_sessions_lock = Lock()
+
+
+def configure_sessions(
+    *,
+    intra_op_num_threads: int = 1,
+    inter_op_num_threads: int = 1,
+    graph_optimization_level: GraphOptimizationLevel = "all",
+    optimized_model_dir: str | Path | None = None,
+) -> None:
+    """
+    「何」読み推定モデルの ONNX Runtime 推論セッションの設定を変更する。
+    作成済みのセッションは破棄され、次回の推定時に新しい設定で作成し直される。
+
+    Args:
+        intra_op_num_threads (int): 演算子内の並列化に使うスレッド数。0 なら ONNX Runtime の既定値 (物理コア数) を使う
+            非常に軽量なモデルのため、既定ではワーカープロセスとの過剰な並列化を避けて1とする (デフォルト: 1)
+        inter_op_num_threads (int): 演算子間の並列化に使うスレッド数。0 なら ONNX Runtime の既定値を使う (デフォルト: 1)
+        graph_optimization_level (GraphOptimizationLevel): グラフ最適化のレベル (デフォルト: `"all"`)
+        optimized_model_dir (str | Path | None): 最適化済みモデルの保存先ディレクトリ
+            指定すると初回のセッション作成時に最適化済みモデルを保存し、以降はそれを読み込んでグラフ最適化を省略する
+            None の場合は保存しない (デフォルト: None)
+
+    Raises:
+        ValueError: スレッド数が0未満の場合
+    """
+
+    global _sessions, _sessions_loaded
+
+    if intra_op_num_threads < 0 or inter_op_num_threads < 0:
+        raise ValueError(
+            "Thread counts must be greater than or equal to 0: "
+            f"intra_op_num_threads={intra_op_num_threads}, "
+            f"inter_op_num_threads={inter_op_num_threads}"
+        )
+    with _sessions_lock:
+        _session_configuration.update(
+            intra_op_num_threads=intra_op_num_threads,
+            inter_op_num_threads=inter_op_num_threads,
+            graph_optimization_level=graph_optimization_level,
+            optimized_model_dir=None if optimized_model_dir is None else Path(optimized_model_dir),
+        )
+        _sessions = None
+        _sessions_loaded = False
+
+
+def get_sessions() -> tuple["InferenceSession", "InferenceSession"] | None:
+    """
+    「何」読み推定モデルのエンコーダーと分類器の推論セッションを、初回呼び出し時に作成して返す。
+
+    Returns:
+        tuple[InferenceSession, InferenceSession] | None: エンコーダーと分類器の推論セッション。
+            ONNX Runtime がインストールされていない場合は None
+    """
+
+    global _sessions, _sessions_loaded
+
+    if _sessions_loaded is True:
+        return _sessions
+    with _sessions_lock:
+        if _sessions_loaded is True:
+            return _sessions
+        try:
+            import onnxruntime
+        except ImportError:
+            # ONNX Runtime は onnxruntime (無印, CPU 版)・onnxruntime-gpu (CUDA 版)・onnxruntime-directml (DirectML 版) などが提供されている
+            # ユーザーはこのうちいずれかのパッケージ「のみ」をインストールする必要があるため、ライブラリ側からは依存関係を明示できない
+            warnings.warn(
+                "ONNX Runtime is not installed, so nani prediction without the lookup table "
+                "is disabled. Please install ONNX Runtime by "
+                "`pip install pyopenjtalk-plus[onnxruntime]`",
+                RuntimeWarning,
+                stacklevel=3,
+            )
+            _sessions = None
+        else:
+            _sessions = (
+                _create_session(onnxruntime, "nani_enc.onnx"),
+                _create_session(onnxruntime, "nani_model.onnx"),
+            )
+        _sessions_loaded = True
+        return _sessions
+
+
+def _create_session(onnxruntime: Any, model_name: str) -> "InferenceSession":
+    """
+    現在の設定で ONNX Runtime の推論セッションを作成する。呼び出し側で _sessions_lock を保持すること。
+
+    Args:
+        onnxruntime (Any): import 済みの ONNX Runtime モジュール
+        model_name (str): MODEL_DIR 内のモデルファイル名
+
+    Returns:
+        InferenceSession: 作成した推論セッション
+    """
+
+    optimization_level = _session_configuration["graph_optimization_level"]
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = _session_configuration["intra_op_num_threads"]
+    session_options.inter_op_num_threads = _session_configuration["inter_op_num_threads"]
+    session_options.graph_optimization_level = {
+        "disable": onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }[optimization_level]
+
+    model_path = MODEL_DIR / model_name
+    optimized_model_dir: Path | None = _session_configuration["optimized_model_dir"]
+    if optimized_model_dir is None:
+        return onnxruntime.InferenceSession(
+            str(model_path), sess_options=session_options, providers=["CPUExecutionProvider"]
+        )
+
+    # 最適化結果はモデル・ONNX Runtime のバージョン・最適化レベルごとに異なるため、ファイル名で区別する
+    optimized_model_path = optimized_model_dir / (
+        f"{model_path.stem}.{compute_model_digest()[:16]}."
+        f"{onnxruntime.__version__}.{optimization_level}.onnx"
     )
-except ImportError:
-    # ONNX Runtime がインストールされていない場合は、モデルをロードしない
-    # ONNX Runtime は onnxruntime (無印, CPU 版)・onnxruntime-gpu (CUDA 版)・onnxruntime-directml (DirectML 版) などが提供されている
-    # ユーザーはこのうちいずれかのパッケージ「のみ」をインストールする必要があるため、ライブラリ側からは依存関係を明示できない
-    print("Warning: ONNX Runtime is not installed. Nani prediction will be disabled.")
-    print("Please install ONNX Runtime by `pip install pyopenjtalk-plus[onnxruntime]`")
-    enc_session = None
-    model_session = None
+    if optimized_model_path.exists():
+        session_options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+        )
+        return onnxruntime.InferenceSession(
+            str(optimized_model_path),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"],
+        )
+
+    # 複数プロセスが同時に保存しても書きかけのファイルを読み込まないよう、一時ファイルから置き換える
+    optimized_model_dir.mkdir(parents=True, exist_ok=True)
+    temporary_path = optimized_model_path.with_name(
+        f"{optimized_model_path.name}.{os.getpid()}.tmp"
+    )
+    session_options.optimized_model_filepath = str(temporary_path)
+    session = onnxruntime.InferenceSession(
+        str(model_path), sess_options=session_options, providers=["CPUExecutionProvider"]
+    )
+    os.replace(temporary_path, optimized_model_path)
+    return session
 
 
 def predict(input_njd: list[NJDFeature | None]) -> int:
     """
-    直後形態素の文脈から「何」の読み (ナニ/ナン) を ONNX モデルで推定する。
+    直後形態素の文脈から「何」の読み (ナニ/ナン) を推定する。
+    複数の「何」をまとめて推定する場合は predict_batch() を使う。
 
     Args:
         input_njd (list[NJDFeature | None]): 直後 1 形態素分の NJDFeature。
             文末など後続がない場合は `[None]`
 
     Returns:
-        int: 0 ならナニ、1 ならナン。ONNX Runtime 未導入時は常に 0
+        int: 0 ならナニ、1 ならナン。判定表と ONNX Runtime がいずれも利用できない場合は常に 0
+    """
+
+    return predict_batch(input_njd[:1])[0]
+
+
+def predict_batch(next_njds: Sequence[NJDFeature | None]) -> list[int]:
     """
+    複数の「何」の読み (ナニ/ナン) を、それぞれの直後形態素の文脈からまとめて推定する。
+    事前計算済みの判定表 (NaniLookupTable) から推定結果を引き、判定表を利用できない場合のみ ONNX モデルを使う。
+    ONNX モデルを使う場合は、推定が必要な文脈を1つの入力行列にまとめ、エンコーダーと分類器をそれぞれ1回だけ実行する。
+
+    Args:
+        next_njds (Sequence[NJDFeature | None]): 各「何」の直後 1 形態素分の NJDFeature のリスト。
+            文末など後続がない場合は None
+
+    Returns:
+        list[int]: next_njds と同じ順序の推定結果。0 ならナニ、1 ならナン。
+            後続がない場合と、判定表と ONNX Runtime がいずれも利用できない場合は 0
+    """
+
+    predictions = [0] * len(next_njds)
+
+    # 後続がない「何」はモデルに入力せず、ナニとする
+    target_indices = [index for index, njd in enumerate(next_njds) if njd is not None]
+    if len(target_indices) == 0:
+        return predictions
+
+    lookup_table = _get_lookup_table()
+    if lookup_table is not None:
+        for index in target_indices:
+            predictions[index] = lookup_table.lookup(cast(NJDFeature, next_njds[index]))
+        return predictions
 
     # ONNX Runtime がインストールされていない場合は常に 0 を返す
-    if enc_session is None or model_session is None:
-        return 0
-
-    if input_njd == [None]:
-        return 0
-    else:
-        # 入力データを準備
-        input_data = np.array(
-            [[njd[col] for col in X_COLS] for njd in input_njd if njd is not None]
-        )
+    sessions = get_sessions()
+    if sessions is None:
+        return predictions
+    enc_session, model_session = sessions
 
-        # OneHotEncoder で変換
-        enc_input = {"input": input_data}
-        enc_output = enc_session.run(None, enc_input)
-        encoded_feature_array = np.asarray(cast(Any, enc_output[0]), dtype=np.float32)
+    # 同じ特徴量の文脈は一度だけ推定する
+    feature_rows_by_index = {
+        index: tuple(cast(NJDFeature, next_njds[index])[col] for col in X_COLS)
+        for index in target_indices
+    }
+    uncached_rows: list[tuple[str, ...]] = []
+    for index, feature_row in feature_rows_by_index.items():
+        cached_prediction = _fallback_predictions.get(feature_row)
+        if cached_prediction is not None:
+            predictions[index] = cached_prediction
+        elif feature_row not in uncached_rows:
+            uncached_rows.append(feature_row)
+    if len(uncached_rows) == 0:
+        return predictions
 
-        # RandomForestClassifier の二クラス確率を取得
-        ## ORT の二値ラベル生成はバージョンによって解釈が異なるため、明示された確率から判定する
-        model_input = {"input": encoded_feature_array}
-        model_output = model_session.run(None, model_input)
-        probability_array = np.asarray(cast(Any, model_output[0]), dtype=np.float32)
+    # 入力データを準備
+    input_data = np.array(uncached_rows)
 
-        return int(np.argmax(probability_array[0]))
+    # OneHotEncoder で変換
+    enc_input = {"input": input_data}
+    enc_output = enc_session.run(None, enc_input)
+    encoded_feature_array = np.asarray(cast(Any, enc_output[0]), dtype=np.float32)
+
+    # RandomForestClassifier の二クラス確率を取得
+    ## ORT の二値ラベル生成はバージョンによって解釈が異なるため、明示された確率から判定する
+    model_input = {"input": encoded_feature_array}
+    model_output = model_session.run(None, model_input)
+    probability_array = np.asarray(cast(Any, model_output[0]), dtype=np.float32)
+
+    row_predictions = {
+        feature_row: int(prediction)
+        for feature_row, prediction in zip(
+            uncached_rows, np.argmax(probability_array, axis=1).tolist(), strict=True
+        )
+    }
+    for feature_row, prediction in row_predictions.items():
+        _fallback_predictions.put(feature_row, prediction)
+    for index, feature_row in feature_rows_by_index.items():
+        if feature_row in row_predictions:
+            predictions[index] = row_predictions[feature_row]
+    return predictions
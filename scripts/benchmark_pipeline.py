@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+フロントエンド処理と音声合成の各経路について、入力の長さとスレッド数ごとのスループットとレイテンシを計測し、
+結果を JSON ファイルへ保存する。
+
+計測ケースごとに新しいプロセスを起動し、短文・中程度の段落・文書長の3種類のコーパスを、
+指定したスレッド数で繰り返し処理する。1秒あたりの処理文数・1呼び出しあたりのレイテンシ (p50 / p99)・
+最大 RSS を記録し、--compare で以前のコミットの結果と比較できる。
+(最大 RSS の取得に resource モジュールを使うため、Windows では動作しない)
+
+Usage:
+    uv run python scripts/benchmark_pipeline.py
+    uv run python scripts/benchmark_pipeline.py --cases run_frontend make_label --threads 1 4
+    uv run python scripts/benchmark_pipeline.py --with-tsqyomi --output results.json
+    uv run python scripts/benchmark_pipeline.py --compare benchmark_results/abc1234.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Barrier, local
+from typing import Any
+
+
+# 短文: 対話や UI の読み上げを想定した1文単位の入力
+SHORT_TEXTS = [
+    "こんにちは。",
+    "今日はいい天気ですね。",
+    "何の話をしていたんだっけ？",
+    "明日の会議は午前十時から第三会議室で行います。",
+    "東京都の人口は約千四百万人です。",
+    "彼女は駅前の本屋で新しい小説を二冊買った。",
+    "この製品は2024年4月1日に発売される予定です。",
+    "はい。",
+]
+
+# 中程度: ニュース記事やチャットの応答を想定した段落単位の入力
+MEDIUM_TEXTS = [
+    "音声合成の品質を評価するため、様々な文章を読み上げてもらいました。"
+    "その結果、固有名詞や数字を含む文では読み間違いが多いことが分かりました。"
+    "今後は辞書の拡充と読み推定モデルの改良を進める予定です。",
+    "昨日の夕方から降り始めた雨は、今朝になっても止む気配がありません。"
+    "気象庁によると、風が強い地域では午後にかけて警報が出る恐れがあるそうです。"
+    "外出の際は、交通機関の運行状況を確認してください。",
+    "このライブラリは、日本語のテキストから音素列とアクセント情報を推定します。"
+    "方言や話し言葉の表現も、ある程度は正しく処理できます。"
+    "何か問題が見つかった場合は、再現手順を添えて報告してください。",
+]
+
+# 文書長: 記事全体の一括処理を想定した、MeCab の入力バッファに収まる範囲の長い入力
+DOCUMENT_TEXTS = ["".join(MEDIUM_TEXTS * 6)]
+
+CORPORA: dict[str, list[str]] = {
+    "short": SHORT_TEXTS,
+    "medium": MEDIUM_TEXTS,
+    "document": DOCUMENT_TEXTS,
+}
+
+# 1テキストに含まれる文数を数えるための文末記号
+_SENTENCE_END_PATTERN = re.compile(r"[。．！？!?]")
+
+# run_frontend() のオプションの組み合わせ
+## tsqyomi はモデルのロードが必要なため、--with-tsqyomi 指定時のみ計測する
+FRONTEND_OPTION_CASES: dict[str, dict[str, bool]] = {
+    "run_frontend": {},
+    "run_frontend[vanilla]": {"use_vanilla": True},
+    "run_frontend[no_sudachi_no_nani]": {"use_sudachi_kanji_yomi": False, "predict_nani": False},
+    "run_frontend[sudachi_only]": {"predict_nani": False},
+    "run_frontend[nani_only]": {"use_sudachi_kanji_yomi": False},
+    "run_frontend[tsqyomi]": {"use_tsqyomi": True},
+}
+
+CASE_NAMES = [
+    "run_mecab",
+    *FRONTEND_OPTION_CASES,
+    "make_label",
+    "g2p_mapping",
+    "run_mecab_nbest_features",
+    "analyze_mecab_candidates",
+    "tts",
+]
+
+TSQYOMI_CASE_NAMES = frozenset({"run_frontend[tsqyomi]"})
+
+
+def count_sentences(text: str) -> int:
+    """
+    テキストに含まれる文数を返す。
+
+    Args:
+        text (str): 入力テキスト
+
+    Returns:
+        int: 文末記号の数 (文末記号がない場合は1)
+    """
+
+    return max(1, len(_SENTENCE_END_PATTERN.findall(text)))
+
+
+def build_case_function(case: str) -> Callable[[str], object]:
+    """
+    計測ケースに対応する、1テキストを処理する関数を返す。
+
+    Args:
+        case (str): 計測ケース名
+
+    Returns:
+        Callable[[str], object]: 1テキストを処理する関数 (複数スレッドから同時に呼び出せる)
+    """
+
+    import pyopenjtalk
+    from pyopenjtalk.openjtalk import MeCabModel, OpenJTalk
+
+    if case == "run_mecab":
+        return pyopenjtalk.run_mecab
+    if case in FRONTEND_OPTION_CASES:
+        frontend_options = FRONTEND_OPTION_CASES[case]
+        return lambda text: pyopenjtalk.run_frontend(text, **frontend_options)
+    if case == "make_label":
+        # フロントエンド処理を除いたラベル生成のみを計測するため、NJD features を事前に計算しておく
+        features_by_text: dict[str, list[pyopenjtalk.NJDFeature]] = {}
+        for texts in CORPORA.values():
+            for text in texts:
+                features_by_text[text] = pyopenjtalk.run_frontend(text)
+        return lambda text: pyopenjtalk.make_label(features_by_text[text])
+    if case == "g2p_mapping":
+        return pyopenjtalk.g2p_mapping
+    if case == "run_mecab_nbest_features":
+        return pyopenjtalk.run_mecab_nbest_features
+    if case == "analyze_mecab_candidates":
+        # モジュールレベルの API がないため、辞書を共有するスレッドごとの OpenJTalk インスタンスで計測する
+        mecab_model = MeCabModel(pyopenjtalk.OPEN_JTALK_DICT_DIR)
+        thread_state = local()
+        multi_read_kanji = frozenset(pyopenjtalk.MULTI_READ_KANJI_LIST)
+
+        def analyze(text: str) -> object:
+            jtalk = getattr(thread_state, "jtalk", None)
+            if jtalk is None:
+                jtalk = OpenJTalk(mecab_model=mecab_model)
+                thread_state.jtalk = jtalk
+            normalized_text = jtalk.normalize_for_mecab(text)
+            target_spans = [
+                (index, index + 1)
+                for index, character in enumerate(normalized_text)
+                if character in multi_read_kanji
+            ]
+            # tsqyomi と同じく、対象がない入力は候補グラフを作らず通常の解析だけを行う
+            if len(target_spans) == 0:
+                return jtalk.run_mecab_detailed(normalized_text)
+            return jtalk.analyze_mecab_candidates(normalized_text, target_spans)
+
+        return analyze
+    if case == "tts":
+        return pyopenjtalk.tts
+    raise ValueError(f"Unknown benchmark case: {case}")
+
+
+def percentile(sorted_values: list[float], ratio: float) -> float:
+    """
+    昇順に並んだ値の百分位数を返す (最近接順位法)。
+
+    Args:
+        sorted_values (list[float]): 昇順に並んだ値
+        ratio (float): 0 から 1 の割合
+
+    Returns:
+        float: 百分位数
+    """
+
+    index = min(len(sorted_values) - 1, max(0, int(len(sorted_values) * ratio + 0.5) - 1))
+    return sorted_values[index]
+
+
+def run_case(case: str, corpus: str, threads: int, min_seconds: float) -> dict[str, Any]:
+    """
+    現在のプロセスで計測ケースを実行する。
+
+    Args:
+        case (str): 計測ケース名
+        corpus (str): コーパス名
+        threads (int): 並行して処理するスレッド数
+        min_seconds (float): 各スレッドが処理を繰り返す最小時間 (秒)
+
+    Returns:
+        dict[str, Any]: 計測結果
+    """
+
+    import resource
+
+    import pyopenjtalk
+
+    pyopenjtalk.set_global_jtalk_pool_size(threads)
+    pyopenjtalk.set_global_htsengine_pool_size(threads)
+    if case in TSQYOMI_CASE_NAMES:
+        from pyopenjtalk import tsqyomi
+
+        tsqyomi.load_model()
+    texts = CORPORA[corpus]
+    process_text = build_case_function(case)
+    # 辞書やモデルの読み込みなど初回のみのコストを計測から除外する
+    ## 最大 RSS にケースで使わないコンポーネントが含まれないよう、プールの生成以外はケース自身の処理で初期化する
+    pyopenjtalk.warmup(["openjtalk", "htsengine"] if case == "tts" else ["openjtalk"], threads)
+    for text in texts:
+        process_text(text)
+
+    barrier = Barrier(threads)
+
+    def worker(worker_index: int) -> tuple[list[float], int]:
+        latencies: list[float] = []
+        sentence_count = 0
+        barrier.wait()
+        started_at = time.perf_counter()
+        # スレッドごとに開始位置をずらし、同じテキストの処理が重ならないようにする
+        text_index = worker_index
+        while time.perf_counter() - started_at < min_seconds or len(latencies) < len(texts):
+            text = texts[text_index % len(texts)]
+            call_started_at = time.perf_counter()
+            process_text(text)
+            latencies.append(time.perf_counter() - call_started_at)
+            sentence_count += count_sentences(text)
+            text_index += 1
+        return latencies, sentence_count
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        worker_results = list(executor.map(worker, range(threads)))
+    elapsed_seconds = time.perf_counter() - started_at
+
+    latencies = sorted(
+        latency for worker_latencies, _ in worker_results for latency in worker_latencies
+    )
+    sentence_count = sum(worker_sentence_count for _, worker_sentence_count in worker_results)
+    peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS の ru_maxrss はバイト単位のため KiB に揃える
+    if sys.platform == "darwin":
+        peak_rss_kib //= 1024
+    return {
+        "case": case,
+        "corpus": corpus,
+        "threads": threads,
+        "calls": len(latencies),
+        "sentences": sentence_count,
+        "seconds": elapsed_seconds,
+        "sentences_per_second": sentence_count / elapsed_seconds,
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        "peak_rss_kib": peak_rss_kib,
+    }
+
+
+def run_case_in_subprocess(
+    case: str, corpus: str, threads: int, min_seconds: float
+) -> dict[str, Any]:
+    """
+    新しいプロセスで計測ケースを実行する。
+
+    Args:
+        case (str): 計測ケース名
+        corpus (str): コーパス名
+        threads (int): 並行して処理するスレッド数
+        min_seconds (float): 各スレッドが処理を繰り返す最小時間 (秒)
+
+    Returns:
+        dict[str, Any]: 計測結果
+    """
+
+    # 最大 RSS が他のケースで確保したメモリの影響を受けないよう、ケースごとにプロセスを分ける
+    completed = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--run-case",
+            json.dumps([case, corpus, threads, min_seconds]),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def collect_metadata() -> dict[str, Any]:
+    """
+    計測環境の情報を返す。
+
+    Returns:
+        dict[str, Any]: 計測日時・コミット・Python と pyopenjtalk のバージョン・プラットフォーム・CPU 数
+    """
+
+    import pyopenjtalk
+
+    repository_root = Path(__file__).resolve().parent.parent
+    try:
+        git_commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=repository_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        is_dirty = (
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                cwd=repository_root,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+            != ""
+        )
+    except (OSError, subprocess.CalledProcessError):
+        git_commit = None
+        is_dirty = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit,
+        "git_dirty": is_dirty,
+        "python": platform.python_version(),
+        "pyopenjtalk": pyopenjtalk.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare_results(results: list[dict[str, Any]], baseline_path: Path, threshold: float) -> int:
+    """
+    以前の計測結果と比較し、処理文数とレイテンシの変化率を表示する。
+
+    Args:
+        results (list[dict[str, Any]]): 今回の計測結果
+        baseline_path (Path): 比較対象の結果ファイル
+        threshold (float): 退行とみなす1秒あたりの処理文数の低下率
+
+    Returns:
+        int: 退行したケース数
+    """
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    baseline_by_key = {
+        (result["case"], result["corpus"], result["threads"]): result
+        for result in baseline["results"]
+    }
+    print(f"\ncompared with {baseline_path} (commit: {baseline['metadata']['git_commit']})")
+    regression_count = 0
+    for result in results:
+        baseline_result = baseline_by_key.get((result["case"], result["corpus"], result["threads"]))
+        if baseline_result is None:
+            continue
+        throughput_change = (
+            result["sentences_per_second"] / baseline_result["sentences_per_second"] - 1
+        )
+        p99_change = result["latency_p99_ms"] / baseline_result["latency_p99_ms"] - 1
+        is_regression = throughput_change < -threshold
+        regression_count += int(is_regression)
+        print(
+            f"{result['case']:36} {result['corpus']:8} threads={result['threads']:<2} "
+            f"sentences/s {throughput_change * 100:+7.1f} %  p99 {p99_change * 100:+7.1f} %"
+            + ("  REGRESSION" if is_regression else "")
+        )
+    return regression_count
+
+
+def main() -> int:
+    """
+    計測ケースを順に実行し、結果を表示して JSON ファイルへ保存する。
+
+    Returns:
+        int: 比較対象から退行したケースがなければ0、あれば1
+    """
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        choices=CASE_NAMES,
+        help="計測するケース (デフォルト: tsqyomi 以外の全ケース)",
+    )
+    parser.add_argument(
+        "--corpora",
+        nargs="+",
+        choices=list(CORPORA),
+        default=list(CORPORA),
+        help="計測するコーパス (デフォルト: 全コーパス)",
+    )
+    parser.add_argument(
+        "--threads",
+        nargs="+",
+        type=int,
+        default=[1, 4],
+        help="並行して処理するスレッド数 (デフォルト: 1 4)",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=1.0,
+        help="各スレッドが処理を繰り返す最小時間 (デフォルト: 1.0)",
+    )
+    parser.add_argument(
+        "--with-tsqyomi",
+        action="store_true",
+        help="tsqyomi のケースも計測する (モデルのロードが必要)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="結果の保存先 (デフォルト: benchmark_results/<コミットの短縮ハッシュ>.json)",
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="比較対象の以前の結果ファイル",
+    )
+    parser.add_argument(
+        "--regression-threshold",
+        type=float,
+        default=0.1,
+        help="退行とみなす1秒あたりの処理文数の低下率 (デフォルト: 0.1)",
+    )
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case is not None:
+        case, corpus, threads, min_seconds = json.loads(args.run_case)
+        print(json.dumps(run_case(case, corpus, threads, min_seconds)))
+        return 0
+
+    cases = args.cases
+    if cases is None:
+        cases = [
+            case
+            for case in CASE_NAMES
+            if case not in TSQYOMI_CASE_NAMES or args.with_tsqyomi is True
+        ]
+    results: list[dict[str, Any]] = []
+    for case in cases:
+        for corpus in args.corpora:
+            for threads in args.threads:
+                result = run_case_in_subprocess(case, corpus, threads, args.min_seconds)
+                results.append(result)
+                print(
+                    f"{case:36} {corpus:8} threads={threads:<2} "
+                    f"{result['sentences_per_second']:10.1f} sentences/s  "
+                    f"p50 {result['latency_p50_ms']:9.3f} ms  p99 {result['latency_p99_ms']:9.3f} ms  "
+                    f"peak RSS {result['peak_rss_kib'] / 1024:7.1f} MiB"
+                )
+
+    metadata = collect_metadata()
+    output_path = args.output
+    if output_path is None:
+        output_name = (metadata["git_commit"] or "unknown")[:7]
+        output_path = Path("benchmark_results") / f"{output_name}.json"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(
+        json.dumps({"metadata": metadata, "results": results}, ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    print(f"\nSaved {len(results)} results to {output_path}")
+
+    if args.compare is not None:
+        regression_count = compare_results(results, args.compare, args.regression_threshold)
+        if regression_count > 0:
+            print(
+                f"{regression_count} cases regressed by more than {args.regression_threshold:.0%}"
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+`OpenJTalk.run_frontend_batch()` と `OpenJTalk.run_frontend()` のループ呼び出しの処理時間を比較する。
+
+同じ OpenJTalk インスタンスと同じ入力文に対して両方の方式を交互に複数回実行し、
+最良値から1文あたりの処理時間と、バッチ化で削減された1文あたりのオーバーヘッドを表示する。
+
+Usage:
+    uv run python scripts/benchmark_run_frontend_batch.py
+    uv run python scripts/benchmark_run_frontend_batch.py --sentences 10000 --repeat 30
+"""
+
+import argparse
+import gc
+import sys
+import time
+
+import pyopenjtalk
+from pyopenjtalk.openjtalk import OpenJTalk
+
+
+# 短文から中程度の長さの文までを含む、コーパス前処理を想定した入力文
+SAMPLE_SENTENCES = [
+    "こんにちは。",
+    "今日はいい天気ですね。",
+    "明日の会議は午前十時から第三会議室で行います。",
+    "東京都の人口は約千四百万人です。",
+    "彼女は駅前の本屋で新しい小説を二冊買った。",
+    "この製品は2024年4月1日に発売される予定です。",
+    "音声合成の品質を評価するため、様々な文章を読み上げてもらいました。",
+    "はい。",
+]
+
+
+def main() -> int:
+    """
+    ループ呼び出しとバッチ呼び出しの処理時間を計測して表示する。
+
+    Returns:
+        int: 両方式の結果が一致すれば0、一致しなければ1
+    """
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--sentences", type=int, default=2000, help="1回の計測で処理する文数 (デフォルト: 2000)"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=15, help="計測の繰り返し回数 (デフォルト: 15)"
+    )
+    args = parser.parse_args()
+
+    jtalk = OpenJTalk(dn_mecab=pyopenjtalk.OPEN_JTALK_DICT_DIR)
+    texts = [SAMPLE_SENTENCES[index % len(SAMPLE_SENTENCES)] for index in range(args.sentences)]
+    # 辞書ページの読み込みなど初回のみのコストを計測から除外する
+    jtalk.run_frontend_batch(SAMPLE_SENTENCES)
+
+    loop_seconds: list[float] = []
+    batch_seconds: list[float] = []
+    for _ in range(args.repeat):
+        # 前回の結果が残す大量の dict を GC が走査し続けると計測がぶれるため、計測ごとに回収する
+        gc.collect()
+        started_at = time.perf_counter()
+        loop_results = [jtalk.run_frontend(text) for text in texts]
+        loop_seconds.append(time.perf_counter() - started_at)
+        del loop_results
+
+        gc.collect()
+        started_at = time.perf_counter()
+        batch_results = jtalk.run_frontend_batch(texts)
+        batch_seconds.append(time.perf_counter() - started_at)
+        del batch_results
+
+    if jtalk.run_frontend_batch(SAMPLE_SENTENCES) != [
+        jtalk.run_frontend(text) for text in SAMPLE_SENTENCES
+    ]:
+        print("ERROR: run_frontend_batch() results differ from run_frontend()")
+        return 1
+
+    loop_microseconds = min(loop_seconds) / len(texts) * 1_000_000
+    batch_microseconds = min(batch_seconds) / len(texts) * 1_000_000
+    print(f"sentences: {len(texts)}, repeat: {args.repeat} (best of)")
+    print(f"run_frontend() loop : {loop_microseconds:8.2f} us/sentence")
+    print(f"run_frontend_batch(): {batch_microseconds:8.2f} us/sentence")
+    print(
+        f"overhead reduction  : {loop_microseconds - batch_microseconds:8.2f} us/sentence "
+        f"({(1 - batch_microseconds / loop_microseconds) * 100:.1f} %)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+tsqyomi のモデルの種類 (fp32 / int8) ごとに、読み推定を含む g2p() のレイテンシ・スループットと、
+tests/test_tsqyomi_regression.py の回帰ケースに対する読みの正解率を計測し、結果を JSON ファイルへ保存する。
+
+モデルの種類ごとにロード時間 (int8 の初回は量子化を含む) を記録したあと、回帰ケースの全テキストを
+1スレッドで1回ずつ処理して正解率と p50 / p99 レイテンシを求め、指定したスレッド数で繰り返し処理して
+1秒あたりの処理テキスト数を求める。
+
+Usage:
+    uv run python scripts/benchmark_tsqyomi_variants.py
+    uv run python scripts/benchmark_tsqyomi_variants.py --variants int8 --intra-op-threads 1 --threads 1 4
+    uv run python scripts/benchmark_tsqyomi_variants.py --model-dir path/to/model --output results.json
+"""
+
+import argparse
+import importlib.util
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Barrier
+from typing import Any
+
+
+REGRESSION_TEST_PATH = (
+    Path(__file__).resolve().parent.parent / "tests" / "test_tsqyomi_regression.py"
+)
+
+
+def load_regression_cases() -> list[tuple[str, str]]:
+    """
+    tsqyomi の回帰テストから、入力テキストと期待するカタカナ出力の組を読み込む。
+
+    Returns:
+        list[tuple[str, str]]: (入力テキスト, 期待するカタカナ出力) のリスト
+    """
+
+    spec = importlib.util.spec_from_file_location("test_tsqyomi_regression", REGRESSION_TEST_PATH)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    # テストモジュールの dataclass が自身のモジュールを参照できるよう、実行前に登録する
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return [(case.text, case.expected_kana) for case in module._CASES]
+
+
+def percentile(sorted_values: list[float], ratio: float) -> float:
+    """
+    昇順に並んだ値の百分位数を返す (最近接順位法)。
+
+    Args:
+        sorted_values (list[float]): 昇順に並んだ値
+        ratio (float): 0 から 1 の割合
+
+    Returns:
+        float: 百分位数
+    """
+
+    index = min(len(sorted_values) - 1, max(0, int(len(sorted_values) * ratio + 0.5) - 1))
+    return sorted_values[index]
+
+
+def run_variant(
+    model_variant: str,
+    cases: list[tuple[str, str]],
+    threads_list: list[int],
+    min_seconds: float,
+    model_dir: Path | None,
+    intra_op_threads: int | None,
+) -> dict[str, Any]:
+    """
+    1種類のモデルをロードして計測する。
+
+    Args:
+        model_variant (str): モデルの種類
+        cases (list[tuple[str, str]]): (入力テキスト, 期待するカタカナ出力) のリスト
+        threads_list (list[int]): スループットを計測するスレッド数のリスト
+        min_seconds (float): スループット計測で各スレッドが処理を繰り返す最小時間 (秒)
+        model_dir (Path | None): ローカルのモデルディレクトリ
+        intra_op_threads (int | None): ONNX Runtime の演算内スレッド数
+
+    Returns:
+        dict[str, Any]: 計測結果
+    """
+
+    import onnxruntime
+
+    import pyopenjtalk
+    from pyopenjtalk import tsqyomi
+
+    session_options = onnxruntime.SessionOptions()
+    if intra_op_threads is not None:
+        session_options.intra_op_num_threads = intra_op_threads
+
+    started_at = time.perf_counter()
+    tsqyomi.load_model(
+        ["CPUExecutionProvider"],
+        model_dir=model_dir,
+        session_options=session_options,
+        model_variant=model_variant,  # type: ignore[arg-type]
+    )
+    load_seconds = time.perf_counter() - started_at
+
+    def process_text(text: str) -> str:
+        kana = pyopenjtalk.g2p(text, kana=True, use_tsqyomi=True, use_vanilla=True)
+        assert isinstance(kana, str)
+        return kana
+
+    try:
+        # 辞書の読み込みなど初回のみのコストを計測から除外する
+        pyopenjtalk.warmup(["openjtalk"], max(threads_list))
+        process_text(cases[0][0])
+
+        latencies: list[float] = []
+        mismatched_texts: list[str] = []
+        for text, expected_kana in cases:
+            call_started_at = time.perf_counter()
+            kana = process_text(text)
+            latencies.append(time.perf_counter() - call_started_at)
+            if kana != expected_kana:
+                mismatched_texts.append(text)
+        latencies.sort()
+
+        throughput: dict[str, float] = {}
+        for threads in threads_list:
+            pyopenjtalk.set_global_jtalk_pool_size(threads)
+            barrier = Barrier(threads)
+
+            def worker(worker_index: int) -> int:
+                call_count = 0
+                barrier.wait()
+                worker_started_at = time.perf_counter()
+                # スレッドごとに開始位置をずらし、同じテキストの処理が重ならないようにする
+                text_index = worker_index
+                while time.perf_counter() - worker_started_at < min_seconds:
+                    process_text(cases[text_index % len(cases)][0])
+                    call_count += 1
+                    text_index += 1
+                return call_count
+
+            started_at = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                call_count = sum(executor.map(worker, range(threads)))
+            throughput[str(threads)] = call_count / (time.perf_counter() - started_at)
+    finally:
+        tsqyomi.unload_model()
+
+    # Hub から取得したモデルのファイルはキャッシュ内の位置が定まらないため、ローカルのモデルだけサイズを記録する
+    model_bytes = None
+    if model_dir is not None:
+        model_file_name = "model.int8.onnx" if model_variant == "int8" else "model.onnx"
+        model_bytes = (model_dir / model_file_name).stat().st_size
+    return {
+        "variant": model_variant,
+        "model_bytes": model_bytes,
+        "load_seconds": load_seconds,
+        "cases": len(cases),
+        "accuracy": (len(cases) - len(mismatched_texts)) / len(cases),
+        "mismatched_texts": mismatched_texts,
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+        "texts_per_second_by_threads": throughput,
+    }
+
+
+def main() -> None:
+    """
+    モデルの種類ごとに計測し、結果を表示して JSON ファイルへ保存する。
+    """
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--variants",
+        nargs="+",
+        choices=["fp32", "int8"],
+        default=["fp32", "int8"],
+        help="計測するモデルの種類 (デフォルト: fp32 int8)",
+    )
+    parser.add_argument(
+        "--threads",
+        nargs="+",
+        type=int,
+        default=[1, 4],
+        help="スループットを計測するスレッド数 (デフォルト: 1 4)",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=3.0,
+        help="スループット計測で各スレッドが処理を繰り返す最小時間 (デフォルト: 3.0)",
+    )
+    parser.add_argument(
+        "--intra-op-threads",
+        type=int,
+        help="ONNX Runtime の演算内スレッド数 (デフォルト: ONNX Runtime の既定値)",
+    )
+    parser.add_argument(
+        "--model-dir",
+        type=Path,
+        help="ローカルのモデルディレクトリ (デフォルト: Hugging Face Hub から取得)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmark_results") / "tsqyomi_variants.json",
+        help="結果の保存先 (デフォルト: benchmark_results/tsqyomi_variants.json)",
+    )
+    args = parser.parse_args()
+
+    cases = load_regression_cases()
+    results: list[dict[str, Any]] = []
+    for model_variant in args.variants:
+        result = run_variant(
+            model_variant,
+            cases,
+            args.threads,
+            args.min_seconds,
+            args.model_dir,
+            args.intra_op_threads,
+        )
+        results.append(result)
+        throughput = "  ".join(
+            f"threads={threads} {texts_per_second:8.1f} texts/s"
+            for threads, texts_per_second in result["texts_per_second_by_threads"].items()
+        )
+        model_size = (
+            "      -    "
+            if result["model_bytes"] is None
+            else f"{result['model_bytes'] / 1024 / 1024:7.1f} MiB"
+        )
+        print(
+            f"{model_variant:5} {model_size}  "
+            f"load {result['load_seconds']:6.2f} s  "
+            f"accuracy {result['accuracy'] * 100:6.2f}% ({result['cases']} cases)  "
+            f"p50 {result['latency_p50_ms']:8.3f} ms  p99 {result['latency_p99_ms']:8.3f} ms  "
+            f"{throughput}"
+        )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps({"results": results}, ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    print(f"\nSaved {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
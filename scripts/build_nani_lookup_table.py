@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+「何」読み推定モデルの全入力に対する推定結果を事前計算し、判定表 (nani_table.npz) を作成するスクリプト。
+nani_enc.onnx または nani_model.onnx を更新した場合は、このスクリプトで判定表を作り直す。
+
+Usage:
+    uv run python scripts/build_nani_lookup_table.py
+"""
+
+import argparse
+import itertools
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+import onnx  # pyright: ignore[reportMissingImports]
+from onnxruntime import InferenceSession
+
+from pyopenjtalk.yomi_model.nani_predict import (
+    LOOKUP_TABLE_PATH,
+    MODEL_DIR,
+    X_COLS,
+    compute_model_digest,
+    save_lookup_table,
+)
+
+
+# 検証用に ONNX エンコーダーへ文字列のまま通す組み合わせ数
+VERIFICATION_SAMPLE_SIZE = 10000
+
+
+def load_encoder_categories(encoder_path: Path) -> list[list[str]]:
+    """
+    ONNX エンコーダーから、X_COLS の各列について既知とするカテゴリを取り出す。
+
+    Args:
+        encoder_path (Path): nani_enc.onnx のパス
+
+    Returns:
+        list[list[str]]: 各列のカテゴリ (ONNX エンコーダーの出力列順)
+
+    Raises:
+        ValueError: エンコーダーが想定している構造 (列ごとの OneHotEncoder で未知カテゴリを0にする) と異なる場合
+    """
+
+    model = onnx.load(encoder_path)
+    categories: list[list[str]] = []
+    for node in model.graph.node:
+        if node.op_type != "OneHotEncoder":
+            continue
+        attributes = {attribute.name: attribute for attribute in node.attribute}
+        # 未知カテゴリが全て0の列に変換されることを前提に、未知の値を1つの組み合わせに集約する
+        if attributes["zeros"].i != 1:
+            raise ValueError("Expected OneHotEncoder to map unknown categories to zeros")
+        categories.append(
+            [category.decode("utf-8") for category in attributes["cats_strings"].strings]
+        )
+    if len(categories) != len(X_COLS):
+        raise ValueError(f"Expected {len(X_COLS)} OneHotEncoder nodes: {len(categories)}")
+    return categories
+
+
+def predict_all_combinations(
+    categories: list[list[str]],
+    model_session: InferenceSession,
+) -> npt.NDArray[np.bool_]:
+    """
+    各列のカテゴリ番号 (未知はカテゴリ数) の全組み合わせについて、分類器の推定結果を計算する。
+    エンコーダーの出力はカテゴリ番号から直接 one-hot 行列として組み立てる。
+
+    Args:
+        categories (list[list[str]]): 各列のカテゴリ
+        model_session (InferenceSession): nani_model.onnx の推論セッション
+
+    Returns:
+        npt.NDArray[np.bool_]: X_COLS 順の混合基数で並べた全組み合わせの推定結果 (True ならナン)
+    """
+
+    radixes = [len(column_categories) + 1 for column_categories in categories]
+    offsets = np.cumsum([0] + [len(column_categories) for column_categories in categories])
+    feature_count = int(offsets[-1])
+    # 先頭2列ごとに分割して推論し、one-hot 行列のメモリ使用量を抑える
+    trailing_indices = np.indices(radixes[2:]).reshape(len(radixes) - 2, -1).T
+    predictions: list[npt.NDArray[np.bool_]] = []
+    for leading_indices in itertools.product(range(radixes[0]), range(radixes[1])):
+        row_count = len(trailing_indices)
+        column_indices = [np.full(row_count, index) for index in leading_indices] + [
+            trailing_indices[:, column] for column in range(trailing_indices.shape[1])
+        ]
+        encoded_features = np.zeros((row_count, feature_count), dtype=np.float32)
+        for column, category_indices in enumerate(column_indices):
+            is_known = category_indices < len(categories[column])
+            encoded_features[
+                np.nonzero(is_known)[0], offsets[column] + category_indices[is_known]
+            ] = 1.0
+        probability_array = np.asarray(
+            model_session.run(None, {"input": encoded_features})[0], dtype=np.float32
+        )
+        # nani_predict の np.argmax() と同じく、同確率の場合はナニとする
+        predictions.append(probability_array[:, 1] > probability_array[:, 0])
+    return np.concatenate(predictions)
+
+
+def verify_with_encoder(
+    categories: list[list[str]],
+    predictions: npt.NDArray[np.bool_],
+    enc_session: InferenceSession,
+    model_session: InferenceSession,
+) -> None:
+    """
+    無作為に選んだ組み合わせを ONNX エンコーダーへ文字列のまま通し、判定表の推定結果と一致するか検証する。
+
+    Args:
+        categories (list[list[str]]): 各列のカテゴリ
+        predictions (npt.NDArray[np.bool_]): 全組み合わせの推定結果
+        enc_session (InferenceSession): nani_enc.onnx の推論セッション
+        model_session (InferenceSession): nani_model.onnx の推論セッション
+
+    Raises:
+        ValueError: 判定表と ONNX モデルの推定結果が一致しない場合
+    """
+
+    radixes = [len(column_categories) + 1 for column_categories in categories]
+    random_generator = np.random.default_rng(0)
+    combination_indices = random_generator.integers(0, len(predictions), VERIFICATION_SAMPLE_SIZE)
+    column_indices = np.unravel_index(combination_indices, radixes)
+    # カテゴリ数と同じ番号は未知のカテゴリを表すため、どのカテゴリにも含まれない文字列を入力する
+    input_data = np.array(
+        [
+            [
+                categories[column][int(category_index)]
+                if category_index < len(categories[column])
+                else "<unknown>"
+                for column, category_index in enumerate(row)
+            ]
+            for row in zip(*column_indices, strict=True)
+        ]
+    )
+    encoded_features = np.asarray(enc_session.run(None, {"input": input_data})[0], dtype=np.float32)
+    probability_array = np.asarray(
+        model_session.run(None, {"input": encoded_features})[0], dtype=np.float32
+    )
+    expected = np.argmax(probability_array, axis=1) == 1
+    if np.array_equal(expected, predictions[combination_indices]) is False:
+        raise ValueError("Lookup table predictions do not match the ONNX model")
+
+
+def main() -> None:
+    """ONNX モデルから判定表を作成して保存する。"""
+
+    parser = argparse.ArgumentParser(
+        description="Precompute the nani reading model over its whole categorical input space.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=LOOKUP_TABLE_PATH,
+        help=f"Output lookup table path (default: {LOOKUP_TABLE_PATH})",
+    )
+    args = parser.parse_args()
+
+    categories = load_encoder_categories(MODEL_DIR / "nani_enc.onnx")
+    enc_session = InferenceSession(MODEL_DIR / "nani_enc.onnx", providers=["CPUExecutionProvider"])
+    model_session = InferenceSession(
+        MODEL_DIR / "nani_model.onnx", providers=["CPUExecutionProvider"]
+    )
+    predictions = predict_all_combinations(categories, model_session)
+    verify_with_encoder(categories, predictions, enc_session, model_session)
+    save_lookup_table(args.output, categories, predictions, compute_model_digest())
+    print(f"Saved {len(predictions)} predictions to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+OpenJTalk インスタンス数ごとの常駐メモリ使用量 (RSS) を、MeCab 辞書を共有する場合としない場合で比較する。
+
+インスタンスごとに辞書を読み込む `OpenJTalk(dn_mecab)` と、読み込み済みの `MeCabModel` を
+`OpenJTalk(mecab_model=...)` で共有する場合のそれぞれについて、計測ごとに新しいプロセスを起動し、
+全インスタンスで1回ずつ解析を実行した後の最大 RSS を表示する。
+(最大 RSS の取得に resource モジュールを使うため、Windows では動作しない)
+
+Usage:
+    uv run python scripts/measure_openjtalk_memory.py
+    uv run python scripts/measure_openjtalk_memory.py --counts 1 4 16
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+
+# 子プロセスで実行する計測コード
+## 親プロセスの import 済みモジュールや確保済みメモリが結果に混ざらないよう、計測ごとにプロセスを分ける
+_MEASUREMENT_CODE = """
+import json
+import resource
+import sys
+
+import pyopenjtalk
+from pyopenjtalk.openjtalk import MeCabModel, OpenJTalk
+
+instance_count = int(sys.argv[1])
+is_shared = sys.argv[2] == "shared"
+baseline_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if is_shared is True:
+    mecab_model = MeCabModel(pyopenjtalk.OPEN_JTALK_DICT_DIR)
+    jtalks = [OpenJTalk(mecab_model=mecab_model) for _ in range(instance_count)]
+else:
+    jtalks = [OpenJTalk(pyopenjtalk.OPEN_JTALK_DICT_DIR) for _ in range(instance_count)]
+for jtalk in jtalks:
+    jtalk.run_frontend("今日はいい天気ですね。")
+peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# macOS の ru_maxrss はバイト単位のため KiB に揃える
+if sys.platform == "darwin":
+    baseline_rss_kib //= 1024
+    peak_rss_kib //= 1024
+print(json.dumps({"baseline_rss_kib": baseline_rss_kib, "peak_rss_kib": peak_rss_kib}))
+"""
+
+
+def measure(instance_count: int, is_shared: bool) -> dict[str, int]:
+    """
+    新しいプロセスで OpenJTalk インスタンスを生成し、RSS を計測する。
+
+    Args:
+        instance_count (int): 生成する OpenJTalk インスタンス数
+        is_shared (bool): True なら1つの MeCabModel を全インスタンスで共有する
+
+    Returns:
+        dict[str, int]: import 直後と解析後の最大 RSS (KiB)
+    """
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _MEASUREMENT_CODE,
+            str(instance_count),
+            "shared" if is_shared is True else "independent",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    """
+    インスタンス数ごとの RSS を計測して表形式で表示する。
+
+    Returns:
+        int: 常に0
+    """
+
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--counts",
+        type=int,
+        nargs="+",
+        default=[1, 16],
+        help="計測する OpenJTalk インスタンス数 (デフォルト: 1 16)",
+    )
+    args = parser.parse_args()
+
+    print(f"{'instances':>9}  {'mode':<11}  {'peak RSS':>10}  {'delta from import':>17}")
+    for instance_count in args.counts:
+        for is_shared in (False, True):
+            result = measure(instance_count, is_shared)
+            delta_mib = (result["peak_rss_kib"] - result["baseline_rss_kib"]) / 1024
+            print(
+                f"{instance_count:>9}  {'shared' if is_shared is True else 'independent':<11}  "
+                f"{result['peak_rss_kib'] / 1024:>7.1f} MiB  {delta_mib:>13.1f} MiB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""pyopenjtalk.aio の非同期 API と同時実行数の制御を検証する。"""
+
+# pyright: reportPrivateUsage=false
+
+import asyncio
+import threading
+from collections.abc import Iterator
+
+import numpy as np
+import pytest
+
+import pyopenjtalk
+from pyopenjtalk import aio
+
+
+@pytest.fixture(autouse=True)
+def restore_aio_state() -> Iterator[None]:
+    """各テストで変更した専用スレッドプールとグローバルインスタンスプールの上限数を元に戻す。"""
+
+    jtalk_pool_size = pyopenjtalk.get_global_jtalk_pool_size()
+    htsengine_pool_size = pyopenjtalk.get_global_htsengine_pool_size()
+    configuration = aio._executor_configuration
+    yield
+    aio.shutdown()
+    aio._executor_configuration = configuration
+    pyopenjtalk.set_global_jtalk_pool_size(jtalk_pool_size)
+    pyopenjtalk.set_global_htsengine_pool_size(htsengine_pool_size)
+
+
+def test_async_api_matches_sync_api() -> None:
+    """非同期 API の結果が同期 API と一致する。"""
+
+    text = "今日はいい天気ですね"
+
+    async def run() -> None:
+        assert await aio.g2p(text, kana=True) == pyopenjtalk.g2p(text, kana=True)
+        features = await aio.run_frontend(text)
+        assert features == pyopenjtalk.run_frontend(text)
+        assert await aio.run_frontend_detailed(text) == pyopenjtalk.run_frontend_detailed(text)
+        labels = await aio.make_label(features)
+        assert labels == pyopenjtalk.make_label(features)
+        wav, sr = await aio.synthesize(labels)
+        expected_wav, expected_sr = pyopenjtalk.synthesize(labels)
+        assert sr == expected_sr
+        np.testing.assert_array_equal(wav, expected_wav)
+        wav, sr = await aio.tts(text, speed=1.2)
+        expected_wav, expected_sr = pyopenjtalk.tts(text, speed=1.2)
+        assert sr == expected_sr
+        np.testing.assert_array_equal(wav, expected_wav)
+
+    asyncio.run(run())
+
+
+def test_async_api_runs_concurrent_requests_in_input_order() -> None:
+    """複数の非同期呼び出しを同時に待機しても、それぞれ対応する結果を返す。"""
+
+    texts = ["こんにちは", "東京は日本の首都です", "明日は雨が降るでしょう"] * 4
+    aio.configure(max_workers=3, max_in_flight=2)
+
+    async def run() -> list[list[str] | str]:
+        return await asyncio.gather(*(aio.g2p(text) for text in texts))
+
+    assert asyncio.run(run()) == [pyopenjtalk.g2p(text) for text in texts]
+
+
+def test_max_in_flight_limits_concurrent_executions() -> None:
+    """同時実行数の上限を超えて処理をワーカースレッドへ投入しない。"""
+
+    aio.configure(max_workers=4, max_in_flight=2)
+    executor = aio._get_executor()
+    mutex = threading.Lock()
+    active_count = 0
+    max_active_count = 0
+    release_event = threading.Event()
+
+    def blocking_task() -> None:
+        nonlocal active_count, max_active_count
+        with mutex:
+            active_count += 1
+            max_active_count = max(max_active_count, active_count)
+        release_event.wait(timeout=5)
+        with mutex:
+            active_count -= 1
+
+    async def run() -> None:
+        tasks = [asyncio.create_task(executor.run(blocking_task)) for _ in range(6)]
+        await asyncio.sleep(0.1)
+        assert max_active_count == 2
+        release_event.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert max_active_count == 2
+
+
+def test_cancelled_request_is_not_executed() -> None:
+    """キャンセルされた未着手の処理は実行されず、イベントループもブロックされない。"""
+
+    aio.configure(max_workers=1)
+    executor = aio._get_executor()
+    started_event = threading.Event()
+    release_event = threading.Event()
+    executed: list[str] = []
+
+    def blocking_task() -> None:
+        started_event.set()
+        release_event.wait(timeout=5)
+        executed.append("blocking")
+
+    def cancelled_task() -> None:
+        executed.append("cancelled")
+
+    async def run() -> None:
+        blocking = asyncio.create_task(executor.run(blocking_task))
+        while started_event.is_set() is False:
+            await asyncio.sleep(0.01)
+        cancelled = asyncio.create_task(executor.run(cancelled_task))
+        await asyncio.sleep(0.05)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        release_event.set()
+        await blocking
+
+    asyncio.run(run())
+    assert executed == ["blocking"]
+
+
+@pytest.mark.parametrize("max_in_flight", [None, 2])
+def test_configure_completes_queued_requests(max_in_flight: int | None) -> None:
+    """処理の実行待ちの間に configure() で切り替えても、投入済みの呼び出しは全て完了する。"""
+
+    texts = ["こんにちは", "東京は日本の首都です", "明日は雨が降るでしょう"] * 2
+    aio.configure(max_workers=1, max_in_flight=max_in_flight)
+    executor = aio._get_executor()
+    started_event = threading.Event()
+    release_event = threading.Event()
+
+    def blocking_task() -> str:
+        started_event.set()
+        release_event.wait(timeout=5)
+        return "blocking"
+
+    async def run() -> list[object]:
+        blocking = asyncio.create_task(executor.run(blocking_task))
+        while started_event.is_set() is False:
+            await asyncio.sleep(0.01)
+        queued = [asyncio.create_task(aio.g2p(text, kana=True)) for text in texts]
+        await asyncio.sleep(0.05)
+        aio.configure(max_workers=2, max_in_flight=max_in_flight)
+        release_event.set()
+        return await asyncio.gather(blocking, *queued, return_exceptions=True)
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        release_event.set()
+
+    assert results == ["blocking", *[pyopenjtalk.g2p(text, kana=True) for text in texts]]
+
+
+def test_configure_grows_global_instance_pools() -> None:
+    """ワーカー数がグローバルインスタンスプールの上限数より大きい場合は上限数を引き上げる。"""
+
+    pyopenjtalk.set_global_jtalk_pool_size(1)
+    pyopenjtalk.set_global_htsengine_pool_size(5)
+    aio.configure(max_workers=3)
+
+    assert pyopenjtalk.get_global_jtalk_pool_size() == 3
+    assert pyopenjtalk.get_global_htsengine_pool_size() == 5
+    with pytest.raises(ValueError):
+        aio.configure(max_workers=0)
+    with pytest.raises(ValueError):
+        aio.configure(max_in_flight=0)
+
+
+def test_first_call_does_not_wait_for_leases_held_by_other_threads() -> None:
+    """
+    最初の非同期 API 呼び出しでグローバルインスタンスプールを拡張する際、
+    他のスレッドが借り出し中のインスタンスの返却を待ってイベントループを止めない。
+    """
+
+    aio.shutdown()
+    # 専用スレッドプールの次回生成時に、グローバルインスタンスプールの拡張が必要となる設定にする
+    aio._executor_configuration = (3, None)
+    pyopenjtalk.set_global_jtalk_pool_size(1)
+    pyopenjtalk.set_global_htsengine_pool_size(1)
+    is_leased = threading.Event()
+    can_release = threading.Event()
+    was_release_timed_out = False
+
+    def hold_leases() -> None:
+        """両方のグローバルインスタンスを借り出したまま、解放の合図を待つ。"""
+
+        nonlocal was_release_timed_out
+        with pyopenjtalk._global_jtalk(), pyopenjtalk._global_htsengine():
+            is_leased.set()
+            # イベントループが止まった場合もテストが終わるよう、一定時間で返却する
+            was_release_timed_out = can_release.wait(timeout=5.0) is False
+
+    holder = threading.Thread(target=hold_leases)
+    holder.start()
+    try:
+        assert is_leased.wait(timeout=5.0) is True
+        kana = asyncio.run(aio.g2p("こんにちは", kana=True))
+    finally:
+        can_release.set()
+        holder.join()
+
+    assert kana == pyopenjtalk.g2p("こんにちは", kana=True)
+    assert was_release_timed_out is False
+    assert pyopenjtalk.get_global_jtalk_pool_size() == 3
+    assert pyopenjtalk.get_global_htsengine_pool_size() == 3
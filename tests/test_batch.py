@@ -0,0 +1,267 @@
+"""pyopenjtalk.batch のチャンク分配・順序保証・シャード出力を検証する。"""
+
+# pyright: reportPrivateUsage=false
+
+import json
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import pyopenjtalk
+from pyopenjtalk import batch, tsqyomi
+
+
+TEXTS = [
+    "こんにちは",
+    "今日はいい天気ですね",
+    "東京は日本の首都です",
+    "明日は雨が降るでしょう",
+    "音声合成のテストです",
+]
+
+
+def test_process_texts_returns_results_in_input_order() -> None:
+    """チャンクの完了順によらず、入力と同じ順序で結果を返す。"""
+
+    texts = TEXTS * 7
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(batch.process_texts(texts, "g2p", executor=executor, chunk_size=3))
+
+    assert results == [pyopenjtalk.g2p(text) for text in texts]
+
+
+def test_process_texts_passes_options_for_each_task() -> None:
+    """各タスクに options のキーワード引数を渡して対応する公開 API を呼ぶ。"""
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        kana = list(batch.process_texts(TEXTS, "g2p", executor=executor, options={"kana": True}))
+        features = list(batch.process_texts(TEXTS, "run_frontend", executor=executor))
+        labels = list(batch.process_texts(TEXTS, "make_label", executor=executor))
+
+    assert kana == [pyopenjtalk.g2p(text, kana=True) for text in TEXTS]
+    assert features == [pyopenjtalk.run_frontend(text) for text in TEXTS]
+    assert labels == [pyopenjtalk.extract_fullcontext(text) for text in TEXTS]
+
+
+def test_process_texts_reads_input_lazily() -> None:
+    """処理中のチャンク数の上限を超えて入力を先読みしない。"""
+
+    consumed_count = 0
+
+    def generate_texts() -> Iterator[str]:
+        nonlocal consumed_count
+        for index in range(1000):
+            consumed_count += 1
+            yield TEXTS[index % len(TEXTS)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = batch.process_texts(
+            generate_texts(), executor=executor, chunk_size=4, max_pending_chunks=2
+        )
+        next(results)
+        assert consumed_count <= 4 * 3
+        results.close()
+
+    assert consumed_count <= 4 * 3
+
+
+def test_process_texts_reports_progress() -> None:
+    """チャンクの結果を返すたびに処理済みテキスト数を通知する。"""
+
+    progress: list[int] = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(
+            batch.process_texts(
+                TEXTS, executor=executor, chunk_size=2, progress_callback=progress.append
+            )
+        )
+
+    assert progress == [2, 4, 5]
+
+
+def _g2p_failing_on_marker(text: str, **options: Any) -> Any:
+    """テキストが "失敗" の場合だけ処理に失敗し、それ以外は g2p() の結果を返す。"""
+
+    if text == "失敗":
+        raise RuntimeError("Failed to process text")
+    return pyopenjtalk.g2p(text, **options)
+
+
+def test_process_texts_return_exceptions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """return_exceptions=True では失敗したテキストの位置に例外を返し、False では送出する。"""
+
+    monkeypatch.setitem(batch._TASK_FUNCTIONS, "g2p", _g2p_failing_on_marker)
+    texts = ["こんにちは", "失敗", "さようなら"]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(
+            batch.process_texts(texts, executor=executor, chunk_size=1, return_exceptions=True)
+        )
+        assert results[0] == pyopenjtalk.g2p("こんにちは")
+        assert isinstance(results[1], Exception)
+        assert results[2] == pyopenjtalk.g2p("さようなら")
+
+        with pytest.raises(RuntimeError):
+            list(batch.process_texts(texts, executor=executor, chunk_size=1))
+
+
+def test_process_texts_rejects_invalid_arguments() -> None:
+    """不正なチャンクサイズやタスク名を拒否する。"""
+
+    with pytest.raises(ValueError):
+        next(batch.process_texts(TEXTS, chunk_size=0))
+    with pytest.raises(ValueError):
+        next(batch.process_texts(TEXTS, max_pending_chunks=0))
+    with pytest.raises(ValueError):
+        next(batch.process_texts(TEXTS, "unknown"))  # type: ignore[arg-type]
+
+
+def test_process_texts_to_shards_resumes_from_completed_shards(tmp_path: Path) -> None:
+    """完成済みのシャードを読み飛ばし、続きのシャードだけを書き出す。"""
+
+    texts = TEXTS * 2
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert (
+            batch.process_texts_to_shards(
+                texts[:4], tmp_path, shard_size=4, executor=executor, chunk_size=3
+            )
+            == 1
+        )
+        first_shard = (tmp_path / "shard-000000.jsonl").read_text(encoding="utf-8")
+
+        processed_texts: list[str] = []
+
+        def record_texts() -> Iterator[str]:
+            for index, text in enumerate(texts):
+                if index >= 4:
+                    processed_texts.append(text)
+                yield text
+
+        progress: list[int] = []
+        shard_count = batch.process_texts_to_shards(
+            record_texts(),
+            tmp_path,
+            shard_size=4,
+            executor=executor,
+            chunk_size=3,
+            progress_callback=progress.append,
+        )
+
+    assert shard_count == 3
+    assert processed_texts == texts[4:]
+    assert progress[-1] == len(texts)
+    assert (tmp_path / "shard-000000.jsonl").read_text(encoding="utf-8") == first_shard
+    records = [
+        json.loads(line)
+        for shard_path in sorted(tmp_path.glob("shard-*.jsonl"))
+        for line in shard_path.read_text(encoding="utf-8").splitlines()
+    ]
+    assert [record["index"] for record in records] == list(range(len(texts)))
+    assert [record["text"] for record in records] == texts
+    assert [record["result"] for record in records] == [pyopenjtalk.g2p(text) for text in texts]
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+@pytest.mark.parametrize(("first_shard_size", "second_shard_size"), [(4, 4), (3, 4), (4, 3)])
+def test_process_texts_to_shards_resumes_after_input_grows(
+    tmp_path: Path, first_shard_size: int, second_shard_size: int
+) -> None:
+    """件数不足の最終シャードの後に入力が増えても、shard_size を変えて再開しても、全入力を1回ずつ書き出す。"""
+
+    texts = TEXTS * 2
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        batch.process_texts_to_shards(
+            texts[:6], tmp_path, shard_size=first_shard_size, executor=executor, chunk_size=3
+        )
+        shard_count = batch.process_texts_to_shards(
+            texts, tmp_path, shard_size=second_shard_size, executor=executor, chunk_size=3
+        )
+
+    shard_paths = sorted(tmp_path.glob("shard-*.jsonl"))
+    assert shard_count == len(shard_paths)
+    records = [
+        json.loads(line)
+        for shard_path in shard_paths
+        for line in shard_path.read_text(encoding="utf-8").splitlines()
+    ]
+    assert [record["index"] for record in records] == list(range(len(texts)))
+    assert [record["text"] for record in records] == texts
+
+
+def test_process_texts_to_shards_records_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """処理に失敗したテキストは error フィールドとして記録する。"""
+
+    monkeypatch.setitem(batch._TASK_FUNCTIONS, "g2p", _g2p_failing_on_marker)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        batch.process_texts_to_shards(["こんにちは", "失敗"], tmp_path, executor=executor)
+
+    records = [
+        json.loads(line)
+        for line in (tmp_path / "shard-000000.jsonl").read_text(encoding="utf-8").splitlines()
+    ]
+    assert records[0]["result"] == pyopenjtalk.g2p("こんにちは")
+    assert "result" not in records[1]
+    assert records[1]["error"].startswith("RuntimeError: ")
+
+
+def test_iter_texts_from_file_reads_text_and_jsonl(tmp_path: Path) -> None:
+    """テキストファイルは空行を含む各行を、JSONL は文字列または指定キーの値を読み出す。"""
+
+    text_path = tmp_path / "input.txt"
+    text_path.write_text("こんにちは\n\nさようなら\n", encoding="utf-8")
+    jsonl_path = tmp_path / "input.jsonl"
+    jsonl_path.write_text(
+        '{"text": "こんにちは", "id": 1}\n\n"さようなら"\n{"sentence": "おはよう"}\n',
+        encoding="utf-8",
+    )
+
+    assert list(batch.iter_texts_from_file(text_path)) == ["こんにちは", "", "さようなら"]
+    with pytest.raises(ValueError):
+        list(batch.iter_texts_from_file(jsonl_path))
+    jsonl_path.write_text('{"sentence": "おはよう"}\n"こんばんは"\n', encoding="utf-8")
+    assert list(batch.iter_texts_from_file(jsonl_path, jsonl_key="sentence")) == [
+        "おはよう",
+        "こんばんは",
+    ]
+
+
+def test_process_texts_with_process_pool() -> None:
+    """事前準備済みのワーカープロセスで処理した結果がメインプロセスと一致する。"""
+
+    executor = batch.create_process_pool(max_workers=2)
+    assert isinstance(executor, ProcessPoolExecutor)
+    with executor:
+        results = list(batch.process_texts(TEXTS, executor=executor, chunk_size=2))
+
+    assert results == [pyopenjtalk.g2p(text) for text in TEXTS]
+
+
+def test_process_pool_loads_tsqyomi_with_load_options(tmp_path: Path) -> None:
+    """tsqyomi_load_options を各ワーカーの load_model() へ渡し、指定したローカルモデルで処理する。"""
+
+    pytest.importorskip("onnxruntime")
+    from test_tsqyomi import _write_small_model_directory
+
+    _write_small_model_directory(tmp_path)
+    load_options = {"onnx_providers": ["CPUExecutionProvider"], "model_dir": str(tmp_path)}
+    texts = ["人気がある", "何を準備しますか"]
+    options = {"kana": True, "use_tsqyomi": True}
+    try:
+        tsqyomi.load_model(**load_options)
+        expected = [pyopenjtalk.g2p(text, **options) for text in texts]
+    finally:
+        tsqyomi.unload_model()
+
+    executor = batch.create_process_pool(
+        max_workers=1, load_tsqyomi=True, tsqyomi_load_options=load_options
+    )
+    with executor:
+        results = list(batch.process_texts(texts, executor=executor, options=options))
+
+    assert results == expected
+    with pytest.raises(ValueError):
+        batch.create_process_pool(max_workers=1, tsqyomi_load_options=load_options)
@@ -0,0 +1,225 @@
+"""LRU キャッシュと、run_frontend() / run_frontend_detailed() の結果キャッシュ・synthesize() の合成波形キャッシュを検証する。"""
+
+# pyright: reportPrivateUsage=false
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import pyopenjtalk
+from pyopenjtalk.cache import LRUCache, get_dictionary_generation
+
+
+@pytest.fixture
+def frontend_cache() -> Iterator[None]:
+    """結果キャッシュを有効化し、テスト後に無効化する。"""
+
+    pyopenjtalk.set_frontend_cache_size(16)
+    pyopenjtalk.clear_frontend_cache()
+    try:
+        yield
+    finally:
+        pyopenjtalk.set_frontend_cache_size(0)
+        pyopenjtalk.clear_frontend_cache()
+
+
+def test_lru_cache_evicts_least_recently_used_entry() -> None:
+    """最大件数を超えると最も長く参照されていない項目から破棄する。"""
+
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "evictions": 1, "size": 2, "max_size": 2}
+
+    cache.resize(1)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 1
+    cache.resize(0)
+    cache.put("d", 4)
+    assert cache.get("d") is None
+    assert cache.stats()["size"] == 0
+    with pytest.raises(ValueError):
+        cache.resize(-1)
+
+
+def test_frontend_cache_is_disabled_by_default() -> None:
+    """最大件数を設定するまでは結果キャッシュを使わない。"""
+
+    pyopenjtalk.clear_frontend_cache()
+    pyopenjtalk.run_frontend("こんにちは")
+    pyopenjtalk.run_frontend("こんにちは")
+
+    assert pyopenjtalk.get_frontend_cache_stats() == {
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "size": 0,
+        "max_size": 0,
+    }
+
+
+@pytest.mark.usefixtures("frontend_cache")
+def test_frontend_cache_returns_equal_copies() -> None:
+    """2回目以降はキャッシュから同じ結果を返し、返却値の書き換えはキャッシュに影響しない。"""
+
+    text = "今日はいい天気ですね"
+    expected_features = pyopenjtalk.run_frontend(text)
+    features = pyopenjtalk.run_frontend(text)
+    assert features == expected_features
+    features[0]["pron"] = "書き換え"
+    features.append(features[0])
+    assert pyopenjtalk.run_frontend(text) == expected_features
+
+    expected_detailed = pyopenjtalk.run_frontend_detailed(text)
+    detailed = pyopenjtalk.run_frontend_detailed(text)
+    assert detailed == expected_detailed
+    detailed[1][0]["features"].append("書き換え")
+    assert pyopenjtalk.run_frontend_detailed(text) == expected_detailed
+
+    assert pyopenjtalk.get_frontend_cache_stats() == {
+        "hits": 4,
+        "misses": 2,
+        "evictions": 0,
+        "size": 2,
+        "max_size": 16,
+    }
+
+
+@pytest.mark.usefixtures("frontend_cache")
+def test_frontend_cache_key_covers_options_and_normalization() -> None:
+    """オプションが異なる呼び出しは別々にキャッシュし、正規化後に同じテキストは共有する。"""
+
+    text = "効果的な人生"
+    assert pyopenjtalk.run_frontend(text, revert_long_vowels=True) != pyopenjtalk.run_frontend(text)
+    assert pyopenjtalk.get_frontend_cache_stats()["misses"] == 2
+    assert pyopenjtalk.g2p(text, kana=True) == pyopenjtalk.g2p(text, kana=True)
+    assert pyopenjtalk.get_frontend_cache_stats()["hits"] == 2
+
+    pyopenjtalk.run_frontend("ｺﾝﾆﾁﾊ", normalize_mode="NFKC")
+    pyopenjtalk.run_frontend("コンニチハ")
+    assert pyopenjtalk.get_frontend_cache_stats()["hits"] == 3
+
+
+@pytest.mark.usefixtures("frontend_cache")
+def test_frontend_cache_bypasses_explicit_jtalk() -> None:
+    """jtalk= 引数で OpenJTalk インスタンスを渡した呼び出しはキャッシュを使わない。"""
+
+    jtalk = pyopenjtalk.OpenJTalk(dn_mecab=pyopenjtalk.OPEN_JTALK_DICT_DIR)
+    pyopenjtalk.run_frontend("こんにちは", jtalk=jtalk)
+    pyopenjtalk.run_frontend("こんにちは", jtalk=jtalk)
+
+    assert pyopenjtalk.get_frontend_cache_stats()["size"] == 0
+    assert pyopenjtalk.get_frontend_cache_stats()["misses"] == 0
+
+
+@pytest.mark.usefixtures("frontend_cache")
+def test_frontend_cache_is_invalidated_by_user_dictionary_update(tmp_path: Path) -> None:
+    """ユーザー辞書の差し替え後は、差し替え前の解析結果を返さない。"""
+
+    user_csv = tmp_path / "user.csv"
+    user_dic = tmp_path / "user.dic"
+    user_csv.write_text(
+        "猫宮ねこ,,,1,名詞,固有名詞,人名,一般,*,*,猫宮ねこ,ネコミヤネコ,ネコミヤネコ,1/6,C1\n",
+        encoding="utf-8",
+    )
+    pyopenjtalk.mecab_dict_index(str(user_csv), str(user_dic))
+    text = "猫宮ねこです"
+    original_kana = pyopenjtalk.g2p(text, kana=True)
+    generation = get_dictionary_generation()
+
+    try:
+        pyopenjtalk.update_global_jtalk_with_user_dict(str(user_dic))
+        assert get_dictionary_generation() > generation
+        assert pyopenjtalk.g2p(text, kana=True) == "ネコミヤネコデス"
+    finally:
+        pyopenjtalk.unset_user_dict()
+
+    assert pyopenjtalk.g2p(text, kana=True) == original_kana
+
+
+def test_lru_cache_limits_total_weight() -> None:
+    """weigher を指定すると、値ごとのサイズの合計で上限を管理する。"""
+
+    cache: LRUCache[str, bytes] = LRUCache(10, weigher=len)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.put("c", b"12345678901")
+    assert cache.get("c") is None
+    cache.put("c", b"1234")
+
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 8
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.fixture
+def waveform_cache() -> Iterator[None]:
+    """合成波形キャッシュを有効化し、テスト後に無効化する。"""
+
+    pyopenjtalk.set_waveform_cache_size(16 * 1024 * 1024)
+    pyopenjtalk.clear_waveform_cache()
+    try:
+        yield
+    finally:
+        pyopenjtalk.set_waveform_cache_size(0)
+        pyopenjtalk.clear_waveform_cache()
+
+
+@pytest.mark.usefixtures("waveform_cache")
+def test_waveform_cache_returns_int16_rounded_waveform() -> None:
+    """
+    初回も2回目以降も int16 に丸めた同じ波形を返し、2回目以降はキャッシュから返す。
+    話速や半音が異なれば合成し直す。
+    """
+
+    labels = pyopenjtalk.extract_fullcontext("こんにちは")
+    pyopenjtalk.set_waveform_cache_size(0)
+    raw_wav, _ = pyopenjtalk.synthesize(labels)
+    pyopenjtalk.set_waveform_cache_size(16 * 1024 * 1024)
+    wav, sr = pyopenjtalk.synthesize(labels)
+    cached_wav, cached_sr = pyopenjtalk.synthesize(labels)
+
+    assert cached_sr == sr
+    assert wav.dtype == np.float64
+    assert cached_wav.dtype == np.float64
+    np.testing.assert_array_equal(wav, np.clip(np.rint(raw_wav), -32768, 32767))
+    np.testing.assert_array_equal(cached_wav, wav)
+    cached_wav[:] = 0
+    assert np.any(pyopenjtalk.synthesize(labels)[0] != 0)
+    fast_wav, _ = pyopenjtalk.synthesize(labels, speed=1.5)
+    high_wav, _ = pyopenjtalk.tts("こんにちは", half_tone=2.0)
+
+    stats = pyopenjtalk.get_waveform_cache_stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 3
+    # int16 で保持するため、1サンプルあたり2バイトとなる
+    assert stats["size"] == 2 * (len(wav) + len(fast_wav) + len(high_wav))
+
+
+def test_waveform_cache_evicts_by_byte_budget() -> None:
+    """合計バイト数が上限を超えると、最も長く参照されていない波形から破棄する。"""
+
+    first_labels = pyopenjtalk.extract_fullcontext("こんにちは")
+    second_labels = pyopenjtalk.extract_fullcontext("さようなら")
+    first_nbytes = 2 * len(pyopenjtalk.synthesize(first_labels)[0])
+    try:
+        pyopenjtalk.set_waveform_cache_size(first_nbytes)
+        pyopenjtalk.synthesize(first_labels)
+        pyopenjtalk.synthesize(second_labels)
+        pyopenjtalk.synthesize(first_labels)
+        stats = pyopenjtalk.get_waveform_cache_stats()
+    finally:
+        pyopenjtalk.set_waveform_cache_size(0)
+        pyopenjtalk.clear_waveform_cache()
+
+    assert stats["hits"] == 0
+    assert stats["size"] <= first_nbytes
+    assert stats["evictions"] >= 1
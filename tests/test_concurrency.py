@@ -2,6 +2,8 @@
 
 # pyright: reportPrivateUsage=false
 
+import time
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
 from threading import Barrier, BrokenBarrierError, Event, Lock
 from types import SimpleNamespace
@@ -13,7 +15,7 @@ import pytest
 
 import pyopenjtalk
 import pyopenjtalk.tsqyomi as tsqyomi
-from pyopenjtalk import NJDFeature
+from pyopenjtalk import NJDFeature, profiling
 
 
 def test_replacement_waits_for_global_jtalk_frontend(
@@ -22,7 +24,8 @@ def test_replacement_waits_for_global_jtalk_frontend(
     """フロントエンド借り出し中はグローバル OpenJTalk の交換が待たされる。"""
 
     original_global_jtalk = pyopenjtalk._global_jtalk
-    original_instance = original_global_jtalk._instance
+    original_instances = list(original_global_jtalk._instances)
+    original_instance_factory = original_global_jtalk._instance_factory
     is_postprocessing_started = Event()
     can_finish_postprocessing = Event()
     is_swap_started = Event()
@@ -63,7 +66,9 @@ def test_replacement_waits_for_global_jtalk_frontend(
     finally:
         # 待機中の呼び出しが持つ参照を壊さないよう、元のマネージャー自体を復元する
         with original_global_jtalk._condition:
-            original_global_jtalk._instance = original_instance
+            original_global_jtalk._instances = original_instances
+            original_global_jtalk._lease_counts = [0] * len(original_instances)
+            original_global_jtalk._instance_factory = original_instance_factory
         pyopenjtalk._global_jtalk = original_global_jtalk
 
     assert is_swap_finished.is_set() is True
@@ -193,6 +198,104 @@ def test_unset_user_dict_keeps_global_jtalk_manager_identity(
         assert instance == "new"
 
 
+def test_pool_leases_distinct_instances_up_to_pool_size() -> None:
+    """同時の借り出しは上限数までプールを拡張し、別々のインスタンスを返す。"""
+
+    created_instances: list[str] = []
+    creation_lock = Lock()
+
+    def create_instance() -> str:
+        """生成順に識別できるインスタンスを返す。"""
+
+        with creation_lock:
+            instance = f"instance-{len(created_instances)}"
+            created_instances.append(instance)
+        return instance
+
+    manager = pyopenjtalk._ReplaceableInstanceManager(create_instance, pool_size=2)
+    with manager() as first_instance:
+        with manager() as second_instance:
+            # 上限に達した後の借り出しは待機せず、既存インスタンスを共有する
+            with manager() as third_instance:
+                assert third_instance in (first_instance, second_instance)
+    assert first_instance != second_instance
+    assert len(created_instances) == 2
+
+    # 返却後の借り出しは新規生成せず、空いているインスタンスを再利用する
+    with manager() as reused_instance:
+        assert reused_instance in created_instances
+    assert len(created_instances) == 2
+
+
+def test_pool_replacement_applies_to_grown_instances() -> None:
+    """交換後にプールを拡張する場合も交換時のファクトリでインスタンスを生成する。"""
+
+    manager = pyopenjtalk._ReplaceableInstanceManager(lambda: "old", pool_size=2)
+    with manager(), manager():
+        pass
+
+    manager.replace("new", lambda: "new-grown")
+    with manager() as first_instance, manager() as second_instance:
+        assert {first_instance, second_instance} == {"new", "new-grown"}
+
+
+def test_pool_resize_discards_excess_instances() -> None:
+    """上限数の縮小は余剰インスタンスを破棄し、以降の借り出しを上限内に収める。"""
+
+    manager = pyopenjtalk._ReplaceableInstanceManager(lambda: object(), pool_size=3)
+    with manager(), manager(), manager():
+        pass
+    assert len(manager._instances) == 3
+
+    manager.resize(1)
+    with manager() as first_instance, manager() as second_instance:
+        assert first_instance is second_instance
+    assert manager.pool_size == 1
+    assert len(manager._instances) == 1
+
+    with pytest.raises(ValueError):
+        manager.resize(0)
+
+
+def test_pool_grow_does_not_wait_for_active_leases() -> None:
+    """上限数の拡大は進行中の借り出しを待たず、拡大後の借り出しは新しい枠でインスタンスを生成する。"""
+
+    created_instances: list[str] = []
+
+    def create_instance() -> str:
+        """生成順に識別できるインスタンスを返す。"""
+
+        instance = f"instance-{len(created_instances)}"
+        created_instances.append(instance)
+        return instance
+
+    manager = pyopenjtalk._ReplaceableInstanceManager(create_instance, pool_size=1)
+    # 拡大が借り出しの返却を待ってしまう場合も、借り出しを先に返却してテストを終えられるようにする
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        with manager() as first_instance:
+            executor.submit(manager.resize, 2).result(timeout=5.0)
+            with manager() as second_instance:
+                assert second_instance != first_instance
+    finally:
+        executor.shutdown(wait=True)
+    assert manager.pool_size == 2
+    assert len(created_instances) == 2
+
+
+def test_pool_size_is_read_from_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    """環境変数で指定したプール上限数を検証して読み込む。"""
+
+    monkeypatch.delenv("OPEN_JTALK_POOL_SIZE", raising=False)
+    assert pyopenjtalk._read_pool_size_from_environment("OPEN_JTALK_POOL_SIZE") == 1
+    monkeypatch.setenv("OPEN_JTALK_POOL_SIZE", "4")
+    assert pyopenjtalk._read_pool_size_from_environment("OPEN_JTALK_POOL_SIZE") == 4
+    for invalid_value in ("0", "many"):
+        monkeypatch.setenv("OPEN_JTALK_POOL_SIZE", invalid_value)
+        with pytest.raises(ValueError):
+            pyopenjtalk._read_pool_size_from_environment("OPEN_JTALK_POOL_SIZE")
+
+
 def test_synthesize_serializes_htsengine_configuration(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -270,6 +373,175 @@ def test_synthesize_serializes_htsengine_configuration(
     assert second_waveform.tolist() == [2.0]
 
 
+def test_exclusive_pool_lends_each_instance_to_one_caller() -> None:
+    """排他プールは上限数まで別々のインスタンスを貸し出し、超過分は返却まで待たせる。"""
+
+    manager = pyopenjtalk._ExclusiveInstanceManager(lambda: object(), pool_size=2)
+    is_second_lease_started = Event()
+    can_finish_second_lease = Event()
+    is_third_lease_entered = Event()
+    borrowed_instances: list[object] = []
+
+    def hold_second_lease() -> None:
+        with manager() as instance:
+            borrowed_instances.append(instance)
+            is_second_lease_started.set()
+            assert can_finish_second_lease.wait(timeout=5.0) is True
+
+    def borrow_third_instance() -> None:
+        with manager() as instance:
+            borrowed_instances.append(instance)
+            is_third_lease_entered.set()
+
+    with manager() as first_instance, ThreadPoolExecutor(max_workers=2) as executor:
+        second_lease_future = executor.submit(hold_second_lease)
+        assert is_second_lease_started.wait(timeout=5.0) is True
+        third_lease_future = executor.submit(borrow_third_instance)
+        try:
+            assert is_third_lease_entered.wait(timeout=0.1) is False
+        finally:
+            can_finish_second_lease.set()
+        second_lease_future.result(timeout=10.0)
+        third_lease_future.result(timeout=10.0)
+
+    second_instance, third_instance = borrowed_instances
+    assert second_instance is not first_instance
+    assert third_instance is second_instance
+
+
+def test_exclusive_pool_resize_discards_returned_excess_instance() -> None:
+    """貸し出し中に上限数を縮小すると、返却されたインスタンスは再利用されない。"""
+
+    manager = pyopenjtalk._ExclusiveInstanceManager(lambda: object(), pool_size=2)
+    with manager() as first_instance, manager() as second_instance:
+        manager.resize(1)
+    assert manager.pool_size == 1
+    assert manager._instance_count == 1
+    with manager() as instance:
+        assert instance is first_instance or instance is second_instance
+    with pytest.raises(ValueError):
+        manager.resize(0)
+
+
+def test_exclusive_pool_grow_does_not_wait_for_active_leases() -> None:
+    """貸し出し中に上限数を拡大すると、返却を待たずに次の貸し出しで新しいインスタンスを生成する。"""
+
+    manager = pyopenjtalk._ExclusiveInstanceManager(lambda: object(), pool_size=1)
+    with manager() as first_instance:
+        manager.resize(2)
+        with manager() as second_instance:
+            assert second_instance is not first_instance
+    assert manager._instance_count == 2
+
+
+@pytest.fixture
+def lock_metrics() -> Iterator[None]:
+    """ロックとインスタンスプールの計測を有効化し、テスト後に無効化する。"""
+
+    profiling.set_lock_metrics_enabled(True)
+    try:
+        yield
+    finally:
+        profiling.set_lock_metrics_enabled(False)
+        pyopenjtalk.reset_lock_stats()
+
+
+@pytest.mark.usefixtures("lock_metrics")
+def test_replaceable_pool_records_wait_hold_and_drain() -> None:
+    """交換可能なプールは借り出しの待ち時間・保持時間と、交換時に返却を待った時間を記録する。"""
+
+    manager = pyopenjtalk._ReplaceableInstanceManager(lambda: "old", pool_size=2)
+    is_lease_started = Event()
+    can_finish_lease = Event()
+
+    def hold_lease() -> None:
+        with manager(), manager():
+            is_lease_started.set()
+            assert can_finish_lease.wait(timeout=5.0) is True
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        lease_future = executor.submit(hold_lease)
+        assert is_lease_started.wait(timeout=5.0) is True
+        assert manager.stats()["active_leases"] == 2
+        replace_future = executor.submit(manager.replace, "new")
+        time.sleep(0.05)
+        can_finish_lease.set()
+        lease_future.result(timeout=10.0)
+        replace_future.result(timeout=10.0)
+
+    stats = manager.stats()
+    assert stats["acquisitions"] == 2
+    assert stats["active_leases"] == 0
+    assert stats["max_active_leases"] == 2
+    assert stats["pool_size"] == 2
+    assert stats["instance_count"] == 1
+    assert stats["wait"]["count"] == 2
+    assert stats["hold"]["count"] == 2
+    assert sum(stats["hold"]["bucket_counts"]) == 2
+    assert stats["drain"]["count"] == 1
+    assert stats["drain"]["max_seconds"] >= 0.04
+
+    manager.reset_stats()
+    assert manager.stats()["acquisitions"] == 0
+    assert manager.stats()["drain"]["count"] == 0
+
+
+@pytest.mark.usefixtures("lock_metrics")
+def test_exclusive_pool_records_contended_leases() -> None:
+    """排他プールは返却を待った貸し出しを競合として数え、計測が無効な間の貸し出しは数えない。"""
+
+    manager = pyopenjtalk._ExclusiveInstanceManager(lambda: object(), pool_size=1)
+    is_lease_started = Event()
+    can_finish_lease = Event()
+
+    def hold_lease() -> None:
+        with manager():
+            is_lease_started.set()
+            assert can_finish_lease.wait(timeout=5.0) is True
+
+    def borrow_instance() -> None:
+        with manager():
+            pass
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        lease_future = executor.submit(hold_lease)
+        assert is_lease_started.wait(timeout=5.0) is True
+        waiting_future = executor.submit(borrow_instance)
+        time.sleep(0.05)
+        can_finish_lease.set()
+        lease_future.result(timeout=10.0)
+        waiting_future.result(timeout=10.0)
+
+    stats = manager.stats()
+    assert stats["acquisitions"] == 2
+    assert stats["contended"] == 1
+    assert stats["wait"]["max_seconds"] >= 0.04
+    assert stats["active_leases"] == 0
+
+    profiling.set_lock_metrics_enabled(False)
+    with manager():
+        pass
+    assert manager.stats()["acquisitions"] == 2
+
+
+@pytest.mark.usefixtures("lock_metrics")
+def test_openjtalk_lock_records_shared_instance_contention() -> None:
+    """OpenJTalk インスタンスのロックは取得ごとに待ち時間と保持時間を記録する。"""
+
+    pyopenjtalk.reset_lock_stats()
+    jtalk = pyopenjtalk.OpenJTalk(dn_mecab=pyopenjtalk.OPEN_JTALK_DICT_DIR)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(jtalk.run_frontend, ["今日はいい天気ですね。"] * 32))
+
+    stats = pyopenjtalk.get_openjtalk_lock_stats()
+    assert stats["acquisitions"] == 32
+    assert stats["active_leases"] == 0
+    assert stats["max_active_leases"] == 1
+    assert stats["hold"]["count"] == 32
+    assert pyopenjtalk.get_global_jtalk_pool_stats()["pool_size"] == 1
+    assert pyopenjtalk.get_global_htsengine_pool_stats()["pool_size"] == 1
+
+
 def test_openjtalk_instances_have_independent_locks() -> None:
     """異なる OpenJTalk インスタンスが同じ排他ロックを共有しないことを確認。"""
 
@@ -288,6 +560,50 @@ def test_htsengine_instances_have_independent_locks() -> None:
     assert first_engine._lock is not second_engine._lock
 
 
+def test_openjtalk_instances_share_mecab_model_across_threads() -> None:
+    """同じ MeCabModel を共有する OpenJTalk インスタンスを並行実行しても結果が一致する。"""
+
+    mecab_model = pyopenjtalk.openjtalk.MeCabModel(pyopenjtalk.OPEN_JTALK_DICT_DIR)
+    shared_jtalks = [pyopenjtalk.openjtalk.OpenJTalk(mecab_model=mecab_model) for _ in range(4)]
+    independent_jtalk = pyopenjtalk.openjtalk.OpenJTalk(pyopenjtalk.OPEN_JTALK_DICT_DIR)
+    texts = ["今日もいい天気ですね", "こんにちは", "マルチスレッドプログラミング", "テストです"] * 4
+    expected_results = [independent_jtalk.run_frontend(text) for text in texts]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(
+                lambda index: shared_jtalks[index % 4].run_frontend(texts[index]),
+                range(len(texts)),
+            )
+        )
+
+    assert results == expected_results
+    assert all(jtalk.mecab_model is mecab_model for jtalk in shared_jtalks)
+    assert independent_jtalk.mecab_model is not mecab_model
+
+
+def test_shared_mecab_model_outlives_released_openjtalk() -> None:
+    """共有 Model を参照するインスタンスを解放しても、他のインスタンスは解析を続けられる。"""
+
+    first_jtalk = pyopenjtalk.openjtalk.OpenJTalk(pyopenjtalk.OPEN_JTALK_DICT_DIR)
+    second_jtalk = pyopenjtalk.openjtalk.OpenJTalk(mecab_model=first_jtalk.mecab_model)
+    expected_features = first_jtalk.run_mecab("こんにちは")
+    del first_jtalk
+
+    assert second_jtalk.run_mecab("こんにちは") == expected_features
+
+
+def test_global_jtalk_factory_loads_mecab_model_once() -> None:
+    """グローバルプール用ファクトリは生成する全インスタンスで MeCab 辞書を共有する。"""
+
+    jtalk_factory = pyopenjtalk._create_openjtalk_factory(pyopenjtalk.OPEN_JTALK_DICT_DIR)
+    first_jtalk = jtalk_factory()
+    second_jtalk = jtalk_factory()
+
+    assert first_jtalk is not second_jtalk
+    assert first_jtalk.mecab_model is second_jtalk.mecab_model
+
+
 def _concurrent_inference_test_metadata() -> tsqyomi.TsqyomiMetadata:
     """並行推論テスト用の最小 v3 メタデータ。"""
 
@@ -313,7 +629,7 @@ def _concurrent_inference_test_target() -> tsqyomi.ReadingTarget:
 
 
 class _ConcurrentInferenceTestTokenizer:
-    """`_predict_single_window()` 向けの最小トークナイザー。"""
+    """`TsqyomiModel.predict()` 向けの最小トークナイザー。"""
 
     def encode(self, text: str, add_special_tokens: bool = True) -> SimpleNamespace:
         """空文字列と本文断片を固定トークン列へ符号化する。"""
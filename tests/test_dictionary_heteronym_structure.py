@@ -176,7 +176,7 @@ def test_tsqyomi_selects_inflected_lemma_and_keeps_auxiliary(
 
     model = SimpleNamespace(
         metadata=SimpleNamespace(
-            surfaces_by_first_character={surface[0]: (surface,)},
+            target_surface_matcher=tsqyomi.TargetSurfaceMatcher((surface,)),
             class_index_by_surface_and_pronunciation={
                 surface: {
                     pronunciation: index
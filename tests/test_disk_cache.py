@@ -0,0 +1,190 @@
+"""SQLite によるフロントエンド処理結果の永続キャッシュを検証する。"""
+
+# pyright: reportPrivateUsage=false
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import pyopenjtalk
+from pyopenjtalk import tsqyomi
+from pyopenjtalk.disk_cache import FrontendDiskCache
+from pyopenjtalk.types import CacheStats
+
+
+TEXTS = ["こんにちは", "今日はいい天気ですね", "東京は日本の首都です"]
+
+
+def _read_with_new_process(cache_path: str) -> CacheStats:
+    """
+    別プロセスで同じキャッシュファイルを開き、TEXTS の g2p() 結果を読み出した統計情報を返す。
+
+    Args:
+        cache_path (str): キャッシュファイルのパス
+
+    Returns:
+        CacheStats: 読み出し後の統計情報
+    """
+
+    with FrontendDiskCache(cache_path) as cache:
+        for text in TEXTS:
+            assert cache.g2p(text) == pyopenjtalk.g2p(text)
+        return cache.stats()
+
+
+def test_disk_cache_persists_results_across_instances(tmp_path: Path) -> None:
+    """キャッシュファイルを開き直しても結果が残り、各処理の結果が公開 API と一致する。"""
+
+    cache_path = tmp_path / "frontend.sqlite3"
+    with FrontendDiskCache(cache_path) as cache:
+        for text in TEXTS:
+            assert cache.g2p(text, kana=True) == pyopenjtalk.g2p(text, kana=True)
+            assert cache.run_frontend(text) == pyopenjtalk.run_frontend(text)
+            assert cache.extract_fullcontext(text) == pyopenjtalk.extract_fullcontext(text)
+        assert cache.stats()["misses"] == 9
+
+    with FrontendDiskCache(cache_path) as cache:
+        for text in TEXTS:
+            assert cache.g2p(text, kana=True) == pyopenjtalk.g2p(text, kana=True)
+            assert cache.run_frontend(text) == pyopenjtalk.run_frontend(text)
+            assert cache.extract_fullcontext(text) == pyopenjtalk.extract_fullcontext(text)
+        assert cache.stats() == {
+            "hits": 9,
+            "misses": 0,
+            "evictions": 0,
+            "size": 9,
+            "max_size": 1_000_000,
+        }
+
+
+def test_disk_cache_key_covers_options(tmp_path: Path) -> None:
+    """既定値を明示した呼び出しは省略時と同じ項目を使い、異なるオプションは別の項目になる。"""
+
+    with FrontendDiskCache(tmp_path / "frontend.sqlite3") as cache:
+        cache.g2p("効果的な人生")
+        cache.g2p("効果的な人生", kana=False, revert_long_vowels=False)
+        assert cache.stats()["hits"] == 1
+        assert cache.g2p("効果的な人生", revert_long_vowels=True) == pyopenjtalk.g2p(
+            "効果的な人生", revert_long_vowels=True
+        )
+        assert cache.stats()["misses"] == 2
+
+
+def test_disk_cache_key_covers_user_dictionary(tmp_path: Path) -> None:
+    """ユーザー辞書を適用すると、辞書適用前の結果を返さない。"""
+
+    user_csv = tmp_path / "user.csv"
+    user_dic = tmp_path / "user.dic"
+    user_csv.write_text(
+        "猫宮ねこ,,,1,名詞,固有名詞,人名,一般,*,*,猫宮ねこ,ネコミヤネコ,ネコミヤネコ,1/6,C1\n",
+        encoding="utf-8",
+    )
+    pyopenjtalk.mecab_dict_index(str(user_csv), str(user_dic))
+    text = "猫宮ねこです"
+
+    with FrontendDiskCache(tmp_path / "frontend.sqlite3") as cache:
+        original_kana = cache.g2p(text, kana=True)
+        try:
+            pyopenjtalk.update_global_jtalk_with_user_dict(str(user_dic))
+            assert cache.g2p(text, kana=True) == "ネコミヤネコデス"
+        finally:
+            pyopenjtalk.unset_user_dict()
+        assert cache.g2p(text, kana=True) == original_kana
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 2
+
+
+def test_disk_cache_evicts_entries_beyond_max_entries(tmp_path: Path) -> None:
+    """最大件数を超えた分を破棄する。"""
+
+    with FrontendDiskCache(tmp_path / "frontend.sqlite3", max_entries=5) as cache:
+        for index in range(12):
+            cache.g2p(f"{index}個のりんご")
+        stats = cache.stats()
+
+    assert stats["size"] == 5
+    assert stats["evictions"] == 7
+
+
+def test_disk_cache_populate_stores_missing_entries(tmp_path: Path) -> None:
+    """事前投入は未格納の項目だけを格納し、投入後の呼び出しはキャッシュから返す。"""
+
+    with FrontendDiskCache(tmp_path / "frontend.sqlite3") as cache:
+        progress: list[int] = []
+        assert cache.populate(TEXTS, "g2p", progress_callback=progress.append) == 3
+        assert progress == [1, 2, 3]
+        assert cache.populate([*TEXTS, "さようなら"], "g2p") == 1
+        for text in TEXTS:
+            assert cache.g2p(text) == pyopenjtalk.g2p(text)
+        assert cache.stats()["hits"] == 3
+        assert cache.stats()["misses"] == 0
+
+
+def test_disk_cache_requires_loaded_tsqyomi_model(tmp_path: Path) -> None:
+    """tsqyomi 未ロード時に use_tsqyomi=True を指定すると、公開 API と同じ例外を送出する。"""
+
+    with FrontendDiskCache(tmp_path / "frontend.sqlite3") as cache:
+        with pytest.raises(RuntimeError):
+            cache.g2p("こんにちは", use_tsqyomi=True)
+        with pytest.raises(RuntimeError):
+            cache.populate(TEXTS, options={"use_tsqyomi": True})
+        assert cache.stats()["size"] == 0
+
+
+def test_disk_cache_is_shared_between_processes(tmp_path: Path) -> None:
+    """ワーカープロセスで事前投入した結果を、別プロセスから同じキャッシュファイルを通じて同時に読み出せる。"""
+
+    cache_path = tmp_path / "frontend.sqlite3"
+    with FrontendDiskCache(cache_path) as cache:
+        assert cache.populate(TEXTS, max_workers=2) == 3
+
+    with ProcessPoolExecutor(
+        max_workers=2, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        results = list(executor.map(_read_with_new_process, [str(cache_path)] * 2))
+
+    assert [stats["hits"] for stats in results] == [3, 3]
+    assert [stats["misses"] for stats in results] == [0, 0]
+
+
+def test_disk_cache_populate_rejects_workers_with_other_tsqyomi_model(tmp_path: Path) -> None:
+    """
+    並列の事前投入では、ワーカーが呼び出し元と同じ tsqyomi のモデルをロードした場合だけ結果を格納する。
+    異なるモデルをロードした場合は、呼び出し元のリビジョンのキーで誤った結果を格納せずに失敗する。
+    """
+
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnx")
+    from test_tsqyomi import _write_small_model_directory
+
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+    _write_small_model_directory(model_dir)
+    load_options = {"onnx_providers": ["CPUExecutionProvider"], "model_dir": str(model_dir)}
+    texts = ["人気がある", "人気者です"]
+    options = {"kana": True, "use_tsqyomi": True}
+    try:
+        tsqyomi.load_model(**load_options)
+        with FrontendDiskCache(tmp_path / "frontend.sqlite3") as cache:
+            with pytest.raises(RuntimeError):
+                cache.populate(
+                    texts,
+                    options=options,
+                    max_workers=2,
+                    tsqyomi_load_options={**load_options, "model_variant": "int8"},
+                )
+            assert cache.stats()["size"] == 0
+
+            assert (
+                cache.populate(
+                    texts, options=options, max_workers=2, tsqyomi_load_options=load_options
+                )
+                == 2
+            )
+            for text in texts:
+                assert cache.g2p(text, **options) == pyopenjtalk.g2p(text, **options)
+            assert cache.stats()["hits"] == 2
+    finally:
+        tsqyomi.unload_model()
@@ -632,14 +632,75 @@ def test_run_frontend_empty_string():
 
 
 def test_run_frontend_very_long_text():
-    """非常に長いテキストを run_frontend() に渡した場合、RuntimeError を送出するか返すこと（セグフォしないこと）。"""
-    with pytest.raises(RuntimeError, match="too long"):
-        pyopenjtalk.run_frontend("あ" * 10000)
+    """MeCab の入力バッファに収まらないテキストを run_frontend() に渡した場合、分割して全体を処理すること。"""
+    features = pyopenjtalk.run_frontend("あ" * 10000)
+    assert "".join(feature["string"] for feature in features) == "あ" * 10000
 
     features = pyopenjtalk.run_frontend("こんにちは")
     assert len(features) > 0
 
 
+LONG_DOCUMENT_TEXT = (
+    "今日は良い天気ですね。明日は雨が降るでしょう！それでも、私は出かけます。"
+    "何をしますか？山田さんは東京へ行った。ABC の件で、1,000円払います。"
+) * 5
+
+
+def test_run_frontend_long_document_matches_single_shot(monkeypatch: pytest.MonkeyPatch):
+    """文・節の境界で分割した長文の NJD features と形態素の char_span が、一括処理の結果と一致すること。"""
+
+    expected_features, expected_morphs = pyopenjtalk.run_frontend_detailed(LONG_DOCUMENT_TEXT)
+    expected_mapping = pyopenjtalk.g2p_mapping(LONG_DOCUMENT_TEXT)
+    monkeypatch.setattr(pyopenjtalk, "_TEXT2MECAB_BUFFER_SIZE", 256)
+
+    segments = pyopenjtalk._split_document(LONG_DOCUMENT_TEXT, None)
+    assert len(segments) > 1
+    assert "".join(segments) == LONG_DOCUMENT_TEXT
+    assert pyopenjtalk.run_frontend(LONG_DOCUMENT_TEXT) == expected_features
+    features, morphs = pyopenjtalk.run_frontend_detailed(LONG_DOCUMENT_TEXT)
+    assert features == expected_features
+    assert [morph["char_span"] for morph in morphs] == [
+        morph["char_span"] for morph in expected_morphs
+    ]
+    assert pyopenjtalk.g2p_mapping(LONG_DOCUMENT_TEXT) == expected_mapping
+
+
+def test_split_document_falls_back_to_clause_and_character_boundaries(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """文末で区切れない長い文は節の区切りで、それでも収まらない区切りは文字単位で分割すること。"""
+
+    monkeypatch.setattr(pyopenjtalk, "_TEXT2MECAB_BUFFER_SIZE", 64)
+    text = "あ" * 15 + "、" + "い" * 30 + "、1,000円"
+
+    segments = pyopenjtalk._split_document(text, None)
+
+    assert segments == ["あ" * 15 + "、", "い" * 21, "い" * 9 + "、1,000円"]
+
+
+def test_extract_fullcontext_long_document_concatenates_segment_labels(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """長文のラベルは分割した部分ごとに生成したラベルを連結したものになり、並行処理しても一致すること。"""
+
+    monkeypatch.setattr(pyopenjtalk, "_TEXT2MECAB_BUFFER_SIZE", 256)
+    segments = pyopenjtalk._split_document(LONG_DOCUMENT_TEXT, None)
+    expected_labels = [
+        label for segment in segments for label in pyopenjtalk.extract_fullcontext(segment)
+    ]
+
+    assert pyopenjtalk.extract_fullcontext(LONG_DOCUMENT_TEXT) == expected_labels
+    pyopenjtalk.set_global_jtalk_pool_size(2)
+    try:
+        assert pyopenjtalk.extract_fullcontext(LONG_DOCUMENT_TEXT) == expected_labels
+        assert pyopenjtalk.g2p(LONG_DOCUMENT_TEXT) == pyopenjtalk.g2p(
+            LONG_DOCUMENT_TEXT,
+            jtalk=pyopenjtalk.OpenJTalk(dn_mecab=pyopenjtalk.OPEN_JTALK_DICT_DIR),
+        )
+    finally:
+        pyopenjtalk.set_global_jtalk_pool_size(1)
+
+
 def test_run_frontend_special_characters_only():
     """特殊文字のみを run_frontend() に渡した場合、クラッシュしないこと。"""
     features = pyopenjtalk.run_frontend("!@#$%^&*()")
@@ -1068,3 +1129,29 @@ def test_run_frontend_split_equivalence(text: str):
     split_result = pyopenjtalk.apply_postprocessing(text, njd_features)
 
     assert original_result == split_result
+
+
+def test_run_frontend_batch_matches_run_frontend():
+    """run_frontend_batch() が入力順に OpenJTalk.run_frontend() と同一の結果を返すことを確認。"""
+
+    jtalk = pyopenjtalk.OpenJTalk(dn_mecab=pyopenjtalk.OPEN_JTALK_DICT_DIR)
+    # ポインタ配列の再確保を通すため、初期容量を超える形態素数のテキストも含める
+    texts = [*RUN_FRONTEND_SPLIT_EQUIVALENCE_CASES, "今日は晴れです。" * 40]
+
+    assert jtalk.run_frontend_batch(texts) == [jtalk.run_frontend(text) for text in texts]
+
+
+def test_run_frontend_batch_reports_errors_per_item():
+    """return_exceptions=True では失敗したテキストの位置に例外を格納し、後続のテキストも処理する。"""
+
+    jtalk = pyopenjtalk.OpenJTalk(dn_mecab=pyopenjtalk.OPEN_JTALK_DICT_DIR)
+    texts = ["こんにちは", "あ" * 10000, "さようなら"]
+
+    results = jtalk.run_frontend_batch(texts, return_exceptions=True)
+
+    assert results[0] == jtalk.run_frontend("こんにちは")
+    assert isinstance(results[1], RuntimeError)
+    assert "too long" in str(results[1])
+    assert results[2] == jtalk.run_frontend("さようなら")
+    with pytest.raises(RuntimeError, match="too long"):
+        jtalk.run_frontend_batch(texts)
@@ -4,6 +4,7 @@ import subprocess
 import sys
 
 import numpy as np
+import pytest
 
 import pyopenjtalk
 
@@ -62,3 +63,75 @@ def test_tts_engine_destruction_does_not_raise_at_interpreter_shutdown() -> None
     assert completed.returncode == 0, completed.stderr
     assert "Exception ignored in:" not in completed.stderr, completed.stderr
     assert "HTSEngine.__dealloc__" not in completed.stderr, completed.stderr
+
+
+def test_synthesize_stream_splits_at_pauses() -> None:
+    """文中のポーズごとに波形を返し、ポーズを複製しないため合計の長さは一括合成と一致する。"""
+
+    labels = pyopenjtalk.extract_fullcontext("今日は、いい天気ですね")
+    engine = pyopenjtalk.HTSEngine(pyopenjtalk.DEFAULT_HTS_VOICE)
+    chunks = list(engine.synthesize_stream(labels))
+    x = engine.synthesize(labels)
+
+    assert len(chunks) == 2
+    assert all(chunk.dtype == np.float64 for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == len(x)
+
+
+def test_tts_stream_yields_segments() -> None:
+    """文とポーズごとにサンプリング周波数付きの波形を返し、話速の指定を全セグメントに適用する。"""
+
+    text = "こんにちは。今日は、いい天気ですね。"
+    chunks = list(pyopenjtalk.tts_stream(text))
+    fast_chunks = list(pyopenjtalk.tts_stream(text, speed=1.5))
+
+    assert len(chunks) == len(fast_chunks) == 3
+    assert all(sr == 48000 for _, sr in chunks)
+    for (x, _), (x_fast, _) in zip(chunks, fast_chunks, strict=True):
+        assert len(x) > len(x_fast)
+    # 発音を持たないテキストは合成するセグメントがない
+    assert list(pyopenjtalk.tts_stream("")) == []
+
+
+def test_tts_stream_can_be_closed_early() -> None:
+    """消費を途中で打ち切っても、グローバルインスタンスを保持したままにしない。"""
+
+    stream = pyopenjtalk.tts_stream("こんにちは。さようなら。またね。")
+    next(stream)
+    stream.close()
+
+    x, _ = pyopenjtalk.tts("こんにちは")
+    assert len(x) > 0
+
+
+def test_get_generated_speech_supports_dtypes_and_output_buffer() -> None:
+    """float32 / int16 で一括取得でき、int16 は丸めてクリップし、指定した出力先の配列に書き込める。"""
+
+    labels = pyopenjtalk.extract_fullcontext("今日はいい天気ですね")
+    engine = pyopenjtalk.HTSEngine(pyopenjtalk.DEFAULT_HTS_VOICE)
+    x = engine.synthesize(labels)
+    x_float32 = engine.synthesize(labels, dtype=np.float32)
+    x_int16 = engine.synthesize(labels, dtype=np.int16)
+
+    assert x_float32.dtype == np.float32
+    np.testing.assert_array_equal(x_float32, x.astype(np.float32))
+    assert x_int16.dtype == np.int16
+    np.testing.assert_array_equal(x_int16, np.clip(np.rint(x), -32768, 32767).astype(np.int16))
+
+    buffer = np.full(len(x) + 16, 1, dtype=np.int16)
+    engine.synthesize_from_strings(labels)
+    try:
+        speech = engine.get_generated_speech(out=buffer)
+        with pytest.raises(ValueError):
+            engine.get_generated_speech(out=np.empty(len(x) - 1, dtype=np.int16))
+        with pytest.raises(ValueError):
+            engine.get_generated_speech(dtype=np.float32, out=buffer)
+        with pytest.raises(ValueError):
+            engine.get_generated_speech(dtype=np.int32)
+    finally:
+        engine.refresh()
+
+    assert np.shares_memory(speech, buffer)
+    np.testing.assert_array_equal(speech, x_int16)
+    assert np.all(buffer[len(x) :] == 1)
+    assert len(engine.get_generated_speech()) == 0
@@ -0,0 +1,76 @@
+"""`import pyopenjtalk` が重い依存関係を読み込まず、import 時間が上限内に収まることを検証する。"""
+
+import subprocess
+import sys
+
+
+# import pyopenjtalk の時点では読み込まない重い依存関係と、tsqyomi のモデル関連モジュール
+DEFERRED_MODULES = (
+    "onnxruntime",
+    "pydantic",
+    "sudachipy",
+    "tokenizers",
+    "pyopenjtalk.tsqyomi.model",
+    "pyopenjtalk.tsqyomi.inference",
+)
+
+# numpy を除いた import pyopenjtalk の累積時間の上限 (マイクロ秒)
+## 計測環境による揺れを吸収できるよう、遅延 import 導入後の実測値 (約 50 ms) より大幅に余裕を持たせる
+IMPORT_TIME_BUDGET_US = 500_000
+
+
+def _run_importtime(code: str) -> dict[str, int]:
+    """
+    新しいインタプリタで `-X importtime` を有効にしてコードを実行し、モジュールごとの累積 import 時間を返す。
+
+    Args:
+        code (str): 実行するコード
+
+    Returns:
+        dict[str, int]: モジュール名から累積 import 時間 (マイクロ秒) への対応。最初に import された時点の値を使う
+    """
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60.0,
+    )
+    cumulative_times: dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") is False or "cumulative" in line:
+            continue
+        _, cumulative_time, module_name = line.removeprefix("import time:").split("|")
+        cumulative_times.setdefault(module_name.strip(), int(cumulative_time))
+    return cumulative_times
+
+
+def test_import_does_not_load_deferred_modules() -> None:
+    """import pyopenjtalk では onnxruntime・pydantic・sudachipy・tsqyomi のモデル関連モジュールを読み込まない。"""
+
+    cumulative_times = _run_importtime("import pyopenjtalk")
+
+    assert "pyopenjtalk" in cumulative_times
+    assert [module for module in DEFERRED_MODULES if module in cumulative_times] == []
+
+
+def test_import_time_is_within_budget() -> None:
+    """numpy を除いた import pyopenjtalk の累積時間が上限内に収まる。"""
+
+    cumulative_times = _run_importtime("import pyopenjtalk")
+
+    # numpy は OpenJTalk 本体の Cython 拡張が必要とするため、上限の対象から除く
+    import_time = cumulative_times["pyopenjtalk"] - cumulative_times.get("numpy", 0)
+    assert import_time < IMPORT_TIME_BUDGET_US
+
+
+def test_deferred_modules_are_loaded_on_first_use() -> None:
+    """遅延 import したモジュールは、その機能を初めて使った時点で読み込まれる。"""
+
+    cumulative_times = _run_importtime(
+        "import pyopenjtalk; pyopenjtalk.g2p('風が吹く'); pyopenjtalk.tsqyomi.is_model_loaded()"
+    )
+
+    assert "sudachipy" in cumulative_times
+    assert "pyopenjtalk.tsqyomi.model" in cumulative_times
@@ -1,8 +1,12 @@
+import subprocess
+import sys
+from pathlib import Path
 from typing import cast
 
 import numpy as np
 import pytest
 
+import pyopenjtalk
 from pyopenjtalk.types import NJDFeature
 from pyopenjtalk.yomi_model import nani_predict
 
@@ -46,16 +50,18 @@ def test_nani_model_exposes_probability_tensor() -> None:
     """nani_model がクラスラベルに依存しない二クラス確率テンソルを返す。"""
 
     pytest.importorskip("onnxruntime")
-    if nani_predict.enc_session is None or nani_predict.model_session is None:
+    sessions = nani_predict.get_sessions()
+    if sessions is None:
         pytest.fail("ONNX Runtime sessions were not initialized")
+    enc_session, model_session = sessions
 
     # ORT 1.26 で挙動が変化した「何を」の特徴量をモデルへ直接入力
     input_data = np.array([["助詞", "格助詞", "一般", "ヲ", "*", "*"]])
     encoded_features = np.asarray(
-        nani_predict.enc_session.run(None, {"input": input_data})[0],
+        enc_session.run(None, {"input": input_data})[0],
         dtype=np.float32,
     )
-    model_outputs = nani_predict.model_session.run(None, {"input": encoded_features})
+    model_outputs = model_session.run(None, {"input": encoded_features})
     probability_array = np.asarray(model_outputs[0], dtype=np.float32)
 
     assert len(model_outputs) == 1
@@ -64,3 +70,146 @@ def test_nani_model_exposes_probability_tensor() -> None:
         np.array([[0.6357111, 0.3642888]], dtype=np.float32),
         atol=1e-6,
     )
+
+
+def test_nani_predict_batch_matches_single_predictions() -> None:
+    """まとめて推定した結果が、入力順のまま1件ずつ推定した結果と一致する。"""
+
+    pytest.importorskip("onnxruntime")
+
+    features = [
+        cast(
+            NJDFeature,
+            {
+                "pos": "助詞",
+                "pos_group1": pos_group1,
+                "pos_group2": pos_group2,
+                "pron": pronunciation,
+                "ctype": "*",
+                "cform": "*",
+            },
+        )
+        for pronunciation, pos_group1, pos_group2 in [
+            ("ヲ", "格助詞", "一般"),
+            ("ノ", "連体化", "*"),
+            ("デス’", "*", "*"),
+            ("ダロ", "*", "*"),
+        ]
+    ]
+    next_njds = [features[0], None, features[1], features[2], features[3]]
+
+    assert nani_predict.predict_batch(next_njds) == [
+        nani_predict.predict([next_njd]) for next_njd in next_njds
+    ]
+    assert nani_predict.predict_batch(next_njds) == [0, 0, 1, 1, 1]
+    assert nani_predict.predict_batch([]) == []
+
+
+def test_nani_lookup_table_matches_onnx_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    """事前計算済みの判定表が、未知のカテゴリを含む文脈でも ONNX モデルと同じ推定結果を返す。"""
+
+    pytest.importorskip("onnxruntime")
+    lookup_table = nani_predict.load_lookup_table()
+    assert lookup_table is not None
+
+    next_njds: list[NJDFeature | None] = []
+    for text in ["何の話", "何ですか", "何だろう", "何と言う", "何かある", "答えは何", "何？"]:
+        njd_features = pyopenjtalk.run_frontend(text, predict_nani=False)
+        next_njds.extend(
+            njd_features[index + 1] if index + 1 < len(njd_features) else None
+            for index, feature in enumerate(njd_features)
+            if feature["orig"] == "何"
+        )
+    for pronunciation in ["ノ", "デス’", "ダロ", "未知の発音"]:
+        next_njds.append(
+            cast(
+                NJDFeature,
+                {
+                    "pos": "未知の品詞",
+                    "pos_group1": "*",
+                    "pos_group2": "*",
+                    "pron": pronunciation,
+                    "ctype": "*",
+                    "cform": "*",
+                },
+            )
+        )
+
+    table_predictions = nani_predict.predict_batch(next_njds)
+    monkeypatch.setattr(nani_predict, "_get_lookup_table", lambda: None)
+    nani_predict._fallback_predictions.clear()
+    onnx_predictions = nani_predict.predict_batch(next_njds)
+
+    assert table_predictions == onnx_predictions
+    assert 0 in table_predictions and 1 in table_predictions
+    # ONNX モデルでの推定結果は、同じ特徴量の文脈ごとに再利用する
+    assert nani_predict.predict_batch(next_njds) == onnx_predictions
+    assert nani_predict._fallback_predictions.stats()["hits"] > 0
+
+
+def test_nani_lookup_table_is_ignored_for_other_models(tmp_path: Path) -> None:
+    """作成元の ONNX モデルと現在のモデルが異なる判定表は読み込まない。"""
+
+    table_path = tmp_path / "nani_table.npz"
+    categories = [["助詞"], ["*"], ["*"], ["ノ"], ["*"], ["*"]]
+    predictions = np.zeros(2**6, dtype=np.bool_)
+    nani_predict.save_lookup_table(table_path, categories, predictions, "0" * 64)
+    assert nani_predict.load_lookup_table(table_path) is None
+
+    nani_predict.save_lookup_table(
+        table_path, categories, predictions, nani_predict.compute_model_digest()
+    )
+    lookup_table = nani_predict.load_lookup_table(table_path)
+    assert lookup_table is not None
+    assert nani_predict.load_lookup_table(tmp_path / "missing.npz") is None
+
+
+def test_nani_sessions_are_not_created_at_import() -> None:
+    """pyopenjtalk の import と判定表で足りる推定では、ONNX Runtime を読み込まず標準出力にも何も出力しない。"""
+
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; import pyopenjtalk; pyopenjtalk.g2p('何の話'); "
+            "print('onnxruntime' in sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60.0,
+    )
+
+    assert completed.stdout == "False\n"
+
+
+def test_nani_sessions_reuse_optimized_models(tmp_path: Path) -> None:
+    """最適化済みモデルの保存先を指定すると初回に保存し、設定変更後のセッションはそれを読み込む。"""
+
+    pytest.importorskip("onnxruntime")
+    try:
+        nani_predict.configure_sessions(
+            intra_op_num_threads=1,
+            graph_optimization_level="extended",
+            optimized_model_dir=tmp_path,
+        )
+        first_sessions = nani_predict.get_sessions()
+        optimized_model_paths = sorted(path.name for path in tmp_path.iterdir())
+        nani_predict.configure_sessions(
+            graph_optimization_level="extended", optimized_model_dir=tmp_path
+        )
+        second_sessions = nani_predict.get_sessions()
+        assert first_sessions is not None and second_sessions is not None
+        assert second_sessions[0] is not first_sessions[0]
+        input_data = np.array([["助詞", "連体化", "*", "ノ", "*", "*"]])
+        encoded_features = second_sessions[0].run(None, {"input": input_data})[0]
+        probability_array = second_sessions[1].run(None, {"input": encoded_features})[0]
+    finally:
+        nani_predict.configure_sessions()
+
+    assert len(optimized_model_paths) == 2
+    assert all(name.endswith(".extended.onnx") for name in optimized_model_paths)
+    assert sorted(path.name for path in tmp_path.iterdir()) == optimized_model_paths
+    assert int(np.argmax(probability_array[0])) == 1
+    with pytest.raises(ValueError):
+        nani_predict.configure_sessions(intra_op_num_threads=-1)
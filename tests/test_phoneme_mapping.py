@@ -1194,7 +1194,7 @@ def test_g2p_recovery_after_error():
     """公開 API でエラーが発生した後も次の g2p() 呼び出しが正常に動作することを確認。"""
 
     with pytest.raises(RuntimeError, match="too long"):
-        pyopenjtalk.g2p("あ" * 10000)
+        pyopenjtalk.run_mecab("あ" * 10000)
 
     result = pyopenjtalk.g2p("復帰")
     assert result == "f u cl k i"
@@ -1,6 +1,7 @@
 """Python 側の読み・アクセント後処理を検証する。"""
 
 import copy
+from collections.abc import Sequence
 
 import pytest
 
@@ -79,12 +80,14 @@ def test_predict_nani_reading_keeps_high_confidence_nani_rules(
 ):
     """後続形態素だけで確定する「何」はモデル誤判定より確実なナニ規則を優先する。"""
 
-    def fail_predict(_features: list[NJDFeature | None]) -> int:
+    def fail_predict(_features: Sequence[NJDFeature | None]) -> list[int]:
         """高確信ナニ規則でモデル推論が呼ばれた場合は失敗させる。"""
 
-        raise AssertionError("predict() must not be called for a high-confidence ナニ context")
+        raise AssertionError(
+            "predict_batch() must not be called for a high-confidence ナニ context"
+        )
 
-    monkeypatch.setattr(pyopenjtalk_utils, "predict", fail_predict)
+    monkeypatch.setattr(pyopenjtalk_utils, "predict_batch", fail_predict)
     njd_features = pyopenjtalk.run_frontend(text, predict_nani=False)
 
     corrected_features = pyopenjtalk_utils.predict_nani_reading(njd_features)
@@ -99,12 +102,12 @@ def test_predict_nani_reading_keeps_product_default_before_case_particle_de(
 ):
     """格助詞「で」の前にある「何」は、製品既定のナンを維持する。"""
 
-    def fail_predict(_features: list[NJDFeature | None]) -> int:
+    def fail_predict(_features: Sequence[NJDFeature | None]) -> list[int]:
         """格助詞「で」の確定規則からモデル推論へ進んだ場合は失敗させる。"""
 
-        raise AssertionError("predict() must not be called before the case particle で")
+        raise AssertionError("predict_batch() must not be called before the case particle で")
 
-    monkeypatch.setattr(pyopenjtalk_utils, "predict", fail_predict)
+    monkeypatch.setattr(pyopenjtalk_utils, "predict_batch", fail_predict)
     njd_features = pyopenjtalk.run_frontend("何で塗る", predict_nani=False)
 
     corrected_features = pyopenjtalk_utils.predict_nani_reading(njd_features)
@@ -114,6 +117,34 @@ def test_predict_nani_reading_keeps_product_default_before_case_particle_de(
     assert nani_feature["pron"] == "ナン"
 
 
+def test_predict_nani_reading_uses_context_before_adjacent_nani_rewrite(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """連続する「何」では、後続の「何」が規則で書き換えられる前の特徴量をモデルに渡す。"""
+
+    recorded_features: list[NJDFeature | None] = []
+
+    def record_predict(features: Sequence[NJDFeature | None]) -> list[int]:
+        """モデルに渡された後続形態素を記録し、常にナンと推定する。"""
+
+        recorded_features.extend(copy.deepcopy(list(features)))
+        return [1] * len(features)
+
+    monkeypatch.setattr(pyopenjtalk_utils, "predict_batch", record_predict)
+    njd_features = pyopenjtalk.run_frontend("何何を選ぶ", predict_nani=False)
+    assert [feature["orig"] for feature in njd_features[:3]] == ["何", "何", "を"]
+    # 後続の「何」の読みが規則 (直後が「を」ならナニ) で書き換わることが分かるよう、辞書由来の読みをナンにしておく
+    njd_features[1]["pron"] = "ナン"
+    njd_features[1]["read"] = "ナン"
+    original_next_feature = copy.deepcopy(njd_features[1])
+
+    corrected_features = pyopenjtalk_utils.predict_nani_reading(njd_features)
+
+    assert recorded_features == [original_next_feature]
+    assert corrected_features[0]["pron"] == "ナン"
+    assert corrected_features[1]["pron"] == "ナニ"
+
+
 @pytest.mark.parametrize(
     ("text", "expected_next_orig"),
     [
@@ -130,13 +161,13 @@ def test_predict_nani_reading_uses_model_outside_high_confidence_rules(
 
     received_features: list[list[NJDFeature | None]] = []
 
-    def predict_nan(features: list[NJDFeature | None]) -> int:
+    def predict_nan(features: Sequence[NJDFeature | None]) -> list[int]:
         """モデルへ渡された後続形態素を記録してナン判定を返す。"""
 
-        received_features.append(features)
-        return 1
+        received_features.append(list(features))
+        return [1] * len(features)
 
-    monkeypatch.setattr(pyopenjtalk_utils, "predict", predict_nan)
+    monkeypatch.setattr(pyopenjtalk_utils, "predict_batch", predict_nan)
     njd_features = pyopenjtalk.run_frontend(text, predict_nani=False)
 
     corrected_features = pyopenjtalk_utils.predict_nani_reading(njd_features)
@@ -149,6 +180,33 @@ def test_predict_nani_reading_uses_model_outside_high_confidence_rules(
     assert nani_feature["pron"] == "ナン"
 
 
+def test_predict_nani_reading_batches_model_predictions(monkeypatch: pytest.MonkeyPatch):
+    """モデル判定が必要な複数の「何」は、1回の predict_batch() 呼び出しでまとめて推定する。"""
+
+    received_features: list[list[NJDFeature | None]] = []
+
+    def predict_nan(features: Sequence[NJDFeature | None]) -> list[int]:
+        """モデルへ渡された後続形態素を記録してナン判定を返す。"""
+
+        received_features.append(list(features))
+        return [1] * len(features)
+
+    monkeypatch.setattr(pyopenjtalk_utils, "predict_batch", predict_nan)
+    njd_features = pyopenjtalk.run_frontend("何かを選ぶ。何を選ぶ。答えは何", predict_nani=False)
+
+    corrected_features = pyopenjtalk_utils.predict_nani_reading(njd_features)
+
+    assert len(received_features) == 1
+    assert [
+        feature["orig"] if feature is not None else None for feature in received_features[0]
+    ] == ["か", None]
+    assert [feature["read"] for feature in corrected_features if feature["orig"] == "何"] == [
+        "ナン",
+        "ナニ",
+        "ナン",
+    ]
+
+
 def test_modify_kanji_yomi_does_not_partially_mutate_on_alignment_failure(
     monkeypatch: pytest.MonkeyPatch,
 ):
@@ -0,0 +1,87 @@
+"""処理ステージごとの所要時間の計測を検証する。"""
+
+# pyright: reportPrivateUsage=false
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import pyopenjtalk
+from pyopenjtalk import profiling
+
+
+@pytest.fixture
+def aggregation() -> Iterator[None]:
+    """プロセス全体の集計を有効化し、テスト後に無効化して破棄する。"""
+
+    profiling.reset_aggregated_stats()
+    profiling.set_aggregation_enabled(True)
+    try:
+        yield
+    finally:
+        profiling.set_aggregation_enabled(False)
+        profiling.reset_aggregated_stats()
+
+
+def test_stage_is_shared_no_op_when_disabled() -> None:
+    """計測が無効な間は共有の何もしないコンテキストマネージャを返し、何も集計しない。"""
+
+    assert profiling.stage("text2mecab") is profiling._DISABLED_STAGE_TIMER
+    pyopenjtalk.g2p("こんにちは")
+    assert profiling.get_aggregated_stats() == {}
+
+
+def test_record_stages_covers_frontend_and_synthesis() -> None:
+    """tts() の呼び出しで、フロントエンド処理から音声合成までの各ステージを集計する。"""
+
+    with profiling.record_stages() as timings:
+        pyopenjtalk.tts("何の話をしようか。時々、風が吹く。")
+
+    stats = timings.to_dict()
+    assert list(stats) == [
+        "text2mecab",
+        "mecab_analysis",
+        "njd",
+        "njd2feature",
+        "sudachi",
+        "nani",
+        "odori",
+        "make_label",
+        "htsengine",
+    ]
+    for stage_stats in stats.values():
+        assert stage_stats["count"] >= 1
+        assert 0.0 <= stage_stats["min_seconds"] <= stage_stats["max_seconds"]
+        assert stage_stats["total_seconds"] >= stage_stats["max_seconds"]
+    assert profiling.stage("text2mecab") is profiling._DISABLED_STAGE_TIMER
+
+
+def test_nested_record_stages_adds_to_outer_timings() -> None:
+    """入れ子にした場合、内側の範囲の処理は外側の集計にも加算される。"""
+
+    with profiling.record_stages() as outer_timings:
+        pyopenjtalk.run_frontend("こんにちは", use_sudachi_kanji_yomi=False)
+        with profiling.record_stages() as inner_timings:
+            pyopenjtalk.run_frontend("さようなら", use_sudachi_kanji_yomi=False)
+
+    assert inner_timings.to_dict()["text2mecab"]["count"] == 1
+    assert outer_timings.to_dict()["text2mecab"]["count"] == 2
+
+
+@pytest.mark.usefixtures("aggregation")
+def test_aggregation_collects_all_threads() -> None:
+    """プロセス全体の集計は全スレッドの処理を含み、record_stages() は現在のスレッドの処理だけを含む。"""
+
+    with profiling.record_stages() as timings:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(pyopenjtalk.g2p, "こんにちは").result()
+        pyopenjtalk.g2p("こんにちは", use_sudachi_kanji_yomi=False)
+
+    assert timings.to_dict()["mecab_analysis"]["count"] == 1
+    assert profiling.get_aggregated_stats()["mecab_analysis"]["count"] == 2
+    assert "sudachi" in profiling.get_aggregated_stats()
+    assert "sudachi" not in timings.to_dict()
+
+    profiling.reset_aggregated_stats()
+    assert profiling.get_aggregated_stats() == {}
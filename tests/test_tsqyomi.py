@@ -4,6 +4,8 @@
 
 from __future__ import annotations
 
+import json
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from threading import Barrier, Event
@@ -79,6 +81,128 @@ def test_load_model_initializes_once_without_blocking_status_queries(
     assert load_count == 1
 
 
+def _write_small_model_directory(directory: Path) -> None:
+    """
+    v3 の ONNX 入出力契約を満たす小さなモデル、トークナイザー、メタデータをディレクトリへ書き出す。
+
+    Args:
+        directory (Path): 書き出し先のディレクトリ
+    """
+
+    onnx = pytest.importorskip("onnx")
+    tokenizers = pytest.importorskip("tokenizers")
+    from onnx import TensorProto, helper, numpy_helper
+
+    rng = np.random.default_rng(0)
+    graph = helper.make_graph(
+        [
+            helper.make_node("Gather", ["embeddings", "input_ids"], ["token_states"]),
+            helper.make_node(
+                "Cast", ["attention_mask"], ["attention_weights"], to=TensorProto.FLOAT
+            ),
+            helper.make_node(
+                "Unsqueeze", ["attention_weights", "last_axis"], ["attention_weights_3d"]
+            ),
+            helper.make_node("Mul", ["token_states", "attention_weights_3d"], ["attended_states"]),
+            helper.make_node("Cast", ["target_mask"], ["target_weights"], to=TensorProto.FLOAT),
+            helper.make_node("MatMul", ["target_weights", "attended_states"], ["target_states"]),
+            helper.make_node("MatMul", ["target_states", "classifier"], ["reading_class_logits"]),
+        ],
+        "tsqyomi_test",
+        [
+            helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "sequence"]),
+            helper.make_tensor_value_info(
+                "attention_mask", TensorProto.INT64, ["batch", "sequence"]
+            ),
+            helper.make_tensor_value_info(
+                "target_mask", TensorProto.BOOL, ["batch", "target", "sequence"]
+            ),
+        ],
+        [
+            helper.make_tensor_value_info(
+                "reading_class_logits", TensorProto.FLOAT, ["batch", "target", 2]
+            )
+        ],
+        [
+            numpy_helper.from_array(rng.standard_normal((8, 32)).astype(np.float32), "embeddings"),
+            numpy_helper.from_array(rng.standard_normal((32, 2)).astype(np.float32), "classifier"),
+            numpy_helper.from_array(np.array([-1], dtype=np.int64), "last_axis"),
+        ],
+    )
+    # 導入済みの ONNX Runtime が読める IR バージョンへ固定する
+    onnx.save(
+        helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)], ir_version=8),
+        directory / "model.onnx",
+    )
+
+    tokenizer = tokenizers.Tokenizer(
+        tokenizers.models.WordLevel(
+            {"[UNK]": 0, "[CLS]": 1, "[SEP]": 2, "人": 3, "気": 4, "が": 5},
+            unk_token="[UNK]",
+        )
+    )
+    tokenizer.pre_tokenizer = tokenizers.pre_tokenizers.Split(tokenizers.Regex("."), "isolated")
+    tokenizer.save(str(directory / "tokenizer.json"))
+
+    (directory / "metadata.json").write_text(
+        json.dumps(
+            _minimal_v3_metadata_payload(
+                model_max_length=16, leading_token_id=1, trailing_token_id=2
+            )
+        ),
+        encoding="utf-8",
+    )
+
+
+def test_load_model_applies_session_options_and_int8_variant(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """
+    load_model() は SessionOptions をセッションへ渡し、int8 指定時は動的量子化したモデルを保存して使う。
+    量子化したモデルも ONNX の入出力契約を満たし、fp32 とは別のリビジョンとして扱う。
+    """
+
+    onnxruntime = pytest.importorskip("onnxruntime")
+    onnx = pytest.importorskip("onnx")
+    _write_small_model_directory(tmp_path)
+    monkeypatch.setattr(tsqyomi_model, "_loaded_model", None)
+    monkeypatch.setattr(tsqyomi_model, "_is_model_loading", False)
+    target = tsqyomi.ReadingTarget(
+        char_span=(0, 2), surface="人気", pronunciations=("ニンキ", "ヒトケ")
+    )
+
+    revisions: dict[str, str | None] = {}
+    try:
+        for model_variant in ("fp32", "int8"):
+            session_options = onnxruntime.SessionOptions()
+            session_options.intra_op_num_threads = 1
+            tsqyomi.load_model(
+                ["CPUExecutionProvider"],
+                model_dir=tmp_path,
+                session_options=session_options,
+                model_variant=model_variant,
+            )
+            model = tsqyomi.get_loaded_model()
+            assert model.session.get_session_options().intra_op_num_threads == 1
+            assert len(model.predict("人気がある", (target,))) == 1
+            revisions[model_variant] = model.revision
+            tsqyomi.unload_model()
+    finally:
+        tsqyomi.unload_model()
+
+    quantized_model = onnx.load(tmp_path / "model.int8.onnx")
+    assert "MatMulInteger" in {node.op_type for node in quantized_model.graph.node}
+    assert revisions["fp32"] != revisions["int8"]
+
+
+def test_load_model_rejects_unknown_model_variant() -> None:
+    """未知の model_variant はモデルを取得する前に拒否する。"""
+
+    with pytest.raises(ValueError, match="unknown tsqyomi model variant"):
+        tsqyomi.load_model(model_variant=cast(Any, "int4"))
+
+
 def _minimal_v3_metadata_payload(**overrides: Any) -> dict[str, Any]:
     """テスト用の最小 v3 metadata 辞書を返す。"""
 
@@ -243,6 +367,296 @@ def test_metadata_rejects_negative_class_index() -> None:
         )
 
 
+def test_metadata_builds_target_surface_matcher() -> None:
+    """メタデータのロード時に、推論対象表層を本文から検出する照合器を構築する。"""
+
+    metadata = tsqyomi.TsqyomiMetadata.model_validate(_minimal_v3_metadata_payload())
+
+    assert metadata.target_surface_matcher.find_spans("人気のある人気店") == ((0, 2), (5, 7))
+    assert metadata.target_surface_matcher.find_spans("対象を含まない本文") == ()
+
+
+def test_target_surface_matcher_prefers_leftmost_longest_match() -> None:
+    """同じ位置では最長の表層を選び、採用した範囲と重なる後続の対象は除く。"""
+
+    matcher = tsqyomi.TargetSurfaceMatcher(("日本", "日本人", "本人", "人気", "一日"))
+
+    # 「日本人気」は先頭の「日本人」を採用し、重なる「人気」は除く
+    assert matcher.find_spans("日本人気") == ((0, 3),)
+    # 「日本」の一致が「一日」と重なるため、先に始まる「一日」を採用する
+    assert matcher.find_spans("一日本人") == ((0, 2), (2, 4))
+    # トライ木を途中まで辿れても表層に至らない位置は読み飛ばす
+    assert matcher.find_spans("日人気") == ((1, 3),)
+    assert matcher.find_spans("") == ()
+    assert tsqyomi.TargetSurfaceMatcher(()).find_spans("日本人") == ()
+
+
+class _CharacterTokenizer:
+    """1文字を1トークンへ符号化し、符号化した本文断片を記録するトークナイザー。"""
+
+    def __init__(self) -> None:
+        """符号化の記録を初期化する。"""
+
+        self.encoded_texts: list[str] = []
+
+    def encode(self, text: str, add_special_tokens: bool = True) -> SimpleNamespace:
+        """本文断片の各文字を、文字コードをトークン ID とする1トークンへ符号化する。"""
+
+        self.encoded_texts.append(text)
+        return SimpleNamespace(
+            ids=[ord(character) for character in text],
+            offsets=[(index, index + 1) for index in range(len(text))],
+        )
+
+
+class _RecordingSession:
+    """
+    ONNX の実行ごとの入力を記録するセッション。
+    入力窓に「あ」を含むバッチ行は読みクラス 1、それ以外は読みクラス 0 を選ぶロジットを返す。
+    """
+
+    def __init__(self) -> None:
+        """実行の記録を初期化する。"""
+
+        self.model_inputs: list[dict[str, Any]] = []
+
+    def run(self, _output_names: list[str], model_inputs: dict[str, Any]) -> list[Any]:
+        """入力を記録し、バッチ行ごとに選ぶ読みクラスのスコアが最大になるロジットを返す。"""
+
+        self.model_inputs.append(model_inputs)
+        batch_size, target_count, _ = model_inputs["target_mask"].shape
+        logits = np.zeros((batch_size, target_count, 2), dtype=np.float32)
+        for batch_index in range(batch_size):
+            attended_ids = model_inputs["input_ids"][batch_index][
+                model_inputs["attention_mask"][batch_index] == 1
+            ]
+            logits[batch_index, :, int(ord("あ") in attended_ids)] = 1.0
+        return [logits]
+
+    @staticmethod
+    def get_providers() -> list[str]:
+        """CPU 利用中の ONNX セッション相当の EP 列を返す。"""
+
+        return ["CPUExecutionProvider"]
+
+
+def _ninki_target(start: int) -> tsqyomi.ReadingTarget:
+    """指定位置から始まる「人気」の対象を返す。"""
+
+    return tsqyomi.ReadingTarget(
+        char_span=(start, start + 2),
+        surface="人気",
+        pronunciations=("ニンキ", "ヒトケ"),
+    )
+
+
+def test_predict_tokenizes_once_and_packs_windows_greedily() -> None:
+    """本文を1回だけトークン化し、入力窓に収まる限り連続する対象を同じ窓へ詰めて推論する。"""
+
+    tokenizer = _CharacterTokenizer()
+    session = _RecordingSession()
+    metadata = tsqyomi.TsqyomiMetadata.model_validate(
+        _minimal_v3_metadata_payload(model_max_length=10, leading_token_id=1, trailing_token_id=2)
+    )
+    model = tsqyomi.TsqyomiModel(tokenizer, session, metadata)
+    text = "人気と人気の、いい人気店の人気"
+    targets = (_ninki_target(13), _ninki_target(0), _ninki_target(3), _ninki_target(9))
+
+    predictions = model.predict(text, targets)
+
+    assert [prediction.pronunciation for prediction in predictions] == ["ニンキ"] * 4
+    # 対象境界で区切った各断片を1回ずつ符号化する
+    assert tokenizer.encoded_texts == ["人気", "と", "人気", "の、いい", "人気", "店の", "人気"]
+    # 本文トークンに使える長さは8のため、(0, 3) と (9, 13) の2窓に詰め、1回の ONNX 実行へ束ねる
+    assert len(session.model_inputs) == 1
+    inputs = session.model_inputs[0]
+    assert inputs["input_ids"].shape == (2, 10)
+    assert inputs["target_mask"].shape == (2, 2, 10)
+    assert (inputs["input_ids"][:, 0] == 1).all()
+    assert (inputs["input_ids"][:, -1] == 2).all()
+    assert inputs["attention_mask"].all()
+
+
+def test_predict_splits_windows_by_max_batch_size() -> None:
+    """入力窓が max_batch_size を超える場合は、max_batch_size 個ずつ ONNX を実行する。"""
+
+    session = _RecordingSession()
+    metadata = tsqyomi.TsqyomiMetadata.model_validate(
+        _minimal_v3_metadata_payload(model_max_length=4, leading_token_id=1, trailing_token_id=2)
+    )
+    model = tsqyomi.TsqyomiModel(_CharacterTokenizer(), session, metadata, max_batch_size=2)
+
+    predictions = model.predict(
+        "人気人気人気",
+        (_ninki_target(0), _ninki_target(2), _ninki_target(4)),
+    )
+
+    assert len(predictions) == 3
+    assert [inputs["input_ids"].shape for inputs in session.model_inputs] == [(2, 4), (1, 4)]
+
+
+def test_batch_queue_pads_concurrent_windows_into_one_run() -> None:
+    """
+    batch_wait_seconds を指定したモデルは、複数スレッドの入力窓を右側パディングで1回の ONNX 実行へ束ね、
+    各呼び出しへ自身のバッチ行の予測を返す。
+    """
+
+    session = _RecordingSession()
+    metadata = tsqyomi.TsqyomiMetadata.model_validate(
+        _minimal_v3_metadata_payload(leading_token_id=1, trailing_token_id=2)
+    )
+    model = tsqyomi.TsqyomiModel(
+        _CharacterTokenizer(),
+        session,
+        metadata,
+        max_batch_size=2,
+        batch_wait_seconds=10.0,
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        short_future = executor.submit(model.predict, "人気", (_ninki_target(0),))
+        long_future = executor.submit(
+            model.predict,
+            "ある人気と人気",
+            (_ninki_target(2), _ninki_target(5)),
+        )
+        short_predictions = short_future.result(timeout=15.0)
+        long_predictions = long_future.result(timeout=15.0)
+
+    assert [prediction.pronunciation for prediction in short_predictions] == ["ニンキ"]
+    assert [prediction.pronunciation for prediction in long_predictions] == ["ヒトケ", "ヒトケ"]
+    assert len(session.model_inputs) == 1
+    inputs = session.model_inputs[0]
+    assert inputs["input_ids"].shape == (2, 9)
+    assert inputs["target_mask"].shape == (2, 2, 9)
+    assert sorted(inputs["attention_mask"].sum(axis=1).tolist()) == [4, 9]
+    # 対象数の少ない窓の埋め草にも、空マスクを渡さない
+    assert inputs["target_mask"].any(axis=2).all()
+
+
+def test_batch_queue_returns_session_error_to_caller() -> None:
+    """待ち行列経由の ONNX 実行で送出された例外を、呼び出し元へそのまま返す。"""
+
+    def run(_output_names: list[str], _model_inputs: dict[str, Any]) -> list[Any]:
+        raise RuntimeError("session failed")
+
+    session = SimpleNamespace(run=run, get_providers=lambda: ["CPUExecutionProvider"])
+    metadata = tsqyomi.TsqyomiMetadata.model_validate(
+        _minimal_v3_metadata_payload(leading_token_id=1, trailing_token_id=2)
+    )
+    model = tsqyomi.TsqyomiModel(_CharacterTokenizer(), session, metadata, batch_wait_seconds=0.0)
+
+    with pytest.raises(RuntimeError, match="session failed"):
+        model.predict("人気", (_ninki_target(0),))
+
+
+def test_predict_rejects_target_longer_than_window() -> None:
+    """単一対象だけで入力窓に収まらない場合は TargetWindowOverflowError を送出する。"""
+
+    metadata = tsqyomi.TsqyomiMetadata.model_validate(
+        _minimal_v3_metadata_payload(model_max_length=3, leading_token_id=1, trailing_token_id=2)
+    )
+    model = tsqyomi.TsqyomiModel(_CharacterTokenizer(), _RecordingSession(), metadata)
+
+    with pytest.raises(tsqyomi.TargetWindowOverflowError):
+        model.predict("人気", (_ninki_target(0),))
+
+
+@pytest.fixture
+def prediction_cache() -> Iterator[None]:
+    """予測キャッシュを有効化し、テスト後に無効化する。"""
+
+    tsqyomi.set_prediction_cache_size(16)
+    tsqyomi.clear_prediction_cache()
+    try:
+        yield
+    finally:
+        tsqyomi.set_prediction_cache_size(0)
+        tsqyomi.clear_prediction_cache()
+
+
+@pytest.mark.usefixtures("prediction_cache")
+def test_prediction_cache_reuses_identical_windows() -> None:
+    """
+    トークン列・対象位置・候補発音が同一の入力窓は ONNX を実行せずキャッシュした予測を返し、
+    候補発音が異なる場合は別の入力窓として推論する。
+    """
+
+    session = _RecordingSession()
+    metadata = tsqyomi.TsqyomiMetadata.model_validate(
+        _minimal_v3_metadata_payload(model_max_length=5, leading_token_id=1, trailing_token_id=2)
+    )
+    model = tsqyomi.TsqyomiModel(_CharacterTokenizer(), session, metadata)
+
+    # 2対象は「人気が」と「が人気」の別々の入力窓に載る
+    first_predictions = model.predict("人気が人気", (_ninki_target(0), _ninki_target(3)))
+    # 2つ目の窓だけが前回と同じ入力窓になる
+    second_predictions = model.predict("人気が人気", (_ninki_target(3),))
+    reordered_target = tsqyomi.ReadingTarget(
+        char_span=(3, 5), surface="人気", pronunciations=("ヒトケ", "ニンキ")
+    )
+    third_predictions = model.predict("人気が人気", (reordered_target,))
+
+    assert second_predictions == first_predictions[1:]
+    assert third_predictions[0].pronunciation == "ニンキ"
+    assert [inputs["input_ids"].shape[0] for inputs in session.model_inputs] == [2, 1]
+    assert tsqyomi.get_prediction_cache_stats() == {
+        "hits": 1,
+        "misses": 3,
+        "evictions": 0,
+        "size": 3,
+        "max_size": 16,
+    }
+
+
+@pytest.mark.usefixtures("prediction_cache")
+def test_prediction_cache_is_separated_by_model_and_cleared_on_unload() -> None:
+    """別のモデルの予測はキャッシュから返さず、unload_model() で全項目を破棄する。"""
+
+    metadata = tsqyomi.TsqyomiMetadata.model_validate(
+        _minimal_v3_metadata_payload(leading_token_id=1, trailing_token_id=2)
+    )
+    first_session = _RecordingSession()
+    second_session = _RecordingSession()
+    first_model = tsqyomi.TsqyomiModel(_CharacterTokenizer(), first_session, metadata)
+    second_model = tsqyomi.TsqyomiModel(_CharacterTokenizer(), second_session, metadata)
+
+    first_model.predict("人気", (_ninki_target(0),))
+    second_model.predict("人気", (_ninki_target(0),))
+    first_model.predict("人気", (_ninki_target(0),))
+
+    assert len(first_session.model_inputs) == 1
+    assert len(second_session.model_inputs) == 1
+    assert tsqyomi.get_prediction_cache_stats()["hits"] == 1
+    assert tsqyomi.get_prediction_cache_stats()["size"] == 2
+
+    tsqyomi.unload_model()
+    assert tsqyomi.get_prediction_cache_stats()["size"] == 0
+
+
+def test_prediction_cache_is_disabled_by_default() -> None:
+    """最大件数を設定するまでは予測キャッシュを使わない。"""
+
+    session = _RecordingSession()
+    metadata = tsqyomi.TsqyomiMetadata.model_validate(
+        _minimal_v3_metadata_payload(leading_token_id=1, trailing_token_id=2)
+    )
+    model = tsqyomi.TsqyomiModel(_CharacterTokenizer(), session, metadata)
+
+    tsqyomi.clear_prediction_cache()
+    model.predict("人気", (_ninki_target(0),))
+    model.predict("人気", (_ninki_target(0),))
+
+    assert len(session.model_inputs) == 2
+    assert tsqyomi.get_prediction_cache_stats() == {
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "size": 0,
+        "max_size": 0,
+    }
+
+
 def test_onnx_contract_rejects_wrong_output_rank() -> None:
     """読みクラス出力が3次元でない ONNX をモデル初期化前に拒否する。"""
 
@@ -566,7 +980,7 @@ def test_tsqyomi_preserves_out_of_class_suffix_default(
 
     model = SimpleNamespace(
         metadata=SimpleNamespace(
-            surfaces_by_first_character={"日": ("日",)},
+            target_surface_matcher=tsqyomi.TargetSurfaceMatcher(("日",)),
             class_index_by_surface_and_pronunciation={
                 "日": {"ヒ": 0, "ニチ": 1},
             },
@@ -618,7 +1032,7 @@ def test_tsqyomi_preserves_productive_compound_suffix_default(
 
     model = SimpleNamespace(
         metadata=SimpleNamespace(
-            surfaces_by_first_character={"家": ("家",)},
+            target_surface_matcher=tsqyomi.TargetSurfaceMatcher(("家",)),
             class_index_by_surface_and_pronunciation={
                 "家": {"イエ": 0, "ウチ": 1},
             },
@@ -779,7 +1193,7 @@ def test_tsqyomi_changes_out_of_class_default_for_independent_reading(
 
     model = SimpleNamespace(
         metadata=SimpleNamespace(
-            surfaces_by_first_character={surface[0]: (surface,)},
+            target_surface_matcher=tsqyomi.TargetSurfaceMatcher((surface,)),
             class_index_by_surface_and_pronunciation={
                 surface: {
                     allowed_readings[0]: 0,
@@ -821,7 +1235,7 @@ def test_tsqyomi_preserves_inflection_pronunciation_within_same_reading_class(
 
     model = SimpleNamespace(
         metadata=SimpleNamespace(
-            surfaces_by_first_character={"来": ("来",)},
+            target_surface_matcher=tsqyomi.TargetSurfaceMatcher(("来",)),
             class_index_by_surface_and_pronunciation={
                 "来": {
                     "キ": 0,
@@ -879,7 +1293,7 @@ def test_tsqyomi_resolves_case_marked_independent_noun_from_morphology(
 
     model = SimpleNamespace(
         metadata=SimpleNamespace(
-            surfaces_by_first_character={"後": ("後",)},
+            target_surface_matcher=tsqyomi.TargetSurfaceMatcher(("後",)),
             class_index_by_surface_and_pronunciation={
                 "後": {
                     "アト": 0,
@@ -925,7 +1339,7 @@ def test_tsqyomi_resolves_baseball_inning_half_from_morphology(
 
     model = SimpleNamespace(
         metadata=SimpleNamespace(
-            surfaces_by_first_character={"表": ("表",)},
+            target_surface_matcher=tsqyomi.TargetSurfaceMatcher(("表",)),
             class_index_by_surface_and_pronunciation={
                 "表": {
                     "オモテ": 0,
@@ -967,7 +1381,7 @@ def test_tsqyomi_preserves_juubun_before_adjectival_continuation(
 
     model = SimpleNamespace(
         metadata=SimpleNamespace(
-            surfaces_by_first_character={"十": ("十分",)},
+            target_surface_matcher=tsqyomi.TargetSurfaceMatcher(("十分",)),
             class_index_by_surface_and_pronunciation={
                 "十分": {
                     "ジューブン": 0,
@@ -1009,7 +1423,7 @@ def test_tsqyomi_resolves_toki_from_fixed_morphology(
 
     model = SimpleNamespace(
         metadata=SimpleNamespace(
-            surfaces_by_first_character={"時": ("時",)},
+            target_surface_matcher=tsqyomi.TargetSurfaceMatcher(("時",)),
             class_index_by_surface_and_pronunciation={
                 "時": {
                     "ジ": 0,
@@ -0,0 +1,75 @@
+"""warmup() によるコンポーネントの事前初期化を検証する。"""
+
+# pyright: reportPrivateUsage=false
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+
+import pyopenjtalk
+from pyopenjtalk import utils
+
+
+@pytest.fixture
+def pool_size_two() -> Iterator[None]:
+    """グローバルインスタンスプールの上限数を2にし、テスト後に1へ戻す。"""
+
+    pyopenjtalk.set_global_jtalk_pool_size(2)
+    pyopenjtalk.set_global_htsengine_pool_size(2)
+    try:
+        yield
+    finally:
+        pyopenjtalk.set_global_jtalk_pool_size(1)
+        pyopenjtalk.set_global_htsengine_pool_size(1)
+
+
+def test_warmup_returns_timing_breakdown_without_touching_caches() -> None:
+    """既定のコンポーネントごとの初期化時間を返し、結果キャッシュと合成波形キャッシュは経由しない。"""
+
+    pyopenjtalk.set_frontend_cache_size(16)
+    pyopenjtalk.set_waveform_cache_size(16 * 1024 * 1024)
+    try:
+        timings = pyopenjtalk.warmup()
+        frontend_cache_stats = pyopenjtalk.get_frontend_cache_stats()
+        waveform_cache_stats = pyopenjtalk.get_waveform_cache_stats()
+    finally:
+        pyopenjtalk.set_frontend_cache_size(0)
+        pyopenjtalk.set_waveform_cache_size(0)
+
+    assert list(timings) == ["openjtalk", "sudachi", "nani", "htsengine", "total"]
+    assert all(seconds >= 0.0 for seconds in timings.values())
+    assert timings["total"] >= sum(seconds for name, seconds in timings.items() if name != "total")
+    assert frontend_cache_stats["hits"] + frontend_cache_stats["misses"] == 0
+    assert waveform_cache_stats["hits"] + waveform_cache_stats["misses"] == 0
+
+
+@pytest.mark.usefixtures("pool_size_two")
+def test_warmup_fills_pools_and_executor_threads() -> None:
+    """threads 個まで各プールを生成し、渡した Executor のワーカースレッドごとの状態も初期化する。"""
+
+    def has_sudachi_tokenizer(barrier: Barrier) -> bool:
+        """全ワーカースレッドで揃って、スレッドごとの Sudachi トークナイザーの有無を返す。"""
+
+        barrier.wait(timeout=5.0)
+        return getattr(utils._SUDACHI_TOKENIZER_LOCAL, "tokenizer", None) is not None
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        timings = pyopenjtalk.warmup(["openjtalk", "sudachi", "htsengine"], 2, executor=executor)
+        barrier = Barrier(2)
+        tokenizer_states = [executor.submit(has_sudachi_tokenizer, barrier) for _ in range(2)]
+
+        assert [future.result() for future in tokenizer_states] == [True, True]
+    assert list(timings) == ["openjtalk", "sudachi", "htsengine", "threads", "total"]
+    assert len(pyopenjtalk._global_jtalk._instances) == 2
+    assert pyopenjtalk._global_htsengine._instance_count == 2
+
+
+def test_warmup_rejects_invalid_arguments() -> None:
+    """未知のコンポーネント名と1未満のタスク数は ValueError になる。"""
+
+    with pytest.raises(ValueError, match="Unknown warmup features"):
+        pyopenjtalk.warmup(["openjtalk", "mecab"])  # type: ignore[list-item]
+    with pytest.raises(ValueError, match="threads"):
+        pyopenjtalk.warmup(threads=0)